@@ -4,12 +4,32 @@
 """Patch for aioeapi waiting for https://github.com/jeremyschulman/aio-eapi/pull/13"""
 from __future__ import annotations
 
-from typing import Any, AnyStr
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AnyStr, Iterator, Optional
 
 import aioeapi
 
 Device = aioeapi.Device
 
+# Timeout of the eAPI requests sent by the current asyncio task, overriding the timeout of the Device
+_request_timeout: ContextVar[Optional[float]] = ContextVar("request_timeout", default=None)
+
+
+@contextmanager
+def request_timeout(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Context manager overriding the timeout of the Device for the eAPI requests sent within it.
+
+    Args:
+        timeout: Timeout in seconds, None to use the timeout of the Device
+    """
+    token = _request_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _request_timeout.reset(token)
+
 
 class EapiCommandError(RuntimeError):
     """
@@ -61,7 +81,10 @@ async def jsonrpc_exec(self, jsonrpc: dict) -> list[dict | AnyStr]:  # type: ign
     The list of command results; either dict or text depending on the
     JSON-RPC format pameter.
     """
-    res = await self.post("/command-api", json=jsonrpc)
+    if (timeout := _request_timeout.get()) is not None:
+        res = await self.post("/command-api", json=jsonrpc, timeout=timeout)
+    else:
+        res = await self.post("/command-api", json=jsonrpc)
     res.raise_for_status()
     body = res.json()
 
@@ -7,18 +7,23 @@ Catalog related functions
 from __future__ import annotations
 
 import importlib
+import importlib.util
+import itertools
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from inspect import isclass
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, ConfigDict, RootModel, ValidationError, ValidationInfo, field_validator, model_validator
 from pydantic.types import ImportString
-from yaml import YAMLError, safe_load
+from pydantic_core import InitErrorDetails, PydanticCustomError
+from yaml import YAMLError
 
 from anta.logger import anta_log_exception
 from anta.models import AntaTest
+from anta.tools.loader import ParseCache, yaml_load
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +93,179 @@ class AntaTestDefinition(BaseModel):
         return self
 
 
+# ( <module_name>, <test_class_name>, <inputs> )
+RawTestDefinition = Tuple[str, str, Any]
+
+# ( <module_name>, <index_in_module> )
+DefinitionLocation = Tuple[str, int]
+
+# ( <error_type>, <error_location>, <error_message>, <input_value> )
+ErrorDetails = Tuple[str, Tuple[Union[str, int], ...], str, Any]
+
+# ( <location>, <raw_test_definition or None if the syntax is invalid>, <syntax_errors> )
+CatalogEntry = Tuple[DefinitionLocation, Optional[RawTestDefinition], List[ErrorDetails]]
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Return a hashable form of a value loaded from a test catalog file, independent of the order of the mapping keys.
+    The type of each value is kept so that e.g. the keys `1` and `"1"` of a YAML mapping are not confused.
+    """
+    if isinstance(value, dict):
+        # Sorting the canonical forms by their representation supports the mappings with keys of different types
+        return ("dict", tuple(sorted(((_canonical(key), _canonical(item)) for key, item in value.items()), key=repr)))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_canonical(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value).__name__, tuple(sorted((_canonical(item) for item in value), key=repr)))
+    return (type(value).__name__, repr(value))
+
+
+def _inputs_key(inputs: Any) -> str:
+    """
+    Return a string identifying test inputs as loaded from a test catalog file.
+    """
+    return repr(_canonical(inputs))
+
+
+def _value_error(message: str, value: Any) -> ErrorDetails:
+    """
+    Return the details of a `value_error` as formatted by pydantic.
+    """
+    return ("value_error", (), f"Value error, {message}", value)
+
+
+def _flatten_module_names(data: dict[str, Any], package: str | None = None) -> dict[str, list[Any]]:
+    """
+    Same as the `flatten_modules()` function of `AntaCatalogFile.check_tests()` but without importing the Python modules.
+    Returns the raw test definitions indexed by absolute Python module name.
+    """
+    modules: dict[str, list[Any]] = {}
+    for module_name, tests in data.items():
+        if package and not module_name.startswith("."):
+            module_name = f".{module_name}"
+        name = importlib.util.resolve_name(module_name, package)
+        if isinstance(tests, dict):
+            # This is an inner Python module
+            modules.update(_flatten_module_names(data=tests, package=name))
+        else:
+            if not isinstance(tests, list):
+                raise ValueError(f"Syntax error when parsing: {tests}\nIt must be a list of ANTA tests. Check the test catalog.")
+            modules[name] = tests
+    return modules
+
+
+def _parse_entries(module_name: str, tests: list[Any]) -> list[CatalogEntry]:
+    """
+    Check the syntax of the raw test definitions of a Python module in a test catalog.
+    """
+    entries: list[CatalogEntry] = []
+    for index, test_definition in enumerate(tests):
+        loc = (module_name, index)
+        if not isinstance(test_definition, dict):
+            error = _value_error(f"Syntax error when parsing: {test_definition}\nIt must be a dictionary. Check the test catalog.", test_definition)
+            entries.append((loc, None, [error]))
+        elif len(test_definition) != 1:
+            error = _value_error(
+                f"Syntax error when parsing: {test_definition}\nIt must be a dictionary with a single entry. Check the indentation in the test catalog.",
+                test_definition,
+            )
+            entries.append((loc, None, [error]))
+        else:
+            test_name, test_inputs = next(iter(test_definition.items()))
+            entries.append((loc, (module_name, test_name, test_inputs), []))
+    return entries
+
+
+def _validate_definition_chunk(definitions: list[RawTestDefinition]) -> list[AntaTestDefinition | list[ErrorDetails]]:
+    """
+    Validate a list of raw test definitions.
+
+    Returns:
+        For each raw test definition, either the AntaTestDefinition instance or the details of the validation errors.
+        Errors are returned as tuples so they can be sent back from a worker process.
+    """
+    results: list[AntaTestDefinition | list[ErrorDetails]] = []
+    for module_name, test_name, inputs in definitions:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # A test module is potentially user-defined code.
+            # We need to catch everything if we want to have meaningful logs
+            message = f"Module named {module_name} cannot be imported. Verify that the module exists and there is no Python syntax issues."
+            results.append([_value_error(message, module_name)])
+            continue
+        test: type[AntaTest] | None = getattr(module, test_name, None)
+        if test is None:
+            message = f"{test_name} is not defined in Python module {module.__name__}{f' (from {module.__file__})' if module.__file__ is not None else ''}"
+            results.append([_value_error(message, {test_name: inputs})])
+            continue
+        try:
+            results.append(AntaTestDefinition(test=test, inputs=inputs))
+        except ValidationError as e:
+            results.append([(error["type"], tuple(error["loc"]), error["msg"], error["input"]) for error in e.errors(include_url=False)])
+    return results
+
+
+def _validate_definitions(definitions: list[RawTestDefinition], max_workers: int | None = None) -> list[AntaTestDefinition | list[ErrorDetails]]:
+    """
+    Validate raw test definitions, in a pool of `max_workers` worker processes if `max_workers` is greater than 1.
+    """
+    if max_workers is None or max_workers <= 1 or len(definitions) <= max_workers:
+        return _validate_definition_chunk(definitions)
+    # Send a few chunks to each worker to balance the load while limiting the inter-process communication overhead
+    chunk_size = -(-len(definitions) // (max_workers * 4))
+    iterator = iter(definitions)
+    chunks = list(iter(lambda: list(itertools.islice(iterator, chunk_size)), []))
+    logger.debug(f"Validating {len(definitions)} test definitions using {max_workers} worker processes")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(itertools.chain.from_iterable(executor.map(_validate_definition_chunk, chunks)))
+
+
+def _build_test_definitions(
+    entries: list[CatalogEntry], max_workers: int | None = None
+) -> tuple[list[tuple[DefinitionLocation, AntaTestDefinition]], list[InitErrorDetails]]:
+    """
+    Build AntaTestDefinition instances from catalog entries.
+    Identical raw test definitions are validated only once and share the same AntaTestDefinition instance.
+
+    Returns:
+        The AntaTestDefinition instances with their location in the catalog and the errors of the invalid entries.
+    """
+    unique_definitions: dict[tuple[str, str, str], RawTestDefinition] = {}
+    for _, definition, _ in entries:
+        if definition is not None:
+            module_name, test_name, inputs = definition
+            unique_definitions.setdefault((module_name, test_name, _inputs_key(inputs)), definition)
+    validated = dict(zip(unique_definitions, _validate_definitions(list(unique_definitions.values()), max_workers)))
+
+    test_definitions: list[tuple[DefinitionLocation, AntaTestDefinition]] = []
+    line_errors: list[InitErrorDetails] = []
+    for loc, definition, errors in entries:
+        if definition is not None:
+            module_name, test_name, inputs = definition
+            result = validated[(module_name, test_name, _inputs_key(inputs))]
+            if isinstance(result, AntaTestDefinition):
+                test_definitions.append((loc, result))
+                continue
+            errors = result
+        line_errors.extend(
+            {"type": PydanticCustomError(error_type, msg), "loc": (*loc, *error_loc), "input": error_input} for error_type, error_loc, msg, error_input in errors
+        )
+    return test_definitions, line_errors
+
+
+def _raw_tags(entry: CatalogEntry) -> list[str] | None:
+    """
+    Return the filter tags of a catalog entry from its raw test inputs, None if there is no tag.
+    Invalid entries are considered without tags so they are always validated when selecting untagged tests.
+    """
+    if (definition := entry[1]) is None or not isinstance(inputs := definition[2], dict) or not isinstance(filters := inputs.get("filters"), dict):
+        return None
+    tags = filters.get("tags")
+    return tags if isinstance(tags, list) and all(isinstance(tag, str) for tag in tags) else None
+
+
 class AntaCatalogFile(RootModel[Dict[ImportString[Any], List[AntaTestDefinition]]]):  # pylint: disable=too-few-public-methods
     """
     This model represents an ANTA Test Catalog File.
@@ -102,12 +280,16 @@ class AntaCatalogFile(RootModel[Dict[ImportString[Any], List[AntaTestDefinition]
 
     @model_validator(mode="before")
     @classmethod
-    def check_tests(cls, data: Any) -> Any:
+    def check_tests(cls, data: Any, info: ValidationInfo) -> Any:
         """
         Allow the user to provide a Python data structure that only has string values.
         This validator will try to flatten and import Python modules, check if the tests classes
         are actually defined in their respective Python module and instantiate Input instances
         with provided value to validate test inputs.
+
+        Identical test definitions are validated only once. If `max_workers` is provided in the
+        validation context, test definitions are validated in a pool of worker processes.
+        All the errors found in the catalog are reported in a single ValidationError.
         """
 
         def flatten_modules(data: dict[str, Any], package: str | None = None) -> dict[ModuleType, list[Any]]:
@@ -149,23 +331,16 @@ class AntaCatalogFile(RootModel[Dict[ImportString[Any], List[AntaTestDefinition]
 
         if isinstance(data, dict):
             typed_data: dict[ModuleType, list[Any]] = flatten_modules(data)
-            for module, tests in typed_data.items():
-                test_definitions: list[AntaTestDefinition] = []
-                for test_definition in tests:
-                    if not isinstance(test_definition, dict):
-                        raise ValueError(f"Syntax error when parsing: {test_definition}\nIt must be a dictionary. Check the test catalog.")
-                    if len(test_definition) != 1:
-                        raise ValueError(
-                            f"Syntax error when parsing: {test_definition}\nIt must be a dictionary with a single entry. Check the indentation in the test catalog."
-                        )
-                    for test_name, test_inputs in test_definition.copy().items():
-                        test: type[AntaTest] | None = getattr(module, test_name, None)
-                        if test is None:
-                            raise ValueError(
-                                f"{test_name} is not defined in Python module {module.__name__}{f' (from {module.__file__})' if module.__file__ is not None else ''}"
-                            )
-                        test_definitions.append(AntaTestDefinition(test=test, inputs=test_inputs))
-                typed_data[module] = test_definitions
+            entries = [entry for module, tests in typed_data.items() for entry in _parse_entries(module.__name__, tests)]
+            max_workers = info.context.get("max_workers") if info.context is not None else None
+            test_definitions, line_errors = _build_test_definitions(entries, max_workers)
+            if line_errors:
+                # Report all the errors of the catalog at once
+                raise ValidationError.from_exception_data(cls.__name__, line_errors)
+            modules = {module.__name__: module for module in typed_data}
+            typed_data = {module: [] for module in typed_data}
+            for (module_name, _), test_definition in test_definitions:
+                typed_data[modules[module_name]].append(test_definition)
         return typed_data
 
 
@@ -174,6 +349,10 @@ class AntaCatalog:
     Class representing an ANTA Catalog.
 
     It can be instantiated using its contructor or one of the static methods: `parse()`, `from_list()` or `from_dict()`
+
+    A catalog loaded with `lazy=True` keeps the raw test definitions and only imports the test modules and validates
+    the test inputs when the test definitions are actually requested, i.e. when accessing the `tests` property or when
+    calling `get_tests_by_tags()` or `get_untagged_tests()`.
     """
 
     def __init__(self, tests: list[AntaTestDefinition] | None = None, filename: str | Path | None = None) -> None:
@@ -193,6 +372,13 @@ class AntaCatalog:
                 self._filename = filename
             else:
                 self._filename = Path(filename)
+        # Raw test definitions of a lazy catalog that have not been validated yet
+        self._pending: list[CatalogEntry] = []
+        self._max_workers: int | None = None
+
+    def __len__(self) -> int:
+        """Number of test definitions in this catalog, including the ones of a lazy catalog that have not been validated yet"""
+        return len(self._tests) + len(self._pending)
 
     @property
     def filename(self) -> Path | None:
@@ -202,6 +388,7 @@ class AntaCatalog:
     @property
     def tests(self) -> list[AntaTestDefinition]:
         """List of AntaTestDefinition in this catalog"""
+        self._resolve(lambda tags: True)
         return self._tests
 
     @tests.setter
@@ -212,27 +399,54 @@ class AntaCatalog:
             if not isinstance(t, AntaTestDefinition):
                 raise ValueError("A test in the catalog must be an AntaTestDefinition instance")
         self._tests = value
+        self._pending = []
 
     @staticmethod
-    def parse(filename: str | Path) -> AntaCatalog:
+    def parse(filename: str | Path | list[str | Path], cache: bool = False, max_workers: int | None = None, lazy: bool = False) -> AntaCatalog:
         """
-        Create an AntaCatalog instance from a test catalog file.
+        Create an AntaCatalog instance from one or more test catalog files.
+
+        If `filename` is a directory, all the YAML files (`*.yml` or `*.yaml`) of this directory and its sub-directories
+        are loaded in alphabetical order. If several files are loaded, the resulting catalogs are merged using `merge_catalogs()`.
 
         Args:
-            filename: Path to test catalog YAML file
+            filename: Path to test catalog YAML file, to a directory of test catalog YAML files or a list of such paths
+            cache: Load the validated test definitions from a parsed-file cache stored next to the catalog file
+                   if the file has not changed, and update this cache otherwise. See `anta.tools.loader.ParseCache`.
+                   The cache is not updated when loading a lazy catalog.
+            max_workers: Number of worker processes used to validate the test definitions. Defaults to None (no worker process).
+            lazy: Only validate the test definitions when they are requested.
         """
+        if isinstance(filename, list):
+            return AntaCatalog.merge_catalogs([AntaCatalog.parse(f, cache=cache, max_workers=max_workers, lazy=lazy) for f in filename])
+        if Path(filename).is_dir():
+            files = sorted(f for f in Path(filename).rglob("*") if f.suffix in (".yml", ".yaml") and f.is_file())
+            logger.debug(f"Loading {len(files)} test catalog files from directory '{filename}'")
+            catalog = AntaCatalog.merge_catalogs([AntaCatalog.parse(f, cache=cache, max_workers=max_workers, lazy=lazy) for f in files])
+            catalog._filename = Path(filename)  # pylint: disable=protected-access
+            return catalog
+
+        parse_cache: ParseCache | None = None
         try:
+            if cache:
+                parse_cache = ParseCache(filename)
+                tests = parse_cache.load()
+                if tests is not None:
+                    return AntaCatalog(tests, filename=filename)
             with open(file=filename, mode="r", encoding="UTF-8") as file:
-                data = safe_load(file)
+                data = yaml_load(file)
         except (TypeError, YAMLError, OSError) as e:
             message = f"Unable to parse ANTA Test Catalog file '{filename}'"
             anta_log_exception(e, message, logger)
             raise
 
-        return AntaCatalog.from_dict(data, filename=filename)
+        catalog = AntaCatalog.from_dict(data, filename=filename, max_workers=max_workers, lazy=lazy)
+        if parse_cache is not None and not lazy:
+            parse_cache.dump(catalog.tests)
+        return catalog
 
     @staticmethod
-    def from_dict(data: RawCatalogInput, filename: str | Path | None = None) -> AntaCatalog:
+    def from_dict(data: RawCatalogInput, filename: str | Path | None = None, max_workers: int | None = None, lazy: bool = False) -> AntaCatalog:
         """
         Create an AntaCatalog instance from a dictionary data structure.
         See RawCatalogInput type alias for details.
@@ -242,6 +456,8 @@ class AntaCatalog:
         Args:
             data: Python dictionary used to instantiate the AntaCatalog instance
             filename: value to be set as AntaCatalog instance attribute
+            max_workers: Number of worker processes used to validate the test definitions. Defaults to None (no worker process).
+            lazy: Only validate the test definitions when they are requested. Test modules are not imported until then.
         """
         tests: list[AntaTestDefinition] = []
         if data is None:
@@ -251,8 +467,20 @@ class AntaCatalog:
         if not isinstance(data, dict):
             raise ValueError(f"Wrong input type for catalog data{f' (from {filename})' if filename is not None else ''}, must be a dict, got {type(data).__name__}")
 
+        if lazy:
+            try:
+                modules = _flatten_module_names(data)
+            except ValueError as e:
+                anta_log_exception(e, f"Test catalog is invalid!{f' (from {filename})' if filename is not None else ''}", logger)
+                raise
+            catalog = AntaCatalog(filename=filename)
+            # pylint: disable=protected-access
+            catalog._pending = [entry for module_name, module_tests in modules.items() for entry in _parse_entries(module_name, module_tests)]
+            catalog._max_workers = max_workers
+            return catalog
+
         try:
-            catalog_data = AntaCatalogFile(**data)  # type: ignore[arg-type]
+            catalog_data = AntaCatalogFile.model_validate(data, context={"max_workers": max_workers})
         except ValidationError as e:
             anta_log_exception(e, f"Test catalog is invalid!{f' (from {filename})' if filename is not None else ''}", logger)
             raise
@@ -277,15 +505,91 @@ class AntaCatalog:
             raise
         return AntaCatalog(tests)
 
+    @staticmethod
+    def merge_catalogs(catalogs: list[AntaCatalog]) -> AntaCatalog:
+        """
+        Merge multiple AntaCatalog instances into a new AntaCatalog instance.
+        Duplicated test definitions (same test with the same inputs) are only kept once.
+        Test definitions that have not been validated yet remain lazy in the merged catalog.
+
+        Args:
+            catalogs: List of AntaCatalog instances to merge
+        """
+        # pylint: disable=protected-access
+        merged = AntaCatalog(list(dict.fromkeys(itertools.chain.from_iterable(catalog._tests for catalog in catalogs))))
+        pending_keys: set[tuple[str, str, str]] = set()
+        for catalog in catalogs:
+            for entry in catalog._pending:
+                if (definition := entry[1]) is not None:
+                    key = (definition[0], definition[1], _inputs_key(definition[2]))
+                    if key in pending_keys:
+                        continue
+                    pending_keys.add(key)
+                merged._pending.append(entry)
+            if catalog._max_workers is not None:
+                merged._max_workers = max(merged._max_workers or 0, catalog._max_workers)
+        return merged
+
+    def merge(self, catalog: AntaCatalog) -> AntaCatalog:
+        """
+        Merge this AntaCatalog instance with another AntaCatalog instance.
+        See `merge_catalogs()`.
+
+        Args:
+            catalog: AntaCatalog instance to merge to this instance
+
+        Returns:
+            A new AntaCatalog instance containing the tests of the two instances.
+        """
+        return AntaCatalog.merge_catalogs([self, catalog])
+
+    def _resolve(self, select: Callable[[list[str] | None], bool]) -> None:
+        """
+        Validate the pending test definitions of a lazy catalog for which `select(<filter tags>)` returns True.
+        The filter tags are read from the raw test inputs: they are None if the test definition has no tags.
+
+        Raises:
+            ValidationError: At least one of the selected test definitions is invalid.
+        """
+        if not self._pending:
+            return
+        selected: list[CatalogEntry] = []
+        remaining: list[CatalogEntry] = []
+        for entry in self._pending:
+            (selected if select(_raw_tags(entry)) else remaining).append(entry)
+        if not selected:
+            return
+        test_definitions, line_errors = _build_test_definitions(selected, self._max_workers)
+        if line_errors:
+            e = ValidationError.from_exception_data(AntaCatalogFile.__name__, line_errors)
+            anta_log_exception(e, f"Test catalog is invalid!{f' (from {self.filename})' if self.filename is not None else ''}", logger)
+            raise e
+        logger.debug(f"Validated {len(selected)} lazy test definitions, {len(remaining)} remaining")
+        self._tests.extend(test_definition for _, test_definition in test_definitions)
+        self._pending = remaining
+
     def get_tests_by_tags(self, tags: list[str], strict: bool = False) -> list[AntaTestDefinition]:
         """
         Return all the tests that have matching tags in their input filters.
         If strict=True, returns only tests that match all the tags provided as input.
         If strict=False, return all the tests that match at least one tag provided as input.
         """
+        tags_set = set(tags)
+
+        def match(filter_tags: list[str]) -> bool:
+            return all(t in tags_set for t in filter_tags) if strict else any(t in tags_set for t in filter_tags)
+
+        self._resolve(lambda filter_tags: filter_tags is not None and match(filter_tags))
         result: list[AntaTestDefinition] = []
-        for test in self.tests:
+        for test in self._tests:
             if test.inputs.filters and (f := test.inputs.filters.tags):
-                if (strict and all(t in tags for t in f)) or (not strict and any(t in tags for t in f)):
+                if match(f):
                     result.append(test)
         return result
+
+    def get_untagged_tests(self) -> list[AntaTestDefinition]:
+        """
+        Return all the tests that do not have tags in their input filters.
+        """
+        self._resolve(lambda filter_tags: filter_tags is None)
+        return [test for test in self._tests if test.inputs.filters is None or test.inputs.filters.tags is None]
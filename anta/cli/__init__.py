@@ -4,6 +4,11 @@
 # that can be found in the LICENSE file.
 """
 ANTA CLI
+
+The CLI must start fast, e.g. for `anta --help` or the shell completion. The subcommands are imported when invoked and
+the heavy dependencies, e.g. asyncssh, httpx, jinja2 or the rich progress bars, are imported inside the functions using them,
+including in the `anta` modules imported by the CLI. `tests/units/cli/test__init__.py` checks that `anta --help` and the
+`--help` of the subcommands do not import them.
 """
 from __future__ import annotations
 
@@ -14,18 +19,25 @@ import sys
 import click
 
 from anta import GITHUB_SUGGESTION, __version__
-from anta.cli.check import check as check_command
-from anta.cli.debug import debug as debug_command
-from anta.cli.exec import exec as exec_command
-from anta.cli.get import get as get_command
-from anta.cli.nrfu import nrfu as nrfu_command
-from anta.cli.utils import AliasedGroup, ExitCode
+from anta.cli.utils import ExitCode, LazyGroup
 from anta.logger import Log, LogLevel, anta_log_exception, setup_logging
 
 logger = logging.getLogger(__name__)
 
+# ANTA subcommands are imported when invoked to keep the CLI startup fast
+SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "check": ("anta.cli.check:check", "Commands to validate configuration files"),
+    "debug": ("anta.cli.debug:debug", "Commands to execute EOS commands on remote devices"),
+    "diff": ("anta.cli.diff:diff", "Commands to compare test results or snapshots"),
+    "exec": ("anta.cli.exec:exec", "Commands to execute various scripts on EOS devices"),
+    "get": ("anta.cli.get:get", "Commands to get information from or generate inventories"),
+    "nrfu": ("anta.cli.nrfu:nrfu", "Run ANTA tests on devices"),
+    "simulate": ("anta.cli.simulate:simulate", "Run a local eAPI simulator of EOS devices for load testing"),
+    "watch": ("anta.cli.watch:watch", "Run ANTA tests continuously and report the changed results"),
+}
+
 
-@click.group(cls=AliasedGroup)
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
 @click.pass_context
 @click.version_option(__version__)
 @click.option(
@@ -52,13 +64,6 @@ def anta(ctx: click.Context, log_level: LogLevel, log_file: pathlib.Path) -> Non
     setup_logging(log_level, log_file)
 
 
-anta.add_command(nrfu_command)
-anta.add_command(check_command)
-anta.add_command(exec_command)
-anta.add_command(get_command)
-anta.add_command(debug_command)
-
-
 def cli() -> None:
     """Entrypoint for pyproject.toml"""
     try:
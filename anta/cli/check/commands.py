@@ -10,20 +10,27 @@ from __future__ import annotations
 import logging
 
 import click
+from pydantic import ValidationError
 from rich.pretty import pretty_repr
 
 from anta.catalog import AntaCatalog
 from anta.cli.console import console
-from anta.cli.utils import catalog_options
+from anta.cli.utils import ExitCode, catalog_options
 
 logger = logging.getLogger(__name__)
 
 
 @click.command
+@click.pass_context
 @catalog_options
-def catalog(catalog: AntaCatalog) -> None:
+def catalog(ctx: click.Context, catalog: AntaCatalog) -> None:
     """
     Check that the catalog is valid
     """
+    try:
+        # Validate all the test definitions of a lazy catalog
+        tests = catalog.tests
+    except ValidationError:
+        ctx.exit(ExitCode.USAGE_ERROR)
     console.print(f"[bold][green]Catalog is valid: {catalog.filename}")
-    console.print(pretty_repr(catalog.tests))
+    console.print(pretty_repr(tests))
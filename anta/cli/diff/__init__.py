@@ -0,0 +1,18 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Click commands to compare test results or snapshots
+"""
+import click
+
+from anta.cli.diff import commands
+
+
+@click.group
+def diff() -> None:
+    """Commands to compare test results or snapshots"""
+
+
+diff.add_command(commands.results)
+diff.add_command(commands.snapshots)
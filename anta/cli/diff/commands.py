@@ -0,0 +1,81 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Click commands to compare test results or snapshots
+"""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import click
+from pydantic import ValidationError
+
+from anta.cli.utils import ExitCode
+from anta.diff import diff_results, diff_snapshots, load_results
+from anta.snapshot import SnapshotArchiveError
+from anta.tools.misc import exc_to_str
+
+from .utils import print_results_diff, print_snapshot_diff
+
+logger = logging.getLogger(__name__)
+
+
+def output_option(f: click.decorators.FC) -> click.decorators.FC:
+    """Click option to save the differences to a JSON file"""
+    return click.option(
+        "--output",
+        "-o",
+        help="Path to save the differences as a JSON file",
+        type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+    )(f)
+
+
+@click.command
+@click.pass_context
+@click.argument("before", type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=Path))
+@click.argument("after", type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=Path))
+@click.option("--regressions-only", help="Only report the tests failing in AFTER that were not failing in BEFORE", default=False, is_flag=True, show_default=True)
+@output_option
+def results(ctx: click.Context, before: Path, after: Path, regressions_only: bool, output: Path | None) -> None:
+    """
+    Compare two test result files written by 'anta nrfu json --output'
+
+    Exit with code 4 if some tests are failing in AFTER that were not failing in BEFORE.
+    """
+    try:
+        diff = diff_results(load_results(before), load_results(after))
+    except (OSError, ValidationError) as e:
+        logger.error(f"Cannot load test results: {exc_to_str(e)}")
+        ctx.exit(ExitCode.USAGE_ERROR)
+    if regressions_only:
+        diff = diff.model_copy(update={"changes": diff.regressions})
+    print_results_diff(diff)
+    if output is not None:
+        output.write_text(diff.model_dump_json(indent=4), encoding="UTF-8")
+    ctx.exit(ExitCode.TESTS_FAILED if diff.regressions else ExitCode.OK)
+
+
+@click.command
+@click.pass_context
+@click.argument("before", type=click.Path(exists=True, readable=True, path_type=Path))
+@click.argument("after", type=click.Path(exists=True, readable=True, path_type=Path))
+@click.option("--device", "-d", help="Only compare the outputs of this device. Can be repeated", type=str, multiple=True)
+@click.option("--ignore-key", "-i", help="Ignore this key of the JSON outputs, e.g. a counter or a timestamp. Can be repeated", type=str, multiple=True)
+@output_option
+def snapshots(ctx: click.Context, before: Path, after: Path, device: tuple[str, ...], ignore_key: tuple[str, ...], output: Path | None) -> None:
+    # pylint: disable=too-many-arguments
+    """
+    Compare two snapshots written by 'anta exec snapshot'
+
+    Each snapshot is either a directory or a snapshot archive.
+    """
+    try:
+        diff = diff_snapshots(before, after, devices=set(device) if device else None, ignore_keys=set(ignore_key))
+    except (OSError, ValueError, SnapshotArchiveError) as e:
+        logger.error(f"Cannot compare the snapshots: {exc_to_str(e)}")
+        ctx.exit(ExitCode.USAGE_ERROR)
+    print_snapshot_diff(diff)
+    if output is not None:
+        output.write_text(diff.model_dump_json(indent=4), encoding="UTF-8")
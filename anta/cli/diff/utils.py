@@ -0,0 +1,66 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Utils functions to use with anta.cli.diff.commands module.
+"""
+from __future__ import annotations
+
+from collections import Counter
+
+from rich.table import Table
+from rich.text import Text
+
+from anta import RICH_COLOR_PALETTE
+from anta.cli.console import console
+from anta.diff import ResultsDiff, SnapshotDiff
+
+CHANGE_STYLES = {"added": "green", "removed": "red", "changed": "yellow"}
+
+
+def _status(status: str | None) -> str:
+    """Return a colored test status"""
+    return "-" if status is None else f"[{status}]{status}"
+
+
+def _summary_table(title: str, header: str, counters: dict[str, Counter[str]], regressions: bool) -> Table:
+    """Create a table with the number of changes of each type per device or per test"""
+    table = Table(title=title, show_lines=True)
+    table.add_column(header, justify="left", style=RICH_COLOR_PALETTE.HEADER, no_wrap=True)
+    columns = ["added", "removed", "changed", *(["regression"] if regressions else [])]
+    for column in columns:
+        table.add_column(f"# {column}", justify="right")
+    for name, counter in sorted(counters.items()):
+        table.add_row(name, *(str(counter[column]) for column in columns))
+    return table
+
+
+def print_results_diff(diff: ResultsDiff) -> None:
+    """Print the changes of the test results and the summaries per device and per test"""
+    if diff.changes:
+        table = Table(title="Test result changes", show_lines=True)
+        table.add_column("Device", justify="left", style=RICH_COLOR_PALETTE.HEADER, no_wrap=True)
+        for header in ("Test Name", "Change", "Before", "After", "Message(s)"):
+            table.add_column(header, justify="left", no_wrap=header == "Test Name")
+        for change in diff.changes:
+            name = change.change if not change.regression else "regression"
+            style = CHANGE_STYLES.get(change.change, "") if not change.regression else "failure"
+            table.add_row(change.name, change.test, f"[{style}]{name}", _status(change.before), _status(change.after), Text("\n".join(change.messages)))
+        console.print(table)
+        console.print(_summary_table("Changes per device", "Device", diff.by_device(), regressions=True))
+        console.print(_summary_table("Changes per test", "Test Name", diff.by_test(), regressions=True))
+    console.print(f"{len(diff.changes)} test result(s) changed, {len(diff.regressions)} regression(s), {diff.unchanged} unchanged")
+
+
+def print_snapshot_diff(diff: SnapshotDiff) -> None:
+    """Print the changes of the command outputs and the summary per device"""
+    if diff.changes:
+        table = Table(title="Command output changes", show_lines=True)
+        table.add_column("Device", justify="left", style=RICH_COLOR_PALETTE.HEADER, no_wrap=True)
+        for header in ("Command", "Format", "Change", "Details"):
+            table.add_column(header, justify="left")
+        for change in diff.changes:
+            table.add_row(change.device, change.command, change.ofmt, f"[{CHANGE_STYLES[change.change]}]{change.change}", Text("\n".join(change.details)))
+        console.print(table)
+        console.print(_summary_table("Changes per device", "Device", diff.by_device(), regressions=False))
+    console.print(f"{len(diff.changes)} command output(s) changed, {diff.unchanged} unchanged")
@@ -11,6 +11,7 @@ import logging
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
 import click
 from yaml import safe_load
@@ -18,6 +19,9 @@ from yaml import safe_load
 from anta.cli.exec.utils import clear_counters_utils, collect_commands, collect_scheduled_show_tech
 from anta.cli.utils import inventory_options
 from anta.inventory import AntaInventory
+from anta.snapshot import SnapshotArchiveError
+from anta.tools.misc import exc_to_str
+from anta.tools.transfer import TransferBudget
 
 logger = logging.getLogger(__name__)
 
@@ -43,15 +47,35 @@ def clear_counters(inventory: AntaInventory, tags: list[str] | None) -> None:
     "--output",
     "-o",
     show_envvar=True,
-    type=click.Path(file_okay=False, dir_okay=True, exists=False, writable=True, path_type=Path),
-    help="Directory to save commands output.",
+    type=click.Path(file_okay=True, dir_okay=True, exists=False, writable=True, path_type=Path),
+    help="Directory to save commands output, or snapshot archive file with '--archive'.",
     default=f"anta_snapshot_{datetime.now().strftime('%Y-%m-%d_%H_%M_%S')}",
     show_default=True,
 )
-def snapshot(inventory: AntaInventory, tags: list[str] | None, commands_list: Path, output: Path) -> None:
+@click.option(
+    "--archive",
+    help="Write all the commands output to a single compressed and indexed snapshot archive file instead of one file per command",
+    show_envvar=True,
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--compression",
+    help="Compression codec of the snapshot archive. zstd requires the 'zstandard' package",
+    show_envvar=True,
+    type=click.Choice(["gzip", "zstd"]),
+    default="gzip",
+    show_default=True,
+)
+def snapshot(inventory: AntaInventory, tags: list[str] | None, commands_list: Path, output: Path, archive: bool, compression: Literal["gzip", "zstd"]) -> None:
     """Collect commands output from devices in inventory"""
+    # pylint: disable=too-many-arguments
+    if archive and output.is_dir():
+        raise click.BadParameter(f"'{output}' is a directory", param_hint="'--output'")
+    if not archive and output.is_file():
+        raise click.BadParameter(f"'{output}' is a file", param_hint="'--output'")
     print(f"Collecting data for {commands_list}")
-    print(f"Output directory is {output}")
+    print(f"Output {'archive' if archive else 'directory'} is {output}")
     try:
         with open(commands_list, "r", encoding="UTF-8") as file:
             file_content = file.read()
@@ -59,7 +83,11 @@ def snapshot(inventory: AntaInventory, tags: list[str] | None, commands_list: Pa
     except FileNotFoundError:
         logger.error(f"Error reading {commands_list}")
         sys.exit(1)
-    asyncio.run(collect_commands(inventory, eos_commands, output, tags=tags))
+    try:
+        asyncio.run(collect_commands(inventory, eos_commands, output, tags=tags, archive=archive, codec=compression))
+    except (OSError, SnapshotArchiveError) as e:
+        logger.error(f"Unable to write snapshot '{output}': {exc_to_str(e)}")
+        sys.exit(1)
 
 
 @click.command()
@@ -68,11 +96,43 @@ def snapshot(inventory: AntaInventory, tags: list[str] | None, commands_list: Pa
 @click.option("--latest", help="Number of scheduled show-tech to retrieve", type=int, required=False)
 @click.option(
     "--configure",
-    help="Ensure devices have 'aaa authorization exec default local' configured (required for SCP on EOS). THIS WILL CHANGE THE CONFIGURATION OF YOUR NETWORK.",
+    help="Ensure devices have 'aaa authorization exec default local' configured (required for SFTP on EOS). THIS WILL CHANGE THE CONFIGURATION OF YOUR NETWORK.",
     default=False,
     is_flag=True,
     show_default=True,
 )
-def collect_tech_support(inventory: AntaInventory, tags: list[str] | None, output: Path, latest: int | None, configure: bool) -> None:
+@click.option(
+    "--max-transfers",
+    help="Maximum number of files downloaded at the same time from all the devices",
+    show_envvar=True,
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+)
+@click.option(
+    "--max-bandwidth",
+    help="Maximum aggregated download bandwidth from all the devices, in megabytes per second. No limit by default",
+    show_envvar=True,
+    type=click.FloatRange(min=0, min_open=True),
+)
+@click.option(
+    "--verify-checksum",
+    help="Compare the SHA-256 digests of the files already downloaded with the files on the devices instead of only their size",
+    show_envvar=True,
+    is_flag=True,
+    default=False,
+)
+def collect_tech_support(
+    inventory: AntaInventory,
+    tags: list[str] | None,
+    output: Path,
+    latest: int | None,
+    configure: bool,
+    max_transfers: int,
+    max_bandwidth: float | None,
+    verify_checksum: bool,
+) -> None:
     """Collect scheduled tech-support from EOS devices"""
-    asyncio.run(collect_scheduled_show_tech(inventory, output, configure, tags=tags, latest=latest))
+    # pylint: disable=too-many-arguments
+    budget = TransferBudget(max_transfers=max_transfers, bandwidth=max_bandwidth * 1_000_000 if max_bandwidth is not None else None)
+    asyncio.run(collect_scheduled_show_tech(inventory, output, configure, tags=tags, latest=latest, budget=budget, verify_checksum=verify_checksum))
@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import asyncio
 import itertools
-import json
 import logging
 from pathlib import Path
 from typing import Literal
@@ -20,6 +19,9 @@ from httpx import ConnectError, HTTPError
 from anta.device import AntaDevice, AsyncEOSDevice
 from anta.inventory import AntaInventory
 from anta.models import AntaCommand
+from anta.snapshot import SnapshotArchiveWriter
+from anta.tools.fileio import AsyncFileIO
+from anta.tools.transfer import TransferBudget
 
 EOS_SCHEDULED_TECH_SUPPORT = "/mnt/flash/schedule/tech-support"
 
@@ -50,50 +52,79 @@ async def clear_counters_utils(anta_inventory: AntaInventory, tags: list[str] |
 
 async def collect_commands(
     inv: AntaInventory,
-    commands: dict[str, str],
+    commands: dict[str, list[str]],
     root_dir: Path,
     tags: list[str] | None = None,
+    archive: bool = False,
+    codec: Literal["gzip", "zstd"] = "gzip",
 ) -> None:
     """
     Collect EOS commands
+
+    The outputs are written in one directory per device under `root_dir` or, if `archive` is True,
+    in a single snapshot archive file `root_dir` compressed with `codec` (see `anta.snapshot`).
     """
+    writer = SnapshotArchiveWriter(root_dir, codec=codec) if archive else None
+    fileio = AsyncFileIO()
 
     async def collect(dev: AntaDevice, command: str, outformat: Literal["json", "text"]) -> None:
-        outdir = Path() / root_dir / dev.name / outformat
-        outdir.mkdir(parents=True, exist_ok=True)
         c = AntaCommand(command=command, ofmt=outformat)
         await dev.collect(c)
         if not c.collected:
             logger.error(f"Could not collect commands on device {dev.name}: {c.errors}")
             return
-        if c.ofmt == "json":
-            outfile = outdir / f"{command}.json"
-            content = json.dumps(c.json_output, indent=2)
-        elif c.ofmt == "text":
-            outfile = outdir / f"{command}.log"
-            content = c.text_output
-        with outfile.open(mode="w", encoding="UTF-8") as f:
-            f.write(content)
+        if writer is not None:
+            # Serialization, compression and disk I/O are done by the writer thread
+            writer.add(dev.name, command, outformat, c.json_output if c.ofmt == "json" else c.text_output)
+        else:
+            # Serialization and disk I/O are done in the file I/O thread pool
+            outdir = Path() / root_dir / dev.name / outformat
+            if c.ofmt == "json":
+                await fileio.write_json(outdir / f"{command}.json", c.json_output, parents=True)
+            elif c.ofmt == "text":
+                await fileio.write_text(outdir / f"{command}.log", c.text_output, parents=True)
         logger.info(f"Collected command '{command}' from device {dev.name} ({dev.hw_model})")
 
-    logger.info("Connecting to devices...")
-    await inv.connect_inventory()
-    devices = inv.get_inventory(established_only=True, tags=tags).values()
-    logger.info("Collecting commands from remote devices")
-    coros = []
-    if "json_format" in commands:
-        coros += [collect(device, command, "json") for device, command in itertools.product(devices, commands["json_format"])]
-    if "text_format" in commands:
-        coros += [collect(device, command, "text") for device, command in itertools.product(devices, commands["text_format"])]
-    res = await asyncio.gather(*coros, return_exceptions=True)
-    for r in res:
-        if isinstance(r, Exception):
-            logger.error(f"Error when collecting commands: {str(r)}")
-
-
-async def collect_scheduled_show_tech(inv: AntaInventory, root_dir: Path, configure: bool, tags: list[str] | None = None, latest: int | None = None) -> None:
+    with fileio:
+        try:
+            logger.info("Connecting to devices...")
+            await inv.connect_inventory()
+            devices = inv.get_inventory(established_only=True, tags=tags).values()
+            logger.info("Collecting commands from remote devices")
+            coros = []
+            if "json_format" in commands:
+                coros += [collect(device, command, "json") for device, command in itertools.product(devices, commands["json_format"])]
+            if "text_format" in commands:
+                coros += [collect(device, command, "text") for device, command in itertools.product(devices, commands["text_format"])]
+            res = await asyncio.gather(*coros, return_exceptions=True)
+            for r in res:
+                if isinstance(r, Exception):
+                    logger.error(f"Error when collecting commands: {str(r)}")
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        if writer is not None:
+            # Wait for the writer thread without blocking the event loop
+            await fileio.run(writer.close)
+            logger.info(f"Snapshot archive written to '{root_dir}'")
+
+
+async def collect_scheduled_show_tech(
+    inv: AntaInventory,
+    root_dir: Path,
+    configure: bool,
+    tags: list[str] | None = None,
+    latest: int | None = None,
+    budget: TransferBudget | None = None,
+    verify_checksum: bool = False,
+) -> None:
+    # pylint: disable=too-many-arguments
     """
     Collect scheduled show-tech on devices
+
+    The files are downloaded in parallel within the concurrency and bandwidth limits of `budget`.
+    Files already downloaded are skipped and interrupted downloads are resumed.
     """
 
     async def collect(device: AntaDevice) -> None:
@@ -115,7 +146,7 @@ async def collect_scheduled_show_tech(inv: AntaInventory, root_dir: Path, config
 
             # Create directories
             outdir = Path() / root_dir / f"{device.name.lower()}"
-            outdir.mkdir(parents=True, exist_ok=True)
+            await fileio.mkdir(outdir)
 
             # Check if 'aaa authorization exec default local' is present in the running-config
             command = AntaCommand(command="show running-config | include aaa authorization exec default", ofmt="text")
@@ -147,13 +178,17 @@ async def collect_scheduled_show_tech(inv: AntaInventory, root_dir: Path, config
                     return
             logger.debug(f"'aaa authorization exec default local' is already configured on device {device.name}")
 
-            await device.copy(sources=filenames, destination=outdir, direction="from")
-            logger.info(f"Collected {len(filenames)} scheduled tech-support from {device.name}")
+            downloaded = await device.download(sources=filenames, destination=outdir, budget=budget, verify_checksum=verify_checksum)
+            logger.info(f"Collected {len(downloaded)} scheduled tech-support from {device.name} ({len(filenames) - len(downloaded)} already collected)")
 
-        except (EapiCommandError, HTTPError, ConnectError) as e:
+        except (EapiCommandError, HTTPError, ConnectError, OSError) as e:
             logger.error(f"Unable to collect tech-support on {device.name}: {str(e)}")
 
     logger.info("Connecting to devices...")
     await inv.connect_inventory()
     devices = inv.get_inventory(established_only=True, tags=tags).values()
-    await asyncio.gather(*(collect(device) for device in devices))
+    with AsyncFileIO() as fileio:
+        try:
+            await asyncio.gather(*(collect(device) for device in devices))
+        finally:
+            await inv.disconnect_inventory()
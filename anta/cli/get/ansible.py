@@ -0,0 +1,240 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Ansible YAML inventory index used by `anta get from-ansible`.
+
+The inventory file is read as a stream of YAML events in a single pass: only the variables of one host are built in
+memory at a time and the group hierarchy is recorded as a group -> hosts and group -> children index. A group can be
+defined at multiple places of the inventory, its definitions are merged like Ansible does.
+"""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from yaml.events import AliasEvent, DocumentStartEvent, MappingEndEvent, MappingStartEvent, ScalarEvent, SequenceEndEvent, SequenceStartEvent
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Ansible implicit groups, not used as ANTA tags
+ANSIBLE_IMPLICIT_GROUPS = ("all", "ungrouped")
+YAML_NULL_VALUES = ("", "~", "null", "Null", "NULL")
+
+
+class _EventReader:
+    """
+    Read values from a stream of YAML events.
+
+    Scalars are read as strings, except plain null scalars which are read as None. Anchors, aliases and merge keys are supported.
+    """
+
+    def __init__(self, loader: Any) -> None:
+        self.loader = loader
+        self.anchors: dict[str, Any] = {}
+
+    def can_stream(self) -> bool:
+        """
+        Return True if the next value is a YAML mapping that can be read key by key.
+        Anchored mappings are read at once with value() so that their aliases can be resolved.
+        """
+        event = self.loader.peek_event()
+        return isinstance(event, MappingStartEvent) and event.anchor is None
+
+    def keys(self) -> Iterator[Optional[str]]:
+        """
+        Iterate over the keys of the YAML mapping starting at the current event.
+
+        The caller must read the value of each key before getting the next key. Complex keys are read as None.
+        """
+        self.loader.get_event()
+        while not self.loader.check_event(MappingEndEvent):
+            key = self.value()
+            yield key if isinstance(key, str) else None
+        self.loader.get_event()
+
+    def value(self) -> Any:
+        """Read the value starting at the current event"""
+        event = self.loader.get_event()
+        value: Any
+        if isinstance(event, AliasEvent):
+            return self.anchors.get(str(event.anchor))
+        if isinstance(event, ScalarEvent):
+            value = None if event.implicit[0] and event.value in YAML_NULL_VALUES else event.value
+        elif isinstance(event, SequenceStartEvent):
+            value = []
+            while not self.loader.check_event(SequenceEndEvent):
+                value.append(self.value())
+            self.loader.get_event()
+        else:
+            value = {}
+            while not self.loader.check_event(MappingEndEvent):
+                key, item = self.value(), self.value()
+                if key == "<<" and isinstance(item, dict):
+                    value = {**item, **value}
+                elif isinstance(key, (str, type(None))):
+                    value[key] = item
+            self.loader.get_event()
+        if event.anchor is not None:
+            self.anchors[event.anchor] = value
+        return value
+
+
+class AnsibleInventoryIndex:
+    """
+    Index of the groups and hosts of an Ansible YAML inventory.
+
+    Attributes:
+        hosts: Address of each host, in the order of the inventory file. The address is None when `ansible_host` is not set.
+        groups: Hosts directly defined in each group
+        children: Child groups of each group
+    """
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, Optional[str]] = {}
+        # dict are used as ordered sets
+        self.groups: dict[str, dict[str, None]] = {}
+        self.children: dict[str, dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of hosts"""
+        return len(self.hosts)
+
+    @staticmethod
+    def parse(inventory: Path) -> AnsibleInventoryIndex:
+        """
+        Create an AnsibleInventoryIndex from an Ansible YAML inventory file.
+
+        Args:
+            inventory: Ansible inventory file to read
+
+        Raises:
+            OSError: the file cannot be read
+            yaml.YAMLError: the file is not a valid YAML file
+        """
+        index = AnsibleInventoryIndex()
+        with open(inventory, encoding="utf-8") as stream:
+            loader = SafeLoader(stream)
+            try:
+                reader = _EventReader(loader)
+                loader.get_event()
+                if loader.check_event(DocumentStartEvent):
+                    loader.get_event()
+                    if loader.check_event(MappingStartEvent):
+                        for group in reader.keys():
+                            index._parse_group(reader, group)  # pylint: disable=protected-access
+            finally:
+                loader.dispose()
+        return index
+
+    def _parse_group(self, reader: _EventReader, name: Optional[str]) -> None:
+        """Index the group definition starting at the current event"""
+        if name is None or not reader.can_stream():
+            # Empty group, or group defined with a YAML anchor or alias
+            data = reader.value()
+            if name is not None:
+                self._add_group(name, data)
+            return
+        self._add_group(name, None)
+        for key in reader.keys():
+            if key == "hosts" and reader.can_stream():
+                for host in reader.keys():
+                    # Only the variables of one host are built at a time
+                    host_vars = reader.value()
+                    if host is not None:
+                        self._add_host(name, host, host_vars)
+            elif key == "children" and reader.can_stream():
+                for child in reader.keys():
+                    if child is not None:
+                        self.children[name][child] = None
+                    self._parse_group(reader, child)
+            else:
+                data = reader.value()
+                if key in ("hosts", "children"):
+                    self._add_group(name, {key: data})
+
+    def _add_group(self, name: str, data: Any) -> None:
+        """Index a group definition already loaded in memory"""
+        self.groups.setdefault(name, {})
+        self.children.setdefault(name, {})
+        if not isinstance(data, dict):
+            return
+        if isinstance(hosts := data.get("hosts"), dict):
+            for host, host_vars in hosts.items():
+                self._add_host(name, str(host), host_vars)
+        if isinstance(children := data.get("children"), dict):
+            for child, child_data in children.items():
+                self.children[name][str(child)] = None
+                self._add_group(str(child), child_data)
+
+    def _add_host(self, group: str, name: str, host_vars: Any) -> None:
+        """Add a host to a group. A host can be defined in multiple groups, `ansible_host` is usually set once."""
+        self.groups[group][name] = None
+        address = host_vars.get("ansible_host") if isinstance(host_vars, dict) else None
+        if address is not None:
+            self.hosts[name] = str(address)
+        else:
+            self.hosts.setdefault(name, None)
+
+    def get_hosts(self, groups: Sequence[str]) -> list[str]:
+        """
+        Get the hosts of groups, including the hosts of their child groups.
+
+        Args:
+            groups: Names of the groups. The `all` group contains all the hosts.
+
+        Returns:
+            The names of the hosts, in the order of the inventory file.
+        """
+        if "all" in groups:
+            return list(self.hosts)
+        members: set[str] = set()
+        visited: set[str] = set()
+        pending = list(groups)
+        while pending:
+            group = pending.pop()
+            if group in visited:
+                continue
+            visited.add(group)
+            members.update(self.groups.get(group, {}))
+            pending.extend(self.children.get(group, {}))
+        return [host for host in self.hosts if host in members]
+
+    def get_host_groups(self) -> dict[str, list[str]]:
+        """
+        Get the groups of each host, including the parent groups of the groups where the host is defined.
+        The Ansible implicit groups `all` and `ungrouped` are ignored.
+
+        Returns:
+            The sorted names of the groups of each host.
+        """
+        parents: dict[str, set[str]] = {}
+        for group, children in self.children.items():
+            for child in children:
+                parents.setdefault(child, set()).add(group)
+        ancestors: dict[str, set[str]] = {}
+
+        def get_ancestors(group: str) -> set[str]:
+            if group not in ancestors:
+                # Break the cycles of invalid inventories
+                ancestors[group] = {group}
+                pending = list(parents.get(group, ()))
+                while pending:
+                    parent = pending.pop()
+                    if parent not in ancestors[group]:
+                        ancestors[group].add(parent)
+                        pending.extend(parents.get(parent, ()))
+            return ancestors[group]
+
+        host_groups: dict[str, set[str]] = {host: set() for host in self.hosts}
+        for group, hosts in self.groups.items():
+            groups = get_ancestors(group)
+            for host in hosts:
+                host_groups[host].update(groups)
+        return {host: sorted(groups.difference(ANSIBLE_IMPLICIT_GROUPS)) for host, groups in host_groups.items()}
@@ -13,8 +13,6 @@ import logging
 from pathlib import Path
 
 import click
-from cvprac.cvp_client import CvpClient
-from cvprac.cvp_client_errors import CvpApiError
 from rich.pretty import pretty_repr
 
 from anta.cli.console import console
@@ -22,7 +20,7 @@ from anta.cli.get.utils import inventory_output_options
 from anta.cli.utils import ExitCode, inventory_options
 from anta.inventory import AntaInventory
 
-from .utils import create_inventory_from_ansible, create_inventory_from_cvp, get_cv_token
+from .utils import create_inventory_from_ansible, create_inventory_from_cvp
 
 logger = logging.getLogger(__name__)
 
@@ -33,47 +31,45 @@ logger = logging.getLogger(__name__)
 @click.option("--host", "-host", help="CloudVision instance FQDN or IP", type=str, required=True)
 @click.option("--username", "-u", help="CloudVision username", type=str, required=True)
 @click.option("--password", "-p", help="CloudVision password", type=str, required=True)
-@click.option("--container", "-c", help="CloudVision container where devices are configured", type=str)
-def from_cvp(ctx: click.Context, output: Path, host: str, username: str, password: str, container: str | None) -> None:
+@click.option("--container", "-c", help="CloudVision container where devices are configured. Can be repeated", type=str, multiple=True)
+@click.option(
+    "--incremental",
+    help="Update the existing inventory file: only the hosts that changed in CloudVision are rewritten",
+    default=False,
+    is_flag=True,
+    show_default=True,
+)
+def from_cvp(ctx: click.Context, output: Path, host: str, username: str, password: str, container: tuple[str, ...], incremental: bool) -> None:
+    # pylint: disable=too-many-arguments
     """
     Build ANTA inventory from Cloudvision
-
-    TODO - handle get_inventory and get_devices_in_container failure
     """
-    logger.info(f"Getting authentication token for user '{username}' from CloudVision instance '{host}'")
-    token = get_cv_token(cvp_ip=host, cvp_username=username, cvp_password=password)
+    from anta.cli.get.cvp import CvpError, get_cvp_inventory  # pylint: disable=import-outside-toplevel
 
-    clnt = CvpClient()
     try:
-        clnt.connect(nodes=[host], username="", password="", api_token=token)
-    except CvpApiError as error:
+        cvp_inventory = asyncio.run(get_cvp_inventory(host, username, password, list(container)))
+    except CvpError as error:
         logger.error(f"Error connecting to CloudVision: {error}")
         ctx.exit(ExitCode.USAGE_ERROR)
-    logger.info(f"Connected to CloudVision instance '{host}'")
-
-    cvp_inventory = None
-    if container is None:
-        # Get a list of all devices
-        logger.info(f"Getting full inventory from CloudVision instance '{host}'")
-        cvp_inventory = clnt.api.get_inventory()
-    else:
-        # Get devices under a container
-        logger.info(f"Getting inventory for container {container} from CloudVision instance '{host}'")
-        cvp_inventory = clnt.api.get_devices_in_container(container)
-    create_inventory_from_cvp(cvp_inventory, output)
+    try:
+        create_inventory_from_cvp(cvp_inventory, output, incremental=incremental)
+    except ValueError as e:
+        logger.error(str(e))
+        ctx.exit(ExitCode.USAGE_ERROR)
 
 
 @click.command
 @click.pass_context
 @inventory_output_options
-@click.option("--ansible-group", "-g", help="Ansible group to filter", type=str, default="all")
+@click.option("--ansible-group", "-g", help="Ansible group to filter. Can be repeated", type=str, default=["all"], multiple=True, show_default=True)
 @click.option(
     "--ansible-inventory",
     help="Path to your ansible inventory file to read",
     type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=Path),
     required=True,
 )
-def from_ansible(ctx: click.Context, output: Path, ansible_group: str, ansible_inventory: Path) -> None:
+@click.option("--group-tags/--no-group-tags", help="Add the Ansible groups of each host as tags", default=True, show_default=True)
+def from_ansible(ctx: click.Context, output: Path, ansible_group: tuple[str, ...], ansible_inventory: Path, group_tags: bool) -> None:
     """Build ANTA inventory from an ansible inventory YAML file"""
     logger.info(f"Building inventory from ansible file '{ansible_inventory}'")
     try:
@@ -81,6 +77,7 @@ def from_ansible(ctx: click.Context, output: Path, ansible_group: str, ansible_i
             inventory=ansible_inventory,
             output=output,
             ansible_group=ansible_group,
+            group_tags=group_tags,
         )
     except ValueError as e:
         logger.error(str(e))
@@ -0,0 +1,179 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Asynchronous CloudVision inventory client used by `anta get from-cvp`.
+
+The device lists are paginated: the first page gives the total number of devices and the remaining pages are fetched
+concurrently. When multiple containers are requested, they are also fetched concurrently. The number of concurrent
+requests to CloudVision is bounded.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from types import TracebackType
+from typing import Any, Optional, Type
+
+import httpx
+
+from anta.tools.misc import exc_to_str
+
+logger = logging.getLogger(__name__)
+
+CVP_PAGE_SIZE = 100
+CVP_MAX_CONCURRENCY = 10
+CVP_TIMEOUT = 30.0
+# Key of the top-level 'Tenant' container of CloudVision
+CVP_ROOT_CONTAINER_KEY = "root"
+
+
+class CvpError(Exception):
+    """Error raised when CloudVision cannot be reached or returns an error"""
+
+
+class CvpInventoryClient:
+    """
+    Asynchronous client for the CloudVision inventory REST API.
+
+    ```python
+    async with CvpInventoryClient("cvp.example.com") as client:
+        await client.login("anta", "anta")
+        devices = await client.get_inventory(containers=["Leaf", "Spine"])
+    ```
+
+    Attributes:
+        base_url: URL of the CloudVision instance
+        page_size: Number of items requested per page
+    """
+
+    def __init__(self, host: str, page_size: int = CVP_PAGE_SIZE, max_concurrency: int = CVP_MAX_CONCURRENCY, timeout: float = CVP_TIMEOUT) -> None:
+        """
+        Constructor of CvpInventoryClient
+
+        Args:
+            host: CloudVision FQDN or IP. HTTPS is used unless a URL with a scheme is provided.
+            page_size: Number of items requested per page
+            max_concurrency: Maximum number of concurrent requests to CloudVision
+            timeout: Timeout in seconds of each request
+        """
+        self.base_url = host if "://" in host else f"https://{host}"
+        self.page_size = page_size
+        self._max_concurrency = max_concurrency
+        # CloudVision on-premise instances usually use self-signed certificates
+        self._client = httpx.AsyncClient(base_url=self.base_url, verify=False, timeout=timeout, headers={"Accept": "application/json"})
+        # asyncio.Semaphore must be created in the running event loop with Python < 3.10
+        self._requests: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> CvpInventoryClient:
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request to CloudVision and return the JSON response"""
+        if self._requests is None:
+            self._requests = asyncio.Semaphore(self._max_concurrency)
+        async with self._requests:
+            try:
+                response = await self._client.request(method, path, **kwargs)
+                response.raise_for_status()
+                data = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                raise CvpError(f"Request to CloudVision '{path}' failed: {exc_to_str(e)}") from e
+        if isinstance(data, dict) and "errorCode" in data:
+            raise CvpError(f"Request to CloudVision '{path}' failed: {data.get('errorMessage', data['errorCode'])}")
+        return data
+
+    async def _get_paginated(self, path: str, key: str, params: dict[str, str]) -> list[dict[str, Any]]:
+        """Fetch all the items of a paginated list. The pages following the first one are fetched concurrently."""
+
+        async def page(start: int) -> dict[str, Any]:
+            return await self._request("GET", path, params={**params, "startIndex": str(start), "endIndex": str(start + self.page_size)})
+
+        first = await page(0)
+        total = int(first.get("total", 0))
+        pages = [first, *await asyncio.gather(*(page(start) for start in range(self.page_size, total, self.page_size)))]
+        return [item for data in pages for item in data.get(key, [])]
+
+    async def login(self, username: str, password: str) -> None:
+        """
+        Get a session token from CloudVision and use it for the following requests.
+
+        Args:
+            username: CloudVision username
+            password: CloudVision password
+        """
+        data = await self._request("POST", "/cvpservice/login/authenticate.do", json={"userId": username, "password": password})
+        if "sessionId" not in data:
+            raise CvpError("CloudVision did not return a session token")
+        self._client.headers["Authorization"] = f"Bearer {data['sessionId']}"
+
+    async def get_container(self, name: str) -> dict[str, Any]:
+        """
+        Get a container by name.
+
+        Args:
+            name: Name of the container
+        """
+        containers = await self._get_paginated("/cvpservice/provisioning/searchTopology.do", "containerList", {"queryParam": name})
+        for container in containers:
+            if container.get("name") == name:
+                return container
+        raise CvpError(f"Container '{name}' not found in CloudVision")
+
+    async def get_devices(self, container_key: str = CVP_ROOT_CONTAINER_KEY) -> list[dict[str, Any]]:
+        """
+        Get the devices of a container and of its child containers.
+
+        Args:
+            container_key: Key of the container. Defaults to the top-level container.
+        """
+        return await self._get_paginated("/cvpservice/provisioning/getNetElementList.do", "netElementList", {"nodeId": container_key, "ignoreAdd": "false"})
+
+    async def get_inventory(self, containers: Optional[list[str]] = None) -> list[dict[str, Any]]:
+        """
+        Get the devices of the CloudVision inventory.
+
+        Args:
+            containers: Names of the containers to get the devices from. Defaults to all the devices.
+
+        Returns:
+            The devices, each device appearing once, with at least the 'hostname', 'ipAddress' and 'containerName' keys.
+        """
+
+        async def devices(name: str) -> list[dict[str, Any]]:
+            container = await self.get_container(name)
+            return [{"containerName": name, **device} for device in await self.get_devices(container["key"])]
+
+        if containers:
+            results = await asyncio.gather(*(devices(name) for name in containers))
+        else:
+            results = [await self.get_devices()]
+        inventory: dict[str, dict[str, Any]] = {}
+        for device in (device for result in results for device in result):
+            device.setdefault("hostname", device.get("fqdn", "").split(".")[0])
+            inventory.setdefault(device.get("systemMacAddress") or device["ipAddress"], device)
+        return list(inventory.values())
+
+
+async def get_cvp_inventory(host: str, username: str, password: str, containers: Optional[list[str]] = None) -> list[dict[str, Any]]:
+    """
+    Get the devices of a CloudVision inventory.
+
+    Args:
+        host: CloudVision FQDN or IP
+        username: CloudVision username
+        password: CloudVision password
+        containers: Names of the containers to get the devices from. Defaults to all the devices.
+    """
+    async with CvpInventoryClient(host) as client:
+        logger.info(f"Getting authentication token for user '{username}' from CloudVision instance '{host}'")
+        await client.login(username, password)
+        logger.info(f"Connected to CloudVision instance '{host}'")
+        if containers:
+            logger.info(f"Getting inventory for container(s) {', '.join(containers)} from CloudVision instance '{host}'")
+        else:
+            logger.info(f"Getting full inventory from CloudVision instance '{host}'")
+        return await client.get_inventory(containers)
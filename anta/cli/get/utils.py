@@ -7,22 +7,20 @@ Utils functions to use with anta.cli.get.commands module.
 from __future__ import annotations
 
 import functools
-import json
 import logging
 from pathlib import Path
 from sys import stdin
-from typing import Any
+from typing import Any, Sequence
 
 import click
-import requests
-import urllib3
 import yaml
+from pydantic import ValidationError
 
+from anta.cli.get.ansible import AnsibleInventoryIndex
 from anta.cli.utils import ExitCode
 from anta.inventory import AntaInventory
 from anta.inventory.models import AntaInventoryHost, AntaInventoryInput
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from anta.tools.misc import exc_to_str
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +51,8 @@ def inventory_output_options(f: Any) -> Any:
     def wrapper(ctx: click.Context, *args: tuple[Any], output: Path, overwrite: bool, **kwargs: dict[str, Any]) -> Any:
         # Boolean to check if the file is empty
         output_is_not_empty = output.exists() and output.stat().st_size != 0
-        # Check overwrite when file is not empty
-        if not overwrite and output_is_not_empty:
+        # Check overwrite when file is not empty, unless the command updates it incrementally
+        if not overwrite and output_is_not_empty and not kwargs.get("incremental"):
             is_tty = stdin.isatty()
             if is_tty:
                 # File has content and it is in an interactive TTY --> Prompt user
@@ -69,85 +67,107 @@ def inventory_output_options(f: Any) -> Any:
     return wrapper
 
 
-def get_cv_token(cvp_ip: str, cvp_username: str, cvp_password: str) -> str:
-    """Generate AUTH token from CVP using password"""
-    # TODO, need to handle requests eror
-
-    # use CVP REST API to generate a token
-    URL = f"https://{cvp_ip}/cvpservice/login/authenticate.do"
-    payload = json.dumps({"userId": cvp_username, "password": cvp_password})
-    headers = {"Content-Type": "application/json", "Accept": "application/json"}
-
-    response = requests.request("POST", URL, headers=headers, data=payload, verify=False, timeout=10)
-    return response.json()["sessionId"]
-
+def write_inventory_to_file(hosts: list[AntaInventoryHost], output: Path, inventory: AntaInventoryInput | None = None) -> None:
+    """
+    Write a file inventory from pydantic models
 
-def write_inventory_to_file(hosts: list[AntaInventoryHost], output: Path) -> None:
-    """Write a file inventory from pydantic models"""
-    i = AntaInventoryInput(hosts=hosts)
+    Args:
+        hosts: Hosts of the inventory
+        output: ANTA inventory file to generate
+        inventory: Existing inventory whose networks and ranges are kept. Its hosts are replaced.
+    """
+    i = AntaInventoryInput(hosts=hosts) if inventory is None else inventory.model_copy(update={"hosts": hosts})
     with open(output, "w", encoding="UTF-8") as out_fd:
-        out_fd.write(yaml.dump({AntaInventory.INVENTORY_ROOT_KEY: i.model_dump(exclude_unset=True)}))
+        out_fd.write(yaml.dump({AntaInventory.INVENTORY_ROOT_KEY: i.model_dump(mode="json", exclude_unset=True)}))
     logger.info(f"ANTA inventory file has been created: '{output}'")
 
 
-def create_inventory_from_cvp(inv: list[dict[str, Any]], output: Path) -> None:
+def _load_inventory_input(output: Path) -> AntaInventoryInput | None:
+    """Load an existing ANTA inventory file, returning None if it does not exist or is empty"""
+    if not output.is_file() or output.stat().st_size == 0:
+        return None
+    try:
+        with open(output, encoding="UTF-8") as file:
+            data = yaml.safe_load(file)
+        return AntaInventoryInput(**data[AntaInventory.INVENTORY_ROOT_KEY])
+    except (OSError, yaml.YAMLError, TypeError, KeyError, ValidationError) as e:
+        raise ValueError(f"Cannot update the ANTA inventory file '{output}': {exc_to_str(e)}") from e
+
+
+def create_inventory_from_cvp(inv: list[dict[str, Any]], output: Path, incremental: bool = False) -> None:
     """
     Create an inventory file from Arista CloudVision inventory
+
+    Args:
+        inv: CloudVision devices
+        output: ANTA inventory file to generate
+        incremental: Update the existing inventory file: hosts that did not change in CloudVision are kept as is,
+                     including their optional settings, and the file is not rewritten if no host changed.
     """
     logger.debug(f"Received {len(inv)} device(s) from CloudVision")
     hosts = []
     for dev in inv:
         logger.info(f"   * adding entry for {dev['hostname']}")
         hosts.append(AntaInventoryHost(name=dev["hostname"], host=dev["ipAddress"], tags=[dev["containerName"].lower()]))
-    write_inventory_to_file(hosts, output)
-
-
-def create_inventory_from_ansible(inventory: Path, output: Path, ansible_group: str = "all") -> None:
+    existing = _load_inventory_input(output) if incremental else None
+    if existing is None:
+        write_inventory_to_file(hosts, output)
+        return
+
+    current = {host.name: host for host in existing.hosts or []}
+    merged: list[AntaInventoryHost] = []
+    added = updated = 0
+    for host in hosts:
+        if (old := current.pop(host.name, None)) is None:
+            added += 1
+            merged.append(host)
+        elif str(old.host) != str(host.host) or old.tags != host.tags:
+            updated += 1
+            merged.append(old.model_copy(update={"host": host.host, "tags": host.tags}))
+        else:
+            merged.append(old)
+    removed = len(current)
+    logger.info(f"{added} host(s) added, {updated} host(s) updated, {removed} host(s) removed, {len(merged) - added - updated} host(s) unchanged")
+    if not added and not updated and not removed:
+        logger.info(f"ANTA inventory file '{output}' is up to date")
+        return
+    write_inventory_to_file(merged, output, existing)
+
+
+def create_inventory_from_ansible(inventory: Path, output: Path, ansible_group: str | Sequence[str] = "all", group_tags: bool = True) -> None:
     """
     Create an ANTA inventory from an Ansible inventory YAML file
 
     Args:
         inventory: Ansible Inventory file to read
         output: ANTA inventory file to generate.
-        ansible_group: Ansible group from where to extract data.
+        ansible_group: Ansible group(s) from where to extract data. The hosts of the child groups are included.
+        group_tags: Add the Ansible groups of each host as tags
     """
-
-    def find_ansible_group(data: dict[str, Any], group: str) -> dict[str, Any] | None:
-        for k, v in data.items():
-            if isinstance(v, dict):
-                if k == group and ("children" in v.keys() or "hosts" in v.keys()):
-                    return v
-                d = find_ansible_group(v, group)
-                if d is not None:
-                    return d
-        return None
-
-    def deep_yaml_parsing(data: dict[str, Any], hosts: list[AntaInventoryHost] | None = None) -> list[AntaInventoryHost]:
-        """Deep parsing of YAML file to extract hosts and associated IPs"""
-        if hosts is None:
-            hosts = []
-        for key, value in data.items():
-            if isinstance(value, dict) and "ansible_host" in value.keys():
-                logger.info(f"   * adding entry for {key}")
-                hosts.append(AntaInventoryHost(name=key, host=value["ansible_host"]))
-            elif isinstance(value, dict):
-                deep_yaml_parsing(value, hosts)
-            else:
-                return hosts
-        return hosts
-
+    groups = [ansible_group] if isinstance(ansible_group, str) else list(ansible_group)
     try:
-        with open(inventory, encoding="utf-8") as inv:
-            ansible_inventory = yaml.safe_load(inv)
-    except OSError as exc:
+        index = AnsibleInventoryIndex.parse(inventory)
+    except (OSError, yaml.YAMLError) as exc:
         raise ValueError(f"Could not parse {inventory}.") from exc
 
-    if not ansible_inventory:
+    if not index.groups:
         raise ValueError(f"Ansible inventory {inventory} is empty")
 
-    ansible_inventory = find_ansible_group(ansible_inventory, ansible_group)
-
-    if ansible_inventory is None:
-        raise ValueError(f"Group {ansible_group} not found in Ansible inventory")
-    ansible_hosts = deep_yaml_parsing(ansible_inventory)
+    for group in groups:
+        if group != "all" and group not in index.groups:
+            raise ValueError(f"Group {group} not found in Ansible inventory")
+
+    host_groups = index.get_host_groups() if group_tags else {}
+    ansible_hosts = []
+    for name in index.get_hosts(groups):
+        # Ansible connects to the inventory hostname when ansible_host is not set
+        host: dict[str, Any] = {"name": name, "host": index.hosts[name] or name}
+        if tags := host_groups.get(name):
+            host["tags"] = tags
+        try:
+            ansible_hosts.append(AntaInventoryHost(**host))
+        except ValidationError:
+            logger.warning(f"   * skipping entry for {name}: invalid host address '{host['host']}'")
+            continue
+        logger.info(f"   * adding entry for {name}")
     write_inventory_to_file(ansible_hosts, output)
@@ -7,18 +7,22 @@ Click commands that run ANTA tests using anta.runner
 from __future__ import annotations
 
 import asyncio
+import pathlib
+from typing import TYPE_CHECKING
 
 import click
+from pydantic import ValidationError
 
-from anta.catalog import AntaCatalog
 from anta.cli.nrfu import commands
-from anta.cli.utils import AliasedGroup, catalog_options, inventory_options
-from anta.inventory import AntaInventory
+from anta.cli.utils import AliasedGroup, ExitCode, catalog_options, inventory_options, tracing_options
 from anta.models import AntaTest
 from anta.result_manager import ResultManager
-from anta.runner import main
 
-from .utils import anta_progress_bar, print_settings
+from .utils import anta_progress_bar, load_latency, print_settings, print_timing, start_evaluation_pool, start_profiler, start_watchdog, write_metrics, write_plan
+
+if TYPE_CHECKING:
+    from anta.catalog import AntaCatalog
+    from anta.inventory import AntaInventory
 
 
 class IgnoreRequiredWithHelp(AliasedGroup):
@@ -55,21 +59,157 @@ class IgnoreRequiredWithHelp(AliasedGroup):
 @click.pass_context
 @inventory_options
 @catalog_options
+@tracing_options
 @click.option("--ignore-status", help="Always exit with success", show_envvar=True, is_flag=True, default=False)
 @click.option("--ignore-error", help="Only report failures and not errors", show_envvar=True, is_flag=True, default=False)
-def nrfu(ctx: click.Context, inventory: AntaInventory, tags: list[str] | None, catalog: AntaCatalog, ignore_status: bool, ignore_error: bool) -> None:
+@click.option(
+    "--dump-plan",
+    help="Write the test plan, i.e. the tests scheduled on each device with their rendered commands, to a JSON file and exit without running the tests",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--plan",
+    help="Run the tests of a test plan JSON file written with '--dump-plan'. The test catalog is not loaded",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--from-snapshot",
+    help="Run the tests offline against the command outputs collected with 'anta exec snapshot' in this directory or snapshot archive",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=True, exists=True, readable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--slowest",
+    help="Print the N slowest tests, devices and commands after the test results, to find where the time of the run is spent",
+    show_envvar=True,
+    type=click.IntRange(min=1),
+    metavar="N",
+)
+@click.option(
+    "--metrics-file",
+    help="Write the Prometheus metrics of the run (tests by status, commands sent, command errors and cache hits by device, "
+    "test and command duration histograms) to this file, e.g. for the node exporter textfile collector",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--latency-file",
+    help="Learn the latency of the commands in this JSON file, updated after each run, and start the tests with the slowest commands first "
+    "to shorten the run. The file is created if it does not exist",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--blocking-threshold",
+    help="Warn about the tests blocking the event loop, i.e. delaying the other tests, for more than this number of seconds",
+    show_envvar=True,
+    type=click.FloatRange(min=0, min_open=True),
+    metavar="SECONDS",
+)
+@click.option(
+    "--offload-blocking-tests",
+    help="Evaluate the tests that blocked the event loop in worker threads for the rest of the run. "
+    "Detects the tests blocking the event loop for more than 0.1 second unless '--blocking-threshold' is set",
+    show_envvar=True,
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--evaluation-processes",
+    help="Evaluate the tests in a pool of N processes once their commands are collected, to spread the CPU-bound evaluation of the tests across "
+    "CPU cores. Only the test classes opting in are evaluated in the pool unless '--process-all-tests' is set",
+    show_envvar=True,
+    type=click.IntRange(min=1),
+    metavar="N",
+)
+@click.option(
+    "--process-all-tests",
+    help="Evaluate all the tests in the process pool, except the test classes opting out. Uses a process per CPU unless '--evaluation-processes' is set",
+    show_envvar=True,
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--profile",
+    help="Profile the run and write the profile to this directory: the CPU profile of the functions (profile.prof), and a summary (summary.txt) "
+    "of the top functions by cumulative time, the event loop lag percentiles and the largest memory allocators",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=pathlib.Path),
+    # Eager to start profiling before the inventory and the catalog are loaded
+    is_eager=True,
+    expose_value=False,
+    callback=start_profiler,
+)
+def nrfu(
+    ctx: click.Context,
+    inventory: AntaInventory,
+    tags: list[str] | None,
+    catalog: AntaCatalog | None,
+    ignore_status: bool,
+    ignore_error: bool,
+    dump_plan: pathlib.Path | None,
+    plan: pathlib.Path | None,
+    from_snapshot: pathlib.Path | None,
+    slowest: int | None,
+    metrics_file: pathlib.Path | None,
+    latency_file: pathlib.Path | None,
+    blocking_threshold: float | None,
+    offload_blocking_tests: bool,
+    evaluation_processes: int | None,
+    process_all_tests: bool,
+) -> None:
     """Run ANTA tests on devices"""
+    # pylint: disable=too-many-arguments,import-outside-toplevel
     # If help is invoke somewhere, skip the command
     if ctx.obj.get("_anta_help"):
         return
+    if dump_plan is not None and plan is not None:
+        raise click.UsageError("'--dump-plan' and '--plan' options are mutually exclusive")
+    from anta.plan import AntaPlan
+    from anta.runner import main
+
+    if from_snapshot is not None:
+        from anta.inventory import AntaInventory
+        from anta.snapshot import SnapshotArchiveError
+
+        try:
+            inventory = AntaInventory.from_snapshot(from_snapshot, inventory)
+        except (OSError, SnapshotArchiveError):
+            ctx.exit(ExitCode.USAGE_ERROR)
+    try:
+        if dump_plan is not None and catalog is not None:
+            write_plan(inventory, catalog, tags, dump_plan)
+            ctx.exit(ExitCode.OK)
+        test_plan = AntaPlan.parse(plan) if plan is not None else None
+    except (ValidationError, ValueError, OSError):
+        ctx.exit(ExitCode.USAGE_ERROR)
     # We use ctx.obj to pass stuff to the next Click functions
     ctx.ensure_object(dict)
     ctx.obj["result_manager"] = ResultManager()
     ctx.obj["ignore_status"] = ignore_status
     ctx.obj["ignore_error"] = ignore_error
-    print_settings(inventory, catalog)
-    with anta_progress_bar() as AntaTest.progress:
-        asyncio.run(main(ctx.obj["result_manager"], inventory, catalog, tags=tags))
+    print_settings(inventory, catalog, test_plan)
+    if slowest is not None:
+        # Printed when the command exits, after the test results
+        ctx.call_on_close(lambda: print_timing(ctx.obj["result_manager"], slowest))
+    if blocking_threshold is not None or offload_blocking_tests:
+        start_watchdog(ctx, blocking_threshold, offload_blocking_tests)
+    if evaluation_processes is not None or process_all_tests:
+        start_evaluation_pool(ctx, evaluation_processes, process_all_tests)
+
+    # The outputs of a snapshot are read without latency: the history is not updated
+    latency = load_latency(ctx, latency_file, learn=from_snapshot is None) if latency_file is not None else None
+
+    try:
+        with anta_progress_bar() as AntaTest.progress:
+            asyncio.run(main(ctx.obj["result_manager"], inventory, catalog, tags=tags, plan=test_plan, latency=latency))
+    except ValidationError:
+        # Test definitions of a lazy catalog are validated when the tests are scheduled
+        ctx.exit(ExitCode.USAGE_ERROR)
+    if metrics_file is not None:
+        write_metrics(ctx.obj["result_manager"], inventory, metrics_file)
     # Invoke `anta nrfu table` if no command is passed
     if ctx.invoked_subcommand is None:
         ctx.invoke(commands.table)
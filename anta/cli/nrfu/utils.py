@@ -10,31 +10,128 @@ import json
 import logging
 import pathlib
 import re
+from typing import TYPE_CHECKING
 
-import rich
+import click
+import rich.spinner
 from rich.panel import Panel
 from rich.pretty import pprint
-from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 
-from anta.catalog import AntaCatalog
 from anta.cli.console import console
-from anta.inventory import AntaInventory
 from anta.reporter import ReportJinja, ReportTable
 from anta.result_manager import ResultManager
+from anta.tools.fileio import write_text
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+    from anta.catalog import AntaCatalog
+    from anta.inventory import AntaInventory
+    from anta.latency import LatencyHistory
+    from anta.plan import AntaPlan
 
 logger = logging.getLogger(__name__)
 
 
+def start_profiler(ctx: click.Context, param: click.Parameter, value: pathlib.Path | None) -> None:
+    """
+    Click option callback starting the profiler of the run.
+
+    The profile is written and its summary printed when the command exits, after the test results.
+    """
+    # pylint: disable=unused-argument
+    if value is None or ctx.resilient_parsing or ctx.obj.get("_anta_help"):
+        return
+    from anta import profiling  # pylint: disable=import-outside-toplevel
+
+    profiler = profiling.Profiler(value)
+    profiling.set_profiler(profiler)
+    profiler.start()
+
+    def stop() -> None:
+        profiling.set_profiler(None)
+        profiler.stop()
+        try:
+            profiler.write()
+        except OSError as e:
+            logger.error(f"Cannot write the profile of the run to '{value}': {e}")
+            return
+        console.print()
+        for table in profiler.tables():
+            console.print(table)
+        console.print(f"Profile of the run written to '{value}'")
+
+    ctx.call_on_close(stop)
+
+
+def start_watchdog(ctx: click.Context, threshold: float | None, offload: bool) -> None:
+    """
+    Detect the tests blocking the event loop until the command exits.
+
+    Args:
+        ctx: Click context
+        threshold: Event loop lag in seconds above which the event loop is considered blocked, None for the default threshold
+        offload: Evaluate the tests that blocked the event loop in worker threads
+    """
+    from anta import watchdog  # pylint: disable=import-outside-toplevel
+
+    watchdog.set_watchdog(watchdog.LoopWatchdog(threshold=threshold or watchdog.DEFAULT_THRESHOLD, offload=offload))
+    ctx.call_on_close(lambda: watchdog.set_watchdog(None))
+
+
+def start_evaluation_pool(ctx: click.Context, processes: int | None, all_tests: bool) -> None:
+    """
+    Evaluate the tests in a pool of processes until the command exits.
+
+    Args:
+        ctx: Click context
+        processes: Number of worker processes, None for the number of CPUs
+        all_tests: Evaluate the test classes that do not opt in nor out in the pool
+    """
+    from anta import evaluation  # pylint: disable=import-outside-toplevel
+
+    pool = evaluation.EvaluationPool(processes=processes, all_tests=all_tests)
+    evaluation.set_pool(pool)
+
+    def shutdown() -> None:
+        evaluation.set_pool(None)
+        pool.shutdown()
+
+    ctx.call_on_close(shutdown)
+
+
 def print_settings(
     inventory: AntaInventory,
-    catalog: AntaCatalog,
+    catalog: AntaCatalog | None,
+    plan: AntaPlan | None = None,
 ) -> None:
     """Print ANTA settings before running tests"""
-    message = f"Running ANTA tests:\n- {inventory}\n- Tests catalog contains {len(catalog.tests)} tests"
+    message = f"Running ANTA tests:\n- {inventory}\n"
+    if plan is not None:
+        message += f"- Test plan contains {len(plan.tests)} tests for {len(plan.devices)} devices"
+    else:
+        message += f"- Tests catalog contains {len(catalog) if catalog is not None else 0} tests"
     console.print(Panel.fit(message, style="cyan", title="[green]Settings"))
     console.print()
 
 
+def write_plan(inventory: AntaInventory, catalog: AntaCatalog, tags: list[str] | None, filename: pathlib.Path) -> None:
+    """
+    Write the test plan of the inventory devices to a JSON file.
+
+    The test plan is built for all the devices of the inventory matching the tags, without connecting to the devices.
+    """
+    # pylint: disable=import-outside-toplevel
+    from anta.plan import AntaPlan
+    from anta.runner import prepare_tests
+
+    devices = list(inventory.get_inventory(established_only=False, tags=tags).values())
+    plan = AntaPlan.build(prepare_tests(devices, catalog, tags))
+    plan.dump(filename)
+    commands = sum(len(device_plan.commands) for device_plan in plan.devices.values())
+    console.print(f"Test plan with {len(plan.tests)} tests and {commands} commands for {len(plan.devices)} devices written to '{filename}'")
+
+
 def print_table(results: ResultManager, device: str | None = None, test: str | None = None, group_by: str | None = None) -> None:
     """Print result in a table"""
     reporter = ReportTable()
@@ -51,14 +148,59 @@ def print_table(results: ResultManager, device: str | None = None, test: str | N
         console.print(reporter.report_all(result_manager=results))
 
 
+def print_timing(results: ResultManager, top: int) -> None:
+    """Print the slowest tests, devices and commands"""
+    reporter = ReportTable()
+    console.print()
+    for table in reporter.report_timing(result_manager=results, top=top):
+        console.print(table)
+
+
+def write_metrics(results: ResultManager, inventory: AntaInventory, path: pathlib.Path) -> None:
+    """Write the Prometheus metrics of the run to a file read by the node exporter textfile collector"""
+    from anta.metrics import AntaMetrics  # pylint: disable=import-outside-toplevel
+
+    metrics = AntaMetrics()
+    metrics.observe(results.get_results())
+    metrics.update_devices(inventory.values())
+    try:
+        metrics.write_textfile(path)
+    except OSError as e:
+        logger.error(f"Cannot write the metrics to '{path}': {e}")
+
+
+def load_latency(ctx: click.Context, path: pathlib.Path, learn: bool) -> LatencyHistory:
+    """
+    Load the command latency learned during the previous runs.
+
+    Args:
+        ctx: Click context
+        path: Path to the latency history JSON file
+        learn: Write the latency learned during the run to the file when the command exits
+    """
+    from anta.latency import LatencyHistory  # pylint: disable=import-outside-toplevel
+
+    history = LatencyHistory.parse(path)
+
+    def write() -> None:
+        try:
+            history.dump(path)
+        except OSError as e:
+            logger.error(f"Cannot write the command latency to '{path}': {e}")
+
+    if learn:
+        ctx.call_on_close(write)
+    return history
+
+
 def print_json(results: ResultManager, output: pathlib.Path | None = None) -> None:
     """Print result in a json format"""
+    json_results = results.get_json_results()
     console.print()
     console.print(Panel("JSON results of all tests", style="cyan"))
-    rich.print_json(results.get_json_results())
+    rich.print_json(json_results)
     if output is not None:
-        with open(output, "w", encoding="utf-8") as fout:
-            fout.write(results.get_json_results())
+        write_text(output, json_results)
 
 
 def print_list(results: ResultManager, output: pathlib.Path | None = None) -> None:
@@ -67,8 +209,7 @@ def print_list(results: ResultManager, output: pathlib.Path | None = None) -> No
     console.print(Panel.fit("List results of all tests", style="cyan"))
     pprint(results.get_results())
     if output is not None:
-        with open(output, "w", encoding="utf-8") as fout:
-            fout.write(str(results.get_results()))
+        write_text(output, str(results.get_results()))
 
 
 def print_text(results: ResultManager, search: str | None = None, skip_error: bool = False) -> None:
@@ -89,8 +230,7 @@ def print_jinja(results: ResultManager, template: pathlib.Path, output: pathlib.
     report = reporter.render(json_data)
     console.print(report)
     if output is not None:
-        with open(output, "w", encoding="utf-8") as file:
-            file.write(report)
+        write_text(output, report)
 
 
 # Adding our own ANTA spinner - overriding rich SPINNERS for our own
@@ -120,6 +260,9 @@ def anta_progress_bar() -> Progress:
     """
     Return a customized Progress for progress bar
     """
+    # pylint: disable-next=import-outside-toplevel
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
+
     return Progress(
         SpinnerColumn("anta"),
         TextColumn("•"),
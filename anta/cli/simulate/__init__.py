@@ -0,0 +1,128 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Click command that runs a local eAPI simulator using anta.simulator
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import pathlib
+
+import click
+
+from anta.cli.utils import ExitCode
+
+from .utils import raise_open_files_limit, run_simulator
+
+logger = logging.getLogger(__name__)
+
+
+@click.command
+@click.pass_context
+@click.option("--devices", "-n", help="Number of simulated devices", show_envvar=True, show_default=True, type=click.IntRange(min=1), default=10)
+@click.option("--host", help="Address the eAPI servers listen on", show_envvar=True, show_default=True, default="127.0.0.1")
+@click.option(
+    "--port",
+    help="eAPI port of the first simulated device, the devices use consecutive ports. 0 selects a free port for each device",
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=0, max=65535),
+    default=8443,
+)
+@click.option(
+    "--snapshot",
+    help="Serve the command outputs of a snapshot directory or archive created with 'anta exec snapshot'. "
+    "The snapshot devices are assigned to the simulated devices in a round-robin fashion",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=True, exists=True, readable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--mock-data",
+    help="Serve the command outputs of a mock data directory, with files named <command>_<ofmt>[_<suffix>].out, e.g. show_version_json_4.27.1.1F.out",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, exists=True, readable=True, path_type=pathlib.Path),
+)
+@click.option("--latency", help="Latency of the eAPI requests in seconds", show_envvar=True, show_default=True, type=click.FloatRange(min=0), default=0.0)
+@click.option(
+    "--jitter",
+    help="Maximum random delay added to the latency of each request in seconds",
+    show_envvar=True,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    default=0.0,
+)
+@click.option(
+    "--error-rate",
+    help="Probability for a command to fail with an eAPI error",
+    show_envvar=True,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1),
+    default=0.0,
+)
+@click.option(
+    "--unsupported",
+    help="Command not supported on the hardware platform of the simulated devices. Can be repeated",
+    show_envvar=True,
+    multiple=True,
+)
+@click.option(
+    "--output",
+    "-o",
+    help="Write an ANTA inventory file of the simulated devices",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--duration", help="Number of seconds to run the simulator. Run until interrupted by default", show_envvar=True, type=click.FloatRange(min=0, min_open=True)
+)
+def simulate(
+    ctx: click.Context,
+    devices: int,
+    host: str,
+    port: int,
+    snapshot: pathlib.Path | None,
+    mock_data: pathlib.Path | None,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    unsupported: tuple[str, ...],
+    output: pathlib.Path | None,
+    duration: float | None,
+) -> None:
+    """
+    Run a local eAPI simulator of EOS devices for load testing
+
+    Each simulated device has its own HTTPS eAPI server with a self-signed certificate. Any credentials are accepted.
+    A command without output in the snapshot or in the mock data fails, except 'show version'.
+    """
+    # pylint: disable=too-many-arguments,import-outside-toplevel
+    from anta.simulator import EapiSimulator
+    from anta.snapshot import SnapshotArchiveError
+
+    try:
+        simulator = EapiSimulator.create(
+            devices,
+            snapshot=snapshot,
+            mock_data=mock_data,
+            host=host,
+            port=port,
+            latency=latency,
+            jitter=jitter,
+            error_rate=error_rate,
+            unsupported=unsupported,
+        )
+    except (OSError, ValueError, SnapshotArchiveError) as e:
+        logger.critical(f"Cannot load the command outputs of the simulated devices: {e}")
+        ctx.exit(ExitCode.USAGE_ERROR)
+    # A listening socket per device and a few connections per device
+    raise_open_files_limit(4 * devices + 64)
+    try:
+        asyncio.run(run_simulator(simulator, duration, output))
+    except OSError as e:
+        logger.critical(f"Cannot run the simulator on {host}:{port}: {e}")
+        ctx.exit(ExitCode.USAGE_ERROR)
+    except KeyboardInterrupt:
+        pass
+    ctx.exit(ExitCode.OK)
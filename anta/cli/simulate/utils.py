@@ -0,0 +1,76 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Utils functions to use with anta.cli.simulate module.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anta.simulator import EapiSimulator
+
+logger = logging.getLogger(__name__)
+
+
+def raise_open_files_limit(required: int) -> None:
+    """
+    Raise the soft limit of open files of the process, up to the hard limit, if it is lower than required.
+
+    Each simulated device uses a listening socket and a socket per client connection. Not supported on Windows.
+
+    Args:
+        required: Number of open files required
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY or soft >= required:
+        return
+    limit = required if hard == resource.RLIM_INFINITY else min(required, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Cannot raise the limit of open files from {soft} to {limit}: {e}")
+        return
+    if limit < required:
+        logger.warning(f"The limit of open files ({limit}) may be too low to simulate the devices, raise it with 'ulimit -n'")
+
+
+async def run_simulator(simulator: EapiSimulator, duration: float | None = None, inventory: Path | None = None) -> None:
+    """
+    Run an EapiSimulator until interrupted by SIGINT or SIGTERM.
+
+    Args:
+        simulator: EapiSimulator to run
+        duration: Number of seconds to run the simulator. Defaults to None, i.e. run until interrupted.
+        inventory: Path of an ANTA inventory file of the simulated devices to write once the simulator is started. Defaults to None.
+    """
+    stop = asyncio.Event()
+    async with simulator:
+        if inventory is not None:
+            simulator.write_inventory(inventory)
+            logger.info(f"ANTA inventory of the simulated devices written to '{inventory}'")
+        loop = asyncio.get_running_loop()
+        installed = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+                installed.append(signum)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are not supported by the event loop on Windows, or outside of the main thread
+                logger.debug(f"Cannot handle signal {signum} while running the simulator")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for signum in installed:
+                loop.remove_signal_handler(signum)
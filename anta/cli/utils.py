@@ -8,17 +8,12 @@ from __future__ import annotations
 
 import enum
 import functools
+import importlib
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal
 
 import click
-from pydantic import ValidationError
-from yaml import YAMLError
-
-from anta.catalog import AntaCatalog
-from anta.inventory import AntaInventory
-from anta.inventory.exceptions import InventoryIncorrectSchema, InventoryRootKeyError
 
 if TYPE_CHECKING:
     from click import Option
@@ -102,7 +97,7 @@ class AliasedGroup(click.Group):
         if not matches:
             return None
         if len(matches) == 1:
-            return click.Group.get_command(self, ctx, matches[0])
+            return self.get_command(ctx, matches[0])
         ctx.fail(f"Too many matches: {', '.join(sorted(matches))}")
         return None
 
@@ -113,6 +108,49 @@ class AliasedGroup(click.Group):
         return cmd.name, cmd, args  # type: ignore
 
 
+class LazyGroup(AliasedGroup):
+    """
+    Implements a subclass of AliasedGroup that imports its subcommands only when they are used.
+    This keeps the ANTA CLI startup fast as the dependencies of a subcommand are only imported when this subcommand is invoked.
+
+    Subcommands are declared with the `lazy_subcommands` argument, a mapping of the subcommand names to a tuple with
+    the import path of the subcommand formatted as `<module>:<attribute>` and the short help displayed by `--help`.
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: dict[str, tuple[str, str]] | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """Return the names of the regular and lazy subcommands"""
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Any:
+        """Import the subcommand if it is a lazy subcommand which has not been imported yet"""
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            if not isinstance(command, click.Command):
+                raise ValueError(f"Lazy loading of '{import_path}' failed: not a Click command")
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """Write the subcommands in the help page without importing the lazy subcommands"""
+        rows: list[tuple[str, str]] = []
+        for cmd_name in self.list_commands(ctx):
+            if cmd_name in self.lazy_subcommands:
+                rows.append((cmd_name, self.lazy_subcommands[cmd_name][1]))
+                continue
+            command = self.get_command(ctx, cmd_name)
+            if command is not None and not command.hidden:
+                rows.append((cmd_name, command.get_short_help_str(formatter.width - 6 - len(cmd_name))))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
 # TODO: check code of click.pass_context that raise mypy errors for types and adapt this decorator
 def inventory_options(f: Any) -> Any:
     """Click common options when requiring an inventory to interact with devices"""
@@ -175,6 +213,15 @@ def inventory_options(f: Any) -> Any:
         show_default=True,
     )
     @click.option("--disable-cache", help="Disable cache globally", show_envvar=True, envvar="ANTA_DISABLE_CACHE", show_default=True, is_flag=True, default=False)
+    @click.option(
+        "--transport",
+        help="Transport used to run commands on the devices. 'auto' selects the fastest of eAPI and SSH per device and falls back to SSH when eAPI is unreachable",
+        type=click.Choice(["eapi", "ssh", "auto"]),
+        default="eapi",
+        show_envvar=True,
+        envvar="ANTA_TRANSPORT",
+        show_default=True,
+    )
     @click.option(
         "--inventory",
         "-i",
@@ -184,6 +231,15 @@ def inventory_options(f: Any) -> Any:
         required=True,
         type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=Path),
     )
+    @click.option(
+        "--inventory-cache",
+        help="Cache the validated inventory next to the inventory file and reuse it while the file is unchanged",
+        show_envvar=True,
+        envvar="ANTA_INVENTORY_CACHE",
+        show_default=True,
+        is_flag=True,
+        default=False,
+    )
     @click.option(
         "--tags",
         "-t",
@@ -209,12 +265,20 @@ def inventory_options(f: Any) -> Any:
         timeout: int,
         insecure: bool,
         disable_cache: bool,
+        transport: Literal["eapi", "ssh", "auto"],
+        inventory_cache: bool,
         **kwargs: dict[str, Any],
     ) -> Any:
-        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-arguments,import-outside-toplevel
         # If help is invoke somewhere, do not parse inventory
         if ctx.obj.get("_anta_help"):
             return f(*args, inventory=None, tags=tags, **kwargs)
+        from pydantic import ValidationError
+        from yaml import YAMLError
+
+        from anta.inventory import AntaInventory
+        from anta.inventory.exceptions import InventoryIncorrectSchema, InventoryRootKeyError
+
         if prompt:
             # User asked for a password prompt
             if password is None:
@@ -239,6 +303,8 @@ def inventory_options(f: Any) -> Any:
                 timeout=timeout,
                 insecure=insecure,
                 disable_cache=disable_cache,
+                cache=inventory_cache,
+                transport=transport,
             )
         except (ValidationError, TypeError, ValueError, YAMLError, OSError, InventoryIncorrectSchema, InventoryRootKeyError):
             ctx.exit(ExitCode.USAGE_ERROR)
@@ -255,20 +321,120 @@ def catalog_options(f: Any) -> Any:
         "-c",
         envvar="ANTA_CATALOG",
         show_envvar=True,
-        help="Path to the test catalog YAML file",
-        type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=Path),
-        required=True,
+        help="Path to the test catalog YAML file or to a directory of test catalog YAML files. Can be repeated to merge multiple test catalogs. "
+        "Required unless running a test plan",
+        type=click.Path(file_okay=True, dir_okay=True, exists=True, readable=True, path_type=Path),
+        multiple=True,
+    )
+    @click.option(
+        "--catalog-cache",
+        help="Cache the validated test catalog next to the catalog file and reuse it while the file is unchanged",
+        show_envvar=True,
+        envvar="ANTA_CATALOG_CACHE",
+        show_default=True,
+        is_flag=True,
+        default=False,
+    )
+    @click.option(
+        "--catalog-max-workers",
+        help="Number of worker processes used to validate the test catalog. Useful for very large catalogs",
+        show_envvar=True,
+        envvar="ANTA_CATALOG_MAX_WORKERS",
+        type=click.IntRange(min=1),
+        required=False,
+    )
+    @click.option(
+        "--catalog-lazy",
+        help="Only import the test modules and validate the test inputs of the tests scheduled on the devices",
+        show_envvar=True,
+        envvar="ANTA_CATALOG_LAZY",
+        show_default=True,
+        is_flag=True,
+        default=False,
     )
     @click.pass_context
     @functools.wraps(f)
-    def wrapper(ctx: click.Context, *args: tuple[Any], catalog: Path, **kwargs: dict[str, Any]) -> Any:
+    def wrapper(
+        ctx: click.Context,
+        *args: tuple[Any],
+        catalog: tuple[Path, ...],
+        catalog_cache: bool,
+        catalog_max_workers: int | None,
+        catalog_lazy: bool,
+        **kwargs: dict[str, Any],
+    ) -> Any:
+        # pylint: disable=too-many-arguments,import-outside-toplevel
         # If help is invoke somewhere, do not parse catalog
         if ctx.obj.get("_anta_help"):
             return f(*args, catalog=None, **kwargs)
+        if not catalog:
+            # A test plan replaces the test catalog, see `anta nrfu --plan`
+            if ctx.params.get("plan") is not None:
+                return f(*args, catalog=None, **kwargs)
+            raise click.MissingParameter(ctx=ctx, param_type="option", param_hint="'-c' / '--catalog'")
+        from pydantic import ValidationError
+        from yaml import YAMLError
+
+        from anta.catalog import AntaCatalog
+
         try:
-            c = AntaCatalog.parse(catalog)
+            c = AntaCatalog.parse(catalog[0] if len(catalog) == 1 else list(catalog), cache=catalog_cache, max_workers=catalog_max_workers, lazy=catalog_lazy)
         except (ValidationError, TypeError, ValueError, YAMLError, OSError):
             ctx.exit(ExitCode.USAGE_ERROR)
         return f(*args, catalog=c, **kwargs)
 
     return wrapper
+
+
+def tracing_options(f: Any) -> Any:
+    """Click common options to export traces of the ANTA runs"""
+
+    @click.option(
+        "--trace-file",
+        help="Write the spans of the run (inventory connection, device refresh, test collection and evaluation, eAPI requests) to this file, one JSON line per span",
+        show_envvar=True,
+        envvar="ANTA_TRACE_FILE",
+        type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+    )
+    @click.option(
+        "--trace-otlp-endpoint",
+        help="Send the spans of the run to this OpenTelemetry collector with the OTLP/HTTP protocol, e.g. http://localhost:4318",
+        show_envvar=True,
+        envvar="ANTA_TRACE_OTLP_ENDPOINT",
+    )
+    @click.pass_context
+    @functools.wraps(f)
+    def wrapper(
+        ctx: click.Context,
+        *args: tuple[Any],
+        trace_file: Path | None,
+        trace_otlp_endpoint: str | None,
+        **kwargs: dict[str, Any],
+    ) -> Any:
+        # pylint: disable=import-outside-toplevel
+        # If help is invoke somewhere or tracing is disabled, do not set up a tracer
+        if ctx.obj.get("_anta_help") or (trace_file is None and trace_otlp_endpoint is None):
+            return f(*args, **kwargs)
+        from anta import tracing
+
+        exporters: list[tracing.SpanExporter] = []
+        try:
+            if trace_file is not None:
+                exporters.append(tracing.JsonFileExporter(trace_file))
+            if trace_otlp_endpoint is not None:
+                exporters.append(tracing.OtlpExporter(trace_otlp_endpoint))
+        except OSError as e:
+            logger.error(f"Cannot open trace file '{trace_file}': {e}")
+            ctx.exit(ExitCode.USAGE_ERROR)
+        tracer = tracing.Tracer(exporters)
+        tracing.set_tracer(tracer)
+
+        def shutdown() -> None:
+            tracing.set_tracer(None)
+            tracer.shutdown()
+
+        # Export the remaining spans when the command exits, including with ctx.exit()
+        ctx.call_on_close(shutdown)
+        return f(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,123 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Click command that runs ANTA tests continuously using anta.watch
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import pathlib
+from typing import TYPE_CHECKING
+
+import click
+from pydantic import ValidationError
+
+from anta.cli.utils import ExitCode, catalog_options, inventory_options, tracing_options
+
+from .utils import parse_test_intervals, print_cycle, run_watcher
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from anta.catalog import AntaCatalog
+    from anta.inventory import AntaInventory
+    from anta.watch import WatchCycle, WatchInterval
+
+
+@click.command
+@click.pass_context
+@inventory_options
+@catalog_options
+@tracing_options
+@click.option(
+    "--interval",
+    help="Default run interval of the tests in seconds",
+    show_envvar=True,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    default=300.0,
+)
+@click.option(
+    "--test-interval",
+    "-I",
+    help="Run interval of the tests matching a pattern, as PATTERN=SECONDS. The pattern is matched against the test name, "
+    "the test categories and the test module, e.g. 'hardware=3600' or 'VerifyBGP*=60'. Can be repeated, the first matching pattern is used",
+    show_envvar=True,
+    multiple=True,
+    callback=parse_test_intervals,
+)
+@click.option("--cycles", help="Number of cycles to run before exiting. Run until interrupted by default", show_envvar=True, type=click.IntRange(min=1))
+@click.option(
+    "--output",
+    "-o",
+    help="Append the test results that changed during each cycle to this file, one JSON line per cycle",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--metrics-port",
+    help="Serve the Prometheus metrics of the runs on this port at /metrics",
+    show_envvar=True,
+    type=click.IntRange(min=0, max=65535),
+)
+@click.option(
+    "--metrics-address",
+    help="Address to serve the Prometheus metrics on. Requires '--metrics-port'",
+    show_envvar=True,
+    show_default=True,
+    default="0.0.0.0",  # nosec B104
+)
+@click.option(
+    "--metrics-file",
+    help="Write the Prometheus metrics of the runs to this file after each cycle, e.g. for the node exporter textfile collector",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+def watch(
+    ctx: click.Context,
+    inventory: AntaInventory,
+    tags: list[str] | None,
+    catalog: AntaCatalog,
+    interval: float,
+    test_interval: list[WatchInterval],
+    cycles: int | None,
+    output: pathlib.Path | None,
+    metrics_port: int | None,
+    metrics_address: str,
+    metrics_file: pathlib.Path | None,
+) -> None:
+    """
+    Run ANTA tests continuously and report the changed results
+
+    The device connections are kept open between the cycles. Send SIGUSR1 to run all the tests immediately.
+    """
+    # pylint: disable=too-many-arguments,too-many-locals,import-outside-toplevel
+    from anta.metrics import AntaMetrics, MetricsServer
+    from anta.watch import AntaWatcher
+
+    metrics = AntaMetrics() if metrics_port is not None or metrics_file is not None else None
+    server = MetricsServer(metrics, host=metrics_address, port=metrics_port) if metrics is not None and metrics_port is not None else None
+
+    def on_cycle(cycle: WatchCycle) -> None:
+        print_cycle(cycle, output)
+        if metrics is not None and metrics_file is not None:
+            try:
+                metrics.write_textfile(metrics_file)
+            except OSError as e:
+                logger.error(f"Cannot write the metrics to '{metrics_file}': {e}")
+
+    watcher = AntaWatcher(inventory, catalog, tags=tags, interval=interval, intervals=test_interval, on_cycle=on_cycle, metrics=metrics)
+    try:
+        asyncio.run(run_watcher(watcher, cycles, server))
+    except ValidationError:
+        # Test definitions of a lazy catalog are validated when the tests are scheduled
+        ctx.exit(ExitCode.USAGE_ERROR)
+    except OSError as e:
+        # The metrics server cannot listen on the address and port
+        logger.critical(f"Cannot serve the metrics on {metrics_address}:{metrics_port}: {e}")
+        ctx.exit(ExitCode.USAGE_ERROR)
+    except KeyboardInterrupt:
+        pass
+    ctx.exit(ExitCode.OK)
@@ -0,0 +1,92 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Utils functions to use with anta.cli.watch module.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from rich.text import Text
+
+from anta.cli.console import console
+
+if TYPE_CHECKING:
+    from anta.metrics import MetricsServer
+    from anta.watch import AntaWatcher, WatchCycle, WatchInterval
+
+logger = logging.getLogger(__name__)
+
+
+def parse_test_intervals(ctx: click.Context, param: click.Parameter, value: tuple[str, ...]) -> list[WatchInterval]:
+    """Click option callback to parse the PATTERN=SECONDS test intervals"""
+    # pylint: disable=unused-argument,import-outside-toplevel
+    from pydantic import ValidationError
+
+    from anta.watch import WatchInterval
+
+    intervals = []
+    for item in value:
+        try:
+            intervals.append(WatchInterval.parse(item))
+        except (ValueError, ValidationError) as e:
+            raise click.BadParameter(f"'{item}' is not a valid PATTERN=SECONDS interval with a positive number of seconds") from e
+    return intervals
+
+
+def print_cycle(cycle: WatchCycle, output: Path | None = None) -> None:
+    """
+    Print the test results that changed during a cycle and optionally append them to a JSON lines file.
+
+    Args:
+        cycle: Results of the cycle
+        output: File to append the cycle to, only if some test results changed
+    """
+    console.print(f"Cycle {cycle.cycle} ({cycle.start:%Y-%m-%d %H:%M:%S}): {cycle.tests} test(s) run in {cycle.duration:.2f}s, {len(cycle.changes)} change(s)")
+    for change in cycle.changes:
+        before = f"[{change.before}]{change.before}[/] -> " if change.before is not None else ""
+        line = Text.from_markup(f"  {change.name} :: {change.test} :: {before}[{change.after}]{change.after}")
+        if change.messages:
+            line.append(f" ({' '.join(change.messages)})")
+        console.print(line)
+    if output is not None and cycle.changes:
+        with open(output, "a", encoding="UTF-8") as file:
+            file.write(f"{cycle.model_dump_json()}\n")
+
+
+async def run_watcher(watcher: AntaWatcher, cycles: int | None = None, server: MetricsServer | None = None) -> None:
+    """
+    Run an AntaWatcher, stopping it on SIGINT or SIGTERM and triggering all the tests on SIGUSR1.
+
+    Args:
+        watcher: AntaWatcher to run
+        cycles: Number of cycles to run. Defaults to None, i.e. run until interrupted.
+        server: Metrics server to run while the watcher is running. Defaults to None.
+    """
+    if server is not None:
+        await server.start()
+    loop = asyncio.get_running_loop()
+    handlers = {getattr(signal, "SIGUSR1", None): watcher.trigger, signal.SIGINT: watcher.stop, signal.SIGTERM: watcher.stop}
+    installed = []
+    for signum, handler in handlers.items():
+        if signum is None:
+            continue
+        try:
+            loop.add_signal_handler(signum, handler)
+            installed.append(signum)
+        except (NotImplementedError, RuntimeError):
+            # Signal handlers are not supported by the event loop on Windows, or outside of the main thread
+            logger.debug(f"Cannot handle signal {signum} while running the tests")
+    try:
+        await watcher.run(cycles)
+    finally:
+        for signum in installed:
+            loop.remove_signal_handler(signum)
+        if server is not None:
+            await server.close()
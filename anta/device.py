@@ -7,26 +7,41 @@ ANTA Device Abstraction Module
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import random
+import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Iterator, Literal, Optional, Union
+from typing import TYPE_CHECKING, Any, Iterator, Literal, Optional, Union
 
-import asyncssh
-from aiocache import Cache
-from aiocache.plugins import HitMissRatioPlugin
-from asyncssh import SSHClientConnection, SSHClientConnectionOptions
-from httpx import ConnectError, HTTPError
+from httpx import ConnectError, HTTPError, TransportError
 
-from anta import __DEBUG__, aioeapi
+from anta import __DEBUG__, aioeapi, tracing
 from anta.models import AntaCommand
+from anta.snapshot import SnapshotArchive, SnapshotArchiveError
+from anta.tools.fileio import AsyncFileIO
 from anta.tools.misc import exc_to_str
+from anta.tools.ssh import SSHConnectionPool
+from anta.tools.transfer import TransferBudget, sftp_download
+
+if TYPE_CHECKING:
+    from aiocache import Cache
+    from asyncssh import SSHClientConnection, SSHClientConnectionOptions, SSHCompletedProcess
 
 logger = logging.getLogger(__name__)
 
+# Transports that can be used by AsyncEOSDevice to run commands
+TRANSPORTS = ("eapi", "ssh", "auto")
+
+# Base and maximum delay in seconds between the retries of a command, see AsyncEOSDevice._eapi_request()
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 10.0
+
 
-class AntaDevice(ABC):
+class AntaDevice(ABC):  # pylint: disable=too-many-instance-attributes
     """
     Abstract class representing a device in ANTA.
     An implementation of this class must override the abstract coroutines `_collect()` and
@@ -40,6 +55,8 @@ class AntaDevice(ABC):
         tags: List of tags for this device
         cache: In-memory cache from aiocache library for this device (None if cache is disabled)
         cache_locks: Dictionary mapping keys to asyncio locks to guarantee exclusive access to the cache if not disabled
+        commands_sent: Number of commands sent to the device, i.e. not read from the cache
+        command_errors: Number of commands sent to the device that failed
     """
 
     def __init__(self, name: str, tags: Optional[list[str]] = None, disable_cache: bool = False) -> None:
@@ -60,6 +77,8 @@ class AntaDevice(ABC):
         self.established: bool = False
         self.cache: Optional[Cache] = None
         self.cache_locks: Optional[defaultdict[str, asyncio.Lock]] = None
+        self.commands_sent: int = 0
+        self.command_errors: int = 0
 
         # Initialize cache if not disabled
         if not disable_cache:
@@ -88,6 +107,10 @@ class AntaDevice(ABC):
         """
         Initialize cache for the device, can be overriden by subclasses to manipulate how it works
         """
+        # pylint: disable=import-outside-toplevel
+        from aiocache import Cache
+        from aiocache.plugins import HitMissRatioPlugin
+
         self.cache = Cache(cache_class=Cache.MEMORY, ttl=60, namespace=self.name, plugins=[HitMissRatioPlugin()])
         self.cache_locks = defaultdict(asyncio.Lock)
 
@@ -148,6 +171,7 @@ class AntaDevice(ABC):
         Args:
             command (AntaCommand): The command to process.
         """
+        start = time.perf_counter()
         # Need to ignore pylint no-member as Cache is a proxy class and pylint is not smart enough
         # https://github.com/pylint-dev/pylint/issues/7258
         if self.cache is not None and self.cache_locks is not None and command.use_cache:
@@ -157,11 +181,18 @@ class AntaDevice(ABC):
                 if cached_output is not None:
                     logger.debug(f"Cache hit for {command.command} on {self.name}")
                     command.output = cached_output
+                    command.cache_hit = True
                 else:
                     await self._collect(command=command)
                     await self.cache.set(command.uid, command.output)  # pylint: disable=no-member
+                    command.cache_hit = False
         else:
             await self._collect(command=command)
+        command.duration = time.perf_counter() - start
+        if not command.cache_hit:
+            self.commands_sent += 1
+            if command.errors:
+                self.command_errors += 1
 
     async def collect_commands(self, commands: list[AntaCommand]) -> None:
         """
@@ -203,17 +234,47 @@ class AntaDevice(ABC):
         """
         raise NotImplementedError(f"copy() method has not been implemented in {self.__class__.__name__} definition")
 
+    async def download(self, sources: list[Path], destination: Path, budget: Optional[TransferBudget] = None, verify_checksum: bool = False) -> list[Path]:
+        """
+        Download files from the device in parallel, resuming partial downloads and skipping files that have already been downloaded.
+        It is not mandatory to implement this for a valid AntaDevice subclass.
 
-class AsyncEOSDevice(AntaDevice):
+        Args:
+            sources: List of files to download from the device.
+            destination: Local directory to download the files to.
+            budget: Concurrency and bandwidth budget shared with other transfers.
+            verify_checksum: Compare the SHA-256 digests of the local and remote files.
+
+        Returns:
+            The local paths of the downloaded files, excluding the skipped files.
+        """
+        raise NotImplementedError(f"download() method has not been implemented in {self.__class__.__name__} definition")
+
+    async def close(self) -> None:
+        """
+        Close the connections to the device that are kept open between commands or transfers.
+        The device can still be used afterwards. The default implementation does nothing.
+        """
+
+
+class AsyncEOSDevice(AntaDevice):  # pylint: disable=too-many-instance-attributes
     """
     Implementation of AntaDevice for EOS using aio-eapi.
 
+    Commands can also be run over SSH, using the `| json` pipe to get JSON outputs, depending on the `transport` attribute:
+        - `eapi`: Commands are run with eAPI.
+        - `ssh`: Commands are run over SSH.
+        - `auto`: `refresh()` measures the latency of both transports and selects the fastest one. Commands fall back to SSH
+          when eAPI is not reachable anymore.
+
     Attributes:
         name: Device name
         is_online: True if the device IP is reachable and a port can be open
         established: True if remote command execution succeeds
         hw_model: Hardware model of the device
         tags: List of tags for this device
+        transport: Transport mode of the device: 'eapi', 'ssh' or 'auto'
+        active_transport: Transport currently used to run commands: 'eapi' or 'ssh'
     """
 
     def __init__(  # pylint: disable=R0913
@@ -231,6 +292,7 @@ class AsyncEOSDevice(AntaDevice):
         insecure: bool = False,
         proto: Literal["http", "https"] = "https",
         disable_cache: bool = False,
+        transport: Literal["eapi", "ssh", "auto"] = "eapi",
     ) -> None:
         """
         Constructor of AsyncEOSDevice
@@ -249,6 +311,7 @@ class AsyncEOSDevice(AntaDevice):
             insecure: Disable SSH Host Key validation
             proto: eAPI protocol. Value can be 'http' or 'https'
             disable_cache: Disable caching for all commands for this device. Defaults to False.
+            transport: Transport used to run commands: 'eapi', 'ssh' or 'auto' to select the fastest one. Defaults to 'eapi'.
         """
         if host is None:
             message = "'host' is required to create an AsyncEOSDevice"
@@ -265,13 +328,43 @@ class AsyncEOSDevice(AntaDevice):
             message = f"'password' is required to instantiate device '{self.name}'"
             logger.error(message)
             raise ValueError(message)
+        if transport not in TRANSPORTS:
+            message = f"'transport' must be one of {', '.join(TRANSPORTS)} for device '{self.name}'"
+            logger.error(message)
+            raise ValueError(message)
+        self.transport = transport
+        self.active_transport: Literal["eapi", "ssh"] = "ssh" if transport == "ssh" else "eapi"
+        self._timeout = timeout
         self.enable = enable
         self._enable_password = enable_password
         self._session: aioeapi.Device = aioeapi.Device(host=host, port=port, username=username, password=password, proto=proto, timeout=timeout)
-        ssh_params: dict[str, Any] = {}
+        self._ssh_params: dict[str, Any] = {"host": host, "port": ssh_port, "username": username, "password": password}
         if insecure:
-            ssh_params["known_hosts"] = None
-        self._ssh_opts: SSHClientConnectionOptions = SSHClientConnectionOptions(host=host, port=ssh_port, username=username, password=password, **ssh_params)
+            self._ssh_params["known_hosts"] = None
+        self._ssh_pool = SSHConnectionPool(self._ssh_connect, name=self.name)
+
+    @cached_property
+    def _ssh_opts(self) -> SSHClientConnectionOptions:
+        """
+        SSH connection options of the device.
+        They are built on first use as asyncssh is only imported when a SSH connection is required.
+        """
+        from asyncssh import SSHClientConnectionOptions  # pylint: disable=import-outside-toplevel
+
+        return SSHClientConnectionOptions(**self._ssh_params)
+
+    async def _ssh_connect(self) -> SSHClientConnection:
+        """Open a new SSH connection to the device"""
+        import asyncssh  # pylint: disable=import-outside-toplevel
+
+        return await asyncssh.connect(
+            host=self._ssh_opts.host,
+            port=self._ssh_opts.port,
+            tunnel=self._ssh_opts.tunnel,
+            family=self._ssh_opts.family,
+            local_addr=self._ssh_opts.local_addr,
+            options=self._ssh_opts,
+        )
 
     def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
         """
@@ -281,9 +374,10 @@ class AsyncEOSDevice(AntaDevice):
         yield from super().__rich_repr__()
         yield ("host", self._session.host)
         yield ("eapi_port", self._session.port)
-        yield ("username", self._ssh_opts.username)
+        yield ("username", self._ssh_params["username"])
         yield ("enable", self.enable)
-        yield ("insecure", self._ssh_opts.known_hosts is None)
+        yield ("insecure", "known_hosts" in self._ssh_params)
+        yield ("transport", self.transport)
         if __DEBUG__:
             _ssh_opts = vars(self._ssh_opts).copy()
             PASSWORD_VALUE = "<removed>"
@@ -307,10 +401,14 @@ class AsyncEOSDevice(AntaDevice):
         Supports outformat `json` and `text` as output structure.
         Gain privileged access using the `enable_password` attribute
         of the `AntaDevice` instance if populated.
+        The command is run over SSH if it is the active transport of the device.
 
         Args:
             command: the command to collect
         """
+        if self.active_transport == "ssh":
+            await self._collect_ssh(command)
+            return
         commands = []
         if self.enable and self._enable_password is not None:
             commands.append(
@@ -327,17 +425,18 @@ class AsyncEOSDevice(AntaDevice):
         else:
             commands.append({"cmd": command.command})
         try:
-            response: list[dict[str, Any]] = await self._session.cli(
-                commands=commands,
-                ofmt=command.ofmt,
-                version=command.version,
-            )
+            response = await self._eapi_request(command, commands)
         except aioeapi.EapiCommandError as e:
             command.errors = e.errors
             if self.supports(command):
                 message = f"Command '{command.command}' failed on {self.name}"
                 logger.error(message)
         except (HTTPError, ConnectError) as e:
+            if self.transport == "auto":
+                logger.warning(f"Cannot run commands with eAPI on device {self.name}: {exc_to_str(e)}. Falling back to SSH")
+                self.active_transport = "ssh"
+                await self._collect_ssh(command)
+                return
             command.errors = [str(e)]
             message = f"Cannot connect to device {self.name}"
             logger.error(message)
@@ -346,6 +445,139 @@ class AsyncEOSDevice(AntaDevice):
             command.output = response[-1]
             logger.debug(f"{self.name}: {command}")
 
+    async def _eapi_request(self, command: AntaCommand, commands: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Send the eAPI request of a command with the timeout, retry and hedging policies of the command.
+
+        After a transport error, e.g. a connection error or a timeout, the request is sent again up to `command.retries` times,
+        with an exponential backoff and full jitter: the delay before the retry N is random between 0 and RETRY_BACKOFF * 2**N seconds.
+
+        Args:
+            command: the command to collect
+            commands: the eAPI commands of the request, i.e. `enable` and the command
+
+        Returns:
+            The outputs of the eAPI commands.
+
+        Raises:
+            EapiCommandError: The command failed.
+            HTTPError: The request failed, after the retries if the error is a transport error.
+        """
+        retry = 0
+        while True:
+            try:
+                with aioeapi.request_timeout(command.timeout):
+                    if command.hedge_after is None:
+                        return await self._eapi_cli(command, commands)
+                    return await self._eapi_hedged(command, commands, command.hedge_after)
+            except TransportError as e:
+                if retry >= command.retries:
+                    raise
+                delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2**retry))  # nosec B311
+                retry += 1
+                logger.debug(f"Command '{command.command}' failed on {self.name}: {exc_to_str(e)}. Retry {retry}/{command.retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _eapi_hedged(self, command: AntaCommand, commands: list[dict[str, Any]], delay: float) -> list[dict[str, Any]]:
+        """
+        Send the eAPI request of a command, and a duplicate request if there is no response after `delay` seconds.
+
+        The first successful response is returned and the other request is cancelled.
+
+        Args:
+            command: the command to collect
+            commands: the eAPI commands of the request
+            delay: Number of seconds to wait for a response before sending the duplicate request
+
+        Returns:
+            The outputs of the eAPI commands.
+        """
+        primary = asyncio.ensure_future(self._eapi_cli(command, commands))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        logger.debug(f"No response for command '{command.command}' on {self.name} after {delay}s, sending a hedged request")
+        pending = {primary, asyncio.ensure_future(self._eapi_cli(command, commands))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # A command error is returned by both requests, a transport error may only affect one of them
+                    if not isinstance(task.exception(), TransportError):
+                        return task.result()
+            # Both requests failed with a transport error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _eapi_cli(self, command: AntaCommand, commands: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Send an eAPI request of a command"""
+        with tracing.span("anta.eapi.request", device=self.name, command=command.command, ofmt=command.ofmt):
+            response: list[dict[str, Any]] = await self._session.cli(
+                commands=commands,
+                ofmt=command.ofmt,
+                version=command.version,
+            )
+        return response
+
+    async def _ssh_run(self, command: str) -> SSHCompletedProcess:
+        """
+        Run a CLI command over SSH on a connection of the pool, gaining privileged access if required.
+
+        Args:
+            command: the CLI command to run
+        """
+        lines = []
+        stdin = None
+        if self.enable:
+            lines.append("enable")
+            if self._enable_password is not None:
+                stdin = f"{self._enable_password}\n"
+        lines.append(command)
+        with tracing.span("anta.ssh.request", device=self.name, command=command):
+            async with self._ssh_pool.connection() as conn:
+                return await conn.run("\n".join(lines), input=stdin, check=False, timeout=self._timeout)
+
+    async def _collect_ssh(self, command: AntaCommand) -> None:
+        """
+        Collect device command output from EOS over SSH.
+
+        JSON outputs are requested with the `| json` pipe. The `revision` of the command is ignored: the latest revision
+        of the output model is returned.
+
+        Args:
+            command: the command to collect
+        """
+        import asyncssh  # pylint: disable=import-outside-toplevel
+
+        try:
+            result = await self._ssh_run(f"{command.command} | json" if command.ofmt == "json" else command.command)
+        except (asyncssh.Error, OSError, asyncio.TimeoutError) as e:
+            command.errors = [exc_to_str(e)]
+            logger.error(f"Cannot connect to device {self.name} over SSH")
+            return
+        stdout = str(result.stdout or "")
+        errors: list[str] = []
+        output: Any = stdout
+        if command.ofmt == "json":
+            try:
+                output = json.loads(stdout)
+            except ValueError:
+                errors = [stdout.strip() or str(result.stderr or "").strip() or f"Exit status {result.exit_status}"]
+            else:
+                if isinstance(output, dict) and "errors" in output:
+                    errors = output["errors"]
+        elif result.exit_status or stdout.startswith("%"):
+            errors = [line.lstrip("% ") for line in (stdout or str(result.stderr or "")).splitlines() if line]
+        if errors:
+            command.errors = errors
+            if self.supports(command):
+                logger.error(f"Command '{command.command}' failed on {self.name}")
+        else:
+            command.output = output
+            logger.debug(f"{self.name}: {command}")
+
     async def refresh(self) -> None:
         """
         Update attributes of an AsyncEOSDevice instance.
@@ -354,48 +586,112 @@ class AsyncEOSDevice(AntaDevice):
         - is_online: When a device IP is reachable and a port can be open
         - established: When a command execution succeeds
         - hw_model: The hardware model of the device
-        """
-        logger.debug(f"Refreshing device {self.name}")
-        self.is_online = await self._session.check_connection()
-        if self.is_online:
-            COMMAND: str = "show version"
-            HW_MODEL_KEY: str = "modelName"
-            try:
-                response = await self._session.cli(command=COMMAND)
-            except aioeapi.EapiCommandError as e:
-                logger.warning(f"Cannot get hardware information from device {self.name}: {e.errmsg}")
-
-            except (HTTPError, ConnectError) as e:
-                logger.warning(f"Cannot get hardware information from device {self.name}: {exc_to_str(e)}")
 
-            else:
-                if HW_MODEL_KEY in response:
-                    self.hw_model = response[HW_MODEL_KEY]
+        With the 'auto' transport, it also selects the active transport of the device: the transport that ran
+        `show version` the fastest.
+        """
+        with tracing.span("anta.device.refresh", device=self.name) as span:
+            logger.debug(f"Refreshing device {self.name}")
+            latencies: dict[Literal["eapi", "ssh"], float] = {}
+            self.is_online = False
+            if self.transport != "ssh":
+                self.is_online = await self._session.check_connection()
+                if self.is_online:
+                    if (latency := await self._refresh_eapi()) is not None:
+                        latencies["eapi"] = latency
                 else:
-                    logger.warning(f"Cannot get hardware information from device {self.name}: cannot parse '{COMMAND}'")
+                    logger.warning(f"Could not connect to device {self.name}: cannot open eAPI port")
+            if self.transport != "eapi":
+                online, latency = await self._refresh_ssh()
+                self.is_online = self.is_online or online
+                if latency is not None:
+                    latencies["ssh"] = latency
+            if latencies:
+                self.active_transport = min(latencies, key=lambda transport: latencies[transport])
+                if self.transport == "auto":
+                    logger.info(
+                        f"Using {self.active_transport} transport for device {self.name} "
+                        f"({', '.join(f'{transport}: {latency * 1000:.0f}ms' for transport, latency in latencies.items())})"
+                    )
+
+            self.established = bool(self.is_online and self.hw_model)
+            if span is not None:
+                span.set_attribute("established", self.established)
+
+    async def _refresh_eapi(self) -> float | None:
+        """
+        Update the hardware model of the device using eAPI.
+
+        Returns:
+            The latency of `show version` in seconds or None if the hardware model cannot be retrieved. With the `auto` transport,
+            the latency is measured on the connection opened by a first `show version`, to compare it with the SSH latency.
+        """
+        COMMAND: str = "show version"
+        HW_MODEL_KEY: str = "modelName"
+        start = time.perf_counter()
+        try:
+            response = await self._session.cli(command=COMMAND)
+            if self.transport == "auto":
+                # Only measure the command latency, as over SSH: the first request opened the connection reused by the following commands
+                start = time.perf_counter()
+                response = await self._session.cli(command=COMMAND)
+        except aioeapi.EapiCommandError as e:
+            logger.warning(f"Cannot get hardware information from device {self.name}: {e.errmsg}")
+
+        except (HTTPError, ConnectError) as e:
+            logger.warning(f"Cannot get hardware information from device {self.name}: {exc_to_str(e)}")
 
         else:
-            logger.warning(f"Could not connect to device {self.name}: cannot open eAPI port")
+            if HW_MODEL_KEY in response:
+                self.hw_model = response[HW_MODEL_KEY]
+                return time.perf_counter() - start
+            logger.warning(f"Cannot get hardware information from device {self.name}: cannot parse '{COMMAND}'")
+        return None
 
-        self.established = bool(self.is_online and self.hw_model)
+    async def _refresh_ssh(self) -> tuple[bool, float | None]:
+        """
+        Update the hardware model of the device over SSH.
+
+        Returns:
+            A tuple with True if a SSH connection can be open and the latency of `show version` in seconds
+            or None if the hardware model cannot be retrieved.
+        """
+        import asyncssh  # pylint: disable=import-outside-toplevel
+
+        COMMAND: str = "show version | json"
+        HW_MODEL_KEY: str = "modelName"
+        try:
+            async with self._ssh_pool.connection():
+                # Only measure the command latency: the connection is reused by the following commands
+                start = time.perf_counter()
+                result = await self._ssh_run(COMMAND)
+                latency = time.perf_counter() - start
+        except (asyncssh.Error, OSError, asyncio.TimeoutError) as e:
+            logger.warning(f"Could not connect to device {self.name} over SSH: {exc_to_str(e)}")
+            return False, None
+        try:
+            response = json.loads(str(result.stdout or ""))
+        except ValueError:
+            response = {}
+        if isinstance(response, dict) and HW_MODEL_KEY in response:
+            self.hw_model = response[HW_MODEL_KEY]
+            return True, latency
+        logger.warning(f"Cannot get hardware information from device {self.name} over SSH: cannot parse '{COMMAND}'")
+        return True, None
 
     async def copy(self, sources: list[Path], destination: Path, direction: Literal["to", "from"] = "from") -> None:
         """
         Copy files to and from the device using asyncssh.scp().
+        The SSH connection is borrowed from the connection pool of the device.
 
         Args:
             sources: List of files to copy to or from the device.
             destination: Local or remote destination when copying the files. Can be a folder.
             direction: Defines if this coroutine copies files to or from the device.
         """
-        async with asyncssh.connect(
-            host=self._ssh_opts.host,
-            port=self._ssh_opts.port,
-            tunnel=self._ssh_opts.tunnel,
-            family=self._ssh_opts.family,
-            local_addr=self._ssh_opts.local_addr,
-            options=self._ssh_opts,
-        ) as conn:
+        import asyncssh  # pylint: disable=import-outside-toplevel
+
+        async with self._ssh_pool.connection() as conn:
             src: Union[list[tuple[SSHClientConnection, Path]], list[Path]]
             dst: Union[tuple[SSHClientConnection, Path], Path]
             if direction == "from":
@@ -415,3 +711,192 @@ class AsyncEOSDevice(AntaDevice):
 
                 return
             await asyncssh.scp(src, dst)
+
+    async def download(self, sources: list[Path], destination: Path, budget: Optional[TransferBudget] = None, verify_checksum: bool = False) -> list[Path]:
+        """
+        Download files from the device in parallel using SFTP.
+
+        All the files are downloaded over a single SSH connection borrowed from the connection pool of the device.
+        A file is skipped if it already exists locally with the same size and, if `verify_checksum` is True, the same
+        SHA-256 digest. Interrupted downloads are resumed. Remote digests are computed on the device with `sha256sum` through eAPI.
+
+        Args:
+            sources: List of files to download from the device.
+            destination: Local directory to download the files to.
+            budget: Concurrency and bandwidth budget shared with other transfers.
+            verify_checksum: Compare the SHA-256 digests of the local and remote files.
+
+        Returns:
+            The local paths of the downloaded files, excluding the skipped files.
+        """
+        import asyncssh  # pylint: disable=import-outside-toplevel
+
+        checksums: dict[Path, str] = {}
+        if verify_checksum:
+            command = AntaCommand(command=f"bash timeout 30 sha256sum {' '.join(str(source) for source in sources)}", ofmt="text", use_cache=False)
+            await self.collect(command)
+            if not command.collected:
+                raise OSError(f"Cannot compute the checksums of the files on device {self.name}: {command.errors}")
+            for line in command.text_output.splitlines():
+                if len(fields := line.split(maxsplit=1)) == 2:
+                    checksums[Path(fields[1])] = fields[0]
+
+        try:
+            async with self._ssh_pool.connection() as conn:
+                async with conn.start_sftp_client() as sftp:
+                    with AsyncFileIO() as fileio:
+                        await fileio.mkdir(destination)
+                        results = await asyncio.gather(
+                            *(sftp_download(sftp, source, destination / source.name, fileio, budget, checksums.get(source)) for source in sources),
+                            return_exceptions=True,
+                        )
+        except asyncssh.Error as e:
+            # Do not leak asyncssh exceptions to the callers that do not import asyncssh
+            raise OSError(f"SFTP download from device {self.name} failed: {exc_to_str(e)}") from e
+        downloaded: list[Path] = []
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Unable to download '{source}' from device {self.name}: {exc_to_str(result)}")
+            elif isinstance(result, BaseException):
+                raise result
+            elif result:
+                downloaded.append(destination / source.name)
+        return downloaded
+
+    async def close(self) -> None:
+        """Close the SSH connections of the connection pool of the device"""
+        await self._ssh_pool.close()
+
+
+class SnapshotDevice(AntaDevice):
+    """
+    Implementation of AntaDevice backed by command outputs previously collected with `anta exec snapshot`.
+
+    The snapshot is either a directory or a snapshot archive (see `anta.snapshot`).
+    In a directory, the command outputs of the device are read from the `<root>/<device name>` directory:
+    JSON outputs from `json/<command>.json` files and text outputs from `text/<command>.log` files.
+    No network connection is made. The command version and revision are ignored.
+    A command missing from the snapshot fails with an error.
+
+    Attributes:
+        name: Device name
+        is_online: True if the snapshot contains outputs of the device
+        established: True if the snapshot contains outputs of the device
+        hw_model: Hardware model of the device, read from the `show version` output of the snapshot if available
+        tags: List of tags for this device
+        root: Path of the snapshot directory or archive
+        archive: Snapshot archive, None if the snapshot is a directory
+    """
+
+    def __init__(self, name: str, root: str | Path | SnapshotArchive, tags: Optional[list[str]] = None, disable_cache: bool = False) -> None:
+        """
+        Constructor of SnapshotDevice
+
+        Args:
+            name: Device name, i.e. the name of the device directory or the device name in the snapshot archive
+            root: Path of the snapshot directory or archive. An opened SnapshotArchive can be shared by multiple devices.
+            tags: List of tags for this device
+            disable_cache: Disable caching for all commands for this device. Defaults to False.
+
+        Raises:
+            OSError: The snapshot archive cannot be read.
+            SnapshotArchiveError: The snapshot archive is invalid.
+        """
+        super().__init__(name, tags, disable_cache)
+        self.archive: Optional[SnapshotArchive] = None
+        if isinstance(root, SnapshotArchive):
+            self.archive = root
+            self.root: Path = root.path
+        else:
+            self.root = Path(root)
+            if self.root.is_file():
+                self.archive = SnapshotArchive(self.root)
+
+    def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
+        """
+        Implements Rich Repr Protocol
+        https://rich.readthedocs.io/en/stable/pretty.html#rich-repr-protocol
+        """
+        yield from super().__rich_repr__()
+        yield ("root", self.root)
+
+    @property
+    def _keys(self) -> tuple[Any, ...]:
+        """
+        Two SnapshotDevice objects are equal if the snapshot path and the device name are the same.
+        """
+        return (self.root, self.name)
+
+    def output_path(self, command: AntaCommand) -> Path:
+        """Path of the output file of a command in a snapshot directory"""
+        if command.ofmt == "json":
+            return self.root / self.name / "json" / f"{command.command}.json"
+        return self.root / self.name / "text" / f"{command.command}.log"
+
+    def has_output(self, command: AntaCommand) -> bool:
+        """Return True if the output of a command is part of the snapshot"""
+        if self.archive is not None:
+            return (self.name, command.command, command.ofmt) in self.archive
+        return self.output_path(command).is_file()
+
+    async def _collect(self, command: AntaCommand) -> None:
+        """
+        Read the command output from the snapshot.
+
+        Args:
+            command: the command to collect
+        """
+        try:
+            if self.archive is not None:
+                command.output = self.archive.get(self.name, command.command, command.ofmt)
+            else:
+                content = self.output_path(command).read_text(encoding="UTF-8")
+                command.output = json.loads(content) if command.ofmt == "json" else content
+        except (KeyError, FileNotFoundError):
+            command.errors = [f"Command '{command.command}' ({command.ofmt}) not found in the snapshot of device {self.name}"]
+            logger.warning(command.errors[0])
+        except (OSError, ValueError, SnapshotArchiveError) as e:
+            command.errors = [f"Cannot read the output of command '{command.command}' from '{self.root}': {exc_to_str(e)}"]
+            logger.error(command.errors[0])
+        else:
+            logger.debug(f"{self.name}: {command}")
+
+    async def refresh(self) -> None:
+        """
+        Update attributes of a SnapshotDevice instance.
+
+        This coroutine updates the following attributes of SnapshotDevice:
+        - is_online and established: When the snapshot contains outputs of the device
+        - hw_model: The hardware model of the device from the `show version` output of the snapshot
+        """
+        logger.debug(f"Refreshing device {self.name}")
+        self.is_online = self.archive.has_device(self.name) if self.archive is not None else (self.root / self.name).is_dir()
+        if not self.is_online:
+            logger.warning(f"Could not find the snapshot of device {self.name} in '{self.root}'")
+        else:
+            show_version = AntaCommand(command="show version")
+            if self.has_output(show_version):
+                await self._collect(show_version)
+                if show_version.collected:
+                    self.hw_model = show_version.json_output.get("modelName")
+            if self.hw_model is None:
+                logger.debug(f"Cannot get hardware information of device {self.name} from the snapshot")
+        self.established = self.is_online
+
+    async def copy(self, sources: list[Path], destination: Path, direction: Literal["to", "from"] = "from") -> None:
+        """
+        Copy files to and from the device: not supported by snapshot devices.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError(f"Cannot copy files {direction} snapshot device {self.name}: the snapshot only contains command outputs")
+
+    async def download(self, sources: list[Path], destination: Path, budget: Optional[TransferBudget] = None, verify_checksum: bool = False) -> list[Path]:
+        """
+        Download files from the device: not supported by snapshot devices.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError(f"Cannot download files from snapshot device {self.name}: the snapshot only contains command outputs")
@@ -0,0 +1,378 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Comparison of two ANTA test result sets or two snapshots.
+
+- Test results, as written by `anta nrfu json --output`, are matched by device, test name and occurrence of the test on
+  the device, and compared on their status and messages.
+- Snapshots, as written by `anta exec snapshot` to a directory or an archive, are matched by device, output format and
+  command. Identical outputs are skipped by comparing the digests of the raw files or archive members. The other outputs
+  are compared structurally for the `json` format and line by line for the `text` format.
+"""
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+
+# Need to keep List for pydantic in python 3.8
+from typing import Any, Collection, Iterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, TypeAdapter
+
+from anta.custom_types import TestStatus
+from anta.result_manager.models import TestResult
+from anta.snapshot import SnapshotArchive, is_archive
+
+logger = logging.getLogger(__name__)
+
+ChangeType = Literal["added", "removed", "changed"]
+# A test result is a regression when it moves to one of these statuses
+REGRESSION_STATUSES: Tuple[str, ...] = ("failure", "error")
+# Values longer than this are truncated in the changes of a JSON output
+MAX_VALUE_LENGTH = 80
+# Key of a command output in a snapshot: device name, output format and command
+OutputKey = Tuple[str, str, str]
+
+
+class ResultChange(BaseModel):
+    """
+    Change of a test result between two result sets.
+
+    Attributes:
+        name: Device name
+        test: Test name
+        index: Occurrence of the test on the device, starting at 0. A test can be run multiple times on a device with different inputs.
+        change: `added`, `removed` or `changed`
+        before: Status of the test in the first result set, None if the test has been added
+        after: Status of the test in the second result set, None if the test has been removed
+        messages: Messages of the test in the second result set, or in the first one if the test has been removed
+        regression: True if the test is failing in the second result set and was not failing in the first one
+    """
+
+    name: str
+    test: str
+    index: int = 0
+    change: ChangeType
+    before: Optional[TestStatus] = None
+    after: Optional[TestStatus] = None
+    messages: List[str] = []
+    regression: bool = False
+
+
+class CommandChange(BaseModel):
+    """
+    Change of a command output between two snapshots.
+
+    Attributes:
+        device: Device name
+        command: Command
+        ofmt: Output format of the command, `json` or `text`
+        change: `added`, `removed` or `changed`
+        details: Differences between the outputs. For the `json` format, one `<path>: <before> -> <after>` line per changed value.
+                 For the `text` format, the removed lines prefixed with `-` and the added lines prefixed with `+`.
+    """
+
+    device: str
+    command: str
+    ofmt: Literal["json", "text"]
+    change: ChangeType
+    details: List[str] = []
+
+
+def _count(changes: list[Any], key: str) -> dict[str, Counter[str]]:
+    """Count the changes by type, grouped by an attribute of the changes"""
+    counters: dict[str, Counter[str]] = {}
+    for change in changes:
+        counter = counters.setdefault(getattr(change, key), Counter())
+        counter[change.change] += 1
+        if getattr(change, "regression", False):
+            counter["regression"] += 1
+    return counters
+
+
+class ResultsDiff(BaseModel):
+    """
+    Differences between two test result sets.
+
+    Attributes:
+        changes: Changes of the test results
+        unchanged: Number of unchanged test results
+    """
+
+    changes: List[ResultChange] = []
+    unchanged: int = 0
+
+    @property
+    def regressions(self) -> list[ResultChange]:
+        """Test results that are failing in the second result set and were not failing in the first one"""
+        return [change for change in self.changes if change.regression]
+
+    def by_device(self) -> dict[str, Counter[str]]:
+        """Return the number of changes of each type, including `regression`, per device"""
+        return _count(self.changes, "name")
+
+    def by_test(self) -> dict[str, Counter[str]]:
+        """Return the number of changes of each type, including `regression`, per test"""
+        return _count(self.changes, "test")
+
+
+class SnapshotDiff(BaseModel):
+    """
+    Differences between two snapshots.
+
+    Attributes:
+        changes: Changes of the command outputs
+        unchanged: Number of unchanged command outputs
+    """
+
+    changes: List[CommandChange] = []
+    unchanged: int = 0
+
+    def by_device(self) -> dict[str, Counter[str]]:
+        """Return the number of changes of each type per device"""
+        return _count(self.changes, "device")
+
+
+def load_results(path: Path) -> list[TestResult]:
+    """
+    Load test results from a JSON file written by `anta nrfu json --output`.
+
+    Args:
+        path: Path of the JSON file
+
+    Raises:
+        OSError: The file cannot be read.
+        pydantic.ValidationError: The file does not contain valid test results.
+    """
+    with open(path, "rb") as file:
+        return TypeAdapter(List[TestResult]).validate_json(file.read())
+
+
+def compare_result(previous: Optional[TestResult], result: TestResult, index: int = 0) -> Optional[ResultChange]:
+    """
+    Compare a test result with the previous result of the same test on the same device.
+
+    Args:
+        previous: Previous result of the test, None if the test has not been run before
+        result: New result of the test
+        index: Occurrence of the test on the device
+
+    Returns:
+        The change of the test result, None if its status and messages are unchanged.
+    """
+    if previous is not None and previous.result == result.result and previous.messages == result.messages:
+        return None
+    return ResultChange(
+        name=result.name,
+        test=result.test,
+        index=index,
+        change="added" if previous is None else "changed",
+        before=None if previous is None else previous.result,
+        after=result.result,
+        messages=result.messages,
+        regression=result.result in REGRESSION_STATUSES and (previous is None or previous.result not in REGRESSION_STATUSES),
+    )
+
+
+def diff_results(before: list[TestResult], after: list[TestResult]) -> ResultsDiff:
+    """
+    Compare two test result sets.
+
+    Args:
+        before: First result set, e.g. the results of last night
+        after: Second result set
+
+    Returns:
+        The changes, in the order of the second result set followed by the removed tests.
+    """
+
+    def index(results: list[TestResult]) -> dict[tuple[str, str, int], TestResult]:
+        indexed: dict[tuple[str, str, int], TestResult] = {}
+        occurrences: Counter[tuple[str, str]] = Counter()
+        for result in results:
+            key = (result.name, result.test)
+            indexed[(result.name, result.test, occurrences[key])] = result
+            occurrences[key] += 1
+        return indexed
+
+    previous_results = index(before)
+    diff = ResultsDiff()
+    for (name, test, occurrence), result in index(after).items():
+        change = compare_result(previous_results.pop((name, test, occurrence), None), result, occurrence)
+        if change is None:
+            diff.unchanged += 1
+        else:
+            diff.changes.append(change)
+    for (name, test, occurrence), previous in previous_results.items():
+        diff.changes.append(ResultChange(name=name, test=test, index=occurrence, change="removed", before=previous.result, messages=previous.messages))
+    return diff
+
+
+def _short(value: Any) -> str:
+    """Return the JSON representation of a value, truncated to MAX_VALUE_LENGTH characters"""
+    text = json.dumps(value)
+    if len(text) <= MAX_VALUE_LENGTH:
+        return text
+    cut = MAX_VALUE_LENGTH - 3
+    return f"{text[:cut]}..."
+
+
+def json_diff(before: Any, after: Any, ignore_keys: Collection[str] = (), path: str = "") -> Iterator[str]:
+    """
+    Compare two JSON documents structurally.
+
+    Args:
+        before: First JSON document
+        after: Second JSON document
+        ignore_keys: Keys of the JSON objects to ignore at any depth, e.g. counters or timestamps
+        path: Path of the documents, used as prefix of the changes
+
+    Yields:
+        One `<path>: <before> -> <after>`, `<path>: added <after>` or `<path>: removed` line per difference.
+    """
+    if before == after and type(before) is type(after):
+        return
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in [*before, *(key for key in after if key not in before)]:
+            if key in ignore_keys:
+                continue
+            child = f"{path}.{key}" if path else str(key)
+            if key not in after:
+                yield f"{child}: removed"
+            elif key not in before:
+                yield f"{child}: added {_short(after[key])}"
+            else:
+                yield from json_diff(before[key], after[key], ignore_keys, child)
+    elif isinstance(before, list) and isinstance(after, list):
+        for i, (item_before, item_after) in enumerate(zip(before, after)):
+            yield from json_diff(item_before, item_after, ignore_keys, f"{path}[{i}]")
+        for i in range(len(after), len(before)):
+            yield f"{path}[{i}]: removed"
+        for i in range(len(before), len(after)):
+            yield f"{path}[{i}]: added {_short(after[i])}"
+    else:
+        yield f"{path or '.'}: {_short(before)} -> {_short(after)}"
+
+
+def text_diff(before: str, after: str) -> list[str]:
+    """
+    Compare two text documents line by line.
+
+    Args:
+        before: First text document
+        after: Second text document
+
+    Returns:
+        The removed lines prefixed with `-` and the added lines prefixed with `+`.
+    """
+    # Skip the file headers and the hunk headers of the unified diff
+    lines = list(difflib.unified_diff(before.splitlines(), after.splitlines(), lineterm="", n=0))[2:]
+    return [line for line in lines if not line.startswith("@@")]
+
+
+class _Snapshot:
+    """Command outputs of a snapshot directory or archive"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.archive: Optional[SnapshotArchive] = None
+        if is_archive(path):
+            self.archive = SnapshotArchive(path)
+        elif not path.is_dir():
+            raise ValueError(f"'{path}' is not a snapshot directory or archive")
+
+    def close(self) -> None:
+        """Close the snapshot archive"""
+        if self.archive is not None:
+            self.archive.close()
+
+    def keys(self, devices: Optional[Collection[str]] = None) -> dict[OutputKey, None]:
+        """Return the command outputs of the snapshot, optionally only the ones of some devices"""
+        keys: dict[OutputKey, None] = {}
+        if self.archive is not None:
+            for device in self.archive.devices:
+                if devices is None or device in devices:
+                    keys.update(((device, ofmt, command), None) for ofmt in ("json", "text") for command in self.archive.commands(device, ofmt))
+            return keys
+        for device_dir in sorted(self.path.iterdir()):
+            if not device_dir.is_dir() or (devices is not None and device_dir.name not in devices):
+                continue
+            for ofmt, suffix in (("json", ".json"), ("text", ".log")):
+                base = device_dir / ofmt
+                # Commands with a slash, e.g. 'show interfaces Ethernet1/1', are stored in sub-directories
+                for file in sorted(base.rglob(f"*{suffix}")):
+                    keys[(device_dir.name, ofmt, file.relative_to(base).with_suffix("").as_posix())] = None
+        return keys
+
+    def _file(self, key: OutputKey) -> Path:
+        device, ofmt, command = key
+        return self.path / device / ofmt / f"{command}{'.json' if ofmt == 'json' else '.log'}"
+
+    def digest(self, key: OutputKey) -> bytes:
+        """Return a digest of the raw command output, equal for identical outputs stored the same way"""
+        device, ofmt, command = key
+        if self.archive is not None:
+            return self.archive.digest(device, command, ofmt)
+        return hashlib.blake2b(self._file(key).read_bytes(), digest_size=16).digest()
+
+    def get(self, key: OutputKey) -> Any:
+        """Return a command output"""
+        device, ofmt, command = key
+        if self.archive is not None:
+            return self.archive.get(device, command, ofmt)
+        content = self._file(key).read_text(encoding="UTF-8")
+        return json.loads(content) if ofmt == "json" else content
+
+
+def diff_snapshots(before: Path, after: Path, devices: Optional[Collection[str]] = None, ignore_keys: Collection[str] = ()) -> SnapshotDiff:
+    """
+    Compare two snapshots written by `anta exec snapshot`. Each snapshot is either a directory or a snapshot archive.
+
+    Args:
+        before: Path of the first snapshot
+        after: Path of the second snapshot
+        devices: Only compare the outputs of these devices
+        ignore_keys: Keys of the JSON outputs to ignore at any depth, e.g. counters or timestamps
+
+    Raises:
+        OSError: A snapshot cannot be read.
+        ValueError: A path is not a snapshot or an output is not valid JSON.
+        SnapshotArchiveError: A snapshot archive is invalid.
+    """
+    snapshot_before = _Snapshot(before)
+    try:
+        snapshot_after = _Snapshot(after)
+    except Exception:
+        snapshot_before.close()
+        raise
+    diff = SnapshotDiff()
+    try:
+        keys_before = snapshot_before.keys(devices)
+        for key in snapshot_after.keys(devices):
+            device, ofmt, command = key
+            if key not in keys_before:
+                diff.changes.append(CommandChange(device=device, command=command, ofmt=ofmt, change="added"))  # type: ignore[arg-type]
+                continue
+            del keys_before[key]
+            if snapshot_before.digest(key) == snapshot_after.digest(key):
+                diff.unchanged += 1
+                continue
+            output_before, output_after = snapshot_before.get(key), snapshot_after.get(key)
+            details = list(json_diff(output_before, output_after, ignore_keys)) if ofmt == "json" else text_diff(output_before, output_after)
+            if not details:
+                # Same output stored differently, or only ignored keys changed
+                diff.unchanged += 1
+                continue
+            diff.changes.append(CommandChange(device=device, command=command, ofmt=ofmt, change="changed", details=details))  # type: ignore[arg-type]
+        for device, ofmt, command in keys_before:
+            diff.changes.append(CommandChange(device=device, command=command, ofmt=ofmt, change="removed"))  # type: ignore[arg-type]
+    finally:
+        snapshot_before.close()
+        snapshot_after.close()
+    logger.debug(f"Compared '{before}' and '{after}': {len(diff.changes)} change(s), {diff.unchanged} unchanged output(s)")
+    return diff
@@ -0,0 +1,215 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Evaluation of the tests in a pool of processes.
+
+ANTA runs the tests in a single asyncio event loop: the `test()` evaluation of the command outputs runs on one CPU core, and a CPU-bound test,
+e.g. parsing `show ip route` on a large device, delays all the other tests. `EvaluationPool` evaluates the tests in a `ProcessPoolExecutor`
+once their commands are collected: the inputs, the command outputs and the result of a test are sent to a worker process that runs its
+`test()` method and sends the result back. The event loop keeps collecting the commands of the other tests meanwhile.
+
+A test class opts in with the `process_evaluation = True` class attribute, or opts out with `process_evaluation = False`, e.g. when its evaluation
+is too short to be worth sending the command outputs to another process. The other test classes are evaluated in the pool if `all_tests` is set.
+
+Within a worker process, the `device` attribute of a test is a `DeviceInfo` with the name, the hardware model and the tags of the device.
+The messages logged by the test logger are logged again in the main process.
+
+Examples:
+    ```python
+    with EvaluationPool(processes=4) as pool:
+        set_pool(pool)
+        try:
+            asyncio.run(main(manager, inventory, catalog))
+        finally:
+            set_pool(None)
+    ```
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from anta.models import AntaCommand, AntaTest
+    from anta.result_manager.models import TestResult
+
+logger = logging.getLogger(__name__)
+
+# Pool used by the AntaTest.anta_test decorator, None when the tests are evaluated in the event loop
+_pool: Optional[EvaluationPool] = None
+
+# Level and message of the records logged by a test in a worker process
+LogMessages = List[Tuple[int, str]]
+
+
+class DeviceInfo(NamedTuple):
+    """Device of a test evaluated in a worker process"""
+
+    name: str
+    hw_model: Optional[str]
+    tags: List[str]
+
+
+class EvaluationRequest(NamedTuple):
+    """Test to evaluate in a worker process"""
+
+    test: Type[AntaTest]
+    device: DeviceInfo
+    inputs: AntaTest.Input
+    commands: List[AntaCommand]
+    result: TestResult
+    level: int
+    kwargs: dict[str, Any]
+
+
+class _MessagesHandler(logging.Handler):
+    """Keep the messages logged in a worker process to log them again in the main process"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: LogMessages = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append((record.levelno, record.getMessage()))
+
+
+def evaluate(request: EvaluationRequest) -> tuple[TestResult, LogMessages]:
+    """
+    Run the `test()` method of a test in a worker process.
+
+    Args:
+        request: Test to evaluate
+
+    Returns:
+        The result of the test and the messages logged by the test logger.
+    """
+    test_logger = logging.getLogger(f"{request.test.__module__}.{request.test.__name__}")
+    handler = _MessagesHandler()
+    propagate, level = test_logger.propagate, test_logger.level
+    # The messages are logged by the main process
+    test_logger.propagate = False
+    test_logger.setLevel(request.level)
+    test_logger.addHandler(handler)
+    try:
+        test = request.test.__new__(request.test)
+        test.logger = test_logger
+        # The AntaDevice of the test cannot be sent to another process
+        test.device = request.device  # type: ignore[assignment]
+        test.inputs = request.inputs
+        test.instance_commands = request.commands
+        test.result = request.result
+        # The test() method without the AntaTest.anta_test decorator
+        inspect.unwrap(request.test.test)(test, **request.kwargs)
+    finally:
+        test_logger.removeHandler(handler)
+        test_logger.propagate = propagate
+        test_logger.setLevel(level)
+    return test.result, handler.messages
+
+
+class EvaluationPool:
+    """
+    Evaluate the tests in a pool of processes.
+
+    The worker processes are started with the `spawn` method when the first test is evaluated: they import the test modules again.
+
+    Attributes:
+        processes: Maximum number of worker processes, None for the number of CPUs
+        all_tests: Evaluate the test classes that do not opt in nor out in the pool
+    """
+
+    def __init__(self, processes: int | None = None, all_tests: bool = False) -> None:
+        """
+        Constructor of EvaluationPool
+
+        Args:
+            processes: Maximum number of worker processes. Defaults to None, i.e. the number of CPUs.
+            all_tests: Evaluate the test classes that do not opt in nor out in the pool. Defaults to False.
+        """
+        self.processes = processes
+        self.all_tests = all_tests
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._accepted: dict[type[AntaTest], bool] = {}
+
+    def __enter__(self) -> EvaluationPool:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.shutdown()
+
+    def accepts(self, test: AntaTest, function: Callable[..., Any]) -> bool:
+        """
+        Return True if a test is evaluated in the pool.
+
+        Args:
+            test: Test to evaluate
+            function: `test()` method of the test without the AntaTest.anta_test decorator
+        """
+        test_class = type(test)
+        if (accepted := self._accepted.get(test_class)) is not None:
+            return accepted
+        accepted = test_class.process_evaluation if test_class.process_evaluation is not None else self.all_tests
+        if accepted:
+            # A worker process imports the test class from its module and runs its undecorated test() method
+            try:
+                pickle.dumps(test_class)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                logger.debug(f"Test {test.name} is evaluated in the event loop: the test class cannot be sent to a worker process: {e}")
+                accepted = False
+            else:
+                if inspect.unwrap(test_class.test) is not function:
+                    logger.debug(f"Test {test.name} is evaluated in the event loop: its test() method is not found by a worker process")
+                    accepted = False
+        self._accepted[test_class] = accepted
+        return accepted
+
+    async def evaluate(self, test: AntaTest, **kwargs: Any) -> None:
+        """
+        Run the `test()` method of a test in a worker process and update the result of the test.
+
+        Args:
+            test: Test to evaluate
+            kwargs: Keyword arguments of the `test()` method
+        """
+        if self._executor is None:
+            # Forking a process running threads, e.g. the watchdog or the tracing exporter, can deadlock the worker processes
+            self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        request = EvaluationRequest(
+            test=type(test),
+            device=DeviceInfo(name=test.device.name, hw_model=test.device.hw_model, tags=list(test.device.tags)),
+            inputs=test.inputs,
+            commands=test.instance_commands,
+            # The timing of the test is updated by the main process
+            result=test.result.model_copy(update={"timing": None}),
+            level=test.logger.getEffectiveLevel(),
+            kwargs=kwargs,
+        )
+        result, messages = await asyncio.get_running_loop().run_in_executor(self._executor, evaluate, request)
+        test.result.result = result.result
+        test.result.messages = result.messages
+        for level, message in messages:
+            test.logger.log(level, message)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def set_pool(pool: Optional[EvaluationPool]) -> None:
+    """Evaluate the tests in a pool of processes, or in the event loop with None"""
+    global _pool  # pylint: disable=global-statement
+    _pool = pool
+
+
+def get_pool() -> Optional[EvaluationPool]:
+    """Return the pool of processes evaluating the tests, None if the tests are evaluated in the event loop"""
+    return _pool
@@ -11,15 +11,18 @@ import asyncio
 import logging
 from ipaddress import ip_address, ip_network
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import ValidationError
-from yaml import YAMLError, safe_load
+from yaml import YAMLError
 
-from anta.device import AntaDevice, AsyncEOSDevice
+from anta import tracing
+from anta.device import AntaDevice, AsyncEOSDevice, SnapshotDevice
 from anta.inventory.exceptions import InventoryIncorrectSchema, InventoryRootKeyError
 from anta.inventory.models import AntaInventoryInput
 from anta.logger import anta_log_exception
+from anta.snapshot import SnapshotArchive, SnapshotArchiveError
+from anta.tools.loader import ParseCache, yaml_load
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +150,8 @@ class AntaInventory(dict):  # type: ignore
         timeout: Optional[float] = None,
         insecure: bool = False,
         disable_cache: bool = False,
+        cache: bool = False,
+        transport: Literal["eapi", "ssh", "auto"] = "eapi",
     ) -> AntaInventory:
         # pylint: disable=too-many-arguments
         """
@@ -162,6 +167,9 @@ class AntaInventory(dict):  # type: ignore
             timeout (float, optional): timeout in seconds for every API call.
             insecure (bool): Disable SSH Host Key validation
             disable_cache (bool): Disable cache globally
+            cache (bool): Load the validated inventory from a parsed-file cache stored next to the inventory file
+                          if the file has not changed, and update this cache otherwise. See `anta.tools.loader.ParseCache`.
+            transport (str): Transport used to run commands on the devices: 'eapi', 'ssh' or 'auto'. See `anta.device.AsyncEOSDevice`.
 
         Raises:
             InventoryRootKeyError: Root key of inventory is missing.
@@ -177,6 +185,7 @@ class AntaInventory(dict):  # type: ignore
             "timeout": timeout,
             "insecure": insecure,
             "disable_cache": disable_cache,
+            "transport": transport,
         }
         if username is None:
             message = "'username' is required to create an AntaInventory"
@@ -187,24 +196,34 @@ class AntaInventory(dict):  # type: ignore
             logger.error(message)
             raise ValueError(message)
 
+        parse_cache: ParseCache | None = None
+        inventory_input: AntaInventoryInput | None = None
         try:
-            with open(file=filename, mode="r", encoding="UTF-8") as file:
-                data = safe_load(file)
+            if cache:
+                parse_cache = ParseCache(filename)
+                inventory_input = parse_cache.load()
+            if inventory_input is None:
+                with open(file=filename, mode="r", encoding="UTF-8") as file:
+                    data = yaml_load(file)
         except (TypeError, YAMLError, OSError) as e:
             message = f"Unable to parse ANTA Device Inventory file '{filename}'"
             anta_log_exception(e, message, logger)
             raise
 
-        if AntaInventory.INVENTORY_ROOT_KEY not in data:
-            exc = InventoryRootKeyError(f"Inventory root key ({AntaInventory.INVENTORY_ROOT_KEY}) is not defined in your inventory")
-            anta_log_exception(exc, f"Device inventory is invalid! (from {filename})", logger)
-            raise exc
+        if inventory_input is None:
+            if AntaInventory.INVENTORY_ROOT_KEY not in data:
+                exc = InventoryRootKeyError(f"Inventory root key ({AntaInventory.INVENTORY_ROOT_KEY}) is not defined in your inventory")
+                anta_log_exception(exc, f"Device inventory is invalid! (from {filename})", logger)
+                raise exc
 
-        try:
-            inventory_input = AntaInventoryInput(**data[AntaInventory.INVENTORY_ROOT_KEY])
-        except ValidationError as e:
-            anta_log_exception(e, f"Device inventory is invalid! (from {filename})", logger)
-            raise
+            try:
+                inventory_input = AntaInventoryInput(**data[AntaInventory.INVENTORY_ROOT_KEY])
+            except ValidationError as e:
+                anta_log_exception(e, f"Device inventory is invalid! (from {filename})", logger)
+                raise
+
+            if parse_cache is not None:
+                parse_cache.dump(inventory_input)
 
         # Read data from input
         AntaInventory._parse_hosts(inventory_input, inventory, **kwargs)
@@ -213,6 +232,44 @@ class AntaInventory(dict):  # type: ignore
 
         return inventory
 
+    @staticmethod
+    def from_snapshot(root: str | Path, inventory: Optional[AntaInventory] = None) -> AntaInventory:
+        """
+        Create an AntaInventory instance replaying command outputs previously collected with `anta exec snapshot`.
+        The inventory devices are SnapshotDevice instances.
+
+        Args:
+            root: Path of the snapshot directory, containing one directory per device, or of the snapshot archive
+            inventory: If provided, each device of this inventory is replaced by a SnapshotDevice instance
+                       with the same name, tags and cache setting. Otherwise, a device is created for
+                       each device of the snapshot.
+
+        Raises:
+            OSError: The snapshot cannot be read.
+            SnapshotArchiveError: The snapshot archive is invalid.
+        """
+        result = AntaInventory()
+        snapshot: Path | SnapshotArchive = Path(root)
+        names: list[str] = []
+        try:
+            if Path(root).is_file():
+                snapshot = SnapshotArchive(root)
+                names = snapshot.devices
+            elif inventory is None:
+                names = [path.name for path in Path(root).iterdir() if path.is_dir()]
+        except (OSError, SnapshotArchiveError) as e:
+            anta_log_exception(e, f"Unable to read ANTA snapshot '{root}'", logger)
+            raise
+        if inventory is not None:
+            for device in inventory.values():
+                # AntaDevice adds its own name to its tags
+                tags = [tag for tag in device.tags if tag != device.name]
+                result.add_device(SnapshotDevice(name=device.name, root=snapshot, tags=tags, disable_cache=device.cache is None))
+            return result
+        for name in sorted(names):
+            result.add_device(SnapshotDevice(name=name, root=snapshot))
+        return result
+
     ###########################################################################
     # Public methods
     ###########################################################################
@@ -272,11 +329,24 @@ class AntaInventory(dict):  # type: ignore
     async def connect_inventory(self) -> None:
         """Run `refresh()` coroutines for all AntaDevice objects in this inventory."""
         logger.debug("Refreshing devices...")
+        with tracing.span("anta.connect_inventory", devices=len(self)):
+            results = await asyncio.gather(
+                *(device.refresh() for device in self.values()),
+                return_exceptions=True,
+            )
+        for r in results:
+            if isinstance(r, Exception):
+                message = "Error when refreshing inventory"
+                anta_log_exception(r, message, logger)
+
+    async def disconnect_inventory(self) -> None:
+        """Run `close()` coroutines for all AntaDevice objects in this inventory."""
+        logger.debug("Closing device connections...")
         results = await asyncio.gather(
-            *(device.refresh() for device in self.values()),
+            *(device.close() for device in self.values()),
             return_exceptions=True,
         )
         for r in results:
             if isinstance(r, Exception):
-                message = "Error when refreshing inventory"
+                message = "Error when closing inventory connections"
                 anta_log_exception(r, message, logger)
@@ -0,0 +1,158 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Command latency learned from the previous ANTA runs, to run the slowest tests first.
+
+The duration of a run is often dominated by a few slow commands, e.g. large `show bgp` outputs or `ping` with many repeats.
+When a slow command starts last, it extends the run while the other tests are already done. `LatencyHistory` keeps the latency
+of each command collected during the previous runs, as an exponential moving average, in a local JSON file. The tests are then
+started in the longest-processing-time-first order: the estimated cost of a test is the sum of the latency of its commands,
+so that the slow commands of each device overlap with the collection of the fast ones.
+
+Examples:
+    ```python
+    history = LatencyHistory.parse("latency.json")
+    asyncio.run(main(manager, inventory, catalog, latency=history))
+    history.dump("latency.json")
+    ```
+"""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+# Need to keep Dict for pydantic in python 3.8
+from typing import TYPE_CHECKING, Dict, Literal, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict, NonNegativeFloat, PositiveInt, PrivateAttr, ValidationError
+
+from anta import __version__
+from anta.logger import anta_log_exception
+
+if TYPE_CHECKING:
+    from anta.models import AntaCommand, AntaTest
+    from anta.result_manager.models import TestResult
+
+logger = logging.getLogger(__name__)
+
+# Weight of a new sample in the moving average of the latency of a command
+SMOOTHING = 0.3
+
+
+class CommandLatency(BaseModel):
+    """
+    Latency of a command learned from the previous runs.
+
+    Attributes:
+        latency: Exponential moving average of the collection time of the command in seconds
+        samples: Number of collections of the command
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    latency: NonNegativeFloat
+    samples: PositiveInt = 1
+
+
+class LatencyHistory(BaseModel):
+    """
+    Latency of the commands collected during the previous ANTA runs.
+
+    The latency of a command is shared by all the devices: the slow commands are usually slow on every device.
+
+    Attributes:
+        anta_version: ANTA version that last updated the history
+        commands: Latency of the commands by output format and command
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    anta_version: str = __version__
+    commands: Dict[Literal["json", "text"], Dict[str, CommandLatency]] = {}
+    # Estimated latency of the commands missing from the history, see estimate()
+    _default: Optional[float] = PrivateAttr(default=None)
+
+    @staticmethod
+    def parse(filename: str | Path) -> LatencyHistory:
+        """
+        Create a LatencyHistory instance from a JSON file.
+
+        The history is empty if the file does not exist, e.g. for the first run, or if the file is invalid: the tests are then run in the catalog order.
+
+        Args:
+            filename: Path to the latency history JSON file
+        """
+        try:
+            with open(file=filename, mode="r", encoding="UTF-8") as file:
+                return LatencyHistory.model_validate_json(file.read())
+        except FileNotFoundError:
+            logger.info(f"Latency history file '{filename}' does not exist, it is created after the run")
+        except (ValidationError, OSError) as e:
+            anta_log_exception(e, f"Unable to parse latency history file '{filename}', the command latency is learned again", logger)
+        return LatencyHistory()
+
+    def dump(self, filename: str | Path) -> None:
+        """
+        Write the latency history to a JSON file.
+
+        Args:
+            filename: Path to the latency history JSON file
+        """
+        self.anta_version = __version__
+        with open(file=filename, mode="w", encoding="UTF-8") as file:
+            file.write(self.model_dump_json(indent=2))
+            file.write("\n")
+
+    def update(self, results: list[TestResult]) -> None:
+        """
+        Learn the latency of the commands collected by the tests.
+
+        The commands read from the device cache are ignored: their collection time is the time spent by another test collecting them.
+
+        Args:
+            results: Results of the tests, with their timing
+        """
+        for result in results:
+            if result.timing is None:
+                continue
+            for timing in result.timing.commands:
+                if timing.cache_hit:
+                    continue
+                commands = self.commands.setdefault(timing.ofmt, {})
+                if (command := commands.get(timing.command)) is None:
+                    commands[timing.command] = CommandLatency(latency=timing.duration)
+                else:
+                    command.latency += SMOOTHING * (timing.duration - command.latency)
+                    command.samples += 1
+        self._default = None
+
+    def estimate(self, command: AntaCommand) -> float:
+        """
+        Return the estimated latency of a command in seconds.
+
+        The latency of a command missing from the history is the median latency of the known commands, 0 if the history is empty.
+
+        Args:
+            command: Command to estimate
+        """
+        if (known := self.commands.get(command.ofmt, {}).get(command.command)) is not None:
+            return known.latency
+        if self._default is None:
+            latencies = sorted(known.latency for commands in self.commands.values() for known in commands.values())
+            self._default = latencies[len(latencies) // 2] if latencies else 0.0
+        return self._default
+
+    def cost(self, test: AntaTest) -> float:
+        """Return the estimated collection time of the commands of a test in seconds"""
+        return sum(self.estimate(command) for command in test.instance_commands)
+
+    def schedule(self, tests: Sequence[AntaTest]) -> Sequence[AntaTest]:
+        """
+        Return the tests in the longest-processing-time-first order: the tests with the slowest commands first.
+
+        As the order is global, the tests of each device are also started from the slowest. The tests with the same
+        estimated cost, e.g. all the tests with an empty history, keep their order.
+
+        Args:
+            tests: Tests to run
+        """
+        return sorted(tests, key=self.cost, reverse=True)
@@ -0,0 +1,324 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Prometheus metrics of the ANTA runs.
+
+`AntaMetrics` aggregates the test results and the device statistics of one or more runs into Prometheus metrics,
+rendered with the Prometheus text exposition format. The metrics can be written to a file read by the textfile
+collector of the Prometheus node exporter, or served over HTTP by `MetricsServer`, e.g. with `anta watch`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import ClassVar, Iterable, Optional, Sequence
+
+from anta.device import AntaDevice
+from anta.result_manager.models import TestResult
+from anta.tools.misc import exc_to_str
+
+logger = logging.getLogger(__name__)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Return a sample value in the Prometheus text format"""
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    """Return the labels of a sample in the Prometheus text format"""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+class Metric(ABC):
+    """
+    Prometheus metric with labels.
+
+    Attributes:
+        name: Name of the metric
+        documentation: Help text of the metric
+        labelnames: Names of the labels of the metric
+    """
+
+    TYPE: ClassVar[str] = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Return the label values in the order of the label names"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects the labels {', '.join(self.labelnames)}, got {', '.join(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def get(self, **labels: str) -> float:
+        """Return the value of the metric for some label values, 0 if the metric has not been set"""
+
+    @abstractmethod
+    def samples(self) -> Iterable[tuple[str, Sequence[tuple[str, str]], float]]:
+        """Yield the samples of the metric as (name, labels, value) tuples"""
+
+    def render(self) -> list[str]:
+        """Return the lines of the metric in the Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class ScalarMetric(Metric):
+    """Prometheus metric with a single value for each label values"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def get(self, **labels: str) -> float:
+        """Return the value of the metric for some label values, 0 if the metric has not been set"""
+        return self._values.get(self._key(labels), 0.0)
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value of the metric for some label values"""
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> Iterable[tuple[str, Sequence[tuple[str, str]], float]]:
+        """Yield the samples of the metric as (name, labels, value) tuples"""
+        for key, value in sorted(self._values.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Counter(ScalarMetric):
+    """
+    Prometheus counter.
+
+    `set()` is used for cumulative values maintained elsewhere, e.g. the cache statistics of a device.
+    """
+
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter for some label values"""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(ScalarMetric):
+    """Prometheus gauge"""
+
+    TYPE = "gauge"
+
+
+class Histogram(Metric):
+    """
+    Prometheus histogram.
+
+    Attributes:
+        buckets: Upper bounds of the buckets, the `+Inf` bucket is added automatically
+    """
+
+    TYPE = "histogram"
+    # Default buckets of the Prometheus client libraries, in seconds
+    DEFAULT_BUCKETS: ClassVar[tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._buckets: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Observe a value for some label values"""
+        key = self._key(labels)
+        counts = self._buckets.setdefault(key, [0] * len(self.buckets))
+        # Buckets are cumulative
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def get(self, **labels: str) -> float:
+        """Return the number of observations for some label values"""
+        counts = self._buckets.get(self._key(labels))
+        return float(counts[-1]) if counts is not None else 0.0
+
+    def samples(self) -> Iterable[tuple[str, Sequence[tuple[str, str]], float]]:
+        """Yield the `_bucket`, `_sum` and `_count` samples of the histogram"""
+        for key, counts in sorted(self._buckets.items()):
+            labels = tuple(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", (*labels, ("le", _format_value(bound))), count
+            yield f"{self.name}_sum", labels, self._sums[key]
+            yield f"{self.name}_count", labels, counts[-1]
+
+
+class AntaMetrics:
+    """
+    Prometheus metrics of the ANTA runs.
+
+    The test counters and histograms accumulate the results passed to `observe()`. The device metrics are read from the
+    device statistics, which are cumulative for the lifetime of the devices, by `update_devices()`.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self) -> None:
+        self.tests = Counter("anta_tests_total", "Number of tests run, by device and test status", ("device", "status"))
+        self.test_duration = Histogram("anta_test_duration_seconds", "Duration of the tests, including the command collection", ("test",))
+        self.command_duration = Histogram("anta_command_duration_seconds", "Latency of the commands sent to the devices, excluding the cache hits")
+        self.commands_sent = Counter("anta_commands_sent_total", "Number of commands sent to the device, excluding the cache hits", ("device",))
+        self.command_errors = Counter("anta_command_errors_total", "Number of commands that failed on the device, e.g. eAPI errors", ("device",))
+        self.cache_hits = Counter("anta_cache_hits_total", "Number of command outputs read from the device cache", ("device",))
+        self.cache_misses = Counter("anta_cache_misses_total", "Number of command outputs not found in the device cache", ("device",))
+        self.device_established = Gauge("anta_device_established", "1 if the device is established, 0 otherwise", ("device",))
+        self.last_run = Gauge("anta_last_run_timestamp_seconds", "Time of the last run of the tests, in seconds since the epoch")
+
+    @property
+    def metrics(self) -> list[Metric]:
+        """All the metrics"""
+        return [
+            self.tests,
+            self.test_duration,
+            self.command_duration,
+            self.commands_sent,
+            self.command_errors,
+            self.cache_hits,
+            self.cache_misses,
+            self.device_established,
+            self.last_run,
+        ]
+
+    def observe(self, results: Iterable[TestResult]) -> None:
+        """
+        Add test results to the metrics.
+
+        Args:
+            results: Test results of a run
+        """
+        for result in results:
+            self.tests.inc(device=result.name, status=result.result)
+            if result.timing is not None:
+                self.test_duration.observe(result.timing.total, test=result.test)
+                for command in result.timing.commands:
+                    if not command.cache_hit:
+                        self.command_duration.observe(command.duration)
+        self.last_run.set(time.time())
+
+    def update_devices(self, devices: Iterable[AntaDevice]) -> None:
+        """
+        Update the device metrics from the device statistics.
+
+        Args:
+            devices: Devices of the run
+        """
+        for device in devices:
+            self.commands_sent.set(device.commands_sent, device=device.name)
+            self.command_errors.set(device.command_errors, device=device.name)
+            self.device_established.set(int(device.established), device=device.name)
+            if device.cache is not None:
+                stats = getattr(device.cache, "hit_miss_ratio", {"total": 0, "hits": 0})
+                self.cache_hits.set(stats["hits"], device=device.name)
+                self.cache_misses.set(stats["total"] - stats["hits"], device=device.name)
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format"""
+        return "".join(f"{line}\n" for metric in self.metrics for line in metric.render())
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Write the metrics to a file read by the textfile collector of the Prometheus node exporter.
+
+        The file is written atomically so that the collector never reads a partial file.
+
+        Args:
+            path: Path of the file, usually with the `.prom` extension
+        """
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="UTF-8")
+        os.replace(tmp, path)
+
+
+class MetricsServer:
+    """
+    HTTP server exposing AntaMetrics at `/metrics` for Prometheus, running in the asyncio event loop.
+
+    Attributes:
+        metrics: Metrics to expose
+        host: Address to listen on
+        port: Port to listen on, the port actually used once started if 0
+    """
+
+    def __init__(self, metrics: AntaMetrics, host: str = "0.0.0.0", port: int = 9464) -> None:  # nosec B104
+        """
+        Constructor of MetricsServer
+
+        Args:
+            metrics: Metrics to expose
+            host: Address to listen on. Defaults to all addresses.
+            port: Port to listen on. Defaults to 9464, 0 selects a free port.
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """
+        Start listening.
+
+        Raises:
+            OSError: The server cannot listen on the address and port.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving the ANTA metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        """Stop listening"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle an HTTP request"""
+        try:
+            request = await reader.readline()
+            # Skip the request headers
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass
+            method, _, target = request.decode("latin-1").partition(" ")
+            path = target.split(" ", maxsplit=1)[0].split("?", maxsplit=1)[0]
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b"Method Not Allowed\n"
+            elif path != "/metrics":
+                status, content_type, body = "404 Not Found", "text/plain", b"Not Found\n"
+            else:
+                status, content_type, body = "200 OK", CONTENT_TYPE, self.metrics.render().encode()
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Cannot handle metrics request: {exc_to_str(e)}")
+        finally:
+            writer.close()
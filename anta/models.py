@@ -6,6 +6,7 @@ Models to define a TestStructure
 """
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import re
@@ -13,20 +14,21 @@ import time
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from datetime import timedelta
-from functools import wraps
+from functools import partial, wraps
 
 # Need to keep Dict and List for pydantic in python 3.8
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Coroutine, Dict, List, Literal, Optional, TypeVar, Union
 
-from pydantic import BaseModel, ConfigDict, ValidationError, conint
-from rich.progress import Progress, TaskID
+from pydantic import BaseModel, ConfigDict, NonNegativeInt, PositiveFloat, ValidationError, conint, model_validator
 
-from anta import GITHUB_SUGGESTION
+from anta import GITHUB_SUGGESTION, evaluation, tracing, watchdog
 from anta.logger import anta_log_exception
-from anta.result_manager.models import TestResult
+from anta.result_manager.models import CommandTiming, ResultTiming, TestResult
 from anta.tools.misc import exc_to_str
 
 if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+
     from anta.device import AntaDevice
 
 F = TypeVar("F", bound=Callable[..., Any])
@@ -65,6 +67,9 @@ class AntaTemplate(BaseModel):
         revision: Revision of the command. Valid values are 1 to 99. Revision has precedence over version.
         ofmt: eAPI output - json or text - default is json
         use_cache: Enable or disable caching for this AntaTemplate if the AntaDevice supports it - default is True
+        timeout: Timeout in seconds of the requests of the rendered commands, overriding the timeout of the device
+        retries: Number of times the rendered commands are sent again after a transport error - default is 0
+        hedge_after: Number of seconds after which a duplicate request of a rendered show command is sent if there is no response yet
     """
 
     template: str
@@ -72,6 +77,9 @@ class AntaTemplate(BaseModel):
     revision: Optional[conint(ge=1, le=99)] = None  # type: ignore
     ofmt: Literal["json", "text"] = "json"
     use_cache: bool = True
+    timeout: Optional[PositiveFloat] = None
+    retries: NonNegativeInt = 0
+    hedge_after: Optional[PositiveFloat] = None
 
     def render(self, **params: dict[str, Any]) -> AntaCommand:
         """Render an AntaCommand from an AntaTemplate instance.
@@ -94,6 +102,9 @@ class AntaTemplate(BaseModel):
                 template=self,
                 params=params,
                 use_cache=self.use_cache,
+                timeout=self.timeout,
+                retries=self.retries,
+                hedge_after=self.hedge_after,
             )
         except KeyError as e:
             raise AntaTemplateRenderError(self, e.args[0]) from e
@@ -123,6 +134,12 @@ class AntaCommand(BaseModel):
         params: Dictionary of variables with string values to render the template
         errors: If the command execution fails, eAPI returns a list of strings detailing the error
         use_cache: Enable or disable caching for this AntaCommand if the AntaDevice supports it - default is True
+        duration: Wall time in seconds to get the output of the command, populated by the collect() function
+        cache_hit: True if the output was read from the device cache, None if the cache is not used, populated by the collect() function
+        timeout: Timeout in seconds of the requests of the command, overriding the timeout of the device
+        retries: Number of times the command is sent again after a transport error, e.g. a connection error or a timeout - default is 0
+        hedge_after: Number of seconds after which a duplicate request of the command is sent if there is no response yet, e.g. the p99 latency
+                     of the command. The first response is used. Only `show` commands, which are idempotent, can be hedged.
     """
 
     command: str
@@ -134,6 +151,18 @@ class AntaCommand(BaseModel):
     errors: List[str] = []
     params: Dict[str, Any] = {}
     use_cache: bool = True
+    duration: Optional[float] = None
+    cache_hit: Optional[bool] = None
+    timeout: Optional[PositiveFloat] = None
+    retries: NonNegativeInt = 0
+    hedge_after: Optional[PositiveFloat] = None
+
+    @model_validator(mode="after")
+    def validate_hedging(self) -> AntaCommand:
+        """Validate that only show commands are hedged: sending a command twice must not change the device state"""
+        if self.hedge_after is not None and not self.command.startswith("show "):
+            raise ValueError(f"Command '{self.command}' cannot be hedged: only show commands can be sent twice")
+        return self
 
     @property
     def uid(self) -> str:
@@ -235,6 +264,8 @@ class AntaTest(ABC):
     description: ClassVar[str]
     categories: ClassVar[list[str]]
     commands: ClassVar[list[Union[AntaTemplate, AntaCommand]]]
+    # Evaluate the test in the process pool of anta.evaluation: True to opt in, False to opt out, None to follow the pool setting
+    process_evaluation: ClassVar[Optional[bool]] = None
     # Class attributes to handle the progress bar of ANTA CLI
     progress: Optional[Progress] = None
     nrfu_task: Optional[TaskID] = None
@@ -307,6 +338,8 @@ class AntaTest(ABC):
                       This list must have the same length and order than the `instance_commands` instance attribute.
         """
         self.logger: logging.Logger = logging.getLogger(f"{self.__module__}.{self.__class__.__name__}")
+        # Used to measure the time the test waits to be executed by the event loop
+        self._created = time.perf_counter()
         self.device: AntaDevice = device
         self.inputs: AntaTest.Input
         self.instance_commands: list[AntaCommand] = []
@@ -428,7 +461,8 @@ class AntaTest(ABC):
         """
         try:
             if self.blocked is False:
-                await self.device.collect_commands(self.instance_commands)
+                with tracing.span("anta.test.collect", test=self.name, device=self.device.name, commands=len(self.instance_commands)):
+                    await self.device.collect_commands(self.instance_commands)
         except Exception as e:  # pylint: disable=broad-exception-caught
             # device._collect() is user-defined code.
             # We need to catch everything if we want the AntaTest object
@@ -469,44 +503,68 @@ class AntaTest(ABC):
                 isec, fsec = divmod(round(seconds * 10**digits), 10**digits)
                 return f"{timedelta(seconds=isec)}.{fsec:0{digits}.0f}"
 
-            start_time = time.time()
             if self.result.result != "unset":
                 return self.result
 
-            # Data
-            if eos_data is not None:
-                self.save_commands_data(eos_data)
-                self.logger.debug(f"Test {self.name} initialized with input data {eos_data}")
-
-            # If some data is missing, try to collect
-            if not self.collected:
-                await self.collect()
-                if self.result.result != "unset":
-                    return self.result
-
-                if cmds := self.failed_commands:
-                    self.logger.debug(self.device.supports)
-                    unsupported_commands = [f"Skipped because {c.command} is not supported on {self.device.hw_model}" for c in cmds if not self.device.supports(c)]
-                    self.logger.debug(unsupported_commands)
-                    if unsupported_commands:
-                        self.logger.warning(f"Test {self.name} has been skipped because it is not supported on {self.device.hw_model}: {GITHUB_SUGGESTION}")
-                        self.result.is_skipped("\n".join(unsupported_commands))
-                        return self.result
-                    self.result.is_error(message="\n".join([f"{c.command} has failed: {', '.join(c.errors)}" for c in cmds]))
-                    return self.result
-
-            try:
-                function(self, **kwargs)
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                # test() is user-defined code.
-                # We need to catch everything if we want the AntaTest object
-                # to live until the reporting
-                message = f"Exception raised for test {self.name} (on device {self.device.name})"
-                anta_log_exception(e, message, self.logger)
-                self.result.is_error(message=exc_to_str(e))
-
-            test_duration = time.time() - start_time
-            self.logger.debug(f"Executing test {self.name} on device {self.device.name} took {format_td(test_duration)}")
+            with tracing.span("anta.test", test=self.name, device=self.device.name) as span:
+                start_time = time.perf_counter()
+                timing = ResultTiming(queue_wait=start_time - self._created)  # pylint: disable=protected-access
+                self.result.timing = timing
+                try:
+                    # Data
+                    if eos_data is not None:
+                        self.save_commands_data(eos_data)
+                        self.logger.debug(f"Test {self.name} initialized with input data {eos_data}")
+
+                    # If some data is missing, try to collect
+                    if not self.collected:
+                        await self.collect()
+                        timing.collection = time.perf_counter() - start_time
+                        if self.result.result != "unset":
+                            return self.result
+
+                        if cmds := self.failed_commands:
+                            self.logger.debug(self.device.supports)
+                            unsupported_commands = [
+                                f"Skipped because {c.command} is not supported on {self.device.hw_model}" for c in cmds if not self.device.supports(c)
+                            ]
+                            self.logger.debug(unsupported_commands)
+                            if unsupported_commands:
+                                self.logger.warning(f"Test {self.name} has been skipped because it is not supported on {self.device.hw_model}: {GITHUB_SUGGESTION}")
+                                self.result.is_skipped("\n".join(unsupported_commands))
+                                return self.result
+                            self.result.is_error(message="\n".join([f"{c.command} has failed: {', '.join(c.errors)}" for c in cmds]))
+                            return self.result
+
+                    evaluation_start = time.perf_counter()
+                    try:
+                        with tracing.span("anta.test.evaluate", test=self.name, device=self.device.name):
+                            if (pool := evaluation.get_pool()) is not None and pool.accepts(self, function):
+                                # CPU-bound evaluation in a worker process
+                                await pool.evaluate(self, **kwargs)
+                            elif (executor := watchdog.evaluation_executor(self)) is not None:
+                                # The test blocked the event loop: evaluate it in a worker thread so that the other tests keep running
+                                await asyncio.get_running_loop().run_in_executor(executor, partial(function, self, **kwargs))
+                            else:
+                                function(self, **kwargs)
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        # test() is user-defined code.
+                        # We need to catch everything if we want the AntaTest object
+                        # to live until the reporting
+                        message = f"Exception raised for test {self.name} (on device {self.device.name})"
+                        anta_log_exception(e, message, self.logger)
+                        self.result.is_error(message=exc_to_str(e))
+                    timing.evaluation = time.perf_counter() - evaluation_start
+                finally:
+                    timing.total = time.perf_counter() - start_time
+                    timing.commands = [
+                        CommandTiming(command=c.command, ofmt=c.ofmt, duration=c.duration, cache_hit=c.cache_hit)
+                        for c in self.instance_commands
+                        if c.duration is not None
+                    ]
+                    if span is not None:
+                        span.set_attribute("result", self.result.result)
+                    self.logger.debug(f"Executing test {self.name} on device {self.device.name} took {format_td(timing.total)}")
 
             AntaTest.update_progress()
             return self.result
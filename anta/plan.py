@@ -0,0 +1,250 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+ANTA test plan: the tests scheduled on each device of an inventory with their rendered commands.
+
+A test plan is built from a test catalog and an inventory and is written to a JSON file with `anta nrfu --dump-plan`.
+Running a test plan with `anta nrfu --plan` skips loading the test catalog and selecting the tests of each device.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+from inspect import isclass
+from pathlib import Path
+
+# Need to keep Dict and List for pydantic in python 3.8
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr, ValidationError, conint
+
+from anta import __version__
+from anta.catalog import AntaTestDefinition
+from anta.logger import anta_log_exception
+from anta.models import AntaCommand, AntaTest
+
+if TYPE_CHECKING:
+    from anta.device import AntaDevice
+
+logger = logging.getLogger(__name__)
+
+
+class PlannedCommand(BaseModel):
+    """
+    Rendered command of a test plan.
+
+    Attributes:
+        command: Device command
+        version: eAPI version - valid values are 1 or "latest"
+        revision: eAPI revision of the command
+        ofmt: eAPI output - json or text
+        use_cache: Enable or disable caching for this command if the AntaDevice supports it
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    command: str
+    version: Literal[1, "latest"] = "latest"
+    revision: Optional[conint(ge=1, le=99)] = None  # type: ignore
+    ofmt: Literal["json", "text"] = "json"
+    use_cache: bool = True
+
+    @staticmethod
+    def from_command(command: AntaCommand) -> PlannedCommand:
+        """Create a PlannedCommand instance from an AntaCommand instance"""
+        return PlannedCommand(command=command.command, version=command.version, revision=command.revision, ofmt=command.ofmt, use_cache=command.use_cache)
+
+
+class PlannedTest(BaseModel):
+    """
+    Test definition of a test plan.
+
+    Attributes:
+        module: Python module of the test
+        test: Name of the AntaTest subclass
+        inputs: Test inputs
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    module: str
+    test: str
+    inputs: Dict[str, Any] = {}
+
+
+class PlannedDeviceTest(BaseModel):
+    """
+    Test scheduled on a device.
+
+    Attributes:
+        test: Index of the test definition in `AntaPlan.tests`
+        commands: Indexes of the commands of this test in `DevicePlan.commands`
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    test: int
+    commands: List[int] = []
+
+
+class DevicePlan(BaseModel):
+    """
+    Test plan of a device.
+
+    Attributes:
+        commands: Deduplicated rendered commands sent to the device
+        tests: Tests scheduled on the device
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    commands: List[PlannedCommand] = []
+    tests: List[PlannedDeviceTest] = []
+
+
+class AntaPlan(BaseModel):
+    """
+    Represents an ANTA test plan.
+
+    It can be built from scheduled tests using `AntaPlan.build()` or loaded from a JSON file using `AntaPlan.parse()`.
+
+    Attributes:
+        anta_version: ANTA version used to build the test plan
+        tests: Deduplicated test definitions of the test plan
+        devices: Test plan of each device, indexed by device name
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    anta_version: str
+    tests: List[PlannedTest] = []
+    devices: Dict[str, DevicePlan] = {}
+    _definitions: List[AntaTestDefinition] = PrivateAttr(default_factory=list)
+    # Planned commands of the tests returned by get_tests()
+    _commands: Dict[Tuple[str, AntaTestDefinition], List[PlannedCommand]] = PrivateAttr(default_factory=dict)
+
+    @staticmethod
+    def build(tests: list[tuple[AntaTestDefinition, AntaDevice]]) -> AntaPlan:
+        """
+        Create an AntaPlan instance from scheduled tests.
+
+        The test commands are rendered for each device. Test definitions are stored once for all devices
+        and the commands of each device are deduplicated.
+
+        Args:
+            tests: Scheduled tests as tuples of a test definition and of the device to run this test on
+        """
+        plan = AntaPlan(anta_version=__version__)
+        definitions: dict[AntaTestDefinition, int] = {}
+        device_commands: dict[str, dict[PlannedCommand, int]] = {}
+        for definition, device in sorted(
+            tests, key=lambda t: (t[1].name, t[0].test.__module__, t[0].test.__name__, t[0].inputs.model_dump_json(exclude_unset=True))
+        ):
+            if definition not in definitions:
+                definitions[definition] = len(plan.tests)
+                plan.tests.append(
+                    PlannedTest(
+                        module=definition.test.__module__, test=definition.test.__name__, inputs=definition.inputs.model_dump(mode="json", exclude_unset=True)
+                    )
+                )
+                plan._definitions.append(definition)  # pylint: disable=protected-access
+            device_plan = plan.devices.setdefault(device.name, DevicePlan())
+            commands = device_commands.setdefault(device.name, {})
+            test_instance = definition.test(device=device, inputs=definition.inputs)
+            if test_instance.result.result != "unset":
+                logger.warning(f"Test {definition.test.__name__} cannot be planned on device {device.name}: {test_instance.result.messages}")
+            device_test = PlannedDeviceTest(test=definitions[definition])
+            for command in test_instance.instance_commands:
+                planned_command = PlannedCommand.from_command(command)
+                if planned_command not in commands:
+                    commands[planned_command] = len(device_plan.commands)
+                    device_plan.commands.append(planned_command)
+                device_test.commands.append(commands[planned_command])
+            device_plan.tests.append(device_test)
+        return plan
+
+    @staticmethod
+    def parse(filename: str | Path) -> AntaPlan:
+        """
+        Create an AntaPlan instance from a test plan JSON file.
+
+        The test modules are imported and the test inputs are validated once per test definition.
+
+        Args:
+            filename: Path to the test plan JSON file
+        """
+        try:
+            with open(file=filename, mode="r", encoding="UTF-8") as file:
+                plan = AntaPlan.model_validate_json(file.read())
+        except (ValidationError, OSError) as e:
+            message = f"Unable to parse ANTA test plan file '{filename}'"
+            anta_log_exception(e, message, logger)
+            raise
+        if plan.anta_version != __version__:
+            logger.warning(f"Test plan '{filename}' has been built with ANTA {plan.anta_version}, running ANTA {__version__}")
+        try:
+            plan._definitions = [AntaPlan._load_definition(test) for test in plan.tests]  # pylint: disable=protected-access
+        except (ValidationError, ValueError) as e:
+            anta_log_exception(e, f"Test plan '{filename}' is invalid!", logger)
+            raise
+        return plan
+
+    @staticmethod
+    def _load_definition(test: PlannedTest) -> AntaTestDefinition:
+        """Import the test class and validate the inputs of a test of the test plan"""
+        try:
+            module = importlib.import_module(test.module)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A test module is potentially user-defined code.
+            # We need to catch everything if we want to have meaningful logs
+            message = f"Module named {test.module} cannot be imported. Verify that the module exists and there is no Python syntax issues."
+            anta_log_exception(e, message, logger)
+            raise ValueError(message) from e
+        test_class = getattr(module, test.test, None)
+        if not (isclass(test_class) and issubclass(test_class, AntaTest)):
+            raise ValueError(f"{test.test} is not defined in Python module {test.module}")
+        return AntaTestDefinition(test=test_class, inputs=test.inputs)
+
+    def dump(self, filename: str | Path) -> None:
+        """
+        Write the test plan to a JSON file.
+
+        Args:
+            filename: Path to the test plan JSON file
+        """
+        with open(file=filename, mode="w", encoding="UTF-8") as file:
+            file.write(self.model_dump_json(indent=2, exclude_defaults=True))
+            file.write("\n")
+
+    def get_tests(self, devices: list[AntaDevice]) -> list[Tuple[AntaTestDefinition, AntaDevice]]:
+        """
+        Return the tests of the test plan scheduled on the provided devices.
+
+        Devices that are not part of the test plan are ignored.
+
+        Args:
+            devices: Devices to run the tests on
+        """
+        tests: list[Tuple[AntaTestDefinition, AntaDevice]] = []
+        for device in devices:
+            if (device_plan := self.devices.get(device.name)) is None:
+                logger.warning(f"Device {device.name} is not part of the test plan")
+                continue
+            for device_test in device_plan.tests:
+                definition = self._definitions[device_test.test]
+                self._commands[(device.name, definition)] = [device_plan.commands[index] for index in device_test.commands]
+                tests.append((definition, device))
+        return tests
+
+    def verify(self, definition: AntaTestDefinition, test: AntaTest) -> bool:
+        """
+        Verify that the rendered commands of a test returned by `get_tests()` match the commands of the test plan.
+        The commands differ when the test code has changed since the test plan has been built.
+
+        Args:
+            definition: Test definition returned by `get_tests()`
+            test: AntaTest instance created from this test definition
+
+        Returns:
+            True if the commands match, False otherwise
+        """
+        if [PlannedCommand.from_command(command) for command in test.instance_commands] == self._commands.get((test.device.name, definition)):
+            return True
+        logger.warning(f"Commands of test {test.name} on device {test.device.name} differ from the test plan. The test plan may be outdated.")
+        return False
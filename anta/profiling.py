@@ -0,0 +1,305 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Profiling of the ANTA runs.
+
+`Profiler` records, for a whole run:
+
+- the CPU time of the functions with cProfile, written to `profile.prof` for pstats, snakeviz or gprof2dot.
+- the lag of the asyncio event loop, i.e. the delay for a callback to run after it is due, with `LoopLagMonitor`.
+  A high lag means that synchronous code, e.g. the evaluation of a test on a large output, blocks the other tests.
+- the memory allocations with tracemalloc: the peak of the traced memory and the largest allocators.
+
+The summary of the profile, with the top functions by cumulative time, the loop lag percentiles and the largest allocators,
+is written to `summary.txt`.
+
+The event loop lag is only measured while a coroutine function decorated with `monitor_loop()`, e.g. `anta.runner.main()`,
+runs with a profiler set with `set_profiler()`.
+
+Examples:
+    ```python
+    profiler = Profiler(Path("profile"))
+    set_profiler(profiler)
+    profiler.start()
+    try:
+        asyncio.run(main(manager, inventory, catalog))
+    finally:
+        set_profiler(None)
+        profiler.stop()
+        profiler.write()
+    ```
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import math
+import pstats
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, NamedTuple, Optional, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Profiler used by monitor_loop(), None when profiling is disabled
+_profiler: Optional[Profiler] = None
+
+# Percentiles of the event loop lag reported in the summary
+LAG_PERCENTILES = (50, 90, 99)
+
+
+class FunctionStats(NamedTuple):
+    """CPU time of a function recorded by cProfile"""
+
+    function: str
+    calls: int
+    total: float
+    cumulative: float
+
+
+class AllocatorStats(NamedTuple):
+    """Memory allocated by a line of code and still in use at the end of the run, recorded by tracemalloc"""
+
+    location: str
+    size: int
+    blocks: int
+
+
+def percentile(samples: Sequence[float], percent: float) -> float:
+    """
+    Return a percentile of samples with the nearest-rank method, 0 if there is no sample.
+
+    Args:
+        samples: Samples, in any order
+        percent: Percentile between 0 and 100
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def function_name(filename: str, line: int, name: str) -> str:
+    """Return the name of a function recorded by cProfile, as displayed by pstats"""
+    # Built-in functions have no file
+    if (filename, line) == ("~", 0):
+        return name
+    return f"{filename}:{line}({name})"
+
+
+class LoopLagMonitor:
+    """
+    Measure the lag of the running asyncio event loop.
+
+    A task sleeps for `interval` seconds in a loop and records the time elapsed beyond the interval: the time the event loop
+    was blocked by synchronous code or busy running the other callbacks.
+
+    Attributes:
+        interval: Sampling interval in seconds
+        samples: Measured lags in seconds
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """
+        Constructor of LoopLagMonitor
+
+        Args:
+            interval: Sampling interval in seconds. Defaults to 10ms.
+        """
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def _run(self) -> None:
+        """Sample the event loop lag until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self) -> None:
+        """Start measuring the lag of the running event loop"""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop measuring the lag"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class Profiler:
+    """
+    Profile the CPU time, the event loop lag and the memory allocations of an ANTA run.
+
+    Attributes:
+        directory: Directory of the profile files
+        top: Number of functions and allocators in the summary
+        lag_interval: Sampling interval of the event loop lag in seconds
+        loop_lag: Event loop lag samples in seconds
+        duration: Duration of the profile in seconds
+        peak_memory: Peak of the memory traced by tracemalloc in bytes
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, directory: Path, top: int = 20, lag_interval: float = 0.01) -> None:
+        """
+        Constructor of Profiler
+
+        Args:
+            directory: Directory of the profile files, created if missing
+            top: Number of functions and allocators in the summary. Defaults to 20.
+            lag_interval: Sampling interval of the event loop lag in seconds. Defaults to 10ms.
+        """
+        self.directory = directory
+        self.top = top
+        self.lag_interval = lag_interval
+        self.loop_lag: list[float] = []
+        self.duration = 0.0
+        self.peak_memory = 0
+        self._profile: Optional[cProfile.Profile] = None
+        self._stats: Optional[pstats.Stats] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stop_tracemalloc = False
+        self._start = 0.0
+
+    def start(self) -> None:
+        """Start profiling"""
+        self._start = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stop_tracemalloc = True
+        elif hasattr(tracemalloc, "reset_peak"):
+            # tracemalloc.reset_peak() requires Python 3.9
+            tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler is active, e.g. with Python 3.12
+            logger.warning(f"Cannot record the CPU profile of the run: {e}")
+        else:
+            self._profile = profile
+
+    def stop(self) -> None:
+        """Stop profiling"""
+        if self._profile is not None:
+            self._profile.disable()
+            self._stats = pstats.Stats(self._profile)
+            self._profile = None
+        if tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            self._snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            if self._stop_tracemalloc:
+                tracemalloc.stop()
+        self.duration = time.perf_counter() - self._start
+
+    def functions(self) -> list[FunctionStats]:
+        """Return the top functions by cumulative time"""
+        if self._stats is None:
+            return []
+        stats: dict[tuple[str, int, str], tuple[int, int, float, float, Any]] = self._stats.stats  # type: ignore[attr-defined]
+        functions = [
+            FunctionStats(function=function_name(*function), calls=calls, total=total, cumulative=cumulative)
+            for function, (_, calls, total, cumulative, _) in stats.items()
+        ]
+        return sorted(functions, key=lambda function: function.cumulative, reverse=True)[: self.top]
+
+    def allocators(self) -> list[AllocatorStats]:
+        """Return the top allocators, i.e. the lines of code with the largest memory allocations still in use at the end of the profile"""
+        if self._snapshot is None:
+            return []
+        return [
+            AllocatorStats(location=f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}", size=statistic.size, blocks=statistic.count)
+            for statistic in self._snapshot.statistics("lineno")[: self.top]
+        ]
+
+    def lag_percentiles(self) -> dict[str, float]:
+        """Return the percentiles and the maximum of the event loop lag in seconds"""
+        lag = {f"p{percent}": percentile(self.loop_lag, percent) for percent in LAG_PERCENTILES}
+        lag["max"] = max(self.loop_lag, default=0.0)
+        return lag
+
+    def tables(self) -> list[Table]:
+        """Return the summary of the profile as rich tables"""
+        from rich.table import Table  # pylint: disable=import-outside-toplevel
+
+        functions = Table(title=f"Top {self.top} functions by cumulative time ({self.duration:.2f}s run)")
+        for column in ("Function", "Calls", "Total time", "Cumulative time"):
+            functions.add_column(column, justify="left" if column == "Function" else "right", no_wrap=column != "Function")
+        for function in self.functions():
+            functions.add_row(function.function, str(function.calls), f"{function.total:.3f}s", f"{function.cumulative:.3f}s")
+
+        lag = Table(title=f"Event loop lag ({len(self.loop_lag)} samples every {self.lag_interval * 1000:g}ms)")
+        for name in self.lag_percentiles():
+            lag.add_column(name, justify="right")
+        lag.add_row(*(f"{value * 1000:.1f}ms" for value in self.lag_percentiles().values()))
+
+        allocators = Table(title=f"Top {self.top} allocators (peak traced memory: {self.peak_memory / 2**20:.1f} MiB)")
+        for column in ("Location", "Size", "Blocks"):
+            allocators.add_column(column, justify="left" if column == "Location" else "right", no_wrap=column != "Location")
+        for allocator in self.allocators():
+            allocators.add_row(allocator.location, f"{allocator.size / 2**10:.1f} KiB", str(allocator.blocks))
+        return [functions, lag, allocators]
+
+    def write(self) -> None:
+        """
+        Write the profile files: `profile.prof` with the cProfile statistics and `summary.txt` with the summary tables.
+
+        Raises:
+            OSError: The profile files cannot be written.
+        """
+        from rich.console import Console  # pylint: disable=import-outside-toplevel
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._stats is not None:
+            self._stats.dump_stats(self.directory / "profile.prof")
+        with open(self.directory / "summary.txt", "w", encoding="UTF-8") as file:
+            console = Console(file=file, width=200, no_color=True)
+            for table in self.tables():
+                console.print(table)
+
+
+def set_profiler(profiler: Optional[Profiler]) -> None:
+    """Enable the event loop monitoring with a profiler, or disable it with None"""
+    global _profiler  # pylint: disable=global-statement
+    _profiler = profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Return the profiler, None if profiling is disabled"""
+    return _profiler
+
+
+def monitor_loop(function: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+    """Decorator measuring the event loop lag while a coroutine function runs, if a profiler is set"""
+
+    @wraps(function)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        profiler = _profiler
+        if profiler is None:
+            return await function(*args, **kwargs)
+        monitor = LoopLagMonitor(profiler.lag_interval)
+        monitor.start()
+        try:
+            return await function(*args, **kwargs)
+        finally:
+            await monitor.stop()
+            profiler.loop_lag.extend(monitor.samples)
+
+    return wrapper
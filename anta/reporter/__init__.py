@@ -12,7 +12,6 @@ import os.path
 import pathlib
 from typing import Any, Optional
 
-from jinja2 import Template
 from rich.table import Table
 
 from anta import RICH_COLOR_PALETTE, RICH_COLOR_THEME
@@ -207,6 +206,51 @@ class ReportTable:
                 )
         return table
 
+    def report_timing(self, result_manager: ResultManager, top: int = 10) -> list[Table]:
+        """
+        Create table reports with the slowest tests, devices and commands.
+
+        Args:
+            result_manager (ResultManager): A manager with a list of tests.
+            top (int, optional): Number of tests, devices and commands to report. Defaults to 10.
+
+        Returns:
+            list[Table]: Fully populated rich Tables of the slowest tests, devices and commands
+        """
+        summary = result_manager.get_timing_summary(top)
+        tests = self._build_headers(
+            headers=["Device", "Test Name", "Test Status", "Total (s)", "Queue wait (s)", "Collection (s)", "Evaluation (s)"],
+            table=Table(title=f"Slowest tests (top {top})", show_lines=True),
+        )
+        for result in summary.tests:
+            if result.timing is not None:
+                timing = result.timing
+                tests.add_row(
+                    result.name,
+                    result.test,
+                    self._color_result(result.result),
+                    *(f"{value:.3f}" for value in (timing.total, timing.queue_wait, timing.collection, timing.evaluation)),
+                )
+        devices = self._build_headers(
+            headers=["Device", "# of tests", "# of commands", "# of cache hits", "Collection (s)", "Evaluation (s)", "Slowest test (s)"],
+            table=Table(title=f"Slowest devices (top {top})", show_lines=True),
+        )
+        for device in summary.devices:
+            devices.add_row(
+                device.name,
+                str(device.tests),
+                str(device.commands),
+                str(device.cache_hits),
+                *(f"{value:.3f}" for value in (device.collection, device.evaluation, device.slowest_test)),
+            )
+        commands = self._build_headers(
+            headers=["Device", "Command", "Test Name", "Format", "Duration (s)"],
+            table=Table(title=f"Slowest commands (top {top})", show_lines=True),
+        )
+        for command in summary.commands:
+            commands.add_row(command.name, command.command, command.test, command.ofmt, f"{command.duration:.3f}")
+        return [tests, devices, commands]
+
 
 class ReportJinja:
     """Report builder based on a Jinja2 template."""
@@ -245,6 +289,8 @@ class ReportJinja:
         Returns:
             str: rendered template
         """
+        from jinja2 import Template  # pylint: disable=import-outside-toplevel
+
         with open(self.tempalte_path, encoding="utf-8") as file_:
             template = Template(file_.read(), trim_blocks=trim_blocks, lstrip_blocks=lstrip_blocks)
 
@@ -8,11 +8,12 @@ from __future__ import annotations
 
 import json
 import logging
+from typing import Any
 
 from pydantic import TypeAdapter
 
 from anta.custom_types import TestStatus
-from anta.result_manager.models import TestResult
+from anta.result_manager.models import DeviceCommandTiming, DeviceTiming, TestResult, TimingSummary
 
 logger = logging.getLogger(__name__)
 
@@ -156,10 +157,44 @@ class ResultManager:
             str: JSON dumps of the list of results
         """
         res = []
-        for device in self._result_entries:
-            res.append({k: v if isinstance(v, list) else str(v) for k, v in device})
+        for result in self._result_entries:
+            entry: dict[str, Any] = {k: v if isinstance(v, list) else str(v) for k, v in result if k != "timing"}
+            if result.timing is not None:
+                entry["timing"] = result.timing.model_dump()
+            res.append(entry)
         return json.dumps(res, indent=4)
 
+    def get_timing_summary(self, top: int = 10) -> TimingSummary:
+        """
+        Aggregate the timing of the test results to find where the time of a test run is spent.
+
+        Args:
+            top: Number of tests, devices and commands to report
+
+        Returns:
+            The slowest tests, devices and commands. Test results without timing are ignored.
+        """
+        timed = [(result, result.timing) for result in self._result_entries if result.timing is not None]
+        devices: dict[str, DeviceTiming] = {}
+        commands: list[DeviceCommandTiming] = []
+        for result, timing in timed:
+            device = devices.setdefault(result.name, DeviceTiming(name=result.name))
+            device.tests += 1
+            device.evaluation += timing.evaluation
+            device.slowest_test = max(device.slowest_test, timing.total)
+            for command in timing.commands:
+                device.commands += 1
+                if command.cache_hit:
+                    device.cache_hits += 1
+                    continue
+                device.collection += command.duration
+                commands.append(DeviceCommandTiming(name=result.name, test=result.test, **command.model_dump()))
+        return TimingSummary(
+            tests=[result for result, _ in sorted(timed, key=lambda item: item[1].total, reverse=True)[:top]],
+            devices=sorted(devices.values(), key=lambda device: device.collection, reverse=True)[:top],
+            commands=sorted(commands, key=lambda command: command.duration, reverse=True)[:top],
+        )
+
     def get_result_by_test(self, test_name: str) -> list[TestResult]:
         """
         Get list of test result for a given test.
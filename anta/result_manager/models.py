@@ -5,13 +5,49 @@
 from __future__ import annotations
 
 # Need to keep List for pydantic in 3.8
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
 from anta.custom_types import TestStatus
 
 
+class CommandTiming(BaseModel):
+    """
+    Collection time of a command of a test.
+
+    Attributes:
+        command: Command
+        ofmt: Output format of the command
+        duration: Wall time in seconds to get the command output, including the wait for another test collecting the same command
+        cache_hit: True if the output was read from the device cache, False if it was collected, None if the cache is not used
+    """
+
+    command: str
+    ofmt: Literal["json", "text"] = "json"
+    duration: float
+    cache_hit: Optional[bool] = None
+
+
+class ResultTiming(BaseModel):
+    """
+    Time spent in each step of a test, in seconds.
+
+    Attributes:
+        queue_wait: Time between the creation of the test and the start of its execution by the event loop
+        collection: Wall time to collect the command outputs of the test
+        evaluation: Time to evaluate the command outputs, i.e. to run the `test()` method
+        total: Wall time of the test execution, excluding the queue wait
+        commands: Collection time of each command of the test
+    """
+
+    queue_wait: float = 0.0
+    collection: float = 0.0
+    evaluation: float = 0.0
+    total: float = 0.0
+    commands: List[CommandTiming] = []
+
+
 class TestResult(BaseModel):
     """
     Describe the result of a test from a single device.
@@ -24,6 +60,7 @@ class TestResult(BaseModel):
         result: Result of the test. Can be one of "unset", "success", "failure", "error" or "skipped".
         messages: Message to report after the test if any.
         custom_field: Custom field to store a string for flexibility in integrating with ANTA
+        timing: Time spent in each step of the test, None if the test has not been run
     """
 
     name: str
@@ -33,6 +70,7 @@ class TestResult(BaseModel):
     result: TestStatus = "unset"
     messages: List[str] = []
     custom_field: Optional[str] = None
+    timing: Optional[ResultTiming] = None
 
     def is_success(self, message: str | None = None) -> None:
         """
@@ -84,3 +122,54 @@ class TestResult(BaseModel):
         Returns a human readable string of this TestResult
         """
         return f"Test '{self.test}' (on '{self.name}'): Result '{self.result}'\nMessages: {self.messages}"
+
+
+class DeviceTiming(BaseModel):
+    """
+    Time spent running the tests of a device, in seconds.
+
+    Attributes:
+        name: Device name
+        tests: Number of timed tests
+        commands: Number of commands of the tests
+        cache_hits: Number of command outputs read from the device cache
+        collection: Sum of the collection time of the commands not read from the cache
+        evaluation: Sum of the evaluation time of the tests
+        slowest_test: Wall time of the slowest test of the device
+    """
+
+    name: str
+    tests: int = 0
+    commands: int = 0
+    cache_hits: int = 0
+    collection: float = 0.0
+    evaluation: float = 0.0
+    slowest_test: float = 0.0
+
+
+class DeviceCommandTiming(CommandTiming):
+    """
+    Collection time of a command of a test on a device.
+
+    Attributes:
+        name: Device name
+        test: Test name
+    """
+
+    name: str
+    test: str
+
+
+class TimingSummary(BaseModel):
+    """
+    Slowest tests, devices and commands of a test run.
+
+    Attributes:
+        tests: Slowest test results, by wall time
+        devices: Slowest devices, by collection time
+        commands: Slowest commands collected from the devices, by wall time. Command outputs read from the cache are ignored.
+    """
+
+    tests: List[TestResult] = []
+    devices: List[DeviceTiming] = []
+    commands: List[DeviceCommandTiming] = []
@@ -9,9 +9,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
-from anta import GITHUB_SUGGESTION
+from anta import GITHUB_SUGGESTION, profiling, tracing, watchdog
 from anta.catalog import AntaCatalog, AntaTestDefinition
 from anta.device import AntaDevice
 from anta.inventory import AntaInventory
@@ -19,12 +19,87 @@ from anta.logger import anta_log_exception
 from anta.models import AntaTest
 from anta.result_manager import ResultManager
 
+if TYPE_CHECKING:
+    from anta.latency import LatencyHistory
+    from anta.plan import AntaPlan
+
 logger = logging.getLogger(__name__)
 
 AntaTestRunner = Tuple[AntaTestDefinition, AntaDevice]
 
 
-async def main(manager: ResultManager, inventory: AntaInventory, catalog: AntaCatalog, tags: list[str] | None = None, established_only: bool = True) -> None:
+def prepare_tests(devices: list[AntaDevice], catalog: AntaCatalog, tags: list[str] | None = None) -> list[AntaTestRunner]:
+    """
+    Select the tests of the catalog to run on each device.
+
+    Args:
+        devices: Devices to run the tests on.
+        catalog: AntaCatalog object that includes the list of tests.
+        tags: List of tags to filter the tests. Defaults to None.
+
+    Returns:
+        The list of tests to run as tuples of a test definition and of a device.
+    """
+    # Using a set to avoid inserting duplicate tests
+    tests_set: set[AntaTestRunner] = set()
+    # Select the tests once for all devices: the test definitions of a lazy catalog are only validated,
+    # and their Python modules imported, if they are scheduled on at least one device
+    if tags:
+        # If there are CLI tags, only execute tests with matching tags
+        tagged_tests = catalog.get_tests_by_tags(tags)
+        for device in devices:
+            tests_set.update((test, device) for test in tagged_tests)
+    else:
+        # If there is no CLI tags, execute all tests without filters
+        untagged_tests = catalog.get_untagged_tests()
+        # Then add the tests with matching tags from device tags
+        tagged_tests = catalog.get_tests_by_tags(list({tag for device in devices for tag in device.tags}))
+        for device in devices:
+            device_tags = set(device.tags)
+            tests_set.update((t, device) for t in untagged_tests)
+            tests_set.update((t, device) for t in tagged_tests if t.inputs.filters and any(tag in device_tags for tag in t.inputs.filters.tags or []))
+    return list(tests_set)
+
+
+def instantiate_test(test_definition: AntaTestDefinition, device: AntaDevice) -> AntaTest | None:
+    """
+    Create the AntaTest instance of a test definition for a device.
+
+    Args:
+        test_definition: Test definition from the test catalog or the test plan.
+        device: Device to run the test on.
+
+    Returns:
+        The AntaTest instance, None if it cannot be created. The error is logged.
+    """
+    try:
+        return test_definition.test(device=device, inputs=test_definition.inputs)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # An AntaTest instance is potentially user-defined code.
+        # We need to catch everything and exit gracefully with an
+        # error message
+        message = "\n".join(
+            [
+                f"There is an error when creating test {test_definition.test.__module__}.{test_definition.test.__name__}.",
+                f"If this is not a custom test implementation: {GITHUB_SUGGESTION}",
+            ]
+        )
+        anta_log_exception(e, message, logger)
+        return None
+
+
+@tracing.traced("anta.nrfu")
+@profiling.monitor_loop
+@watchdog.monitored
+async def main(
+    manager: ResultManager,
+    inventory: AntaInventory,
+    catalog: AntaCatalog | None,
+    tags: list[str] | None = None,
+    established_only: bool = True,
+    plan: AntaPlan | None = None,
+    latency: LatencyHistory | None = None,
+) -> None:
     """
     Main coroutine to run ANTA.
     Use this as an entrypoint to the test framwork in your script.
@@ -32,14 +107,19 @@ async def main(manager: ResultManager, inventory: AntaInventory, catalog: AntaCa
     Args:
         manager: ResultManager object to populate with the test results.
         inventory: AntaInventory object that includes the device(s).
-        catalog: AntaCatalog object that includes the list of tests.
+        catalog: AntaCatalog object that includes the list of tests. Ignored if `plan` is provided.
         tags: List of tags to filter devices from the inventory. Defaults to None.
         established_only: Include only established device(s). Defaults to True.
+        plan: AntaPlan object to run instead of the test catalog. The tests of the test plan are run on
+              the devices of the inventory that are part of the test plan. Defaults to None.
+        latency: Command latency learned from the previous runs. The tests with the slowest commands are started first
+                 and the latency of the collected commands is learned. Defaults to None, i.e. the tests are started in the catalog order.
 
     Returns:
         any: ResultManager object gets updated with the test results.
     """
-    if not catalog.tests:
+    # pylint: disable=too-many-arguments
+    if (plan is None and (catalog is None or len(catalog) == 0)) or (plan is not None and not plan.tests):
         logger.info("The list of tests is empty, exiting")
         return
     if len(inventory) == 0:
@@ -55,55 +135,56 @@ async def main(manager: ResultManager, inventory: AntaInventory, catalog: AntaCa
         )
 
         return
-    coros = []
-    # Using a set to avoid inserting duplicate tests
-    tests_set: set[AntaTestRunner] = set()
-    for device in devices:
-        if tags:
-            # If there are CLI tags, only execute tests with matching tags
-            tests_set.update((test, device) for test in catalog.get_tests_by_tags(tags))
-        else:
-            # If there is no CLI tags, execute all tests without filters
-            tests_set.update((t, device) for t in catalog.tests if t.inputs.filters is None or t.inputs.filters.tags is None)
-
-            # Then add the tests with matching tags from device tags
-            tests_set.update((t, device) for t in catalog.get_tests_by_tags(device.tags))
-
-    tests: list[AntaTestRunner] = list(tests_set)
+    tests: list[AntaTestRunner] = []
+    if plan is not None:
+        # The tests of a test plan are already selected for each device
+        tests = plan.get_tests(devices)
+    elif catalog is not None:
+        tests = prepare_tests(devices, catalog, tags)
 
     if not tests:
         logger.info(f"There is no tests{f' matching the tags {tags} ' if tags else ' '}to run on current inventory. " "Exiting...")
         return
 
+    test_instances: list[AntaTest] = []
     for test_definition, device in tests:
-        try:
-            test_instance = test_definition.test(device=device, inputs=test_definition.inputs)
-
-            coros.append(test_instance.test())
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            # An AntaTest instance is potentially user-defined code.
-            # We need to catch everything and exit gracefully with an
-            # error message
-            message = "\n".join(
-                [
-                    f"There is an error when creating test {test_definition.test.__module__}.{test_definition.test.__name__}.",
-                    f"If this is not a custom test implementation: {GITHUB_SUGGESTION}",
-                ]
-            )
-            anta_log_exception(e, message, logger)
+        test_instance = instantiate_test(test_definition, device)
+        if test_instance is None:
+            continue
+        if plan is not None:
+            plan.verify(test_definition, test_instance)
+        test_instances.append(test_instance)
+    # Longest processing time first: the slow commands are collected while the fast ones complete
+    scheduled = latency.schedule(test_instances) if latency is not None else test_instances
+    # The tests start in the order of their tasks, the results are gathered in the catalog order
+    tasks = {id(test_instance): asyncio.ensure_future(test_instance.test()) for test_instance in scheduled}
+    coros = [tasks[id(test_instance)] for test_instance in test_instances]
     if AntaTest.progress is not None:
         AntaTest.nrfu_task = AntaTest.progress.add_task("Running NRFU Tests...", total=len(coros))
 
     logger.info("Running ANTA tests...")
-    test_results = await asyncio.gather(*coros)
+    try:
+        test_results = await asyncio.gather(*coros)
+    finally:
+        # Close the connections kept open by the devices during the tests
+        await inventory.disconnect_inventory()
     for r in test_results:
         manager.add_test_result(r)
+    if latency is not None:
+        latency.update(test_results)
+    # Per-device statistics are logged at DEBUG level, see anta.metrics for the per-device metrics of large inventories
+    hits = total = cached = 0
     for device in devices:
-        if device.cache_statistics is not None:
-            logger.info(
-                f"Cache statistics for '{device.name}': "
-                f"{device.cache_statistics['cache_hits']} hits / {device.cache_statistics['total_commands_sent']} "
-                f"command(s) ({device.cache_statistics['cache_hit_ratio']})"
+        if (stats := device.cache_statistics) is not None:
+            logger.debug(
+                f"Cache statistics for '{device.name}': {stats['cache_hits']} hits / {stats['total_commands_sent']} command(s) ({stats['cache_hit_ratio']})"
             )
+            hits, total, cached = hits + stats["cache_hits"], total + stats["total_commands_sent"], cached + 1
         else:
-            logger.info(f"Caching is not enabled on {device.name}")
+            logger.debug(f"Caching is not enabled on {device.name}")
+    summary = (
+        f"{sum(device.commands_sent for device in devices)} command(s) sent to {len(devices)} device(s), {sum(device.command_errors for device in devices)} failed"
+    )
+    if cached:
+        summary += f", {hits} cache hits / {total} command(s) on {cached} device(s) with caching enabled"
+    logger.info(summary)
@@ -0,0 +1,480 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Local eAPI simulator for load and scale testing.
+
+`EapiSimulator` runs an asyncio HTTPS server per virtual EOS device, on consecutive ports of a single host. The servers
+implement the eAPI JSON-RPC `runCmds` method used by `aioeapi.Device` and answer with canned command outputs read from
+snapshot directories or archives (see `anta exec snapshot`) and from mock data files, e.g. `tests/mock_data`.
+Each virtual device can emulate a latency, random command errors and commands not supported on its hardware platform.
+"""
+from __future__ import annotations
+
+import ast
+import asyncio
+import functools
+import json
+import logging
+import random
+import re
+import ssl
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Iterable, Literal, Optional, Sequence, Type
+
+import yaml
+
+from anta.device import AsyncEOSDevice, SnapshotDevice
+from anta.inventory import AntaInventory
+from anta.models import AntaCommand
+from anta.snapshot import SnapshotArchive, is_archive
+from anta.tools.misc import exc_to_str
+
+logger = logging.getLogger(__name__)
+
+# eAPI error codes
+ERROR_CODE_COMMAND_FAILED = 1000
+ERROR_CODE_INVALID_COMMAND = 1002
+# JSON-RPC error codes
+ERROR_CODE_PARSE_ERROR = -32700
+ERROR_CODE_METHOD_NOT_FOUND = -32601
+
+UNSUPPORTED_ERROR = "Unavailable command (not supported on this hardware platform)"
+
+# Mock data files are named `<command>_<ofmt>[_<suffix>].out`, e.g. `show_version_json_4.27.1.1F.out`
+MOCK_DATA_PATTERN = re.compile(r"^(?P<command>.+?)_(?P<ofmt>json|text)(_.*)?\.out$")
+
+# `show version` output of the virtual devices without a recorded `show version` output
+DEFAULT_SHOW_VERSION: dict[str, Any] = {
+    "mfgName": "Arista",
+    "modelName": "cEOSLab",
+    "hardwareRevision": "",
+    "serialNumber": "ANTASIMULATOR",
+    "systemMacAddress": "00:1c:73:00:00:01",
+    "version": "4.31.1F",
+    "architecture": "x86_64",
+    "internalVersion": "4.31.1F-33820164.4311F",
+    "imageFormatVersion": "1.0",
+    "uptime": 1000000.0,
+    "memTotal": 8098984,
+    "memFree": 6131068,
+    "isIntlVersion": False,
+}
+
+
+def load_mock_data(directory: Path) -> dict[tuple[str, str], Any]:
+    """
+    Load the command outputs of a mock data directory, e.g. `tests/mock_data`.
+
+    The files are named `<command>_<ofmt>[_<suffix>].out` with the spaces of the command replaced by underscores,
+    e.g. `show_version_json_4.27.1.1F.out`, and contain the `result` list of an eAPI response, as JSON or as a Python literal.
+    The first file in alphabetical order is used if a command has multiple files.
+
+    Args:
+        directory: Path of the mock data directory
+
+    Returns:
+        A dictionary mapping the command and the output format to the command output.
+
+    Raises:
+        OSError: A file cannot be read.
+        ValueError: A file does not contain an eAPI result.
+    """
+    outputs: dict[tuple[str, str], Any] = {}
+    for path in sorted(directory.iterdir()):
+        if (match := MOCK_DATA_PATTERN.match(path.name)) is None:
+            continue
+        key = (match.group("command").replace("_", " "), match.group("ofmt"))
+        if key in outputs:
+            logger.debug(f"Ignoring '{path}': output of command '{key[0]}' ({key[1]}) already loaded")
+            continue
+        content = path.read_text(encoding="UTF-8")
+        try:
+            result = json.loads(content)
+        except ValueError:
+            try:
+                result = ast.literal_eval(content)
+            except (ValueError, SyntaxError) as e:
+                raise ValueError(f"Cannot parse the mock data file '{path}': {exc_to_str(e)}") from e
+        if not isinstance(result, list) or not result:
+            raise ValueError(f"Mock data file '{path}' does not contain an eAPI result")
+        # The last result is the output of the command, the previous ones are the outputs of e.g. `enable`
+        outputs[key] = result[-1]["output"] if key[1] == "text" else result[-1]
+    return outputs
+
+
+def self_signed_context() -> ssl.SSLContext:
+    """
+    Return a server SSL context with a self-signed certificate generated on the fly.
+
+    aioeapi does not verify the server certificates, the certificate is only used to speak HTTPS like EOS.
+    """
+    # Deferred imports, cryptography is a dependency of asyncssh
+    # pylint: disable=import-outside-toplevel
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "anta-simulator")])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = Path(directory) / "cert.pem", Path(directory) / "key.pem"
+        certfile.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+        keyfile.write_bytes(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+        context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+class SimulatedDevice:
+    """
+    Virtual EOS device of the eAPI simulator.
+
+    The output of a command is read from `outputs`, then from the snapshot of the device. A command without output fails
+    with an `invalid command` eAPI error, except `show version` which returns `DEFAULT_SHOW_VERSION`.
+
+    Attributes:
+        name: Device name
+        outputs: Command outputs of the device, mapping the command and the output format to the output
+        snapshot: Snapshot of a device providing the outputs missing from `outputs`
+        latency: Latency of the eAPI requests in seconds
+        jitter: Maximum random delay added to the latency of each request in seconds
+        error_rate: Probability for a command to fail with an eAPI error
+        unsupported: Commands not supported on the hardware platform of the device
+        port: Port of the eAPI server of the device, set when the simulator is started
+        connections: Number of connections accepted by the device
+        requests: Number of eAPI requests received by the device
+        commands: Number of commands run by the device
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        outputs: Optional[dict[tuple[str, str], Any]] = None,
+        snapshot: Optional[SnapshotDevice] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        unsupported: Iterable[str] = (),
+    ) -> None:
+        """
+        Constructor of SimulatedDevice
+
+        Args:
+            name: Device name
+            outputs: Command outputs of the device, mapping the command and the output format to the output
+            snapshot: Snapshot of a device providing the outputs missing from `outputs`
+            latency: Latency of the eAPI requests in seconds
+            jitter: Maximum random delay added to the latency of each request in seconds
+            error_rate: Probability for a command to fail with an eAPI error, between 0 and 1
+            unsupported: Commands not supported on the hardware platform of the device
+        """
+        self.name = name
+        self.outputs = outputs if outputs is not None else {}
+        self.snapshot = snapshot
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.unsupported = set(unsupported)
+        self.port: Optional[int] = None
+        self.connections = 0
+        self.requests = 0
+        self.commands = 0
+
+    async def delay(self) -> None:
+        """Wait for the latency of a request"""
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)  # nosec B311
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def output(self, command: str, ofmt: Literal["json", "text"]) -> Any:
+        """
+        Return the output of a command.
+
+        Args:
+            command: CLI command
+            ofmt: Output format, 'json' or 'text'
+
+        Raises:
+            KeyError: The device has no output for this command.
+        """
+        if (output := self.outputs.get((command, ofmt))) is not None:
+            return output
+        if self.snapshot is not None:
+            snapshot_command = AntaCommand(command=command, ofmt=ofmt, use_cache=False)
+            if self.snapshot.has_output(snapshot_command):
+                await self.snapshot.collect(snapshot_command)
+                if snapshot_command.collected:
+                    return snapshot_command.output
+        if (command, ofmt) == ("show version", "json"):
+            return DEFAULT_SHOW_VERSION
+        raise KeyError(command)
+
+    async def run_cmds(self, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run the commands of an eAPI `runCmds` request.
+
+        Args:
+            params: Parameters of the JSON-RPC request
+
+        Returns:
+            The `result` or the `error` member of the JSON-RPC response.
+        """
+        ofmt = params.get("format", "json")
+        cmds = params.get("cmds", [])
+        results: list[Any] = []
+        for index, cmd in enumerate(cmds, start=1):
+            command = (cmd["cmd"] if isinstance(cmd, dict) else str(cmd)).strip()
+            self.commands += 1
+            code, errors = None, []
+            if command == "enable":
+                results.append({"output": ""} if ofmt == "text" else {})
+                continue
+            if command in self.unsupported:
+                code, errors = ERROR_CODE_COMMAND_FAILED, [UNSUPPORTED_ERROR]
+            elif self.error_rate and random.random() < self.error_rate:  # nosec B311
+                code, errors = ERROR_CODE_COMMAND_FAILED, ["Simulated command error"]
+            else:
+                try:
+                    output = await self.output(command, ofmt)
+                except KeyError:
+                    code, errors = ERROR_CODE_INVALID_COMMAND, [f"Invalid input (no '{ofmt}' output for this command in the simulator)"]
+                else:
+                    results.append({"output": output} if ofmt == "text" else output)
+                    continue
+            failure = "invalid command" if code == ERROR_CODE_INVALID_COMMAND else "could not run command"
+            data = {"errors": errors, "output": "".join(f"% {error}\n" for error in errors)} if ofmt == "text" else {"errors": errors}
+            return {"error": {"code": code, "message": f"CLI command {index} of {len(cmds)} '{command}' failed: {failure}", "data": [*results, data]}}
+        return {"result": results}
+
+
+class EapiSimulator:
+    """
+    eAPI simulator running an HTTPS server per virtual EOS device in the asyncio event loop.
+
+    The servers support HTTP keep-alive so that the connection pooling of the clients can be tested. Any credentials are accepted.
+
+    Attributes:
+        devices: Virtual devices of the simulator
+        host: Address the servers listen on
+        port: Port of the first device, the devices use consecutive ports. 0 selects a free port for each device.
+        tls: Serve HTTPS with a self-signed certificate, otherwise HTTP
+    """
+
+    def __init__(self, devices: Sequence[SimulatedDevice], host: str = "127.0.0.1", port: int = 0, tls: bool = True) -> None:
+        """
+        Constructor of EapiSimulator
+
+        Args:
+            devices: Virtual devices of the simulator
+            host: Address the servers listen on. Defaults to localhost.
+            port: Port of the first device, the devices use consecutive ports. Defaults to 0, i.e. a free port for each device.
+            tls: Serve HTTPS with a self-signed certificate, otherwise HTTP. Defaults to True.
+        """
+        self.devices = list(devices)
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self._servers: list[asyncio.AbstractServer] = []
+        # Connections kept alive by the clients, closed with the servers
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task[Any]] = {}
+
+    @staticmethod
+    def create(  # pylint: disable=too-many-arguments
+        count: int,
+        snapshot: Optional[Path] = None,
+        mock_data: Optional[Path] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        unsupported: Iterable[str] = (),
+    ) -> EapiSimulator:
+        """
+        Create an EapiSimulator with virtual devices sharing the same outputs and behavior.
+
+        The virtual devices are named `sim-<index>`. If a snapshot is provided, the snapshot devices are assigned to the virtual devices
+        in a round-robin fashion.
+
+        Args:
+            count: Number of virtual devices
+            snapshot: Path of a snapshot directory or archive
+            mock_data: Path of a mock data directory, see `load_mock_data()`
+            host: Address the servers listen on
+            port: Port of the first device. 0 selects a free port for each device.
+            latency: Latency of the eAPI requests in seconds
+            jitter: Maximum random delay added to the latency of each request in seconds
+            error_rate: Probability for a command to fail with an eAPI error
+            unsupported: Commands not supported on the hardware platform of the devices
+
+        Raises:
+            OSError: The snapshot or the mock data cannot be read.
+            ValueError: The snapshot has no device or the mock data is invalid.
+            SnapshotArchiveError: The snapshot archive is invalid.
+        """
+        outputs = load_mock_data(mock_data) if mock_data is not None else {}
+        snapshots: list[SnapshotDevice] = []
+        if snapshot is not None:
+            if is_archive(snapshot):
+                archive = SnapshotArchive(snapshot)
+                snapshots = [SnapshotDevice(name, archive, disable_cache=True) for name in archive.devices]
+            else:
+                snapshots = [SnapshotDevice(path.name, snapshot, disable_cache=True) for path in sorted(snapshot.iterdir()) if path.is_dir()]
+            if not snapshots:
+                raise ValueError(f"No device found in the snapshot '{snapshot}'")
+        devices = [
+            SimulatedDevice(
+                name=f"sim-{index + 1}",
+                outputs=outputs,
+                snapshot=snapshots[index % len(snapshots)] if snapshots else None,
+                latency=latency,
+                jitter=jitter,
+                error_rate=error_rate,
+                unsupported=unsupported,
+            )
+            for index in range(count)
+        ]
+        return EapiSimulator(devices, host=host, port=port)
+
+    async def __aenter__(self) -> EapiSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Start the eAPI servers of the devices.
+
+        Raises:
+            OSError: A server cannot listen on its address and port. The servers already started are closed.
+        """
+        context = self_signed_context() if self.tls else None
+        try:
+            for index, device in enumerate(self.devices):
+                server = await asyncio.start_server(
+                    functools.partial(self._handle, device), self.host, self.port + index if self.port else 0, ssl=context, reuse_address=True
+                )
+                self._servers.append(server)
+                device.port = server.sockets[0].getsockname()[1]
+        except OSError:
+            await self.close()
+            raise
+        logger.info(f"Simulating {len(self.devices)} EOS device(s) with eAPI on {'https' if self.tls else 'http'}://{self.host}")
+
+    async def close(self) -> None:
+        """Stop the eAPI servers of the devices"""
+        for server in self._servers:
+            server.close()
+        handlers = list(self._connections.values())
+        for writer in list(self._connections):
+            # Do not wait for the TLS shutdown of the connections kept alive by the clients
+            writer.transport.abort()
+        await asyncio.gather(*handlers, *(server.wait_closed() for server in self._servers))
+        if self._servers:
+            connections = sum(device.connections for device in self.devices)
+            requests = sum(device.requests for device in self.devices)
+            commands = sum(device.commands for device in self.devices)
+            logger.info(f"{requests} eAPI request(s) with {commands} command(s) received on {connections} connection(s) by {len(self.devices)} simulated device(s)")
+        self._servers = []
+
+    def inventory(self, username: str = "anta", password: str = "anta", **kwargs: Any) -> AntaInventory:
+        """
+        Return an AntaInventory of the virtual devices.
+
+        Args:
+            username: Username of the devices, any credentials are accepted by the simulator
+            password: Password of the devices
+            kwargs: Other arguments of AsyncEOSDevice, e.g. `timeout`
+        """
+        inventory = AntaInventory()
+        for device in self.devices:
+            inventory.add_device(
+                AsyncEOSDevice(
+                    name=device.name, host=self.host, port=device.port, username=username, password=password, proto="https" if self.tls else "http", **kwargs
+                )
+            )
+        return inventory
+
+    def write_inventory(self, path: Path) -> None:
+        """
+        Write an ANTA inventory file of the virtual devices.
+
+        Args:
+            path: Path of the inventory file
+
+        Raises:
+            ValueError: The simulator does not serve HTTPS, which is required by the devices of an inventory file.
+        """
+        if not self.tls:
+            raise ValueError("The devices of an ANTA inventory file use HTTPS, the simulator must be started with TLS")
+        hosts = [{"name": device.name, "host": self.host, "port": device.port} for device in self.devices]
+        path.write_text(yaml.safe_dump({AntaInventory.INVENTORY_ROOT_KEY: {"hosts": hosts}}, sort_keys=False), encoding="UTF-8")
+
+    async def _handle(self, device: SimulatedDevice, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle the HTTP requests of a connection to the eAPI server of a device"""
+        self._connections[writer] = asyncio.current_task()  # type: ignore[assignment]
+        device.connections += 1
+        try:
+            while request := await reader.readline():
+                method, _, target = request.decode("latin-1").partition(" ")
+                path = target.split(" ", maxsplit=1)[0]
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if method != "POST":
+                    status, response = "405 Method Not Allowed", b'{"error": "Method Not Allowed"}'
+                elif path != "/command-api":
+                    status, response = "404 Not Found", b'{"error": "Not Found"}'
+                else:
+                    device.requests += 1
+                    await device.delay()
+                    status, response = "200 OK", json.dumps(await self._jsonrpc(device, body)).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(response)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + response
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            logger.debug(f"Connection to simulated device {device.name} closed: {exc_to_str(e)}")
+        finally:
+            del self._connections[writer]
+            writer.close()
+
+    @staticmethod
+    async def _jsonrpc(device: SimulatedDevice, body: bytes) -> dict[str, Any]:
+        """Return the JSON-RPC response of a request to a device"""
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": ERROR_CODE_PARSE_ERROR, "message": f"Parse error: {exc_to_str(e)}", "data": []}}
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+        if request.get("method") != "runCmds":
+            response["error"] = {"code": ERROR_CODE_METHOD_NOT_FOUND, "message": f"Method not found: {request.get('method')}", "data": []}
+        else:
+            response.update(await device.run_cmds(request.get("params", {})))
+        return response
@@ -0,0 +1,351 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+ANTA snapshot archive: command outputs of multiple devices stored in a single compressed file.
+
+Archive layout:
+
+- header: `ANTASNAP` magic, format version (1 byte) and compression codec (1 byte)
+- members: one independently compressed blob per command output
+- index: compressed JSON document mapping each device, output format and command to the offset and size of its member
+- trailer: offset and size of the index (2 unsigned 64-bit little-endian integers) followed by the `ANTASNAP` magic
+
+Any command output can be read without decompressing the rest of the archive.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import queue
+import struct
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, Literal, Optional, Tuple, Type
+
+from anta import __version__
+from anta.tools.misc import exc_to_str
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ANTASNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(f"<{len(MAGIC)}sBB")
+TRAILER = struct.Struct(f"<QQ{len(MAGIC)}s")
+CODECS: Tuple[str, ...] = ("gzip", "zstd")
+
+# Index of the members: device name -> output format -> command -> (offset, size)
+Index = Dict[str, Dict[str, Dict[str, Tuple[int, int]]]]
+
+
+class SnapshotArchiveError(Exception):
+    """Error raised when a snapshot archive cannot be read"""
+
+
+def _codec(name: str) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Return the compression and decompression functions of a codec.
+
+    zstd compression requires the optional `zstandard` package.
+
+    Args:
+        name: Codec name, one of `CODECS`
+    """
+    if name == "gzip":
+        return (lambda data: gzip.compress(data, compresslevel=6, mtime=0)), gzip.decompress
+    if name == "zstd":
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise SnapshotArchiveError("zstd compression requires the 'zstandard' package: pip install zstandard") from e
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    raise SnapshotArchiveError(f"Unsupported compression codec '{name}'")
+
+
+def is_archive(path: str | Path) -> bool:
+    """
+    Return True if the file is an ANTA snapshot archive.
+
+    Args:
+        path: Path to test
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SnapshotArchiveWriter:
+    """
+    Write command outputs to a snapshot archive.
+
+    Outputs are queued by `add()` and serialized, compressed and written to disk by a dedicated thread
+    so that disk I/O never blocks the asyncio event loop. The archive is written to a temporary file
+    which replaces the destination when `close()` is called.
+
+    Can be used as a context manager:
+
+    ```python
+    with SnapshotArchiveWriter("snapshot.anta-snapshot") as writer:
+        writer.add("leaf1", "show version", "json", {"version": "4.31.1F"})
+    ```
+
+    Attributes:
+        path: Path of the archive
+    """
+
+    def __init__(self, path: str | Path, codec: Literal["gzip", "zstd"] = "gzip") -> None:
+        """
+        Constructor of SnapshotArchiveWriter. The writer thread is started immediately.
+
+        Args:
+            path: Path of the archive
+            codec: Compression codec of the archive members
+        """
+        self.path: Path = Path(path)
+        self._compress, _ = _codec(codec)
+        self._index: Index = {}
+        self._queue: queue.SimpleQueue[tuple[str, str, str, Any] | None] = queue.SimpleQueue()
+        self._error: Exception | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp_path, "wb")  # pylint: disable=consider-using-with
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, CODECS.index(codec)))
+        self._thread = threading.Thread(target=self._run, name="anta-snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> SnapshotArchiveWriter:
+        return self
+
+    @property
+    def _tmp_path(self) -> Path:
+        """Path of the archive while it is written"""
+        return self.path.with_name(f"{self.path.name}.tmp")
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, device: str, command: str, ofmt: str, output: Any) -> None:
+        """
+        Queue a command output to be written in the archive. This method does not block and is thread-safe.
+
+        Args:
+            device: Device name
+            command: Command
+            ofmt: Output format of the command, `json` or `text`
+            output: Command output, a JSON-serializable object for the `json` format or a string for the `text` format
+        """
+        self._queue.put((device, command, ofmt, output))
+
+    def _run(self) -> None:
+        """Writer thread: serialize, compress and write the queued outputs"""
+        while (item := self._queue.get()) is not None:
+            if self._error is not None:
+                continue
+            device, command, ofmt, output = item
+            try:
+                data = json.dumps(output, separators=(",", ":")).encode() if ofmt == "json" else str(output).encode()
+                blob = self._compress(data)
+                offset = self._file.tell()
+                self._file.write(blob)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Surface any error to the caller of close()
+                self._error = e
+                continue
+            self._index.setdefault(device, {}).setdefault(ofmt, {})[command] = (offset, len(blob))
+
+    def _stop(self) -> None:
+        """Wait for the writer thread to process all the queued outputs"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def close(self) -> None:
+        """
+        Write the index and the trailer and move the archive to its destination.
+
+        Raises:
+            OSError: The archive cannot be written.
+        """
+        self._stop()
+        try:
+            if self._error is not None:
+                raise self._error
+            index = {"anta_version": __version__, "created": datetime.now(timezone.utc).isoformat(), "devices": self._index}
+            blob = self._compress(json.dumps(index, separators=(",", ":")).encode())
+            offset = self._file.tell()
+            self._file.write(blob)
+            self._file.write(TRAILER.pack(offset, len(blob), MAGIC))
+            self._file.close()
+            self._tmp_path.replace(self.path)
+        except Exception:
+            self.abort()
+            raise
+        logger.debug(f"Snapshot archive written to '{self.path}'")
+
+    def abort(self) -> None:
+        """Stop writing and delete the temporary archive file"""
+        if self._thread.is_alive():
+            self._stop()
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class SnapshotArchive:
+    """
+    Read command outputs from a snapshot archive.
+
+    Only the index is loaded when opening the archive: command outputs are read and decompressed on demand.
+
+    Attributes:
+        path: Path of the archive
+        codec: Compression codec of the archive members
+        metadata: Metadata of the archive: ANTA version used to write the archive (`anta_version`)
+                  and creation date in ISO 8601 format (`created`)
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Constructor of SnapshotArchive.
+
+        Args:
+            path: Path of the archive
+
+        Raises:
+            OSError: The archive cannot be read.
+            SnapshotArchiveError: The file is not a valid snapshot archive.
+        """
+        self.path: Path = Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "rb")  # pylint: disable=consider-using-with
+        try:
+            index = self._load_index()
+        except Exception:
+            self._file.close()
+            raise
+        self._index: Index = index.pop("devices")
+        self.metadata: dict[str, Any] = index
+
+    def _load_index(self) -> dict[str, Any]:
+        """Check the header and the trailer of the archive and load its index"""
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size or header[: len(MAGIC)] != MAGIC:
+            raise SnapshotArchiveError(f"'{self.path}' is not an ANTA snapshot archive")
+        _, version, codec = HEADER.unpack(header)
+        if version != FORMAT_VERSION:
+            raise SnapshotArchiveError(f"Unsupported ANTA snapshot archive format version {version} in '{self.path}'")
+        if codec >= len(CODECS):
+            raise SnapshotArchiveError(f"Unsupported compression codec in '{self.path}'")
+        self.codec = CODECS[codec]
+        _, self._decompress = _codec(self.codec)
+        size = self._file.seek(0, 2)
+        if size < HEADER.size + TRAILER.size:
+            raise SnapshotArchiveError(f"ANTA snapshot archive '{self.path}' is truncated")
+        self._file.seek(size - TRAILER.size)
+        offset, length, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != MAGIC or offset + length > size - TRAILER.size:
+            raise SnapshotArchiveError(f"ANTA snapshot archive '{self.path}' is truncated")
+        try:
+            index = json.loads(self._read(offset, length))
+        except ValueError as e:
+            raise SnapshotArchiveError(f"The index of ANTA snapshot archive '{self.path}' is corrupted: {exc_to_str(e)}") from e
+        if not isinstance(index, dict) or not isinstance(index.get("devices"), dict):
+            raise SnapshotArchiveError(f"The index of ANTA snapshot archive '{self.path}' is corrupted")
+        return index
+
+    def __enter__(self) -> SnapshotArchive:
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the archive file"""
+        self._file.close()
+
+    @property
+    def devices(self) -> list[str]:
+        """Names of the devices of the archive"""
+        return list(self._index)
+
+    def has_device(self, device: str) -> bool:
+        """
+        Return True if the archive contains outputs of a device.
+
+        Args:
+            device: Device name
+        """
+        return device in self._index
+
+    def commands(self, device: str, ofmt: str) -> list[str]:
+        """
+        Return the commands of a device stored in the archive.
+
+        Args:
+            device: Device name
+            ofmt: Output format of the commands, `json` or `text`
+        """
+        return list(self._index.get(device, {}).get(ofmt, {}))
+
+    def __contains__(self, key: tuple[str, str, str]) -> bool:
+        device, command, ofmt = key
+        return command in self._index.get(device, {}).get(ofmt, {})
+
+    def _read(self, offset: int, size: int) -> bytes:
+        """Read and decompress a member of the archive"""
+        with self._lock:
+            self._file.seek(offset)
+            blob = self._file.read(size)
+        try:
+            return self._decompress(blob)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Each compression library raises its own exception types
+            raise SnapshotArchiveError(f"Cannot decompress a member of ANTA snapshot archive '{self.path}': {exc_to_str(e)}") from e
+
+    def digest(self, device: str, command: str, ofmt: str) -> bytes:
+        """
+        Return a digest of a command output without decompressing it.
+
+        The members are compressed deterministically: identical outputs stored with the same codec have the same digest.
+        Different digests do not guarantee different outputs if the archives have been written with different codecs
+        or compression library versions.
+
+        Args:
+            device: Device name
+            command: Command
+            ofmt: Output format of the command, `json` or `text`
+
+        Raises:
+            KeyError: The command output is not part of the archive.
+        """
+        offset, size = self._index[device][ofmt][command]
+        with self._lock:
+            self._file.seek(offset)
+            blob = self._file.read(size)
+        return hashlib.blake2b(blob, digest_size=16, person=self.codec.encode()).digest()
+
+    def get(self, device: str, command: str, ofmt: str) -> Any:
+        """
+        Return a command output of a device.
+
+        Args:
+            device: Device name
+            command: Command
+            ofmt: Output format of the command, `json` or `text`
+
+        Raises:
+            KeyError: The command output is not part of the archive.
+            SnapshotArchiveError: The command output cannot be decoded.
+        """
+        offset, size = self._index[device][ofmt][command]
+        data = self._read(offset, size)
+        try:
+            return json.loads(data) if ofmt == "json" else data.decode()
+        except ValueError as e:
+            raise SnapshotArchiveError(f"Cannot decode the output of command '{command}' of device {device}: {exc_to_str(e)}") from e
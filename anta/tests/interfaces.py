@@ -33,6 +33,8 @@ class VerifyInterfaceUtilization(AntaTest):
     name = "VerifyInterfaceUtilization"
     description = "Verifies that all interfaces have a usage below 75%."
     categories = ["interfaces"]
+    # Parses the text counters of every interface of the device
+    process_evaluation = True
     # TODO - move from text to json if possible
     commands = [AntaCommand(command="show interfaces counters rates", ofmt="text")]
 
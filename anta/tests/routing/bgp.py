@@ -510,6 +510,8 @@ class VerifyBGPExchangedRoutes(AntaTest):
     name = "VerifyBGPExchangedRoutes"
     description = "Verifies if BGP peers have correctly advertised/received routes with type as valid and active for a specified VRF."
     categories = ["bgp"]
+    # The routes exchanged with a peer can be a full Internet routing table
+    process_evaluation = True
     commands = [
         AntaTemplate(template="show bgp neighbors {peer} advertised-routes vrf {vrf}"),
         AntaTemplate(template="show bgp neighbors {peer} routes vrf {vrf}"),
@@ -589,6 +591,7 @@ class VerifyBGPPeerMPCaps(AntaTest):
     name = "VerifyBGPPeerMPCaps"
     description = "Verifies the multiprotocol capabilities of a BGP peer in a specified VRF"
     categories = ["bgp"]
+    process_evaluation = True
     commands = [AntaCommand(command="show bgp neighbors vrf all")]
 
     class Input(AntaTest.Input):
@@ -664,6 +667,7 @@ class VerifyBGPPeerASNCap(AntaTest):
     name = "VerifyBGPPeerASNCap"
     description = "Verifies the four octet asn capabilities of a BGP peer in a specified VRF."
     categories = ["bgp"]
+    process_evaluation = True
     commands = [AntaCommand(command="show bgp neighbors vrf all")]
 
     class Input(AntaTest.Input):
@@ -733,6 +737,7 @@ class VerifyBGPPeerRouteRefreshCap(AntaTest):
     name = "VerifyBGPPeerRouteRefreshCap"
     description = "Verifies the route refresh capabilities of a BGP peer in a specified VRF."
     categories = ["bgp"]
+    process_evaluation = True
     commands = [AntaCommand(command="show bgp neighbors vrf all")]
 
     class Input(AntaTest.Input):
@@ -0,0 +1,169 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Non-blocking file I/O for ANTA.
+
+`AsyncFileIO` runs file system operations, and the serialization of the data to write, in a dedicated thread pool
+so that disk latency never stalls the asyncio event loop. The number of pending operations is bounded: when the
+limit is reached, coroutines wait for a slot without blocking the event loop and synchronous callers are blocked,
+which bounds the memory used by the data waiting to be written.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Optional, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+
+def write_text(path: Path, content: str, parents: bool = False) -> None:
+    """
+    Write a string to a file, UTF-8 encoded.
+
+    Args:
+        path: Path of the file
+        content: String to write
+        parents: Create the missing parent directories
+    """
+    if parents:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open(mode="w", encoding="UTF-8") as file:
+        file.write(content)
+
+
+def write_json(path: Path, data: Any, parents: bool = False, indent: int | None = 2) -> None:
+    """
+    Serialize data to JSON and write it to a file, UTF-8 encoded.
+
+    Args:
+        path: Path of the file
+        data: JSON-serializable data
+        parents: Create the missing parent directories
+        indent: JSON indentation
+    """
+    write_text(path, json.dumps(data, indent=indent), parents=parents)
+
+
+class AsyncFileIO:
+    """
+    Thread-pool backed file I/O with bounded queueing.
+
+    Can be used as a context manager, waiting for all the pending operations on exit:
+
+    ```python
+    with AsyncFileIO() as fileio:
+        await fileio.write_json(Path("show version.json"), output, parents=True)
+    ```
+
+    Attributes:
+        max_pending: Maximum number of operations submitted to the thread pool at the same time
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        """
+        Constructor of AsyncFileIO
+
+        Args:
+            max_workers: Number of threads of the thread pool
+            max_pending: Maximum number of operations submitted to the thread pool at the same time
+        """
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="anta-file-io")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # asyncio.Semaphore must be created in the running event loop with Python < 3.10
+        self._async_slots: asyncio.Semaphore | None = None
+
+    def __enter__(self) -> AsyncFileIO:
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for the pending operations and stop the thread pool"""
+        self._executor.shutdown(wait=True)
+
+    def submit(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        """
+        Submit a function to the thread pool from synchronous code.
+        The caller is blocked while the maximum number of pending operations is reached.
+
+        Args:
+            func: Function to run in the thread pool
+            args: Positional arguments of the function
+            kwargs: Keyword arguments of the function
+
+        Returns:
+            The future of the result of the function
+        """
+        self._slots.acquire()  # pylint: disable=consider-using-with
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a function in the thread pool without blocking the event loop.
+        The coroutine waits while the maximum number of pending operations is reached.
+
+        Args:
+            func: Function to run in the thread pool
+            args: Positional arguments of the function
+            kwargs: Keyword arguments of the function
+
+        Returns:
+            The result of the function
+        """
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_pending)
+        async with self._async_slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def mkdir(self, path: Path) -> None:
+        """
+        Create a directory and its missing parents.
+
+        Args:
+            path: Path of the directory
+        """
+        await self.run(path.mkdir, parents=True, exist_ok=True)
+
+    async def write_text(self, path: Path, content: str, parents: bool = False) -> None:
+        """
+        Write a string to a file, UTF-8 encoded.
+
+        Args:
+            path: Path of the file
+            content: String to write
+            parents: Create the missing parent directories
+        """
+        await self.run(write_text, path, content, parents=parents)
+
+    async def write_json(self, path: Path, data: Any, parents: bool = False, indent: int | None = 2) -> None:
+        """
+        Serialize data to JSON and write it to a file, UTF-8 encoded. The serialization is also done in the thread pool.
+
+        Args:
+            path: Path of the file
+            data: JSON-serializable data. It must not be modified until the coroutine returns.
+            parents: Create the missing parent directories
+            indent: JSON indentation
+        """
+        await self.run(write_json, path, data, parents=parents, indent=indent)
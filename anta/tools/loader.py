@@ -0,0 +1,128 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Helpers to load ANTA input files.
+
+YAML files are loaded with the libyaml `CSafeLoader` when PyYAML has been built with libyaml,
+falling back to the pure-Python `SafeLoader` otherwise.
+
+`ParseCache` stores the validated representation of an input file next to the source file
+so that an unchanged file skips both YAML parsing and pydantic validation on the next run.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import IO, Any, Union
+
+import yaml
+
+from anta import __version__
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Bump this value when the structure of the cached data changes
+CACHE_FORMAT_VERSION = 1
+CACHE_SUFFIX = ".anta-cache"
+
+
+def yaml_load(stream: Union[str, bytes, IO[str], IO[bytes]]) -> Any:
+    """
+    Load a YAML document using the fastest safe loader available.
+
+    Args:
+        stream: YAML document as a string, bytes or file object
+
+    Returns:
+        The Python object built from the YAML document
+    """
+    return yaml.load(stream, Loader=SafeLoader)  # nosec B506 - SafeLoader or CSafeLoader
+
+
+class ParseCache:
+    """
+    Cache of the validated data built from a source file.
+
+    The cache file is stored next to the source file as `.<source name>.anta-cache` and is keyed on
+    the source file modification time and SHA-256 digest, as well as on the ANTA version.
+    Any mismatch or any error when reading the cache file is a cache miss.
+
+    !!! warning
+        The cache file is a Python pickle: only enable caching for files stored in a trusted location.
+
+    Attributes:
+        source: Path of the source file
+        path: Path of the cache file
+    """
+
+    def __init__(self, source: str | Path) -> None:
+        """
+        Constructor of ParseCache
+
+        Args:
+            source: Path of the source file
+        """
+        self.source: Path = Path(source)
+        self.path: Path = self.source.with_name(f".{self.source.name}{CACHE_SUFFIX}")
+        self._key: dict[str, Any] | None = None
+
+    @property
+    def key(self) -> dict[str, Any]:
+        """Key identifying the current content of the source file"""
+        if self._key is None:
+            stat = self.source.stat()
+            self._key = {
+                "format": CACHE_FORMAT_VERSION,
+                "anta": __version__,
+                "mtime": stat.st_mtime_ns,
+                "sha256": hashlib.sha256(self.source.read_bytes()).hexdigest(),
+            }
+        return self._key
+
+    def load(self) -> Any | None:
+        """
+        Return the cached data if the cache is valid for the source file, None otherwise.
+        """
+        if not self.path.is_file():
+            logger.debug(f"No parsed-file cache found for '{self.source}'")
+            return None
+        try:
+            with open(self.path, "rb") as file:
+                key = pickle.load(file)  # nosec B301
+                if key != self.key:
+                    logger.debug(f"Parsed-file cache for '{self.source}' is outdated")
+                    return None
+                data = pickle.load(file)  # nosec B301
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Unpickling can raise almost anything, a broken cache must never prevent ANTA to run
+            logger.debug(f"Could not read parsed-file cache '{self.path}': {e!r}")
+            return None
+        logger.info(f"Loaded '{self.source}' from parsed-file cache '{self.path}'")
+        return data
+
+    def dump(self, data: Any) -> None:
+        """
+        Store data in the cache file.
+
+        Args:
+            data: Picklable data built from the source file
+        """
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as file:
+                pickle.dump(self.key, file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(self.path)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Could not write parsed-file cache '{self.path}': {e!r}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        logger.debug(f"Parsed-file cache for '{self.source}' written to '{self.path}'")
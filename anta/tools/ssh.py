@@ -0,0 +1,189 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+SSH connection pooling.
+
+Opening a SSH connection requires a TCP handshake, a key exchange and an authentication which can take hundreds of
+milliseconds. `SSHConnectionPool` keeps the connections to a device open while they are in use and for a short idle
+period afterwards so that consecutive SCP or SFTP transfers reuse them. A SSH connection multiplexes multiple sessions:
+a connection of the pool is shared by up to `max_sessions` concurrent users.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional
+
+if TYPE_CHECKING:
+    from asyncssh import SSHClientConnection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 2
+# OpenSSH MaxSessions defaults to 10
+DEFAULT_MAX_SESSIONS = 8
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+class _PooledConnection:  # pylint: disable=too-few-public-methods
+    """SSH connection of a SSHConnectionPool with its number of users"""
+
+    def __init__(self, connection: SSHClientConnection) -> None:
+        self.connection = connection
+        self.users = 0
+        self.idle_handle: asyncio.TimerHandle | None = None
+        self.closed: asyncio.Future[None] | None = None
+
+
+class SSHConnectionPool:  # pylint: disable=too-many-instance-attributes
+    """
+    Pool of SSH connections to a single device.
+
+    Connections are opened on demand, shared by up to `max_sessions` concurrent users and closed after `idle_timeout`
+    seconds without users. Connections closed by the device are discarded.
+
+    ```python
+    async with pool.connection() as conn:
+        await asyncssh.scp((conn, "/mnt/flash/file"), ".")
+    ```
+
+    Attributes:
+        name: Name of the device, used in logs
+        max_connections: Maximum number of connections opened to the device
+        max_sessions: Maximum number of users of a connection at the same time
+        idle_timeout: Delay in seconds after which a connection without users is closed
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[SSHClientConnection]],
+        name: str,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+        """
+        Constructor of SSHConnectionPool
+
+        Args:
+            connect: Coroutine function opening a new SSH connection to the device
+            name: Name of the device, used in logs
+            max_connections: Maximum number of connections opened to the device
+            max_sessions: Maximum number of users of a connection at the same time
+            idle_timeout: Delay in seconds after which a connection without users is closed
+        """
+        if max_connections < 1 or max_sessions < 1:
+            raise ValueError("The maximum number of connections and sessions must be at least 1")
+        self._connect = connect
+        self.name = name
+        self.max_connections = max_connections
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._connections: list[_PooledConnection] = []
+        # Number of connections being opened
+        self._opening = 0
+        # asyncio primitives must be created in the running event loop with Python < 3.10
+        # and are bound to the first event loop using them with Python >= 3.10
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        """Return the number of open connections"""
+        return len(self._connections)
+
+    @property
+    def _cond(self) -> asyncio.Condition:
+        # The pool can be used by successive event loops, e.g. by successive asyncio.run() calls
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SSHClientConnection]:
+        """Borrow a connection of the pool, opening a new one if required"""
+        pooled = await self._acquire()
+        try:
+            yield pooled.connection
+        finally:
+            await self._release(pooled)
+
+    async def _acquire(self) -> _PooledConnection:
+        """Return the least used connection with a free session or open a new one"""
+        async with self._cond:
+            while True:
+                available = [pooled for pooled in self._connections if pooled.users < self.max_sessions]
+                if available:
+                    pooled = min(available, key=lambda pooled: pooled.users)
+                    if pooled.idle_handle is not None:
+                        pooled.idle_handle.cancel()
+                        pooled.idle_handle = None
+                    pooled.users += 1
+                    return pooled
+                if len(self._connections) + self._opening < self.max_connections:
+                    self._opening += 1
+                    break
+                await self._cond.wait()
+        try:
+            logger.debug(f"Opening a SSH connection to device {self.name}")
+            pooled = _PooledConnection(await self._connect())
+        finally:
+            async with self._cond:
+                self._opening -= 1
+                self._cond.notify_all()
+        pooled.users = 1
+        pooled.closed = asyncio.ensure_future(pooled.connection.wait_closed())
+        pooled.closed.add_done_callback(lambda _: self._discard(pooled))
+        self._connections.append(pooled)
+        return pooled
+
+    async def _release(self, pooled: _PooledConnection) -> None:
+        """Give back a connection to the pool and schedule its closing if it is not used anymore"""
+        async with self._cond:
+            pooled.users -= 1
+            if pooled.users == 0 and pooled in self._connections:
+                pooled.idle_handle = asyncio.get_running_loop().call_later(self.idle_timeout, self._expire, pooled)
+            self._cond.notify_all()
+
+    def _expire(self, pooled: _PooledConnection) -> None:
+        """Close a connection that has not been used during the idle timeout"""
+        logger.debug(f"Closing idle SSH connection to device {self.name}")
+        self._discard(pooled)
+        pooled.connection.close()
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        """Remove a connection from the pool"""
+        if pooled.idle_handle is not None:
+            pooled.idle_handle.cancel()
+            pooled.idle_handle = None
+        if pooled in self._connections:
+            self._connections.remove(pooled)
+            # Wake up the coroutines waiting for a connection
+            asyncio.ensure_future(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+    async def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Close all the connections of the pool, including the connections in use.
+        The pool can still be used afterwards, including by another event loop, and will open new connections.
+
+        Args:
+            timeout: Maximum time in seconds to wait for the connections to be closed
+        """
+        connections, self._connections = self._connections, []
+        for pooled in connections:
+            if pooled.idle_handle is not None:
+                pooled.idle_handle.cancel()
+            pooled.connection.close()
+        if connections:
+            logger.debug(f"Closing {len(connections)} SSH connection(s) to device {self.name}")
+            _, pending = await asyncio.wait([pooled.closed for pooled in connections if pooled.closed is not None], timeout=timeout)
+            for future in pending:
+                future.cancel()
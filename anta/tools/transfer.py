@@ -0,0 +1,154 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+File transfer helpers: a global concurrency and bandwidth budget shared by transfers and resumable SFTP downloads.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from anta.tools.fileio import AsyncFileIO
+
+if TYPE_CHECKING:
+    from asyncssh import SFTPClient
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+PARTIAL_SUFFIX = ".part"
+
+
+class TransferBudget:
+    """
+    Concurrency and bandwidth budget shared by multiple file transfers, potentially from multiple devices.
+
+    Attributes:
+        max_transfers: Maximum number of files transferred at the same time. None means no limit.
+        bandwidth: Maximum aggregated throughput in bytes per second. None means no limit.
+    """
+
+    def __init__(self, max_transfers: Optional[int] = None, bandwidth: Optional[float] = None) -> None:
+        """
+        Constructor of TransferBudget
+
+        Args:
+            max_transfers: Maximum number of files transferred at the same time. None means no limit.
+            bandwidth: Maximum aggregated throughput in bytes per second. None means no limit.
+        """
+        if max_transfers is not None and max_transfers < 1:
+            raise ValueError("The maximum number of transfers must be at least 1")
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError("The bandwidth must be positive")
+        self.max_transfers = max_transfers
+        self.bandwidth = bandwidth
+        # asyncio primitives must be created in the running event loop with Python < 3.10
+        self._slots: asyncio.Semaphore | None = None
+        # Event loop time when all the bytes reserved so far will have been transferred at the maximum bandwidth
+        self._next: float = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a transfer slot"""
+        if self.max_transfers is None:
+            yield
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_transfers)
+        async with self._slots:
+            yield
+
+    async def consume(self, size: int) -> None:
+        """
+        Account for transferred bytes, sleeping as long as required to keep the aggregated throughput below the bandwidth.
+
+        Args:
+            size: Number of bytes that have been transferred
+        """
+        if self.bandwidth is None:
+            return
+        now = asyncio.get_running_loop().time()
+        self._next = max(self._next, now) + size / self.bandwidth
+        if (delay := self._next - now) > 0:
+            await asyncio.sleep(delay)
+
+
+def sha256sum(path: Path) -> str:
+    """
+    Return the SHA-256 digest of a file.
+
+    Args:
+        path: Path of the file
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _append(path: Path, data: bytes) -> None:
+    """Append data to a file"""
+    with path.open("ab") as file:
+        file.write(data)
+
+
+async def sftp_download(
+    sftp: SFTPClient, source: Path, destination: Path, fileio: AsyncFileIO, budget: Optional[TransferBudget] = None, checksum: Optional[str] = None
+) -> bool:
+    # pylint: disable=too-many-arguments
+    """
+    Download a file with SFTP.
+
+    The file is skipped if the destination already exists with the same size as the remote file and, if provided,
+    the same SHA-256 digest. The file is downloaded to `<destination>.part` which is renamed when the download
+    is complete: an existing partial file is resumed.
+
+    Args:
+        sftp: SFTP client session
+        source: Remote path of the file
+        destination: Local path of the file
+        fileio: AsyncFileIO instance used for the local file operations
+        budget: Concurrency and bandwidth budget of the transfer
+        checksum: SHA-256 digest of the remote file, if known
+
+    Returns:
+        True if the file has been downloaded, False if the file has been skipped.
+    """
+    size = (await sftp.stat(str(source))).size or 0
+    if destination.is_file() and destination.stat().st_size == size:
+        if checksum is None or await fileio.run(sha256sum, destination) == checksum:
+            logger.info(f"Skipping '{source}': '{destination}' already exists")
+            return False
+        logger.warning(f"'{destination}' differs from '{source}': downloading it again")
+    partial = destination.with_name(f"{destination.name}{PARTIAL_SUFFIX}")
+    offset = partial.stat().st_size if partial.is_file() else 0
+    if offset > size:
+        offset = 0
+    if offset:
+        logger.info(f"Resuming download of '{source}' at {offset}/{size} bytes")
+    else:
+        await fileio.run(partial.write_bytes, b"")
+    async with (budget or TransferBudget()).slot():
+        async with sftp.open(str(source), "rb") as file:
+            while offset < size:
+                data = await file.read(CHUNK_SIZE, offset)
+                if not data:
+                    break
+                await fileio.run(_append, partial, data)
+                offset += len(data)
+                if budget is not None:
+                    await budget.consume(len(data))
+    if offset != size:
+        raise OSError(f"Download of '{source}' is incomplete: {offset}/{size} bytes")
+    if checksum is not None and await fileio.run(sha256sum, partial) != checksum:
+        await fileio.run(partial.unlink)
+        raise OSError(f"Checksum of '{source}' does not match after download")
+    await fileio.run(partial.replace, destination)
+    logger.info(f"Downloaded '{source}' to '{destination}' ({size} bytes)")
+    return True
@@ -0,0 +1,351 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tracing of the ANTA runs.
+
+ANTA records spans, i.e. timed operations with a parent span, for the main steps of a run: the inventory connection,
+the refresh of each device, each test with its command collection and evaluation, and each eAPI or SSH request.
+The spans are exported in batches, in a background thread, by the exporters of the tracer:
+
+- `JsonFileExporter` writes one JSON line per span to a file.
+- `OtlpExporter` sends the spans to an OpenTelemetry collector with the OTLP/HTTP JSON protocol.
+
+Tracing is disabled unless a tracer is set with `set_tracer()`. When disabled, `span()` returns a shared no-op
+context manager and nothing is recorded.
+
+Examples:
+    ```python
+    tracer = Tracer([OtlpExporter("http://localhost:4318")])
+    set_tracer(tracer)
+    try:
+        asyncio.run(main(manager, inventory, catalog))
+    finally:
+        set_tracer(None)
+        tracer.shutdown()
+    ```
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from functools import wraps
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, ContextManager, Coroutine, Optional, Sequence, TypeVar, Union
+
+from anta import __version__
+from anta.tools.misc import exc_to_str
+
+logger = logging.getLogger(__name__)
+
+AttributeValue = Union[str, int, float, bool]
+T = TypeVar("T")
+
+# Span currently active in the running task or thread
+_current_span: ContextVar[Optional[Span]] = ContextVar("anta_current_span", default=None)
+# Tracer used by span(), None when tracing is disabled
+_tracer: Optional[Tracer] = None
+# Shared no-op context manager returned by span() when tracing is disabled
+_NO_SPAN: ContextManager[None] = nullcontext()
+
+
+class Span:
+    """
+    Timed operation of an ANTA run.
+
+    A span is a context manager: it starts when entering the context and ends when exiting it. The spans started
+    within the context, including in the asyncio tasks created within the context, are its children.
+
+    Attributes:
+        name: Name of the operation, e.g. `anta.test`
+        attributes: Attributes of the operation, e.g. the device name
+        trace_id: 128-bit identifier of the trace, shared by all the spans of a root span
+        span_id: 64-bit identifier of the span
+        parent_id: Identifier of the parent span, None for a root span
+        start: Start time in nanoseconds since the epoch
+        end: End time in nanoseconds since the epoch
+        error: Error message if the operation raised an exception
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id", "start", "end", "error", "_tracer", "_token")
+
+    def __init__(self, tracer: Tracer, name: str, attributes: dict[str, AttributeValue]) -> None:
+        self.name = name
+        self.attributes = attributes
+        parent = _current_span.get()
+        self.trace_id: int = parent.trace_id if parent is not None else random.getrandbits(128)
+        self.span_id: int = random.getrandbits(64)
+        self.parent_id: Optional[int] = parent.span_id if parent is not None else None
+        self.start = 0
+        self.end = 0
+        self.error: Optional[str] = None
+        self._tracer = tracer
+        self._token: Optional[Token[Optional[Span]]] = None
+
+    def __enter__(self) -> Span:
+        self.start = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        self.end = time.time_ns()
+        if self._token is not None:
+            _current_span.reset(self._token)
+        if exc_value is not None:
+            self.error = exc_to_str(exc_value)
+        self._tracer.finish(self)
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Set an attribute of the span"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the span as a dictionary, with hexadecimal identifiers like OpenTelemetry"""
+        return {
+            "name": self.name,
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_id": f"{self.parent_id:016x}" if self.parent_id is not None else None,
+            "start_time_unix_nano": self.start,
+            "end_time_unix_nano": self.end,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter(ABC):
+    """
+    Export the spans of a Tracer.
+
+    The methods of an exporter are called from a single background thread.
+    """
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """Export a batch of ended spans"""
+
+    def shutdown(self) -> None:
+        """Release the resources of the exporter. The default implementation does nothing."""
+
+
+class JsonFileExporter(SpanExporter):
+    """Write one JSON line per span to a file"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Constructor of JsonFileExporter
+
+        Args:
+            path: Path of the file, overwritten if it exists
+
+        Raises:
+            OSError: The file cannot be opened.
+        """
+        self.path = path
+        self._file = open(path, "w", encoding="UTF-8")  # pylint: disable=consider-using-with
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Write the spans to the file"""
+        self._file.writelines(f"{json.dumps(span.to_dict())}\n" for span in spans)
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        """Close the file"""
+        self._file.close()
+
+
+def _otlp_value(value: AttributeValue) -> dict[str, Any]:
+    """Return an attribute value in the OTLP JSON encoding"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are encoded as strings in OTLP JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter(SpanExporter):
+    """
+    Send the spans to an OpenTelemetry collector with the OTLP/HTTP protocol, JSON encoded.
+
+    Export errors are logged and the spans are dropped: tracing never fails an ANTA run.
+    """
+
+    # OTLP span kind INTERNAL and status codes
+    SPAN_KIND_INTERNAL = 1
+    STATUS_CODE_OK = 1
+    STATUS_CODE_ERROR = 2
+
+    def __init__(self, endpoint: str, headers: Optional[dict[str, str]] = None, service_name: str = "anta", timeout: float = 10.0) -> None:
+        """
+        Constructor of OtlpExporter
+
+        Args:
+            endpoint: URL of the collector, e.g. `http://localhost:4318`. The `/v1/traces` path is added if missing.
+            headers: HTTP headers of the requests, e.g. for authentication
+            service_name: Value of the `service.name` resource attribute
+            timeout: Timeout of the requests in seconds
+        """
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        self.service_name = service_name
+        self._client = httpx.Client(headers=headers, timeout=timeout)
+
+    def encode(self, spans: Sequence[Span]) -> dict[str, Any]:
+        """Return the OTLP JSON request body of a batch of spans"""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "anta", "version": __version__},
+                            "spans": [
+                                {
+                                    "traceId": f"{span.trace_id:032x}",
+                                    "spanId": f"{span.span_id:016x}",
+                                    **({"parentSpanId": f"{span.parent_id:016x}"} if span.parent_id is not None else {}),
+                                    "name": span.name,
+                                    "kind": self.SPAN_KIND_INTERNAL,
+                                    "startTimeUnixNano": str(span.start),
+                                    "endTimeUnixNano": str(span.end),
+                                    "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                                    "status": ({"code": self.STATUS_CODE_ERROR, "message": span.error} if span.error is not None else {"code": self.STATUS_CODE_OK}),
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Send the spans to the collector"""
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        try:
+            response = self._client.post(self.url, json=self.encode(spans))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Cannot export {len(spans)} span(s) to '{self.url}': {exc_to_str(e)}")
+
+    def shutdown(self) -> None:
+        """Close the HTTP connections"""
+        self._client.close()
+
+
+class Tracer:
+    """
+    Record spans and export them in batches.
+
+    Attributes:
+        exporters: Exporters of the spans
+        batch_size: Number of ended spans exported at once
+    """
+
+    def __init__(self, exporters: Sequence[SpanExporter], batch_size: int = 512) -> None:
+        """
+        Constructor of Tracer
+
+        Args:
+            exporters: Exporters of the spans
+            batch_size: Number of ended spans exported at once. Defaults to 512.
+        """
+        self.exporters = list(exporters)
+        self.batch_size = batch_size
+        self._spans: list[Span] = []
+        self._futures: list[Future[None]] = []
+        # The spans are exported in a single background thread to keep the order of the batches
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="anta-tracing")
+
+    def span(self, name: str, **attributes: AttributeValue) -> Span:
+        """Return a new span, child of the current span"""
+        return Span(self, name, attributes)
+
+    def finish(self, ended: Span) -> None:
+        """Record an ended span"""
+        self._spans.append(ended)
+        if len(self._spans) >= self.batch_size:
+            self.flush()
+
+    def _export(self, spans: list[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Exporters are potentially user-defined code
+                logger.warning(f"Cannot export spans with {exporter.__class__.__name__}: {exc_to_str(e)}")
+
+    def flush(self) -> None:
+        """Export the ended spans in the background thread"""
+        if self._spans:
+            spans, self._spans = self._spans, []
+            self._futures = [future for future in self._futures if not future.done()]
+            self._futures.append(self._executor.submit(self._export, spans))
+
+    def shutdown(self) -> None:
+        """Export the remaining spans, wait for the exports to complete and shut down the exporters"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Enable tracing with a tracer, or disable it with None"""
+    global _tracer  # pylint: disable=global-statement
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the tracer, None if tracing is disabled"""
+    return _tracer
+
+
+def span(name: str, **attributes: AttributeValue) -> ContextManager[Optional[Span]]:
+    """
+    Return a span to use as a context manager, child of the current span.
+
+    Args:
+        name: Name of the operation
+        attributes: Attributes of the operation
+
+    Returns:
+        A new Span if tracing is enabled, a no-op context manager otherwise.
+    """
+    if _tracer is None:
+        return _NO_SPAN
+    return _tracer.span(name, **attributes)
+
+
+def traced(name: str) -> Callable[[Callable[..., Coroutine[Any, Any, T]]], Callable[..., Coroutine[Any, Any, T]]]:
+    """
+    Decorator running a coroutine function in a span.
+
+    Args:
+        name: Name of the span
+    """
+
+    def decorator(function: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+        @wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with span(name):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,280 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Continuous runs of the ANTA tests, used by `anta watch`.
+
+The inventory is connected and the tests of the catalog are selected and validated once. The tests are then run in
+cycles, keeping the device connections open between cycles. Each test is run at its own interval: the default interval,
+or the interval of the first WatchInterval rule matching the test. A cycle runs the tests that are due and reports only
+the test results that changed since the previous run of each test.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from fnmatch import fnmatchcase
+
+# Need to keep List for pydantic in python 3.8
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
+
+from pydantic import BaseModel, PositiveFloat
+
+from anta import tracing
+from anta.catalog import AntaCatalog, AntaTestDefinition
+from anta.device import AntaDevice
+from anta.diff import ResultChange, compare_result
+from anta.inventory import AntaInventory
+from anta.result_manager.models import TestResult
+from anta.runner import instantiate_test, prepare_tests
+
+if TYPE_CHECKING:
+    from anta.metrics import AntaMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class WatchInterval(BaseModel):
+    """
+    Run interval of the tests matching a pattern.
+
+    Attributes:
+        pattern: Case-insensitive shell-style pattern matched against the test name, the test categories and the
+                 name of the Python module of the test, e.g. `VerifyBGP*`, `hardware` or `anta.tests.routing.*`
+        interval: Run interval of the matching tests in seconds
+    """
+
+    pattern: str
+    interval: PositiveFloat
+
+    @staticmethod
+    def parse(value: str) -> WatchInterval:
+        """
+        Create a WatchInterval from a `PATTERN=SECONDS` string.
+
+        Raises:
+            ValueError: The string is not a valid `PATTERN=SECONDS` string.
+        """
+        pattern, sep, interval = value.rpartition("=")
+        if not sep or not pattern:
+            raise ValueError(f"Invalid test interval '{value}', expected PATTERN=SECONDS")
+        return WatchInterval(pattern=pattern, interval=interval)  # type: ignore[arg-type]
+
+    def matches(self, definition: AntaTestDefinition) -> bool:
+        """Return True if the pattern matches the test of a test definition"""
+        test = definition.test
+        module = test.__module__
+        names = (test.name, *test.categories, module, module.rsplit(".", maxsplit=1)[-1])
+        return any(fnmatchcase(name.lower(), self.pattern.lower()) for name in names)
+
+
+class WatchCycle(BaseModel):
+    """
+    Results of a cycle of `AntaWatcher`.
+
+    Attributes:
+        cycle: Number of the cycle, starting at 1
+        start: Start time of the cycle
+        duration: Duration of the cycle in seconds
+        tests: Number of tests run during the cycle
+        changes: Test results that changed since the previous run of each test. All the test results of the first run of a test are reported as `added`.
+    """
+
+    cycle: int
+    start: datetime
+    duration: float
+    tests: int
+    changes: List[ResultChange] = []
+
+
+class _ScheduledTest:  # pylint: disable=too-few-public-methods
+    """A test of the catalog scheduled on a device"""
+
+    def __init__(self, definition: AntaTestDefinition, device: AntaDevice, index: int, interval: float) -> None:
+        self.definition = definition
+        self.device = device
+        # Occurrence of the test on the device, to tell apart the results of a test run multiple times with different inputs
+        self.index = index
+        self.interval = interval
+        self.next_run = 0.0
+        self.result: Optional[TestResult] = None
+
+
+class AntaWatcher:
+    """
+    Run the tests of a catalog continuously.
+
+    Attributes:
+        inventory: Devices to run the tests on
+        catalog: Tests to run
+        tags: Tags to filter the devices and the tests
+        interval: Default run interval of the tests in seconds
+        intervals: Run interval rules. The first rule matching a test sets its run interval.
+        on_cycle: Function called with the results of each cycle
+        metrics: Prometheus metrics updated with the test results and the device statistics of each cycle
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        inventory: AntaInventory,
+        catalog: AntaCatalog,
+        tags: Optional[list[str]] = None,
+        interval: float = 300.0,
+        intervals: Sequence[WatchInterval] = (),
+        on_cycle: Optional[Callable[[WatchCycle], None]] = None,
+        metrics: Optional[AntaMetrics] = None,
+    ) -> None:
+        """
+        Constructor of AntaWatcher
+
+        Args:
+            inventory: Devices to run the tests on
+            catalog: Tests to run
+            tags: Tags to filter the devices and the tests. Defaults to None.
+            interval: Default run interval of the tests in seconds. Defaults to 300.
+            intervals: Run interval rules. The first rule matching a test sets its run interval.
+            on_cycle: Function called with the results of each cycle. Defaults to None.
+            metrics: Prometheus metrics updated after each cycle. Defaults to None.
+        """
+        # pylint: disable=too-many-arguments
+        self.inventory = inventory
+        self.catalog = catalog
+        self.tags = tags
+        self.interval = interval
+        self.intervals = list(intervals)
+        self.on_cycle = on_cycle
+        self.metrics = metrics
+        self.cycles = 0
+        self._tests: list[_ScheduledTest] = []
+        self._unreachable: set[str] = set()
+        self._triggered = False
+        self._stopped = False
+        # asyncio.Event must be created in the running event loop with Python < 3.10
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def results(self) -> list[TestResult]:
+        """Latest result of each test that has been run"""
+        return [test.result for test in self._tests if test.result is not None]
+
+    def get_interval(self, definition: AntaTestDefinition) -> float:
+        """Return the run interval of a test in seconds"""
+        for rule in self.intervals:
+            if rule.matches(definition):
+                return rule.interval
+        return self.interval
+
+    def trigger(self) -> None:
+        """Run all the tests now, regardless of their interval"""
+        self._triggered = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stop(self) -> None:
+        """Stop running the tests after the current cycle"""
+        self._stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _schedule(self) -> None:
+        """Select the tests to run on each device of the inventory"""
+        devices = list(self.inventory.get_inventory(established_only=False, tags=self.tags).values())
+        # Sort the tests so that the occurrences of a test on a device keep the same index across cycles
+        tests = sorted(prepare_tests(devices, self.catalog, self.tags), key=lambda test: (test[1].name, test[0].test.name))
+        occurrences: dict[tuple[str, str], int] = {}
+        for definition, device in tests:
+            key = (device.name, definition.test.name)
+            index = occurrences.get(key, 0)
+            occurrences[key] = index + 1
+            self._tests.append(_ScheduledTest(definition, device, index, self.get_interval(definition)))
+
+    async def _refresh(self, devices: set[AntaDevice]) -> None:
+        """Refresh the devices that are not established, e.g. devices that were offline during the previous cycle"""
+        await asyncio.gather(*(device.refresh() for device in devices if not device.established), return_exceptions=True)
+        for device in devices:
+            if not device.established and device.name not in self._unreachable:
+                logger.warning(f"Device {device.name} is not established, its tests are skipped until it is reachable")
+                self._unreachable.add(device.name)
+            elif device.established and device.name in self._unreachable:
+                logger.info(f"Device {device.name} is established again")
+                self._unreachable.discard(device.name)
+
+    @tracing.traced("anta.watch.cycle")
+    async def _run_cycle(self, tests: list[_ScheduledTest]) -> WatchCycle:
+        """Run the tests of a cycle and return the changed test results"""
+        start, begin = datetime.now(), time.perf_counter()
+        devices = {test.device for test in tests}
+        await self._refresh(devices)
+        for device in devices:
+            # Command outputs are cached during a cycle only
+            if device.cache is not None:
+                await device.cache.clear()
+        scheduled = []
+        coros = []
+        for test in tests:
+            if not test.device.established:
+                continue
+            instance = instantiate_test(test.definition, test.device)
+            if instance is not None:
+                scheduled.append(test)
+                coros.append(instance.test())
+        results = await asyncio.gather(*coros)
+        self.cycles += 1
+        cycle = WatchCycle(cycle=self.cycles, start=start, duration=0.0, tests=len(results))
+        for test, result in zip(scheduled, results):
+            change = compare_result(test.result, result, test.index)
+            if change is not None:
+                cycle.changes.append(change)
+            test.result = result
+        cycle.duration = time.perf_counter() - begin
+        if self.metrics is not None:
+            self.metrics.observe(results)
+            self.metrics.update_devices(devices)
+        logger.debug(f"Cycle {cycle.cycle}: {cycle.tests} test(s) run in {cycle.duration:.3f}s, {len(cycle.changes)} change(s)")
+        return cycle
+
+    async def run(self, cycles: Optional[int] = None) -> None:
+        """
+        Run the tests until stop() is called.
+
+        Args:
+            cycles: Number of cycles to run before returning. Defaults to None, i.e. run until stop() is called.
+        """
+        if len(self.catalog) == 0:
+            logger.info("The list of tests is empty, exiting")
+            return
+        if len(self.inventory) == 0:
+            logger.info("The inventory is empty, exiting")
+            return
+        self._schedule()
+        if not self._tests:
+            logger.info(f"There is no tests{f' matching the tags {self.tags} ' if self.tags else ' '}to run on current inventory. Exiting...")
+            return
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        await self.inventory.connect_inventory()
+        logger.info(f"Watching {len(self._tests)} test(s) on {len({test.device.name for test in self._tests})} device(s)...")
+        try:
+            while not self._stopped and (cycles is None or self.cycles < cycles):
+                now = loop.time()
+                due = [test for test in self._tests if self._triggered or test.next_run <= now]
+                self._triggered = False
+                if due:
+                    for test in due:
+                        test.next_run = now + test.interval
+                    cycle = await self._run_cycle(due)
+                    if self.on_cycle is not None:
+                        self.on_cycle(cycle)
+                    continue
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(test.next_run for test in self._tests) - now)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Close the connections kept open by the devices between the cycles
+            await self.inventory.disconnect_inventory()
@@ -0,0 +1,244 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Detection of the tests blocking the asyncio event loop during the ANTA runs.
+
+ANTA runs the tests concurrently in a single asyncio event loop: while a test runs synchronous code, e.g. the evaluation of a large
+command output by its `test()` method, the event loop cannot send the requests of the other tests nor read their responses.
+
+`LoopWatchdog` measures the event loop lag while a coroutine function decorated with `monitored()`, e.g. `anta.runner.main()`, runs.
+When the event loop is late, a watchdog thread samples the stack of the event loop thread to find the `AntaTest` instance running,
+so that the blocking is attributed to its test class. Optionally, the `test()` evaluation of the test classes that blocked the event loop
+is moved to worker threads for the rest of the run.
+
+Examples:
+    ```python
+    watchdog = LoopWatchdog(threshold=0.1, offload=True)
+    set_watchdog(watchdog)
+    try:
+        asyncio.run(main(manager, inventory, catalog))
+    finally:
+        set_watchdog(None)
+    ```
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, NamedTuple, Optional, Tuple, Type, TypeVar
+
+if TYPE_CHECKING:
+    from anta.models import AntaTest
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Watchdog used by monitored() and evaluation_executor(), None when the watchdog is disabled
+_watchdog: Optional[LoopWatchdog] = None
+
+# Default duration in seconds above which a blocked event loop is reported
+DEFAULT_THRESHOLD = 0.1
+
+# Name of the blocking sections that are not attributed to a test, e.g. the instantiation of the tests by the runner
+UNATTRIBUTED = "<unattributed>"
+
+# Test class and device name of a test found in the stack of the event loop thread
+Suspect = Tuple[Type["AntaTest"], str]
+
+
+class BlockingStats(NamedTuple):
+    """Blocking sections of the event loop attributed to a test class"""
+
+    test: str
+    times: int
+    total: float
+    maximum: float
+
+
+class LoopWatchdog:
+    """
+    Detect the tests blocking the asyncio event loop.
+
+    A heartbeat task of the event loop records its time every `interval` seconds. The watchdog thread samples the stack of the event loop thread
+    when the heartbeat is late, and a blocking section is recorded when the event loop lag is above `threshold` seconds.
+
+    Attributes:
+        threshold: Event loop lag in seconds above which the event loop is considered blocked
+        interval: Heartbeat and sampling interval in seconds
+        offload: Move the evaluation of the test classes that blocked the event loop to worker threads
+        blocking: Durations in seconds of the blocking sections by test name
+        offloaded: Test classes evaluated in worker threads
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, interval: float = 0.01, offload: bool = False, workers: int | None = None) -> None:
+        """
+        Constructor of LoopWatchdog
+
+        Args:
+            threshold: Event loop lag in seconds above which the event loop is considered blocked. Defaults to 100ms.
+            interval: Heartbeat and sampling interval in seconds. Defaults to 10ms.
+            offload: Move the evaluation of the test classes that blocked the event loop to worker threads. Defaults to False.
+            workers: Maximum number of worker threads. Defaults to None, i.e. the ThreadPoolExecutor default.
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.offload = offload
+        self.workers = workers
+        self.blocking: dict[str, list[float]] = {}
+        self.offloaded: set[type[AntaTest]] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._suspects: Counter[Suspect] = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._loop_thread = 0
+        self._beat = 0.0
+
+    def start(self) -> None:
+        """Start watching the running event loop"""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        if self.offload:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="anta-evaluation")
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="anta-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop watching the event loop and wait for the worker threads"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # The event loop may have been blocked right before the watchdog is stopped
+            self._check()
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def executor(self, test: type[AntaTest]) -> Optional[Executor]:
+        """Return the executor evaluating a test class, None if the test class is evaluated in the event loop"""
+        return self._executor if test in self.offloaded else None
+
+    def statistics(self) -> list[BlockingStats]:
+        """Return the blocking sections by test, the test blocking the event loop the longest first"""
+        stats = [BlockingStats(test=test, times=len(durations), total=sum(durations), maximum=max(durations)) for test, durations in self.blocking.items()]
+        return sorted(stats, key=lambda stat: stat.total, reverse=True)
+
+    def report(self) -> None:
+        """Log the tests that blocked the event loop"""
+        stats = [stat for stat in self.statistics() if stat.test != UNATTRIBUTED]
+        if stats:
+            tests = ", ".join(f"{stat.test} {stat.times} time(s) ({stat.total:.2f}s in total, max {stat.maximum * 1000:.0f}ms)" for stat in stats)
+            logger.warning(f"Tests blocking the event loop for more than {self.threshold * 1000:g}ms: {tests}")
+        if UNATTRIBUTED in self.blocking:
+            durations = self.blocking[UNATTRIBUTED]
+            logger.debug(f"The event loop was blocked {len(durations)} time(s) ({sum(durations):.2f}s in total) outside of the tests")
+
+    async def _heartbeat(self) -> None:
+        """Measure the event loop lag until cancelled"""
+        while True:
+            # The first check measures the lag since start(), the task may start after a blocking section
+            self._check()
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _check(self) -> None:
+        """Record a blocking section if the event loop lag since the last heartbeat is above the threshold"""
+        lag = time.monotonic() - self._beat - self.interval
+        with self._lock:
+            suspects, self._suspects = self._suspects, Counter()
+        if lag >= self.threshold:
+            self._record(lag, suspects)
+
+    def _watch(self) -> None:
+        """Sample the stack of the event loop thread while the heartbeat is late, until stopped"""
+        while not self._stop.wait(self.interval):
+            # Start sampling before the threshold to attribute the short blocking sections
+            if time.monotonic() - self._beat - self.interval < self.threshold / 2:
+                continue
+            if (suspect := self._running_test()) is not None:
+                with self._lock:
+                    self._suspects[suspect] += 1
+
+    def _running_test(self) -> Optional[Suspect]:
+        """Return the test class and the device of the innermost AntaTest instance in the stack of the event loop thread"""
+        # Deferred import as anta.models uses this module
+        from anta.models import AntaTest  # pylint: disable=import-outside-toplevel
+
+        frame = sys._current_frames().get(self._loop_thread)  # pylint: disable=protected-access
+        while frame is not None:
+            if isinstance(candidate := frame.f_locals.get("self"), AntaTest):
+                return type(candidate), candidate.device.name
+            frame = frame.f_back
+        return None
+
+    def _record(self, lag: float, suspects: Counter[Suspect]) -> None:
+        """Attribute a blocking section to the test found the most often in the stack of the event loop thread"""
+        if not suspects:
+            self.blocking.setdefault(UNATTRIBUTED, []).append(lag)
+            return
+        (test, device), _ = suspects.most_common(1)[0]
+        if test.name not in self.blocking:
+            message = f"Test {test.name} blocked the event loop for {lag * 1000:.0f}ms on device {device}, delaying the other tests"
+            if self.offload:
+                message += ": its evaluation is moved to worker threads for the rest of the run"
+            logger.warning(message)
+        self.blocking.setdefault(test.name, []).append(lag)
+        if self.offload:
+            self.offloaded.add(test)
+
+
+def set_watchdog(watchdog: Optional[LoopWatchdog]) -> None:
+    """Enable the event loop watchdog, or disable it with None"""
+    global _watchdog  # pylint: disable=global-statement
+    _watchdog = watchdog
+
+
+def get_watchdog() -> Optional[LoopWatchdog]:
+    """Return the event loop watchdog, None if the watchdog is disabled"""
+    return _watchdog
+
+
+def evaluation_executor(test: AntaTest) -> Optional[Executor]:
+    """Return the executor to run the `test()` evaluation of a test in, None to run it in the event loop"""
+    if _watchdog is None:
+        return None
+    return _watchdog.executor(type(test))
+
+
+def monitored(function: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+    """Decorator watching the event loop while a coroutine function runs, if a watchdog is set"""
+
+    @wraps(function)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        watchdog = _watchdog
+        if watchdog is None:
+            return await function(*args, **kwargs)
+        watchdog.start()
+        try:
+            return await function(*args, **kwargs)
+        finally:
+            await watchdog.stop()
+            watchdog.report()
+
+    return wrapper
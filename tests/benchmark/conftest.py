@@ -0,0 +1,14 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+conftest.py - fixtures of the ANTA benchmarks
+
+The benchmarks require pytest-benchmark and are not collected if it is not installed.
+"""
+from __future__ import annotations
+
+import importlib.util
+
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
@@ -0,0 +1,37 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Benchmarks of the evaluation of the ANTA tests against recorded outputs
+"""
+from __future__ import annotations
+
+import asyncio
+from copy import deepcopy
+from types import ModuleType
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from anta.device import AntaDevice
+from tests.benchmark.utils import anta_tests_modules
+from tests.units import anta_tests
+
+MODULES = anta_tests_modules()
+
+
+@pytest.mark.parametrize("module", MODULES, ids=[f"anta.tests.{module.__name__[len(anta_tests.__name__) + 1 :].replace('test_', '')}" for module in MODULES])
+def test_anta_tests(benchmark: BenchmarkFixture, device: AntaDevice, module: ModuleType) -> None:
+    """
+    Benchmark the input validation and the evaluation of the tests of an `anta.tests` module against the outputs
+    recorded in the DATA of its unit tests
+    """
+
+    async def evaluate() -> list[Any]:
+        # Some tests modify the command outputs in place, e.g. VerifySTPBlockedPorts
+        instances = [data["test"](device, inputs=data["inputs"], eos_data=deepcopy(data["eos_data"])) for data in module.DATA]
+        return await asyncio.gather(*(instance.test() for instance in instances))
+
+    results = benchmark(lambda: asyncio.run(evaluate()))
+    assert [result.result for result in results] == [data["expected"]["result"] for data in module.DATA]
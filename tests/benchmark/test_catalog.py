@@ -0,0 +1,74 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Benchmarks of anta.catalog
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from anta.catalog import AntaCatalog
+
+
+def synthetic_catalog(size: int) -> dict[str, Any]:
+    """Return a raw test catalog with `size` test definitions spread over several modules"""
+    tests: list[dict[str, Any]] = []
+    data: dict[str, Any] = {
+        "anta.tests.system": tests,
+        "anta.tests.interfaces": [],
+        "anta.tests.routing.bgp": [],
+    }
+    for index in range(size):
+        tags = [f"pod{index % 10}"]
+        if index % 3 == 0:
+            tests.append({"VerifyUptime": {"minimum": index, "filters": {"tags": tags}}})
+        elif index % 3 == 1:
+            data["anta.tests.interfaces"].append(
+                {"VerifyInterfacesStatus": {"interfaces": [{"interface": f"Ethernet{i}", "state": "up"} for i in range(1, 9)], "filters": {"tags": tags}}}
+            )
+        else:
+            data["anta.tests.routing.bgp"].append(
+                {
+                    "VerifyBGPPeersHealth": {
+                        "address_families": [{"afi": "ipv4", "safi": "unicast", "vrf": "default"}, {"afi": "evpn"}],
+                        "filters": {"tags": tags},
+                    }
+                }
+            )
+    return data
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+def test_catalog_parse(benchmark: BenchmarkFixture, tmp_path: Path, size: int) -> None:
+    """
+    Benchmark AntaCatalog.parse() with a large catalog file: YAML loading, test import and input validation
+    """
+    path = tmp_path / "catalog.yml"
+    path.write_text(yaml.safe_dump(synthetic_catalog(size)), encoding="UTF-8")
+    catalog = benchmark(AntaCatalog.parse, path)
+    assert len(catalog) == size
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+def test_catalog_from_dict(benchmark: BenchmarkFixture, size: int) -> None:
+    """
+    Benchmark AntaCatalog.from_dict() with a large catalog: input validation only
+    """
+    data = synthetic_catalog(size)
+    catalog = benchmark(AntaCatalog.from_dict, data)
+    assert len(catalog) == size
+
+
+def test_catalog_get_tests_by_tags(benchmark: BenchmarkFixture) -> None:
+    """
+    Benchmark the selection of the tests by tags of a large catalog
+    """
+    catalog = AntaCatalog.from_dict(synthetic_catalog(10000))
+    tests = benchmark(catalog.get_tests_by_tags, ["pod1", "pod2"])
+    assert len(tests) == 2000
@@ -0,0 +1,31 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Benchmarks of anta.inventory
+"""
+from __future__ import annotations
+
+from ipaddress import ip_address
+from pathlib import Path
+
+import pytest
+import yaml
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from anta.inventory import AntaInventory
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+def test_inventory_parse_ranges(benchmark: BenchmarkFixture, tmp_path: Path, size: int) -> None:
+    """
+    Benchmark AntaInventory.parse() with large address ranges and networks
+    """
+    start = ip_address("10.0.0.0")
+    ranges = [{"start": str(start + offset), "end": str(start + offset + 249), "tags": [f"pod{offset // 250}"]} for offset in range(0, size // 2, 250)]
+    # Half of the devices from networks, half from ranges
+    networks = [{"network": f"172.{16 + index // 256}.{index % 256}.0/24", "tags": ["network"]} for index in range(size // 2 // 256 + 1)]
+    path = tmp_path / "inventory.yml"
+    path.write_text(yaml.safe_dump({"anta_inventory": {"ranges": ranges, "networks": networks}}), encoding="UTF-8")
+    inventory = benchmark(AntaInventory.parse, path, username="anta", password="anta")
+    assert len(inventory) >= size
@@ -0,0 +1,73 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Benchmarks of anta.result_manager and anta.reporter
+"""
+from __future__ import annotations
+
+import io
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from rich.console import Console
+
+from anta.reporter import ReportTable
+from anta.result_manager import ResultManager
+from tests.benchmark.utils import make_results
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+def test_result_manager_add(benchmark: BenchmarkFixture, size: int) -> None:
+    """
+    Benchmark the ingestion of test results by ResultManager
+    """
+    results = make_results(size)
+
+    def add() -> ResultManager:
+        manager = ResultManager()
+        for result in results:
+            manager.add_test_result(result)
+        return manager
+
+    manager = benchmark(add)
+    assert len(manager) == size
+
+
+@pytest.fixture(name="manager")
+def result_manager() -> ResultManager:
+    """Return a ResultManager with 5k test results"""
+    manager = ResultManager()
+    manager.add_test_results(make_results(5000))
+    return manager
+
+
+def test_result_manager_json(benchmark: BenchmarkFixture, manager: ResultManager) -> None:
+    """
+    Benchmark the JSON serialization of the test results
+    """
+    assert benchmark(manager.get_json_results)
+
+
+@pytest.mark.parametrize(
+    "report",
+    [
+        pytest.param(lambda reporter, manager: [reporter.report_all(manager)], id="all"),
+        pytest.param(lambda reporter, manager: [reporter.report_summary_tests(manager)], id="summary tests"),
+        pytest.param(lambda reporter, manager: [reporter.report_summary_hosts(manager)], id="summary hosts"),
+    ],
+)
+def test_report_table(benchmark: BenchmarkFixture, manager: ResultManager, report: object) -> None:
+    """
+    Benchmark the table reports of the test results, including the rendering by rich
+    """
+    reporter = ReportTable()
+
+    def render() -> str:
+        output = io.StringIO()
+        console = Console(file=output, width=200)
+        for table in report(reporter, manager):  # type: ignore[operator]
+            console.print(table)
+        return output.getvalue()
+
+    assert benchmark.pedantic(render, rounds=3)
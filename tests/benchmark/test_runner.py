@@ -0,0 +1,42 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Benchmarks of anta.runner
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from anta.catalog import AntaCatalog
+from anta.inventory import AntaInventory
+from anta.result_manager import ResultManager
+from anta.runner import main
+from tests.benchmark.utils import BenchmarkDevice, recorded_catalog
+from tests.units.anta_tests import test_system
+
+
+@pytest.mark.parametrize("devices, rounds", [pytest.param(1000, 5, id="1000"), pytest.param(10000, 1, id="10000")])
+def test_runner(benchmark: BenchmarkFixture, devices: int, rounds: int) -> None:
+    """
+    Benchmark runner.main() running the anta.tests.system tests on devices returning recorded outputs instantly
+    """
+    catalog, outputs = recorded_catalog(test_system)
+
+    def setup() -> tuple[tuple[ResultManager, AntaInventory, object], dict[str, object]]:
+        # A new inventory for each round so that the device caches are empty
+        inventory = AntaInventory()
+        for index in range(devices):
+            inventory.add_device(BenchmarkDevice(f"leaf{index}", outputs))
+        return (ResultManager(), inventory, catalog), {}
+
+    def run(manager: ResultManager, inventory: AntaInventory, catalog: AntaCatalog) -> ResultManager:
+        asyncio.run(main(manager, inventory, catalog))
+        return manager
+
+    manager = benchmark.pedantic(run, setup=setup, rounds=rounds)
+    assert len(manager) == devices * len(catalog)
+    assert manager.get_status() == "success"
@@ -0,0 +1,97 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+tests.benchmark.utils
+"""
+from __future__ import annotations
+
+import importlib
+import pkgutil
+from types import ModuleType
+from typing import Any, Optional
+
+from anta.catalog import AntaCatalog
+from anta.device import AntaDevice
+from anta.models import AntaCommand
+from anta.result_manager.models import TestResult
+from tests.units import anta_tests
+
+
+# The benchmarked tests only collect commands: copy() and download() are left unimplemented
+class BenchmarkDevice(AntaDevice):  # pylint: disable=abstract-method
+    """AntaDevice returning recorded command outputs instantly"""
+
+    def __init__(self, name: str, outputs: dict[str, Any], tags: Optional[list[str]] = None) -> None:
+        """
+        Constructor of BenchmarkDevice
+
+        Args:
+            name: Device name
+            outputs: Command outputs by command string
+            tags: List of tags for this device
+        """
+        super().__init__(name, tags)
+        self.outputs = outputs
+
+    @property
+    def _keys(self) -> tuple[Any, ...]:
+        return (self.name,)
+
+    async def _collect(self, command: AntaCommand) -> None:
+        command.output = self.outputs[command.command]
+
+    async def refresh(self) -> None:
+        self.is_online = True
+        self.hw_model = "cEOSLab"
+        self.established = True
+
+
+def anta_tests_modules() -> list[ModuleType]:
+    """Return the unit test modules of the ANTA tests running their DATA recorded outputs"""
+    modules = [importlib.import_module(module.name) for module in pkgutil.walk_packages(anta_tests.__path__, f"{anta_tests.__name__}.") if not module.ispkg]
+    # The DATA of a module is only run by the unit tests if the module imports the generic test function
+    return [module for module in modules if hasattr(module, "test")]
+
+
+def success_data(module: ModuleType) -> list[dict[str, Any]]:
+    """Return the first DATA entry expecting a success of each test of a unit test module"""
+    entries: dict[type, dict[str, Any]] = {}
+    for entry in module.DATA:
+        if entry["expected"]["result"] == "success":
+            entries.setdefault(entry["test"], entry)
+    return list(entries.values())
+
+
+def recorded_catalog(module: ModuleType) -> tuple[AntaCatalog, dict[str, Any]]:
+    """
+    Return a catalog of the tests of a unit test module with inputs expecting a success, and their recorded command outputs.
+
+    Args:
+        module: Unit test module of an `anta.tests` module, e.g. `tests.units.anta_tests.test_system`
+
+    Returns:
+        The test catalog and the command outputs by command string
+    """
+    entries = success_data(module)
+    outputs: dict[str, Any] = {}
+    device = BenchmarkDevice("recorder", outputs={})
+    for entry in entries:
+        instance = entry["test"](device, inputs=entry["inputs"], eos_data=entry["eos_data"])
+        outputs.update((command.command, command.output) for command in instance.instance_commands)
+    return AntaCatalog.from_list([(entry["test"], entry["inputs"]) for entry in entries]), outputs
+
+
+def make_results(count: int, devices: int = 100) -> list[TestResult]:
+    """Return test results of various status spread over devices"""
+    statuses = ["success", "success", "success", "failure", "error", "skipped"]
+    results = []
+    for index in range(count):
+        result = TestResult(name=f"leaf{index % devices}", test=f"VerifyTest{index // devices}", categories=["system"], description="Verifies a test")
+        status = statuses[index % len(statuses)]
+        if status == "success":
+            result.is_success()
+        else:
+            getattr(result, f"is_{status}")(f"Test {index} message")
+        results.append(result)
+    return results
@@ -0,0 +1,129 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Local HTTP server emulating the CloudVision inventory REST API
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+CVP_USERNAME = "anta"
+CVP_PASSWORD = "anta"
+CVP_TOKEN = "dummy-token"
+CVP_CONTAINERS: list[dict[str, Any]] = [
+    {"key": "container_leaf", "name": "Leaf", "parentContainerId": "root"},
+    {"key": "container_spine", "name": "Spine", "parentContainerId": "root"},
+    {"key": "container_empty", "name": "Empty", "parentContainerId": "root"},
+]
+
+
+def cvp_devices(leaves: int = 240, spines: int = 4) -> list[dict[str, Any]]:
+    """Return CloudVision devices in the Leaf and Spine containers"""
+    devices = []
+    for i in range(leaves + spines):
+        name, container = (f"leaf{i + 1}", CVP_CONTAINERS[0]) if i < leaves else (f"spine{i - leaves + 1}", CVP_CONTAINERS[1])
+        devices.append(
+            {
+                "hostname": name,
+                "fqdn": f"{name}.anta.ninja",
+                "ipAddress": f"10.0.{i // 256}.{i % 256}",
+                "systemMacAddress": f"00:1c:73:00:{i // 256:02x}:{i % 256:02x}",
+                "containerName": container["name"],
+                "parentContainerId": container["key"],
+            }
+        )
+    return devices
+
+
+class CvpStubHandler(BaseHTTPRequestHandler):
+    """Request handler of CvpStubServer"""
+
+    server: CvpStubServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Do not log the requests"""
+
+    def _reply(self, data: Any, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle the login requests"""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path != "/cvpservice/login/authenticate.do":
+            self._reply({}, status=404)
+        elif body == {"userId": CVP_USERNAME, "password": CVP_PASSWORD}:
+            self._reply({"sessionId": CVP_TOKEN})
+        else:
+            self._reply({"errorCode": "112498", "errorMessage": "Unauthorized User"})
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handle the paginated inventory requests"""
+        url = urlparse(self.path)
+        params = {key: value[0] for key, value in parse_qs(url.query, keep_blank_values=True).items()}
+        if self.headers.get("Authorization") != f"Bearer {CVP_TOKEN}":
+            self._reply({}, status=401)
+            return
+        with self.server.lock:
+            self.server.requests.append(url.path)
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(self.server.delay)
+        if url.path == "/cvpservice/provisioning/searchTopology.do":
+            key, items = "containerList", [container for container in CVP_CONTAINERS if params["queryParam"] in container["name"]]
+        elif url.path == "/cvpservice/provisioning/getNetElementList.do":
+            key, items = "netElementList", [device for device in self.server.devices if params["nodeId"] in ("root", device["parentContainerId"])]
+        else:
+            key, items = "", []
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if not key:
+            self._reply({}, status=404)
+            return
+        start, end = int(params["startIndex"]), int(params["endIndex"])
+        self._reply({"total": len(items), key: items[start:end]})
+
+
+class CvpStubServer(ThreadingHTTPServer):
+    """
+    Local HTTP server emulating the CloudVision inventory REST API.
+
+    Attributes:
+        devices: CloudVision devices
+        delay: Latency of the inventory requests in seconds
+        requests: Paths of the inventory requests
+        max_in_flight: Maximum number of inventory requests handled at the same time
+    """
+
+    def __init__(self, devices: list[dict[str, Any]], delay: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), CvpStubHandler)
+        self.devices = devices
+        self.delay = delay
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """URL of the server"""
+        return f"http://{self.server_address[0]!s}:{self.server_address[1]}"
+
+    def __enter__(self) -> CvpStubServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
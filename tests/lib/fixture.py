@@ -4,13 +4,15 @@
 """Fixture for Anta Testing"""
 from __future__ import annotations
 
+import json
 import logging
 import shutil
 from pathlib import Path
 from typing import Any, Callable, Iterator
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from asyncssh import SSHClientConnection
 from click.testing import CliRunner, Result
 from pytest import CaptureFixture
 
@@ -21,6 +23,9 @@ from anta.inventory import AntaInventory
 from anta.models import AntaCommand
 from anta.result_manager import ResultManager
 from anta.result_manager.models import TestResult
+from anta.snapshot import SnapshotArchiveWriter
+from tests.lib.cvp import CvpStubServer, cvp_devices
+from tests.lib.otlp import OtlpStubServer
 from tests.lib.utils import default_anta_env
 
 logger = logging.getLogger(__name__)
@@ -104,6 +109,44 @@ def async_device(request: pytest.FixtureRequest) -> AsyncEOSDevice:
 
 
 # tests.units.result_manager fixtures
+# tests.unit.test_device.py fixture
+@pytest.fixture(params=["directory", "archive"])
+def snapshot_root(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    """
+    Returns the path of the test snapshot, either as a directory or converted to a snapshot archive
+    """
+    snapshot_dir = Path(__file__).parents[1].resolve() / "data" / "test_snapshot"
+    if request.param == "directory":
+        return snapshot_dir
+    archive = tmp_path / "snapshot.anta-snapshot"
+    with SnapshotArchiveWriter(archive) as writer:
+        for path in snapshot_dir.glob("*/*/*"):
+            content = path.read_text(encoding="UTF-8")
+            ofmt = path.parent.name
+            writer.add(path.parent.parent.name, path.stem, ofmt, json.loads(content) if ofmt == "json" else content)
+    return archive
+
+
+# tests.units.cli.get fixture
+@pytest.fixture
+def cvp_server() -> Iterator[CvpStubServer]:
+    """
+    Returns a running local HTTP server emulating the CloudVision inventory REST API
+    """
+    with CvpStubServer(cvp_devices()) as server:
+        yield server
+
+
+# tests.units.test_tracing fixture
+@pytest.fixture
+def otlp_server() -> Iterator[OtlpStubServer]:
+    """
+    Returns a running local HTTP server emulating an OpenTelemetry collector
+    """
+    with OtlpStubServer() as server:
+        yield server
+
+
 @pytest.fixture
 def test_result_factory(device: AntaDevice) -> Callable[[int], TestResult]:
     """
@@ -234,8 +277,8 @@ def click_runner(capsys: CaptureFixture[str]) -> Iterator[CliRunner]:
         return res
 
     # Patch aioeapi methods used by AsyncEOSDevice. See tests/units/test_device.py
-    with patch("aioeapi.device.Device.check_connection", return_value=True), patch("aioeapi.device.Device.cli", side_effect=cli), patch("asyncssh.connect"), patch(
-        "asyncssh.scp"
-    ):
+    with patch("aioeapi.device.Device.check_connection", return_value=True), patch("aioeapi.device.Device.cli", side_effect=cli), patch(
+        "asyncssh.connect", new_callable=AsyncMock, return_value=MagicMock(spec=SSHClientConnection)
+    ), patch("asyncssh.scp"), patch("anta.device.sftp_download", return_value=True):
         console._color_system = None  # pylint: disable=protected-access
         yield AntaCliRunner()
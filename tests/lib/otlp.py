@@ -0,0 +1,79 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Local HTTP server emulating an OpenTelemetry collector receiving traces with OTLP/HTTP JSON
+"""
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class OtlpStubHandler(BaseHTTPRequestHandler):
+    """Request handler of OtlpStubServer"""
+
+    server: OtlpStubServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Do not log the requests"""
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle the trace export requests"""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path != "/v1/traces" or self.headers.get("Content-Type") != "application/json":
+            status = 404
+        elif self.server.status != 200:
+            status = self.server.status
+        else:
+            status = 200
+            with self.server.lock:
+                self.server.requests.append(json.loads(body))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+
+class OtlpStubServer(ThreadingHTTPServer):
+    """
+    Local HTTP server emulating an OpenTelemetry collector.
+
+    Attributes:
+        status: HTTP status of the responses
+        requests: Bodies of the successful export requests
+    """
+
+    def __init__(self, status: int = 200) -> None:
+        super().__init__(("127.0.0.1", 0), OtlpStubHandler)
+        self.status = status
+        self.requests: list[dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """URL of the server"""
+        return f"http://{self.server_address[0]!s}:{self.server_address[1]}"
+
+    @property
+    def spans(self) -> list[dict[str, Any]]:
+        """Spans of the successful export requests"""
+        return [
+            span
+            for request in self.requests
+            for resource_spans in request["resourceSpans"]
+            for scope_spans in resource_spans["scopeSpans"]
+            for span in scope_spans["spans"]
+        ]
+
+    def __enter__(self) -> OtlpStubServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
@@ -35,3 +35,29 @@ def test_catalog(click_runner: CliRunner, catalog_path: Path, expected_exit: int
     result = click_runner.invoke(anta, ["check", "catalog", "-c", str(DATA_DIR / catalog_path)])
     assert result.exit_code == expected_exit
     assert expected_output in result.output
+
+
+@pytest.mark.parametrize(
+    "catalog_path, expected_exit, expected_output",
+    [
+        pytest.param("test_catalog_with_undefined_tests.yml", ExitCode.USAGE_ERROR, "Test catalog is invalid!", id="catalog is not valid"),
+        pytest.param("test_catalog.yml", ExitCode.OK, "Catalog is valid", id="catalog valid"),
+    ],
+)
+def test_catalog_lazy(click_runner: CliRunner, catalog_path: Path, expected_exit: int, expected_output: str) -> None:
+    """
+    Test `anta check catalog -c catalog --catalog-lazy
+    """
+    result = click_runner.invoke(anta, ["check", "catalog", "-c", str(DATA_DIR / catalog_path), "--catalog-lazy"])
+    assert result.exit_code == expected_exit
+    assert expected_output in result.output
+
+
+def test_catalog_multiple(click_runner: CliRunner) -> None:
+    """
+    Test `anta check catalog -c catalog1 -c catalog2
+    """
+    result = click_runner.invoke(anta, ["check", "catalog", "-c", str(DATA_DIR / "test_catalog.yml"), "-c", str(DATA_DIR / "test_catalog_with_tags.yml")])
+    assert result.exit_code == ExitCode.OK
+    assert "VerifyEOSVersion" in result.output
+    assert "VerifyUptime" in result.output
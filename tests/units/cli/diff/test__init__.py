@@ -0,0 +1,30 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.cli.diff
+"""
+from __future__ import annotations
+
+from click.testing import CliRunner
+
+from anta.cli import anta
+from anta.cli.utils import ExitCode
+
+
+def test_anta_diff(click_runner: CliRunner) -> None:
+    """
+    Test anta diff
+    """
+    result = click_runner.invoke(anta, ["diff"])
+    assert result.exit_code == ExitCode.OK
+    assert "Usage: anta diff" in result.output
+
+
+def test_anta_diff_help(click_runner: CliRunner) -> None:
+    """
+    Test anta diff --help
+    """
+    result = click_runner.invoke(anta, ["diff", "--help"])
+    assert result.exit_code == ExitCode.OK
+    assert "Usage: anta diff" in result.output
@@ -0,0 +1,99 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.cli.diff.commands
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from anta.cli import anta
+from anta.cli.utils import ExitCode
+from tests.units.test_diff import SNAPSHOT_AFTER, SNAPSHOT_BEFORE, write_snapshot
+
+if TYPE_CHECKING:
+    from click.testing import CliRunner
+
+
+def write_results(path: Path, statuses: dict[str, str]) -> Path:
+    """Write test results to a JSON file like `anta nrfu json --output`"""
+    results = [
+        {"name": name, "test": "VerifyUptime", "categories": ["system"], "description": "", "result": status, "messages": [], "custom_field": "None"}
+        for name, status in statuses.items()
+    ]
+    path.write_text(json.dumps(results, indent=4), encoding="UTF-8")
+    return path
+
+
+@pytest.mark.parametrize(
+    "after, regressions_only, expected_exit, expected_output",
+    [
+        pytest.param({"leaf1": "success", "leaf2": "success"}, False, ExitCode.OK, "0 test result(s) changed, 0 regression(s), 2 unchanged", id="unchanged"),
+        pytest.param({"leaf1": "success", "leaf2": "failure"}, False, ExitCode.TESTS_FAILED, "1 test result(s) changed, 1 regression(s)", id="regression"),
+        pytest.param({"leaf1": "success", "leaf3": "success"}, True, ExitCode.OK, "0 test result(s) changed, 0 regression(s), 1 unchanged", id="regressions only"),
+    ],
+)
+def test_results(tmp_path: Path, click_runner: CliRunner, after: dict[str, str], regressions_only: bool, expected_exit: int, expected_output: str) -> None:
+    # pylint: disable=too-many-arguments
+    """
+    Test `anta diff results`
+    """
+    before_path = write_results(tmp_path / "before.json", {"leaf1": "success", "leaf2": "success"})
+    after_path = write_results(tmp_path / "after.json", after)
+    output = tmp_path / "diff.json"
+    cli_args = ["diff", "results", str(before_path), str(after_path), "--output", str(output)]
+    if regressions_only:
+        cli_args.append("--regressions-only")
+    result = click_runner.invoke(anta, cli_args)
+    assert result.exit_code == expected_exit
+    assert expected_output in result.output
+    diff = json.loads(output.read_text(encoding="UTF-8"))
+    assert len(diff["changes"]) == int(expected_output.split()[0])
+
+
+def test_results_invalid(tmp_path: Path, click_runner: CliRunner) -> None:
+    """
+    Test `anta diff results` with an invalid file
+    """
+    before_path = write_results(tmp_path / "before.json", {"leaf1": "success"})
+    (tmp_path / "after.json").write_text("{}", encoding="UTF-8")
+    result = click_runner.invoke(anta, ["diff", "results", str(before_path), str(tmp_path / "after.json")])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "Cannot load test results" in result.output
+
+
+@pytest.mark.parametrize(
+    "cli_args, expected_output",
+    [
+        pytest.param([], "4 command output(s) changed, 1 unchanged", id="all"),
+        pytest.param(["--ignore-key", "uptime"], "3 command output(s) changed, 2 unchanged", id="ignore key"),
+        pytest.param(["--device", "leaf1", "-i", "uptime"], "1 command output(s) changed, 2 unchanged", id="device"),
+    ],
+)
+def test_snapshots(tmp_path: Path, click_runner: CliRunner, cli_args: list[str], expected_output: str) -> None:
+    """
+    Test `anta diff snapshots`
+    """
+    before = write_snapshot(tmp_path / "before", SNAPSHOT_BEFORE, archive=False)
+    after = write_snapshot(tmp_path / "after", SNAPSHOT_AFTER, archive=True)
+    output = tmp_path / "diff.json"
+    result = click_runner.invoke(anta, ["diff", "snapshots", str(before), str(after), "--output", str(output), *cli_args])
+    assert result.exit_code == ExitCode.OK
+    assert expected_output in result.output
+    diff: dict[str, Any] = json.loads(output.read_text(encoding="UTF-8"))
+    assert len(diff["changes"]) == int(expected_output.split()[0])
+
+
+def test_snapshots_invalid(tmp_path: Path, click_runner: CliRunner) -> None:
+    """
+    Test `anta diff snapshots` with a file that is not a snapshot
+    """
+    (tmp_path / "file.json").write_text("{}", encoding="UTF-8")
+    result = click_runner.invoke(anta, ["diff", "snapshots", str(tmp_path), str(tmp_path / "file.json")])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "is not a snapshot" in result.output
@@ -15,6 +15,7 @@ import pytest
 from anta.cli import anta
 from anta.cli.exec.commands import clear_counters, collect_tech_support, snapshot
 from anta.cli.utils import ExitCode
+from anta.snapshot import SnapshotArchive
 
 if TYPE_CHECKING:
     from click.testing import CliRunner
@@ -98,6 +99,26 @@ def test_snapshot(tmp_path: Path, click_runner: CliRunner, commands_path: Path |
     assert result.exit_code == ExitCode.OK
 
 
+def test_snapshot_archive(tmp_path: Path, click_runner: CliRunner) -> None:
+    """
+    Test `anta exec snapshot --archive` and `anta nrfu --from-snapshot` with the snapshot archive
+    """
+    archive = tmp_path / "snapshot.anta-snapshot"
+    result = click_runner.invoke(anta, ["exec", "snapshot", "--commands-list", str(COMMAND_LIST_PATH_FILE), "--output", str(archive), "--archive"])
+    assert result.exit_code == ExitCode.OK
+    with SnapshotArchive(archive) as snapshot_archive:
+        assert snapshot_archive.devices == ["dummy", "dummy2", "dummy3"]
+        assert ("dummy", "show version", "json") in snapshot_archive
+
+    result = click_runner.invoke(anta, ["nrfu", "--from-snapshot", str(archive), "json"])
+    assert "ANTA Inventory contains 3 devices (SnapshotDevice)" in result.output
+    assert '"name": "dummy3"' in result.output
+
+    result = click_runner.invoke(anta, ["exec", "snapshot", "--commands-list", str(COMMAND_LIST_PATH_FILE), "--output", str(tmp_path), "--archive"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "is a directory" in result.output
+
+
 @pytest.mark.parametrize(
     "output, latest, configure, tags",
     [
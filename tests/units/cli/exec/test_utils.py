@@ -7,19 +7,26 @@ Tests for anta.cli.exec.utils
 
 from __future__ import annotations
 
+import asyncio
+import json
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from unittest.mock import call, patch
 
 import pytest
 
-from anta.cli.exec.utils import clear_counters_utils  # , collect_commands, collect_scheduled_show_tech
+from anta.cli.exec.utils import clear_counters_utils, collect_commands  # , collect_scheduled_show_tech
 from anta.device import AntaDevice
 from anta.inventory import AntaInventory
 from anta.models import AntaCommand
+from anta.tools.fileio import write_text
 
 if TYPE_CHECKING:
     from pytest import LogCaptureFixture
 
+DATA_DIR: Path = Path(__file__).parents[3].resolve() / "data"
+
 
 # TODO complete test cases
 @pytest.mark.asyncio
@@ -132,3 +139,37 @@ async def test_clear_counters_utils(
                 assert f"Could not clear counters on device {key}: []" in caplog.text
     else:
         mocked_collect.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_collect_commands_loop_lag(tmp_path: Path) -> None:
+    """
+    Test that collect_commands() does not block the event loop while writing the outputs to a slow disk
+    """
+    inventory = AntaInventory.from_snapshot(DATA_DIR / "test_snapshot")
+    disk_latency = 0.2
+
+    def slow_write_text(path: Path, content: str, parents: bool = False) -> None:
+        time.sleep(disk_latency)
+        write_text(path, content, parents=parents)
+
+    max_lag = 0.0
+
+    async def monitor() -> None:
+        nonlocal max_lag
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.005)
+
+    monitor_task = asyncio.create_task(monitor())
+    with patch("anta.tools.fileio.write_text", side_effect=slow_write_text):
+        await collect_commands(inventory, {"json_format": ["show version"], "text_format": ["show version"]}, tmp_path)
+    # Let the monitor measure the lag of the last write
+    await asyncio.sleep(0.01)
+    monitor_task.cancel()
+    assert json.loads((tmp_path / "dummy" / "json" / "show version.json").read_text(encoding="UTF-8"))["version"] == "4.31.1F"
+    assert (tmp_path / "dummy" / "text" / "show version.log").is_file()
+    # dummy2 has no text output in the snapshot
+    assert not (tmp_path / "dummy2" / "text").exists()
+    assert max_lag < disk_latency
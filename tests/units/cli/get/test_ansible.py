@@ -0,0 +1,166 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.cli.get.ansible
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from anta.cli.get.ansible import AnsibleInventoryIndex
+
+DATA_DIR: Path = Path(__file__).parents[3].resolve() / "data"
+
+INDEX_DATA: list[dict[str, Any]] = [
+    {
+        "name": "siblings after a scalar value",
+        "inventory": """
+all:
+  children:
+    LEAFS:
+      vars:
+        type: leaf
+      hosts:
+        leaf1:
+          ansible_host: 10.0.0.1
+          platform: eos
+        leaf2:
+          ansible_host: 10.0.0.2
+""",
+        "groups": ["LEAFS"],
+        "expected": {"hosts": {"leaf1": "10.0.0.1", "leaf2": "10.0.0.2"}, "tags": {"leaf1": ["LEAFS"], "leaf2": ["LEAFS"]}},
+    },
+    {
+        "name": "group defined multiple times",
+        "inventory": """
+all:
+  children:
+    FABRIC:
+      children:
+        SPINES:
+          hosts:
+            spine1:
+              ansible_host: 10.0.0.1
+    EVPN:
+      children:
+        SPINES:
+          hosts:
+            spine2:
+              ansible_host: 10.0.0.2
+""",
+        "groups": ["FABRIC"],
+        "expected": {
+            "hosts": {"spine1": "10.0.0.1", "spine2": "10.0.0.2"},
+            "tags": {"spine1": ["EVPN", "FABRIC", "SPINES"], "spine2": ["EVPN", "FABRIC", "SPINES"]},
+        },
+    },
+    {
+        "name": "host in multiple groups",
+        "inventory": """
+all:
+  children:
+    SPINES:
+      hosts:
+        spine1:
+          ansible_host: 10.0.0.1
+    BGP:
+      hosts:
+        spine1:
+        border1:
+""",
+        "groups": ["SPINES", "BGP"],
+        "expected": {"hosts": {"spine1": "10.0.0.1", "border1": None}, "tags": {"spine1": ["BGP", "SPINES"], "border1": ["BGP"]}},
+    },
+    {
+        "name": "anchors and merge keys",
+        "inventory": """
+all:
+  hosts:
+    leaf1: &leaf1
+      ansible_host: 10.0.0.1
+  children:
+    LEAFS: &leafs
+      hosts:
+        leaf1: *leaf1
+        leaf2:
+          <<: *leaf1
+          ansible_host: 10.0.0.2
+    POD: *leafs
+""",
+        "groups": ["POD"],
+        "expected": {"hosts": {"leaf1": "10.0.0.1", "leaf2": "10.0.0.2"}, "tags": {"leaf1": ["LEAFS", "POD"], "leaf2": ["LEAFS", "POD"]}},
+    },
+    {
+        "name": "top-level groups",
+        "inventory": """
+ungrouped:
+  hosts:
+    leaf1:
+      ansible_host: 10.0.0.1
+SPINES:
+  hosts:
+    spine1:
+      ansible_host: 10.0.0.2
+""",
+        "groups": ["all"],
+        "expected": {"hosts": {"leaf1": "10.0.0.1", "spine1": "10.0.0.2"}, "tags": {"leaf1": [], "spine1": ["SPINES"]}},
+    },
+    {
+        "name": "cycle",
+        "inventory": """
+A:
+  children:
+    B:
+      hosts:
+        leaf1:
+          ansible_host: 10.0.0.1
+      children:
+        A:
+""",
+        "groups": ["B"],
+        "expected": {"hosts": {"leaf1": "10.0.0.1"}, "tags": {"leaf1": ["A", "B"]}},
+    },
+]
+
+
+@pytest.mark.parametrize("data", INDEX_DATA, ids=[data["name"] for data in INDEX_DATA])
+def test_index(tmp_path: Path, data: dict[str, Any]) -> None:
+    """
+    Test AnsibleInventoryIndex
+    """
+    inventory = tmp_path / "inventory.yml"
+    inventory.write_text(data["inventory"], encoding="utf-8")
+    index = AnsibleInventoryIndex.parse(inventory)
+    assert {host: index.hosts[host] for host in index.get_hosts(data["groups"])} == data["expected"]["hosts"]
+    assert index.get_host_groups() == data["expected"]["tags"]
+
+
+@pytest.mark.parametrize(
+    "inventory, expected_hosts",
+    [
+        pytest.param("ansible_inventory.yml", 7, id="inventory"),
+        pytest.param("empty_ansible_inventory.yml", 0, id="empty inventory"),
+    ],
+)
+def test_index_data_files(inventory: str, expected_hosts: int) -> None:
+    """
+    Test AnsibleInventoryIndex with the Ansible inventories of the test data
+    """
+    index = AnsibleInventoryIndex.parse(DATA_DIR / inventory)
+    assert len(index) == expected_hosts
+    assert index.get_hosts(["ATD_LEAFS"]) == (["leaf1", "leaf2", "leaf3", "leaf4"] if expected_hosts else [])
+
+
+def test_index_invalid_yaml(tmp_path: Path) -> None:
+    """
+    Test AnsibleInventoryIndex.parse() with an invalid YAML file
+    """
+    inventory = tmp_path / "inventory.yml"
+    inventory.write_text("all:\n  children: [\n", encoding="utf-8")
+    with pytest.raises(yaml.YAMLError):
+        AnsibleInventoryIndex.parse(inventory)
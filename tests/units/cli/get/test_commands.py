@@ -9,14 +9,14 @@ from __future__ import annotations
 import filecmp
 from pathlib import Path
 from typing import TYPE_CHECKING
-from unittest.mock import ANY, patch
+from unittest.mock import patch
 
 import pytest
-from cvprac.cvp_client import CvpClient
-from cvprac.cvp_client_errors import CvpApiError
+import yaml
 
 from anta.cli import anta
 from anta.cli.utils import ExitCode
+from tests.lib.cvp import CVP_PASSWORD, CVP_USERNAME, CvpStubServer
 
 if TYPE_CHECKING:
     from click.testing import CliRunner
@@ -25,18 +25,21 @@ DATA_DIR: Path = Path(__file__).parents[3].resolve() / "data"
 
 
 @pytest.mark.parametrize(
-    "cvp_container, cvp_connect_failure",
+    "cvp_containers, cvp_password, expected_hosts",
     [
-        pytest.param(None, False, id="all devices"),
-        pytest.param("custom_container", False, id="custom container"),
-        pytest.param(None, True, id="cvp connect failure"),
+        pytest.param([], CVP_PASSWORD, 244, id="all devices"),
+        pytest.param(["Spine"], CVP_PASSWORD, 4, id="custom container"),
+        pytest.param(["Spine", "Leaf"], CVP_PASSWORD, 244, id="multiple containers"),
+        pytest.param([], "wrong", 0, id="cvp connect failure"),
     ],
 )
 def test_from_cvp(
     tmp_path: Path,
     click_runner: CliRunner,
-    cvp_container: str | None,
-    cvp_connect_failure: bool,
+    cvp_server: CvpStubServer,
+    cvp_containers: list[str],
+    cvp_password: str,
+    expected_hosts: int,
 ) -> None:
     """
     Test `anta get from-cvp`
@@ -44,40 +47,38 @@ def test_from_cvp(
     This test verifies that username and password are NOT mandatory to run this command
     """
     output: Path = tmp_path / "output.yml"
-    cli_args = ["get", "from-cvp", "--output", str(output), "--host", "42.42.42.42", "--username", "anta", "--password", "anta"]
+    cli_args = ["get", "from-cvp", "--output", str(output), "--host", cvp_server.url, "--username", CVP_USERNAME, "--password", cvp_password]
+    for container in cvp_containers:
+        cli_args.extend(["--container", container])
 
-    if cvp_container is not None:
-        cli_args.extend(["--container", cvp_container])
-
-    def mock_cvp_connect(self: CvpClient, *args: str, **kwargs: str) -> None:
-        # pylint: disable=unused-argument
-        if cvp_connect_failure:
-            raise CvpApiError(msg="mocked CvpApiError")
-
-    # always get a token
-    with patch("anta.cli.get.commands.get_cv_token", return_value="dummy_token"), patch(
-        "cvprac.cvp_client.CvpClient.connect", autospec=True, side_effect=mock_cvp_connect
-    ) as mocked_cvp_connect, patch("cvprac.cvp_client.CvpApi.get_inventory", autospec=True, return_value=[]) as mocked_get_inventory, patch(
-        "cvprac.cvp_client.CvpApi.get_devices_in_container", autospec=True, return_value=[]
-    ) as mocked_get_devices_in_container:
-        result = click_runner.invoke(anta, cli_args)
-
-    if not cvp_connect_failure:
-        assert output.exists()
+    result = click_runner.invoke(anta, cli_args)
 
-    mocked_cvp_connect.assert_called_once()
-    if not cvp_connect_failure:
+    if expected_hosts:
         assert "Connected to CloudVision" in result.output
-        if cvp_container is not None:
-            mocked_get_devices_in_container.assert_called_once_with(ANY, cvp_container)
-        else:
-            mocked_get_inventory.assert_called_once()
         assert result.exit_code == ExitCode.OK
+        assert len(yaml.safe_load(output.read_text(encoding="UTF-8"))["anta_inventory"]["hosts"]) == expected_hosts
     else:
+        assert not output.exists()
         assert "Error connecting to CloudVision" in result.output
         assert result.exit_code == ExitCode.USAGE_ERROR
 
 
+def test_from_cvp_incremental(tmp_path: Path, click_runner: CliRunner, cvp_server: CvpStubServer) -> None:
+    """
+    Test `anta get from-cvp --incremental`
+    """
+    output: Path = tmp_path / "output.yml"
+    cli_args = ["get", "from-cvp", "--output", str(output), "--host", cvp_server.url, "--username", CVP_USERNAME, "--password", CVP_PASSWORD, "--incremental"]
+    result = click_runner.invoke(anta, cli_args)
+    assert result.exit_code == ExitCode.OK
+    # The existing inventory file is updated without prompting
+    cvp_server.devices = cvp_server.devices[1:]
+    result = click_runner.invoke(anta, cli_args)
+    assert result.exit_code == ExitCode.OK
+    assert "0 host(s) added, 0 host(s) updated, 1 host(s) removed, 243 host(s) unchanged" in result.output
+    assert len(yaml.safe_load(output.read_text(encoding="UTF-8"))["anta_inventory"]["hosts"]) == 243
+
+
 @pytest.mark.parametrize(
     "ansible_inventory, ansible_group, expected_exit, expected_log",
     [
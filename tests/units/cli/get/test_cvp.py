@@ -0,0 +1,75 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.cli.get.cvp
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from anta.cli.get.cvp import CvpError, CvpInventoryClient, get_cvp_inventory
+from tests.lib.cvp import CVP_PASSWORD, CVP_USERNAME, CvpStubServer
+
+INVENTORY_DATA: list[dict[str, Any]] = [
+    {"name": "all devices", "containers": None, "expected": {"devices": 244, "containers": {"Leaf", "Spine"}}},
+    {"name": "one container", "containers": ["Spine"], "expected": {"devices": 4, "containers": {"Spine"}}},
+    {"name": "multiple containers", "containers": ["Leaf", "Spine", "Empty"], "expected": {"devices": 244, "containers": {"Leaf", "Spine"}}},
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", INVENTORY_DATA, ids=[data["name"] for data in INVENTORY_DATA])
+async def test_get_inventory(cvp_server: CvpStubServer, data: dict[str, Any]) -> None:
+    """
+    Test CvpInventoryClient.get_inventory()
+    """
+    async with CvpInventoryClient(cvp_server.url, page_size=50) as client:
+        await client.login(CVP_USERNAME, CVP_PASSWORD)
+        devices = await client.get_inventory(data["containers"])
+    assert len(devices) == data["expected"]["devices"]
+    assert len({device["systemMacAddress"] for device in devices}) == len(devices)
+    assert {device["containerName"] for device in devices} == data["expected"]["containers"]
+    assert all(device["hostname"] and device["ipAddress"] for device in devices)
+
+
+@pytest.mark.asyncio
+async def test_get_inventory_concurrency(cvp_server: CvpStubServer) -> None:
+    """
+    Test that CvpInventoryClient.get_inventory() fetches the pages concurrently within the concurrency limit
+    """
+    cvp_server.delay = 0.05
+    async with CvpInventoryClient(cvp_server.url, page_size=10, max_concurrency=4) as client:
+        await client.login(CVP_USERNAME, CVP_PASSWORD)
+        devices = await client.get_inventory(["Leaf", "Spine"])
+    assert len(devices) == 244
+    # 2 container lookups, 24 pages of leaves and 1 page of spines
+    assert len(cvp_server.requests) == 27
+    assert cvp_server.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "password, containers, error",
+    [
+        pytest.param("wrong", None, "Unauthorized User", id="wrong password"),
+        pytest.param(CVP_PASSWORD, ["Undefined"], "Container 'Undefined' not found in CloudVision", id="unknown container"),
+    ],
+)
+async def test_get_cvp_inventory_error(cvp_server: CvpStubServer, password: str, containers: list[str] | None, error: str) -> None:
+    """
+    Test get_cvp_inventory() with CloudVision errors
+    """
+    with pytest.raises(CvpError, match=error):
+        await get_cvp_inventory(cvp_server.url, CVP_USERNAME, password, containers)
+
+
+@pytest.mark.asyncio
+async def test_get_cvp_inventory_unreachable() -> None:
+    """
+    Test get_cvp_inventory() when CloudVision cannot be reached
+    """
+    with pytest.raises(CvpError, match="Request to CloudVision '/cvpservice/login/authenticate.do' failed"):
+        await get_cvp_inventory("http://127.0.0.1:1", CVP_USERNAME, CVP_PASSWORD)
@@ -6,44 +6,20 @@ Tests for anta.cli.get.utils
 """
 from __future__ import annotations
 
+import logging
 from contextlib import nullcontext
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, patch
 
 import pytest
-import requests
+import yaml
 
-from anta.cli.get.utils import create_inventory_from_ansible, create_inventory_from_cvp, get_cv_token
+from anta.cli.get.utils import create_inventory_from_ansible, create_inventory_from_cvp
 from anta.inventory import AntaInventory
 
 DATA_DIR: Path = Path(__file__).parents[3].resolve() / "data"
 
 
-def test_get_cv_token() -> None:
-    """
-    Test anta.get.utils.get_cv_token
-    """
-    ip = "42.42.42.42"
-    username = "ant"
-    password = "formica"
-
-    with patch("anta.cli.get.utils.requests.request") as patched_request:
-        mocked_ret = MagicMock(autospec=requests.Response)
-        mocked_ret.json.return_value = {"sessionId": "simple"}
-        patched_request.return_value = mocked_ret
-        res = get_cv_token(ip, username, password)
-    patched_request.assert_called_once_with(
-        "POST",
-        "https://42.42.42.42/cvpservice/login/authenticate.do",
-        headers={"Content-Type": "application/json", "Accept": "application/json"},
-        data='{"userId": "ant", "password": "formica"}',
-        verify=False,
-        timeout=10,
-    )
-    assert res == "simple"
-
-
 # truncated inventories
 CVP_INVENTORY = [
     {
@@ -85,17 +61,54 @@ def test_create_inventory_from_cvp(tmp_path: Path, inventory: list[dict[str, Any
     assert len(inv) == len(inventory)
 
 
+def test_create_inventory_from_cvp_incremental(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test anta.get.utils.create_inventory_from_cvp with incremental updates
+    """
+    caplog.set_level(logging.INFO)
+    output = tmp_path / "output.yml"
+    create_inventory_from_cvp(CVP_INVENTORY, output, incremental=True)
+    # Settings added by the user are kept
+    data = yaml.safe_load(output.read_text(encoding="UTF-8"))
+    data["anta_inventory"]["hosts"][0]["disable_cache"] = True
+    data["anta_inventory"]["networks"] = [{"network": "10.0.0.0/24"}]
+    output.write_text(yaml.dump(data), encoding="UTF-8")
+    mtime = output.stat().st_mtime_ns
+
+    create_inventory_from_cvp(CVP_INVENTORY, output, incremental=True)
+    assert "is up to date" in caplog.text
+    assert output.stat().st_mtime_ns == mtime
+
+    inventory = [{**CVP_INVENTORY[0], "ipAddress": "10.20.20.100"}, CVP_INVENTORY[2], {"hostname": "device4", "containerName": "DC1", "ipAddress": "10.20.20.101"}]
+    create_inventory_from_cvp(inventory, output, incremental=True)
+    assert "1 host(s) added, 1 host(s) updated, 1 host(s) removed, 1 host(s) unchanged" in caplog.text
+    data = yaml.safe_load(output.read_text(encoding="UTF-8"))["anta_inventory"]
+    assert data["hosts"] == [
+        {"name": "device1", "host": "10.20.20.100", "tags": ["dc1"], "disable_cache": True},
+        {"name": "device3", "host": "10.20.20.99", "tags": [""]},
+        {"name": "device4", "host": "10.20.20.101", "tags": ["dc1"]},
+    ]
+    assert data["networks"] == [{"network": "10.0.0.0/24"}]
+
+    output.write_text("invalid", encoding="UTF-8")
+    with pytest.raises(ValueError, match="Cannot update the ANTA inventory file"):
+        create_inventory_from_cvp(CVP_INVENTORY, output, incremental=True)
+
+
 @pytest.mark.parametrize(
     "inventory_filename, ansible_group, expected_raise, expected_inv_length",
     [
         pytest.param("ansible_inventory.yml", None, nullcontext(), 7, id="no group"),
         pytest.param("ansible_inventory.yml", "ATD_LEAFS", nullcontext(), 4, id="group found"),
+        pytest.param("ansible_inventory.yml", ["ATD_SPINES", "cv_servers"], nullcontext(), 3, id="multiple groups"),
         pytest.param("ansible_inventory.yml", "DUMMY", pytest.raises(ValueError, match="Group DUMMY not found in Ansible inventory"), 0, id="group not found"),
         pytest.param("empty_ansible_inventory.yml", None, pytest.raises(ValueError, match="Ansible inventory .* is empty"), 0, id="empty inventory"),
         pytest.param("wrong_ansible_inventory.yml", None, pytest.raises(ValueError, match="Could not parse"), 0, id="os error inventory"),
     ],
 )
-def test_create_inventory_from_ansible(tmp_path: Path, inventory_filename: Path, ansible_group: str | None, expected_raise: Any, expected_inv_length: int) -> None:
+def test_create_inventory_from_ansible(
+    tmp_path: Path, inventory_filename: Path, ansible_group: str | list[str] | None, expected_raise: Any, expected_inv_length: int
+) -> None:
     """
     Test anta.get.utils.create_inventory_from_ansible
     """
@@ -113,3 +126,21 @@ def test_create_inventory_from_ansible(tmp_path: Path, inventory_filename: Path,
         assert len(inv) == expected_inv_length
     if not isinstance(expected_raise, nullcontext):
         assert not target_file.exists()
+
+
+@pytest.mark.parametrize(
+    "group_tags, expected_tags",
+    [
+        pytest.param(True, ["ATD_FABRIC", "ATD_LAB", "ATD_LEAFS", "ATD_SERVERS", "ATD_TENANTS_NETWORKS", "pod1"], id="group tags"),
+        pytest.param(False, None, id="no group tags"),
+    ],
+)
+def test_create_inventory_from_ansible_tags(tmp_path: Path, group_tags: bool, expected_tags: list[str] | None) -> None:
+    """
+    Test the tags of anta.get.utils.create_inventory_from_ansible
+    """
+    target_file = tmp_path / "inventory.yml"
+    create_inventory_from_ansible(DATA_DIR / "ansible_inventory.yml", target_file, "pod1", group_tags=group_tags)
+    hosts = yaml.safe_load(target_file.read_text(encoding="UTF-8"))["anta_inventory"]["hosts"]
+    assert [host["name"] for host in hosts] == ["leaf1", "leaf2"]
+    assert all(host.get("tags") == expected_tags for host in hosts)
@@ -6,8 +6,14 @@ Tests for anta.cli.nrfu
 """
 from __future__ import annotations
 
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 from click.testing import CliRunner
 
+from anta import evaluation, watchdog
 from anta.cli import anta
 from anta.cli.utils import ExitCode
 from tests.lib.utils import default_anta_env
@@ -34,6 +40,51 @@ def test_anta_nrfu(click_runner: CliRunner) -> None:
     assert "Tests catalog contains 1 tests" in result.output
 
 
+def test_anta_nrfu_slowest(click_runner: CliRunner) -> None:
+    """
+    Test anta nrfu --slowest
+    """
+    result = click_runner.invoke(anta, ["nrfu", "--slowest", "2", "text"])
+    assert result.exit_code == ExitCode.OK
+    # The timing report is printed after the test results
+    assert result.output.index("VerifyEOSVersion :: SUCCESS") < result.output.index("Slowest tests (top 2)")
+    assert "Slowest devices (top 2)" in result.output
+    assert "Slowest commands (top 2)" in result.output
+
+
+def test_anta_nrfu_trace_file(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --trace-file
+    """
+    trace_file = tmp_path / "trace.jsonl"
+    result = click_runner.invoke(anta, ["nrfu", "--trace-file", str(trace_file), "text"])
+    assert result.exit_code == ExitCode.OK
+    spans = {span["span_id"]: span for span in map(json.loads, trace_file.read_text(encoding="UTF-8").splitlines())}
+    names = [span["name"] for span in spans.values()]
+    assert names.count("anta.device.refresh") == 3
+    assert names.count("anta.test") == 3
+    assert names.count("anta.nrfu") == 1
+    # Path from the eAPI requests of the tests to the root span
+    requests = [span for span in spans.values() if span["name"] == "anta.eapi.request" and spans[span["parent_id"]]["name"] == "anta.test.collect"]
+    assert len(requests) == 3
+    for request in requests:
+        test = spans[spans[request["parent_id"]]["parent_id"]]
+        assert (test["name"], test["attributes"]["result"], spans[test["parent_id"]]["name"]) == ("anta.test", "success", "anta.nrfu")
+
+
+def test_anta_nrfu_metrics_file(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --metrics-file
+    """
+    metrics_file = tmp_path / "anta.prom"
+    result = click_runner.invoke(anta, ["nrfu", "--metrics-file", str(metrics_file), "text"])
+    assert result.exit_code == ExitCode.OK
+    metrics = metrics_file.read_text(encoding="UTF-8")
+    assert 'anta_tests_total{device="dummy",status="success"} 1' in metrics
+    assert 'anta_device_established{device="dummy3"} 1' in metrics
+    assert "anta_command_duration_seconds_count " in metrics
+
+
 def test_anta_password_required(click_runner: CliRunner) -> None:
     """
     Test that password is provided
@@ -109,3 +160,111 @@ def test_disable_cache(click_runner: CliRunner) -> None:
         if "disable_cache" in line:
             assert "True" in line
     assert result.exit_code == ExitCode.OK
+
+
+def test_anta_nrfu_dump_plan(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --dump-plan and anta nrfu --plan
+    """
+    plan = tmp_path / "plan.json"
+    result = click_runner.invoke(anta, ["nrfu", "--dump-plan", str(plan)])
+    assert result.exit_code == ExitCode.OK
+    assert "Test plan with 1 tests and 3 commands for 3 devices written to" in result.output
+    assert "Running ANTA tests" not in result.output
+    assert plan.exists()
+
+    env = default_anta_env()
+    env["ANTA_CATALOG"] = None
+    result = click_runner.invoke(anta, ["nrfu", "--plan", str(plan)], env=env)
+    assert result.exit_code == ExitCode.OK
+    assert "Test plan contains 1 tests for 3 devices" in result.output
+
+
+def test_anta_nrfu_plan_errors(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --plan errors
+    """
+    plan = tmp_path / "plan.json"
+    plan.write_text("{}", encoding="UTF-8")
+    result = click_runner.invoke(anta, ["nrfu", "--plan", str(plan)])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+
+    result = click_runner.invoke(anta, ["nrfu", "--plan", str(plan), "--dump-plan", str(plan)])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "'--dump-plan' and '--plan' options are mutually exclusive" in result.output
+
+    env = default_anta_env()
+    env["ANTA_CATALOG"] = None
+    result = click_runner.invoke(anta, ["nrfu"], env=env)
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "Missing option '-c' / '--catalog'" in result.output
+
+
+def test_anta_nrfu_from_snapshot(click_runner: CliRunner) -> None:
+    """
+    Test anta nrfu --from-snapshot
+    """
+    snapshot = Path(__file__).parents[3].resolve() / "data" / "test_snapshot"
+    result = click_runner.invoke(anta, ["nrfu", "--from-snapshot", str(snapshot), "json"])
+    assert result.exit_code == ExitCode.TESTS_FAILED
+    assert "ANTA Inventory contains 3 devices (SnapshotDevice)" in result.output
+    assert '"result": "success"' in result.output
+    assert '"result": "failure"' in result.output
+    # No snapshot for dummy3: the device is not established and no test is run
+    assert '"name": "dummy3"' not in result.output
+
+
+def test_anta_nrfu_profile(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --profile
+    """
+    profile = tmp_path / "profile"
+    result = click_runner.invoke(anta, ["nrfu", "--profile", str(profile)])
+    assert result.exit_code == ExitCode.OK
+    assert f"Profile of the run written to '{profile}'" in result.output
+    assert (profile / "profile.prof").exists()
+    summary = (profile / "summary.txt").read_text(encoding="UTF-8")
+    for title in ("Top 20 functions by cumulative time", "Event loop lag", "Top 20 allocators"):
+        assert title in summary
+
+
+@pytest.mark.parametrize("args", [["--blocking-threshold", "0.5"], ["--offload-blocking-tests"]], ids=["threshold", "offload"])
+def test_anta_nrfu_watchdog(click_runner: CliRunner, args: list[str]) -> None:
+    """
+    Test anta nrfu --blocking-threshold and --offload-blocking-tests
+    """
+    with patch.object(watchdog.LoopWatchdog, "report") as report:
+        result = click_runner.invoke(anta, ["nrfu", *args])
+    assert result.exit_code == ExitCode.OK
+    report.assert_called_once()
+    # The watchdog is only enabled during the command
+    assert watchdog.get_watchdog() is None
+
+
+def test_anta_nrfu_evaluation_processes(click_runner: CliRunner) -> None:
+    """
+    Test anta nrfu --evaluation-processes --process-all-tests
+    """
+    with patch.object(evaluation.EvaluationPool, "shutdown") as shutdown:
+        result = click_runner.invoke(anta, ["nrfu", "--evaluation-processes", "1", "--process-all-tests", "json"])
+    assert result.exit_code == ExitCode.OK
+    assert '"result": "success"' in result.output
+    shutdown.assert_called_once()
+    assert evaluation.get_pool() is None
+
+
+def test_anta_nrfu_latency_file(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --latency-file
+    """
+    latency_file = tmp_path / "latency.json"
+    # show version is collected on the 3 devices of the inventory
+    for samples in (3, 6):
+        result = click_runner.invoke(anta, ["nrfu", "--latency-file", str(latency_file), "text"])
+        assert result.exit_code == ExitCode.OK
+        history = json.loads(latency_file.read_text(encoding="UTF-8"))
+        assert history["commands"]["json"]["show version"]["samples"] == samples
+    # The latency history is not updated by the runs on a snapshot
+    snapshot = Path(__file__).parents[3].resolve() / "data" / "test_snapshot"
+    result = click_runner.invoke(anta, ["nrfu", "--latency-file", str(latency_file), "--from-snapshot", str(snapshot), "text"])
+    assert json.loads(latency_file.read_text(encoding="UTF-8")) == history
@@ -0,0 +1,63 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.cli.simulate
+"""
+from __future__ import annotations
+
+import socket
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+
+from anta.cli import anta
+from anta.cli.utils import ExitCode
+
+DATA_DIR: Path = Path(__file__).parent.parent.parent.parent.resolve() / "data"
+
+
+def test_anta_simulate_help(click_runner: CliRunner) -> None:
+    """
+    Test anta simulate --help
+    """
+    result = click_runner.invoke(anta, ["simulate", "--help"])
+    assert result.exit_code == ExitCode.OK
+    assert "Usage: anta simulate" in result.output
+
+
+def test_anta_simulate(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta simulate --output
+    """
+    output = tmp_path / "inventory.yml"
+    result = click_runner.invoke(
+        anta, ["simulate", "-n", "3", "--port", "0", "--snapshot", str(DATA_DIR / "test_snapshot"), "--output", str(output), "--duration", "0.1"]
+    )
+    assert result.exit_code == ExitCode.OK
+    hosts = yaml.safe_load(output.read_text(encoding="UTF-8"))["anta_inventory"]["hosts"]
+    assert [host["name"] for host in hosts] == ["sim-1", "sim-2", "sim-3"]
+    assert all(host["host"] == "127.0.0.1" and host["port"] > 0 for host in hosts)
+
+
+def test_anta_simulate_port_in_use(click_runner: CliRunner) -> None:
+    """
+    Test anta simulate when a port is in use
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        port = sock.getsockname()[1]
+        result = click_runner.invoke(anta, ["simulate", "-n", "1", "--port", str(port), "--duration", "0.1"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert f"Cannot run the simulator on 127.0.0.1:{port}" in result.output
+
+
+def test_anta_simulate_invalid_snapshot(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta simulate with a snapshot without devices
+    """
+    result = click_runner.invoke(anta, ["simulate", "--snapshot", str(tmp_path), "--duration", "0.1"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "Cannot load the command outputs of the simulated devices" in result.output
@@ -7,11 +7,51 @@ Tests for anta.cli.__init__
 
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+from typing import Any
+
+import pytest
 from click.testing import CliRunner
 
-from anta.cli import anta
+from anta.cli import SUBCOMMANDS, anta
 from anta.cli.utils import ExitCode
 
+# Budget in seconds for the cumulative import time of anta.cli reported by `python -X importtime`.
+# The import time depends on the host and its load: the budget is only checked when set.
+IMPORT_TIME_BUDGET = os.environ.get("ANTA_IMPORT_TIME_BUDGET")
+HEAVY_MODULES = {"asyncssh", "aiocache", "httpx", "jinja2", "rich.progress"}
+
+DATA: list[dict[str, Any]] = [
+    {"name": "anta", "args": [], "heavy_modules": HEAVY_MODULES | {"anta.catalog", "anta.inventory"}},
+    {"name": "anta --help", "args": ["--help"], "heavy_modules": HEAVY_MODULES | {"anta.catalog", "anta.inventory"}},
+    {"name": "anta check --help", "args": ["check", "--help"], "heavy_modules": HEAVY_MODULES | {"anta.inventory"}},
+    {"name": "anta nrfu --help", "args": ["nrfu", "--help"], "heavy_modules": HEAVY_MODULES | {"anta.catalog", "anta.inventory"}},
+    {"name": "anta watch --help", "args": ["watch", "--help"], "heavy_modules": HEAVY_MODULES | {"anta.catalog", "anta.inventory"}},
+    {"name": "anta simulate --help", "args": ["simulate", "--help"], "heavy_modules": HEAVY_MODULES | {"anta.catalog", "anta.inventory", "anta.simulator"}},
+    # The commands building an inventory import httpx, which imports rich.progress
+    {"name": "anta get --help", "args": ["get", "--help"], "heavy_modules": {"asyncssh", "jinja2"}},
+    {"name": "anta exec --help", "args": ["exec", "--help"], "heavy_modules": {"asyncssh", "jinja2"}},
+]
+
+
+def importtime(code: str) -> dict[str, int]:
+    """
+    Run Python code in a new interpreter with `-X importtime`
+
+    Returns:
+        A dictionary mapping the imported modules to their cumulative import time in microseconds
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        modules[module.strip()] = int(cumulative)
+    return modules
+
 
 def test_anta(click_runner: CliRunner) -> None:
     """
@@ -56,3 +96,35 @@ def test_anta_get_help(click_runner: CliRunner) -> None:
     result = click_runner.invoke(anta, ["get", "--help"])
     assert result.exit_code == ExitCode.OK
     assert "Usage: anta get" in result.output
+
+
+def test_anta_subcommands_help(click_runner: CliRunner) -> None:
+    """
+    Test that the help of the lazy subcommands matches the help of the subcommands
+    """
+    result = click_runner.invoke(anta, ["--help"])
+    assert result.exit_code == ExitCode.OK
+    for name, (_, short_help) in SUBCOMMANDS.items():
+        command = anta.get_command(None, name)  # type: ignore[arg-type]
+        assert command is not None
+        assert command.get_short_help_str(limit=165) == short_help
+        assert short_help in result.output
+
+
+@pytest.mark.skipif(IMPORT_TIME_BUDGET is None, reason="ANTA_IMPORT_TIME_BUDGET is not set")
+def test_anta_import_time() -> None:
+    """
+    Test that importing anta.cli stays within the import time budget
+    """
+    assert IMPORT_TIME_BUDGET is not None
+    modules = importtime("import anta.cli")
+    assert modules["anta.cli"] < float(IMPORT_TIME_BUDGET) * 1_000_000, f"Importing anta.cli took {modules['anta.cli'] / 1_000_000:.3f}s"
+
+
+@pytest.mark.parametrize("data", DATA, ids=[data["name"] for data in DATA])
+def test_anta_lazy_imports(data: dict[str, Any]) -> None:
+    """
+    Test that heavy dependencies are not imported when they are not required by the command
+    """
+    modules = importtime(f"from anta.cli import anta\ntry:\n    anta({data['args']!r}, obj={{}})\nexcept SystemExit:\n    pass")
+    assert not {module for module in modules if module in data["heavy_modules"]}
@@ -0,0 +1,77 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.cli.watch
+"""
+from __future__ import annotations
+
+import json
+import socket
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from anta.cli import anta
+from anta.cli.utils import ExitCode
+
+
+def test_anta_watch_help(click_runner: CliRunner) -> None:
+    """
+    Test anta watch --help
+    """
+    result = click_runner.invoke(anta, ["watch", "--help"])
+    assert result.exit_code == ExitCode.OK
+    assert "Usage: anta watch" in result.output
+
+
+def test_anta_watch(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta watch, inventory and catalog are given via env
+    """
+    output = tmp_path / "changes.jsonl"
+    result = click_runner.invoke(anta, ["watch", "--interval", "3600", "-I", "software=0.01", "--cycles", "2", "--output", str(output)])
+    assert result.exit_code == ExitCode.OK
+    assert "Cycle 1" in result.output
+    assert "Cycle 2" in result.output
+    assert "dummy :: VerifyEOSVersion :: success" in result.output
+    # The test results do not change during the second cycle
+    cycles = [json.loads(line) for line in output.read_text(encoding="UTF-8").splitlines()]
+    assert len(cycles) == 1
+    assert cycles[0]["cycle"] == 1
+    assert cycles[0]["changes"][0]["after"] == "success"
+
+
+def test_anta_watch_metrics(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta watch --metrics-file and --metrics-port
+    """
+    metrics = tmp_path / "anta.prom"
+    result = click_runner.invoke(
+        anta, ["watch", "--cycles", "2", "--interval", "0.01", "--metrics-file", str(metrics), "--metrics-address", "127.0.0.1", "--metrics-port", "0"]
+    )
+    assert result.exit_code == ExitCode.OK
+    # The counters accumulate the test results of the cycles
+    assert 'anta_tests_total{device="dummy",status="success"} 2' in metrics.read_text(encoding="UTF-8")
+
+
+def test_anta_watch_metrics_port_in_use(click_runner: CliRunner) -> None:
+    """
+    Test anta watch when the metrics server cannot listen on its port
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        port = sock.getsockname()[1]
+        result = click_runner.invoke(anta, ["watch", "--cycles", "1", "--metrics-address", "127.0.0.1", "--metrics-port", str(port)])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "Cannot serve the metrics on 127.0.0.1" in result.output
+
+
+def test_anta_watch_invalid_interval(click_runner: CliRunner) -> None:
+    """
+    Test anta watch with an invalid test interval
+    """
+    result = click_runner.invoke(anta, ["watch", "-I", "hardware", "--cycles", "1"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "is not a valid PATTERN=SECONDS interval" in result.output
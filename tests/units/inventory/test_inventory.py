@@ -6,22 +6,28 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
+from unittest.mock import patch
 
 import pytest
 import yaml
 from pydantic import ValidationError
 
+from anta.device import AsyncEOSDevice, SnapshotDevice
 from anta.inventory import AntaInventory
 from anta.inventory.exceptions import InventoryIncorrectSchema, InventoryRootKeyError
+from anta.snapshot import SnapshotArchiveError, SnapshotArchiveWriter
 from tests.data.json_data import ANTA_INVENTORY_TESTS_INVALID, ANTA_INVENTORY_TESTS_VALID
 from tests.lib.utils import generate_test_ids_dict
 
+DATA_DIR: Path = Path(__file__).parents[2].resolve() / "data"
+INVENTORY: dict[str, Any] = {"anta_inventory": {"hosts": [{"host": "192.168.0.17"}, {"host": "192.168.0.2"}, {"host": "my.awesome.host.com"}]}}
+
 
 class Test_AntaInventory:
     """Test AntaInventory class."""
 
-    def create_inventory(self, content: str, tmp_path: Path) -> str:
+    def create_inventory(self, content: dict[str, Any], tmp_path: Path) -> str:
         """Create fakefs inventory file."""
         tmp_inventory = tmp_path / "mydir/myfile"
         tmp_inventory.parent.mkdir()
@@ -79,3 +85,53 @@ class Test_AntaInventory:
         inventory_file = self.create_inventory(content=test_definition["input"], tmp_path=tmp_path)
         with pytest.raises((InventoryIncorrectSchema, InventoryRootKeyError, ValidationError)):
             AntaInventory.parse(filename=inventory_file, username="arista", password="arista123")
+
+    def test_parse_cache(self, tmp_path: Path) -> None:
+        """Test AntaInventory.parse() with the parsed-file cache."""
+        inventory_file = self.create_inventory(content=INVENTORY, tmp_path=tmp_path)
+        inventory = AntaInventory.parse(filename=inventory_file, username="arista", password="arista123", cache=True)
+        assert (Path(inventory_file).parent / ".myfile.anta-cache").is_file()
+        with patch("anta.inventory.yaml_load") as yaml_load:
+            cached_inventory = AntaInventory.parse(filename=inventory_file, username="arista", password="arista123", cache=True)
+            yaml_load.assert_not_called()
+        assert cached_inventory.keys() == inventory.keys()
+
+    @pytest.mark.parametrize("transport", ["eapi", "ssh", "auto"])
+    def test_parse_transport(self, tmp_path: Path, transport: Literal["eapi", "ssh", "auto"]) -> None:
+        """Test AntaInventory.parse() with a transport."""
+        inventory_file = self.create_inventory(content=INVENTORY, tmp_path=tmp_path)
+        inventory = AntaInventory.parse(filename=inventory_file, username="arista", password="arista123", transport=transport)
+        assert inventory
+        assert all(isinstance(device, AsyncEOSDevice) and device.transport == transport for device in inventory.values())
+
+    def test_from_snapshot(self, test_inventory: AntaInventory) -> None:
+        """Test AntaInventory.from_snapshot()."""
+        inventory = AntaInventory.from_snapshot(DATA_DIR / "test_snapshot")
+        assert list(inventory) == ["dummy", "dummy2"]
+        assert all(isinstance(device, SnapshotDevice) for device in inventory.values())
+
+        inventory = AntaInventory.from_snapshot(DATA_DIR / "test_snapshot", test_inventory)
+        assert list(inventory) == list(test_inventory)
+        assert inventory["dummy3"].tags == ["spine", "dummy3"]
+        assert inventory["dummy"].root == DATA_DIR / "test_snapshot"
+
+        with pytest.raises(OSError):
+            AntaInventory.from_snapshot(DATA_DIR / "undefined")
+
+    def test_from_snapshot_archive(self, tmp_path: Path, test_inventory: AntaInventory) -> None:
+        """Test AntaInventory.from_snapshot() with a snapshot archive."""
+        archive = tmp_path / "snapshot.anta-snapshot"
+        with SnapshotArchiveWriter(archive) as writer:
+            writer.add("dummy2", "show version", "json", {})
+            writer.add("dummy", "show version", "json", {})
+        inventory = AntaInventory.from_snapshot(archive)
+        assert list(inventory) == ["dummy", "dummy2"]
+        # The archive is opened once for all devices
+        assert inventory["dummy"].archive is inventory["dummy2"].archive is not None
+
+        inventory = AntaInventory.from_snapshot(archive, test_inventory)
+        assert list(inventory) == list(test_inventory)
+
+        (tmp_path / "invalid.anta-snapshot").write_text("{}", encoding="UTF-8")
+        with pytest.raises(SnapshotArchiveError):
+            AntaInventory.from_snapshot(tmp_path / "invalid.anta-snapshot")
@@ -14,6 +14,7 @@ import pytest
 
 from anta.custom_types import TestStatus
 from anta.result_manager import ResultManager
+from anta.result_manager.models import CommandTiming, ResultTiming
 
 if TYPE_CHECKING:
     from anta.result_manager.models import TestResult
@@ -189,6 +190,52 @@ class Test_ResultManager:
         # verifies it can be loaded as json
         json.loads(res)
 
+    def test_get_json_results_timing(self, list_result_factory: Callable[[int], list[TestResult]]) -> None:
+        """
+        test ResultManager.get_json_results with timed test results
+        """
+        result_manager = ResultManager()
+        results = list_result_factory(2)
+        results[0].timing = ResultTiming(total=1.5, commands=[CommandTiming(command="show version", duration=1.2, cache_hit=False)])
+        result_manager.add_test_results(results)
+        res = json.loads(result_manager.get_json_results())
+        assert res[0]["timing"]["total"] == 1.5
+        assert res[0]["timing"]["commands"] == [{"command": "show version", "ofmt": "json", "duration": 1.2, "cache_hit": False}]
+        assert "timing" not in res[1]
+
+    def test_get_timing_summary(self, list_result_factory: Callable[[int], list[TestResult]]) -> None:
+        """
+        test ResultManager.get_timing_summary
+        """
+        result_manager = ResultManager()
+        results = list_result_factory(4)
+        # Device name, total duration and collected commands of each result
+        timings: list[tuple[str, float, list[tuple[str, float, bool | None]] | None]] = [
+            ("leaf1", 2.0, [("show version", 1.5, False), ("show uptime", 0.2, None)]),
+            ("leaf1", 1.0, [("show version", 0.8, True)]),
+            ("leaf2", 3.0, [("show interfaces", 2.5, False)]),
+            ("leaf2", 0.0, None),
+        ]
+        for result, (name, total, commands) in zip(results, timings):
+            result.name = name
+            if commands is not None:
+                timing_commands = [CommandTiming(command=command, duration=duration, cache_hit=cache_hit) for command, duration, cache_hit in commands]
+                result.timing = ResultTiming(total=total, evaluation=0.1, commands=timing_commands)
+        result_manager.add_test_results(results)
+
+        summary = result_manager.get_timing_summary(top=2)
+        assert [(result.name, result.test) for result in summary.tests] == [("leaf2", "VerifyTest2"), ("leaf1", "VerifyTest0")]
+        assert [(device.name, device.tests, device.commands, device.cache_hits, device.slowest_test) for device in summary.devices] == [
+            ("leaf2", 1, 1, 0, 3.0),
+            ("leaf1", 2, 3, 1, 2.0),
+        ]
+        assert summary.devices[1].collection == pytest.approx(1.7)
+        # Cache hits are not reported
+        assert [(command.name, command.command, command.test) for command in summary.commands] == [
+            ("leaf2", "show interfaces", "VerifyTest2"),
+            ("leaf1", "show version", "VerifyTest0"),
+        ]
+
     # TODO
     # get_result_by_test
     # get_result_by_host
@@ -8,12 +8,13 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
 from yaml import safe_load
 
-from anta.catalog import AntaCatalog, AntaTestDefinition
+from anta.catalog import AntaCatalog, AntaTestDefinition, _inputs_key, _validate_definition_chunk
 from anta.models import AntaTest
 from anta.tests.interfaces import VerifyL3MTU
 from anta.tests.mlag import VerifyMlagStatus
@@ -309,3 +310,142 @@ class Test_AntaCatalog:
         catalog: AntaCatalog = AntaCatalog.parse(str(DATA_DIR / "test_catalog_with_tags.yml"))
         tests: list[AntaTestDefinition] = catalog.get_tests_by_tags(tags=["leaf"])
         assert len(tests) == 2
+
+    def test_parse_cache(self, tmp_path: Path) -> None:
+        """
+        Instantiate AntaCatalog from a file using the parsed-file cache
+        """
+        catalog_file = tmp_path / "catalog.yml"
+        catalog_file.write_text((DATA_DIR / "test_catalog_with_tags.yml").read_text(encoding="UTF-8"), encoding="UTF-8")
+        catalog = AntaCatalog.parse(catalog_file, cache=True)
+        assert (tmp_path / ".catalog.yml.anta-cache").is_file()
+        with patch("anta.catalog.AntaCatalog.from_dict") as from_dict:
+            cached_catalog = AntaCatalog.parse(catalog_file, cache=True)
+            from_dict.assert_not_called()
+        assert cached_catalog.tests == catalog.tests
+        assert cached_catalog.filename == catalog_file
+
+    def test_from_dict_deduplicate(self) -> None:
+        """
+        Identical test definitions are validated only once
+        """
+        data = {"anta.tests.software": [{"VerifyEOSVersion": {"versions": ["4.31.1F"]}}] * 3 + [{"VerifyEOSVersion": {"versions": ["4.31.2F"]}}]}
+        with patch("anta.catalog._validate_definition_chunk", wraps=_validate_definition_chunk) as validate:
+            catalog: AntaCatalog = AntaCatalog.from_dict(data)  # type: ignore[arg-type]
+        assert len(validate.call_args.args[0]) == 2
+        assert len(catalog.tests) == 4
+        assert catalog.tests[0] is catalog.tests[1] is catalog.tests[2]
+        assert catalog.tests[3].inputs == VerifyEOSVersion.Input(versions=["4.31.2F"])
+
+    def test_parse_max_workers(self) -> None:
+        """
+        Instantiate AntaCatalog from a file using worker processes
+        """
+        catalog: AntaCatalog = AntaCatalog.parse(str(DATA_DIR / "test_catalog_with_tags.yml"), max_workers=2)
+        assert catalog.tests == AntaCatalog.parse(str(DATA_DIR / "test_catalog_with_tags.yml")).tests
+
+    @pytest.mark.parametrize("max_workers", [None, 2])
+    def test_from_dict_all_errors(self, max_workers: int | None) -> None:
+        """
+        All the errors of the catalog are reported at once
+        """
+        data = {
+            "anta.tests.software": [
+                {"VerifyEOSVersion": {"versions": "4.31.1F"}},
+                "VerifyEOSVersion",
+                {"FakeTest": None},
+                {"VerifyEOSVersion": {"versions": ["4.31.1F"]}},
+            ]
+            * 2
+        }
+        with pytest.raises(ValidationError) as exec_info:
+            AntaCatalog.from_dict(data, max_workers=max_workers)  # type: ignore[arg-type]
+        errors = exec_info.value.errors()
+        assert [error["loc"] for error in errors] == [
+            ("anta.tests.software", 0, "inputs", "versions"),
+            ("anta.tests.software", 1),
+            ("anta.tests.software", 2),
+            ("anta.tests.software", 4, "inputs", "versions"),
+            ("anta.tests.software", 5),
+            ("anta.tests.software", 6),
+        ]
+        assert errors[1]["msg"] == "Value error, Syntax error when parsing: VerifyEOSVersion\nIt must be a dictionary. Check the test catalog."
+        assert "FakeTest is not defined in Python module anta.tests.software" in errors[2]["msg"]
+
+    def test_parse_multiple_files(self) -> None:
+        """
+        Instantiate AntaCatalog from multiple files
+        """
+        catalog: AntaCatalog = AntaCatalog.parse([DATA_DIR / "test_catalog_with_tags.yml", DATA_DIR / "test_catalog.yml", DATA_DIR / "test_catalog_with_tags.yml"])
+        assert catalog.filename is None
+        assert len(catalog.tests) == len(INIT_CATALOG_DATA[1]["tests"]) + 1
+        assert catalog.tests[-1].test == VerifyEOSVersion
+
+    def test_parse_directory(self, tmp_path: Path) -> None:
+        """
+        Instantiate AntaCatalog from a directory
+        """
+        (tmp_path / "site").mkdir()
+        (tmp_path / "site" / "catalog.yaml").write_text((DATA_DIR / "test_catalog.yml").read_text(encoding="UTF-8"), encoding="UTF-8")
+        (tmp_path / "catalog.yml").write_text((DATA_DIR / "test_catalog_with_tags.yml").read_text(encoding="UTF-8"), encoding="UTF-8")
+        (tmp_path / "duplicate.yml").write_text((DATA_DIR / "test_catalog.yml").read_text(encoding="UTF-8"), encoding="UTF-8")
+        (tmp_path / "README.md").write_text("Not a catalog", encoding="UTF-8")
+        catalog: AntaCatalog = AntaCatalog.parse(tmp_path)
+        assert catalog.filename == tmp_path
+        assert [t.test for t in catalog.tests] == [test for test, _ in INIT_CATALOG_DATA[1]["tests"]] + [VerifyEOSVersion]
+
+    def test_merge(self) -> None:
+        """
+        Test AntaCatalog.merge()
+        """
+        catalog1: AntaCatalog = AntaCatalog.from_list([(VerifyUptime, {"minimum": 10}), (VerifyNTP, None)])
+        catalog2: AntaCatalog = AntaCatalog.from_list([(VerifyNTP, None), (VerifyUptime, {"minimum": 20})])
+        merged = catalog1.merge(catalog2)
+        assert [(t.test, t.inputs) for t in merged.tests] == [
+            (VerifyUptime, VerifyUptime.Input(minimum=10)),
+            (VerifyNTP, VerifyNTP.Input()),
+            (VerifyUptime, VerifyUptime.Input(minimum=20)),
+        ]
+
+    def test_lazy(self) -> None:
+        """
+        Test definitions of a lazy AntaCatalog are only validated when requested
+        """
+        data = {
+            "anta.tests.system": [{"VerifyUptime": {"minimum": 10, "filters": {"tags": ["leaf"]}}}, {"VerifyNTP": None}],
+            "tests.data.syntax_error": [{"FakeTest": {"filters": {"tags": ["spine"]}}}],
+        }
+        catalog: AntaCatalog = AntaCatalog.from_dict(data, lazy=True)  # type: ignore[arg-type]
+        assert len(catalog) == 3
+        with patch("anta.catalog._validate_definition_chunk", wraps=_validate_definition_chunk) as validate:
+            assert [t.test for t in catalog.get_tests_by_tags(["leaf"])] == [VerifyUptime]
+            assert [t.test for t in catalog.get_untagged_tests()] == [VerifyNTP]
+            assert validate.call_count == 2
+        assert len(catalog) == 3
+        # The module of the remaining test definition has a syntax error
+        with pytest.raises(ValidationError) as exec_info:
+            catalog.get_tests_by_tags(["spine"])
+        assert "Module named tests.data.syntax_error cannot be imported" in exec_info.value.errors()[0]["msg"]
+        assert exec_info.value.errors()[0]["loc"] == ("tests.data.syntax_error", 0)
+
+    def test_lazy_merge(self) -> None:
+        """
+        Test definitions of lazy AntaCatalog instances remain lazy when merged
+        """
+        catalog: AntaCatalog = AntaCatalog.parse(DATA_DIR / "test_catalog_with_tags.yml", lazy=True).merge(
+            AntaCatalog.parse(DATA_DIR / "test_catalog_with_tags.yml", lazy=True)
+        )
+        assert len(catalog) == len(INIT_CATALOG_DATA[1]["tests"])
+        assert len(catalog.get_tests_by_tags(["leaf"])) == 2
+        assert len(catalog.tests) == len(INIT_CATALOG_DATA[1]["tests"])
+
+
+def test_inputs_key() -> None:
+    """
+    The deduplication key of the test inputs ignores the order of the mapping keys but not the type of the values
+    """
+    assert _inputs_key({"versions": ["4.31.1F"], "filters": {"tags": ["leaf"]}}) == _inputs_key({"filters": {"tags": ["leaf"]}, "versions": ["4.31.1F"]})
+    # A YAML mapping can mix int and str keys
+    assert _inputs_key({1: "a", "1": "b"}) == _inputs_key({"1": "b", 1: "a"})
+    assert _inputs_key({1: "a"}) != _inputs_key({"1": "a"})
+    assert _inputs_key([1, True, 1.0]) != _inputs_key([1, 1, 1])
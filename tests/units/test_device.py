@@ -9,17 +9,18 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 from _pytest.mark.structures import ParameterSet
-from asyncssh import SSHClientConnection, SSHClientConnectionOptions
+from asyncssh import SSHClientConnection
 from rich import print as rprint
 
 from anta import aioeapi
-from anta.device import AntaDevice, AsyncEOSDevice
+from anta.device import AntaDevice, AsyncEOSDevice, SnapshotDevice
 from anta.models import AntaCommand
 from tests.lib.fixture import COMMAND_OUTPUT
 from tests.lib.utils import generate_test_ids_list
@@ -592,10 +593,177 @@ COLLECT_DATA: list[dict[str, Any]] = [
         "expected": {},
     },
 ]
+COMMAND_POLICY_DATA: list[dict[str, Any]] = [
+    {
+        "name": "retry after a connection error",
+        "command": {"command": "show version", "retries": 2},
+        "responses": [httpx.ConnectError("Connection refused"), (0, [{}, {"modelName": "DCS-7280CR3-32P4-F"}])],
+        "expected": {"output": {"modelName": "DCS-7280CR3-32P4-F"}, "errors": [], "calls": 2},
+    },
+    {
+        "name": "retries exhausted",
+        "command": {"command": "show version", "retries": 1},
+        "responses": [httpx.ConnectError("Connection refused"), httpx.ReadTimeout("Read timed out")],
+        "expected": {"output": None, "errors": ["Read timed out"], "calls": 2},
+    },
+    {
+        "name": "no retry after a command error",
+        "command": {"command": "show version", "retries": 2},
+        "responses": [aioeapi.EapiCommandError(passed=[], failed="show version", errors=["Authorization denied"], errmsg="", not_exec=[])],
+        "expected": {"output": None, "errors": ["Authorization denied"], "calls": 1},
+    },
+    {
+        "name": "hedged request answered first",
+        "command": {"command": "show version", "hedge_after": 0.01},
+        "responses": [(1, [{}, {"modelName": "slow"}]), (0, [{}, {"modelName": "DCS-7280CR3-32P4-F"}])],
+        "expected": {"output": {"modelName": "DCS-7280CR3-32P4-F"}, "errors": [], "calls": 2},
+    },
+    {
+        "name": "no hedged request before the delay",
+        "command": {"command": "show version", "hedge_after": 1},
+        "responses": [(0, [{}, {"modelName": "DCS-7280CR3-32P4-F"}])],
+        "expected": {"output": {"modelName": "DCS-7280CR3-32P4-F"}, "errors": [], "calls": 1},
+    },
+    {
+        "name": "hedged request failed",
+        "command": {"command": "show version", "hedge_after": 0.01},
+        "responses": [(0.05, [{}, {"modelName": "DCS-7280CR3-32P4-F"}]), httpx.ConnectError("Connection refused")],
+        "expected": {"output": {"modelName": "DCS-7280CR3-32P4-F"}, "errors": [], "calls": 2},
+    },
+]
+SNAPSHOT_DIR: Path = Path(__file__).parent.parent.resolve() / "data" / "test_snapshot"
+SNAPSHOT_COLLECT_DATA: list[dict[str, Any]] = [
+    {
+        "name": "json",
+        "command": {"command": "show version"},
+        "expected": {"output": {"modelName": "DCS-7280CR3-32P4-F", "version": "4.31.1F", "uptime": 1000000.0}, "errors": []},
+    },
+    {
+        "name": "text",
+        "command": {"command": "show version", "ofmt": "text"},
+        "expected": {"output": "Arista DCS-7280CR3-32P4-F\nSoftware image version: 4.31.1F\n", "errors": []},
+    },
+    {
+        "name": "missing",
+        "command": {"command": "show uptime"},
+        "expected": {"output": None, "errors": ["Command 'show uptime' (json) not found in the snapshot of device dummy"]},
+    },
+]
 CACHE_STATS_DATA: list[ParameterSet] = [
     pytest.param({"disable_cache": False}, {"total_commands_sent": 0, "cache_hits": 0, "cache_hit_ratio": "0.00%"}, id="with_cache"),
     pytest.param({"disable_cache": True}, None, id="without_cache"),
 ]
+SSH_COLLECT_DATA: list[dict[str, Any]] = [
+    {
+        "name": "json",
+        "device": {"transport": "ssh"},
+        "command": {"command": "show version"},
+        "run": {"stdout": '{"modelName": "DCS-7280CR3-32P4-F"}\n', "exit_status": 0},
+        "expected": {"run": "show version | json", "output": {"modelName": "DCS-7280CR3-32P4-F"}, "errors": []},
+    },
+    {
+        "name": "text",
+        "device": {"transport": "ssh"},
+        "command": {"command": "show version", "ofmt": "text"},
+        "run": {"stdout": "Arista DCS-7280CR3-32P4-F\n", "exit_status": 0},
+        "expected": {"run": "show version", "output": "Arista DCS-7280CR3-32P4-F\n", "errors": []},
+    },
+    {
+        "name": "enable",
+        "device": {"transport": "ssh", "enable": True, "enable_password": "anta"},
+        "command": {"command": "show version"},
+        "run": {"stdout": '{"modelName": "DCS-7280CR3-32P4-F"}\n', "exit_status": 0},
+        "expected": {"run": "enable\nshow version | json", "input": "anta\n", "output": {"modelName": "DCS-7280CR3-32P4-F"}, "errors": []},
+    },
+    {
+        "name": "json error",
+        "device": {"transport": "ssh"},
+        "command": {"command": "show bgp evpn route-type mac-ip"},
+        "run": {"stdout": '{"errors": ["BGP inactive"]}\n', "exit_status": 1},
+        "expected": {"run": "show bgp evpn route-type mac-ip | json", "output": None, "errors": ["BGP inactive"]},
+    },
+    {
+        "name": "text error",
+        "device": {"transport": "ssh"},
+        "command": {"command": "show bgp evpn route-type mac-ip", "ofmt": "text"},
+        "run": {"stdout": "% BGP inactive\n", "exit_status": 1},
+        "expected": {"run": "show bgp evpn route-type mac-ip", "output": None, "errors": ["BGP inactive"]},
+    },
+    {
+        "name": "invalid json",
+        "device": {"transport": "ssh"},
+        "command": {"command": "show version"},
+        "run": {"stdout": "", "stderr": "Permission denied", "exit_status": 1},
+        "expected": {"run": "show version | json", "output": None, "errors": ["Permission denied"]},
+    },
+    {
+        "name": "connection error",
+        "device": {"transport": "ssh"},
+        "command": {"command": "show version"},
+        "run": OSError("Connection refused"),
+        "expected": {"run": "show version | json", "output": None, "errors": ["OSError (Connection refused)"]},
+    },
+]
+TRANSPORT_REFRESH_DATA: list[dict[str, Any]] = [
+    {
+        "name": "ssh",
+        "device": {"transport": "ssh"},
+        "eapi": {"online": True, "delay": 0.0},
+        "ssh": {"delay": 0.0},
+        "expected": {"is_online": True, "established": True, "active_transport": "ssh", "check_connection": False},
+    },
+    {
+        "name": "auto ssh faster",
+        "device": {"transport": "auto"},
+        "eapi": {"online": True, "delay": 0.05},
+        "ssh": {"delay": 0.0},
+        "expected": {"is_online": True, "established": True, "active_transport": "ssh", "check_connection": True},
+    },
+    {
+        "name": "auto eapi faster",
+        "device": {"transport": "auto"},
+        "eapi": {"online": True, "delay": 0.0},
+        "ssh": {"delay": 0.05},
+        "expected": {"is_online": True, "established": True, "active_transport": "eapi", "check_connection": True},
+    },
+    {
+        "name": "auto eapi faster once connected",
+        "device": {"transport": "auto"},
+        "eapi": {"online": True, "delay": 0.0, "connect": 0.1},
+        "ssh": {"delay": 0.03},
+        "expected": {"is_online": True, "established": True, "active_transport": "eapi", "check_connection": True},
+    },
+    {
+        "name": "auto eapi unreachable",
+        "device": {"transport": "auto"},
+        "eapi": {"online": False, "delay": 0.0},
+        "ssh": {"delay": 0.05},
+        "expected": {"is_online": True, "established": True, "active_transport": "ssh", "check_connection": True},
+    },
+    {
+        "name": "auto ssh unreachable",
+        "device": {"transport": "auto"},
+        "eapi": {"online": True, "delay": 0.05},
+        "ssh": {"error": OSError("Connection refused")},
+        "expected": {"is_online": True, "established": True, "active_transport": "eapi", "check_connection": True},
+    },
+    {
+        "name": "ssh unreachable",
+        "device": {"transport": "ssh"},
+        "eapi": {"online": True, "delay": 0.0},
+        "ssh": {"error": OSError("Connection refused")},
+        "expected": {"is_online": False, "established": False, "active_transport": "ssh", "check_connection": False},
+    },
+]
+
+
+def ssh_connection() -> MagicMock:
+    """Return a mocked asyncssh connection that stays open until close() is called"""
+    closed = asyncio.Event()
+    conn = MagicMock(spec=SSHClientConnection)
+    conn.close.side_effect = closed.set
+    conn.wait_closed.side_effect = closed.wait
+    return conn
 
 
 class TestAntaDevice:
@@ -624,6 +792,9 @@ class TestAntaDevice:
 
         await device.collect(command)
 
+        assert command.duration is not None
+        assert command.cache_hit is (expected_data["cache_hit"] if device.cache is not None and command.use_cache else None)
+        assert (device.commands_sent, device.command_errors) == (0 if command.cache_hit else 1, 0)
         if device.cache is not None:  # device_cache is enabled
             current_cached_data = await device.cache.get(command.uid)
             if command.use_cache is True:  # command is allowed to use cache
@@ -751,6 +922,114 @@ class TestAsyncEOSDevice:
             assert cmd.output == expected["output"]
             assert cmd.errors == expected["errors"]
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "async_device, command, run, expected",
+        map(lambda d: (d["device"], d["command"], d["run"], d["expected"]), SSH_COLLECT_DATA),
+        ids=generate_test_ids_list(SSH_COLLECT_DATA),
+        indirect=["async_device"],
+    )
+    async def test__collect_ssh(self, async_device: AsyncEOSDevice, command: dict[str, Any], run: Any, expected: dict[str, Any]) -> None:
+        # pylint: disable=protected-access
+        """Test AsyncEOSDevice._collect() with the SSH transport"""
+        cmd = AntaCommand(**command)
+        conn = ssh_connection()
+        if isinstance(run, Exception):
+            conn.run.side_effect = run
+        else:
+            conn.run.return_value = SimpleNamespace(**{"stderr": "", **run})
+        with patch("asyncssh.connect", new_callable=AsyncMock, return_value=conn), patch.object(async_device._session, "cli") as cli_mock:
+            await async_device.collect(cmd)
+        cli_mock.assert_not_called()
+        conn.run.assert_awaited_once_with(expected["run"], input=expected.get("input"), check=False, timeout=None)
+        assert cmd.output == expected["output"]
+        assert cmd.errors == expected["errors"]
+        await async_device.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "async_device, eapi, ssh, expected",
+        map(lambda d: (d["device"], d["eapi"], d["ssh"], d["expected"]), TRANSPORT_REFRESH_DATA),
+        ids=generate_test_ids_list(TRANSPORT_REFRESH_DATA),
+        indirect=["async_device"],
+    )
+    async def test_refresh_transport(self, async_device: AsyncEOSDevice, eapi: dict[str, Any], ssh: dict[str, Any], expected: dict[str, Any]) -> None:
+        # pylint: disable=protected-access
+        """Test AsyncEOSDevice.refresh() transport selection"""
+
+        connections: list[None] = []
+
+        async def eapi_cli(**_: Any) -> dict[str, Any]:
+            if not connections:
+                # The first request opens the HTTP connection
+                connections.append(None)
+                await asyncio.sleep(eapi.get("connect", 0.0))
+            await asyncio.sleep(eapi["delay"])
+            return {"modelName": "DCS-7280CR3-32P4-F"}
+
+        async def ssh_run(*_: Any, **__: Any) -> SimpleNamespace:
+            await asyncio.sleep(ssh["delay"])
+            return SimpleNamespace(stdout='{"modelName": "DCS-7280CR3-32P4-F"}', stderr="", exit_status=0)
+
+        if "error" in ssh:
+            connect_mock = AsyncMock(side_effect=ssh["error"])
+        else:
+            connect_mock = AsyncMock(return_value=ssh_connection())
+            connect_mock.return_value.run.side_effect = ssh_run
+        with patch("asyncssh.connect", connect_mock), patch.object(
+            async_device._session, "check_connection", return_value=eapi["online"]
+        ) as check_connection_mock, patch.object(async_device._session, "cli", side_effect=eapi_cli):
+            await async_device.refresh()
+        assert check_connection_mock.called is expected["check_connection"]
+        assert async_device.is_online == expected["is_online"]
+        assert async_device.established == expected["established"]
+        assert async_device.active_transport == expected["active_transport"]
+        await async_device.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("async_device", [{"transport": "auto"}], indirect=True)
+    async def test__collect_fallback(self, async_device: AsyncEOSDevice) -> None:
+        # pylint: disable=protected-access
+        """Test that AsyncEOSDevice._collect() falls back to SSH when eAPI is not reachable with the 'auto' transport"""
+        cmd = AntaCommand(command="show version")
+        conn = ssh_connection()
+        conn.run.return_value = SimpleNamespace(stdout='{"modelName": "DCS-7280CR3-32P4-F"}', stderr="", exit_status=0)
+        with patch("asyncssh.connect", new_callable=AsyncMock, return_value=conn), patch.object(
+            async_device._session, "cli", side_effect=httpx.ConnectError("Connection refused")
+        ):
+            assert async_device.active_transport == "eapi"
+            await async_device.collect(cmd)
+        assert cmd.output == {"modelName": "DCS-7280CR3-32P4-F"}
+        assert async_device.active_transport == "ssh"
+        await async_device.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("data", COMMAND_POLICY_DATA, ids=generate_test_ids_list(COMMAND_POLICY_DATA))
+    async def test__collect_policies(self, async_device: AsyncEOSDevice, data: dict[str, Any]) -> None:
+        # pylint: disable=protected-access
+        """Test the retry and hedging policies of the commands in AsyncEOSDevice._collect()"""
+        responses = list(data["responses"])
+
+        async def eapi_cli(**_: Any) -> list[dict[str, Any]]:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            delay, output = response
+            await asyncio.sleep(delay)
+            return output
+
+        cmd = AntaCommand(**data["command"])
+        with patch("anta.device.RETRY_BACKOFF", 0), patch.object(async_device._session, "cli", side_effect=eapi_cli) as cli_mock:
+            await async_device.collect(cmd)
+        assert cli_mock.call_count == data["expected"]["calls"]
+        assert cmd.output == data["expected"]["output"]
+        assert cmd.errors == data["expected"]["errors"]
+
+    def test_invalid_transport(self) -> None:
+        """Test the AsyncEOSDevice constructor with an invalid transport"""
+        with pytest.raises(ValueError, match="'transport' must be one of eapi, ssh, auto"):
+            AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", transport="telnet")  # type: ignore[arg-type]
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "async_device, copy",
@@ -760,9 +1039,8 @@ class TestAsyncEOSDevice:
     )
     async def test_copy(self, async_device: AsyncEOSDevice, copy: dict[str, Any]) -> None:
         """Test AsyncEOSDevice.copy()"""
-        conn = SSHClientConnection(asyncio.get_event_loop(), SSHClientConnectionOptions())
-        with patch("asyncssh.connect") as connect_mock:
-            connect_mock.return_value.__aenter__.return_value = conn
+        conn = ssh_connection()
+        with patch("asyncssh.connect", new_callable=AsyncMock, return_value=conn):
             with patch("asyncssh.scp") as scp_mock:
                 await async_device.copy(copy["sources"], copy["destination"], copy["direction"])
                 if copy["direction"] == "from":
@@ -775,3 +1053,98 @@ class TestAsyncEOSDevice:
                     scp_mock.assert_not_awaited()
                     return
                 scp_mock.assert_awaited_once_with(src, dst)
+
+    @pytest.mark.asyncio
+    async def test_ssh_connection_pool(self, async_device: AsyncEOSDevice, tmp_path: Path) -> None:
+        """Test that AsyncEOSDevice.copy() and AsyncEOSDevice.download() reuse the SSH connection until AsyncEOSDevice.close()"""
+        conn = ssh_connection()
+        with patch("asyncssh.connect", new_callable=AsyncMock, return_value=conn) as connect_mock, patch("asyncssh.scp"), patch(
+            "anta.device.sftp_download", return_value=True
+        ):
+            await async_device.copy([Path("/mnt/flash/file1")], tmp_path)
+            await async_device.copy([Path("/mnt/flash/file2")], tmp_path)
+            await async_device.download([Path("/mnt/flash/file3")], tmp_path)
+            connect_mock.assert_awaited_once()
+            await async_device.close()
+            conn.close.assert_called_once()
+            await async_device.copy([Path("/mnt/flash/file1")], tmp_path)
+            assert connect_mock.await_count == 2
+            await async_device.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("verify_checksum", [False, True])
+    async def test_download(self, async_device: AsyncEOSDevice, tmp_path: Path, verify_checksum: bool) -> None:
+        # pylint: disable=protected-access
+        """Test AsyncEOSDevice.download()"""
+        sources = [Path("/mnt/flash/schedule/tech-support/ts1.log.gz"), Path("/mnt/flash/schedule/tech-support/ts2.log.gz")]
+        sha256sum_output = "".join(f"{'a' * 64}  {source}\n" for source in sources)
+        conn = ssh_connection()
+        with patch("asyncssh.connect", new_callable=AsyncMock, return_value=conn), patch.object(
+            async_device._session, "cli", return_value=[sha256sum_output]
+        ) as cli_mock:
+            sftp = conn.start_sftp_client.return_value.__aenter__.return_value
+            with patch("anta.device.sftp_download", side_effect=[True, False]) as download_mock:
+                downloaded = await async_device.download(sources, tmp_path / "out", verify_checksum=verify_checksum)
+        assert downloaded == [tmp_path / "out" / "ts1.log.gz"]
+        assert (tmp_path / "out").is_dir()
+        assert [c.args[:3] for c in download_mock.call_args_list] == [(sftp, source, tmp_path / "out" / source.name) for source in sources]
+        assert [c.args[5] for c in download_mock.call_args_list] == (["a" * 64] * 2 if verify_checksum else [None, None])
+        assert cli_mock.called is verify_checksum
+
+    @pytest.mark.asyncio
+    async def test_download_error(self, async_device: AsyncEOSDevice, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Test AsyncEOSDevice.download() with a failed download"""
+        sources = [Path("/mnt/flash/ts1.log.gz"), Path("/mnt/flash/ts2.log.gz")]
+        with patch("asyncssh.connect", new_callable=AsyncMock, return_value=ssh_connection()):
+            with patch("anta.device.sftp_download", side_effect=[True, OSError("boom")]):
+                assert await async_device.download(sources, tmp_path) == [tmp_path / "ts1.log.gz"]
+        assert f"Unable to download '/mnt/flash/ts2.log.gz' from device {async_device.name}: OSError (boom)" in caplog.messages
+
+
+class TestSnapshotDevice:
+    """
+    Test for anta.device.SnapshotDevice
+    """
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("data", SNAPSHOT_COLLECT_DATA, ids=generate_test_ids_list(SNAPSHOT_COLLECT_DATA))
+    async def test_collect(self, snapshot_root: Path, data: dict[str, Any]) -> None:
+        """Test SnapshotDevice.collect()"""
+        device = SnapshotDevice(name="dummy", root=snapshot_root)
+        assert (device.archive is not None) is snapshot_root.is_file()
+        command = AntaCommand(**data["command"])
+        await device.collect(command)
+        assert command.output == data["expected"]["output"]
+        assert command.errors == data["expected"]["errors"]
+
+    @pytest.mark.asyncio
+    async def test_collect_invalid_json(self, tmp_path: Path) -> None:
+        """Test SnapshotDevice.collect() with an invalid JSON output"""
+        (tmp_path / "dummy" / "json").mkdir(parents=True)
+        (tmp_path / "dummy" / "json" / "show version.json").write_text("{", encoding="UTF-8")
+        device = SnapshotDevice(name="dummy", root=tmp_path)
+        command = AntaCommand(command="show version")
+        await device.collect(command)
+        assert not command.collected
+        assert command.errors[0].startswith("Cannot read the output of command 'show version'")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name, expected", [("dummy", "DCS-7280CR3-32P4-F"), ("dummy3", None)])
+    async def test_refresh(self, snapshot_root: Path, name: str, expected: str | None) -> None:
+        """Test SnapshotDevice.refresh()"""
+        device = SnapshotDevice(name=name, root=snapshot_root, tags=["leaf"])
+        await device.refresh()
+        assert device.established is (expected is not None)
+        assert device.hw_model == expected
+        assert device.tags == ["leaf", name]
+        assert device != SnapshotDevice(name=name, root=SNAPSHOT_DIR.parent)
+        rprint(device)
+
+    @pytest.mark.asyncio
+    async def test_transfer(self, tmp_path: Path) -> None:
+        """Test SnapshotDevice.copy() and SnapshotDevice.download()"""
+        device = SnapshotDevice(name="dummy", root=SNAPSHOT_DIR)
+        with pytest.raises(NotImplementedError, match="Cannot copy files from snapshot device dummy"):
+            await device.copy(sources=[Path("/mnt/flash/schedule/tech-support/dummy.log.gz")], destination=tmp_path)
+        with pytest.raises(NotImplementedError, match="Cannot download files from snapshot device dummy"):
+            await device.download(sources=[Path("/mnt/flash/schedule/tech-support/dummy.log.gz")], destination=tmp_path)
@@ -0,0 +1,179 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.diff.py
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from anta.diff import diff_results, diff_snapshots, json_diff, text_diff
+from anta.result_manager.models import TestResult
+from anta.snapshot import SnapshotArchiveWriter
+
+
+def result(name: str, test: str, status: str, messages: list[str] | None = None) -> TestResult:
+    """Return a TestResult"""
+    return TestResult(name=name, test=test, categories=[], description="", result=status, messages=messages or [])  # type: ignore[arg-type]
+
+
+RESULTS_DATA: list[dict[str, Any]] = [
+    {
+        "name": "unchanged",
+        "before": [result("leaf1", "VerifyUptime", "success")],
+        "after": [result("leaf1", "VerifyUptime", "success")],
+        "expected": {"changes": [], "regressions": 0, "unchanged": 1},
+    },
+    {
+        "name": "regression",
+        "before": [result("leaf1", "VerifyUptime", "success"), result("leaf1", "VerifyNTP", "success")],
+        "after": [result("leaf1", "VerifyUptime", "failure", ["Uptime is too low"]), result("leaf1", "VerifyNTP", "success")],
+        "expected": {"changes": [("leaf1", "VerifyUptime", 0, "changed", "success", "failure")], "regressions": 1, "unchanged": 1},
+    },
+    {
+        "name": "fixed and new messages",
+        "before": [result("leaf1", "VerifyUptime", "failure", ["Uptime is too low"]), result("leaf1", "VerifyNTP", "error", ["timeout"])],
+        "after": [result("leaf1", "VerifyUptime", "success"), result("leaf1", "VerifyNTP", "failure", ["NTP is not synchronized"])],
+        "expected": {
+            "changes": [("leaf1", "VerifyUptime", 0, "changed", "failure", "success"), ("leaf1", "VerifyNTP", 0, "changed", "error", "failure")],
+            "regressions": 0,
+            "unchanged": 0,
+        },
+    },
+    {
+        "name": "added and removed",
+        "before": [result("leaf1", "VerifyUptime", "success"), result("leaf2", "VerifyUptime", "success")],
+        "after": [result("leaf1", "VerifyUptime", "success"), result("leaf3", "VerifyUptime", "error", ["timeout"])],
+        "expected": {
+            "changes": [("leaf3", "VerifyUptime", 0, "added", None, "error"), ("leaf2", "VerifyUptime", 0, "removed", "success", None)],
+            "regressions": 1,
+            "unchanged": 1,
+        },
+    },
+    {
+        "name": "same test multiple times",
+        "before": [result("leaf1", "VerifyInterfacesStatus", "success"), result("leaf1", "VerifyInterfacesStatus", "success")],
+        "after": [result("leaf1", "VerifyInterfacesStatus", "success"), result("leaf1", "VerifyInterfacesStatus", "failure", ["Ethernet2 is down"])],
+        "expected": {"changes": [("leaf1", "VerifyInterfacesStatus", 1, "changed", "success", "failure")], "regressions": 1, "unchanged": 1},
+    },
+]
+
+
+@pytest.mark.parametrize("data", RESULTS_DATA, ids=[data["name"] for data in RESULTS_DATA])
+def test_diff_results(data: dict[str, Any]) -> None:
+    """
+    Test diff_results()
+    """
+    diff = diff_results(data["before"], data["after"])
+    assert [(change.name, change.test, change.index, change.change, change.before, change.after) for change in diff.changes] == data["expected"]["changes"]
+    assert len(diff.regressions) == data["expected"]["regressions"]
+    assert diff.unchanged == data["expected"]["unchanged"]
+
+
+def test_diff_results_summary() -> None:
+    """
+    Test ResultsDiff.by_device() and ResultsDiff.by_test()
+    """
+    before = [result(f"leaf{i}", test, "success") for i in range(3) for test in ("VerifyUptime", "VerifyNTP")]
+    after = [result(f"leaf{i}", test, "failure" if i else "success") for i in range(3) for test in ("VerifyUptime", "VerifyNTP")]
+    diff = diff_results(before, after)
+    assert diff.by_device() == {"leaf1": {"changed": 2, "regression": 2}, "leaf2": {"changed": 2, "regression": 2}}
+    assert diff.by_test() == {"VerifyUptime": {"changed": 2, "regression": 2}, "VerifyNTP": {"changed": 2, "regression": 2}}
+
+
+JSON_DIFF_DATA: list[dict[str, Any]] = [
+    {"name": "equal", "before": {"a": [1, {"b": 2}]}, "after": {"a": [1, {"b": 2}]}, "ignore": (), "expected": []},
+    {"name": "value", "before": {"a": {"b": "up"}}, "after": {"a": {"b": "down"}}, "ignore": (), "expected": ['a.b: "up" -> "down"']},
+    {"name": "keys", "before": {"a": 1, "b": 2}, "after": {"b": 2, "c": 3}, "ignore": (), "expected": ["a: removed", "c: added 3"]},
+    {"name": "lists", "before": {"a": [1, 2]}, "after": {"a": [1, 3, 4]}, "ignore": (), "expected": ["a[1]: 2 -> 3", "a[2]: added 4"]},
+    {"name": "type", "before": {"a": 1}, "after": {"a": "1"}, "ignore": (), "expected": ['a: 1 -> "1"']},
+    {"name": "ignored keys", "before": {"a": {"uptime": 1, "b": 1}}, "after": {"a": {"uptime": 2, "b": 1}}, "ignore": ("uptime",), "expected": []},
+    {"name": "truncated", "before": "a", "after": "b" * 100, "ignore": (), "expected": [f'.: "a" -> "{"b" * 76}...']},
+]
+
+
+@pytest.mark.parametrize("data", JSON_DIFF_DATA, ids=[data["name"] for data in JSON_DIFF_DATA])
+def test_json_diff(data: dict[str, Any]) -> None:
+    """
+    Test json_diff()
+    """
+    assert list(json_diff(data["before"], data["after"], data["ignore"])) == data["expected"]
+
+
+def test_text_diff() -> None:
+    """
+    Test text_diff()
+    """
+    assert text_diff("line1\nline2\nline3\n", "line1\nline 2\nline3\nline4\n") == ["-line2", "+line 2", "+line4"]
+    assert not text_diff("line1\n", "line1\n")
+
+
+SNAPSHOT_BEFORE: dict[tuple[str, str, str], Any] = {
+    ("leaf1", "json", "show version"): {"version": "4.31.1F", "uptime": 100},
+    ("leaf1", "json", "show interfaces Ethernet1/1"): {"interfaces": {"Ethernet1/1": {"lineProtocolStatus": "up"}}},
+    ("leaf1", "text", "show clock"): "Mon Jan 1 00:00:00 2024\n",
+    ("leaf2", "json", "show version"): {"version": "4.30.2F", "uptime": 100},
+}
+SNAPSHOT_AFTER: dict[tuple[str, str, str], Any] = {
+    ("leaf1", "json", "show version"): {"version": "4.31.1F", "uptime": 200},
+    ("leaf1", "json", "show interfaces Ethernet1/1"): {"interfaces": {"Ethernet1/1": {"lineProtocolStatus": "down"}}},
+    ("leaf1", "text", "show clock"): "Mon Jan 1 00:00:00 2024\n",
+    ("leaf3", "json", "show version"): {"version": "4.30.2F", "uptime": 100},
+}
+
+
+def write_snapshot(path: Path, outputs: dict[tuple[str, str, str], Any], archive: bool) -> Path:
+    """Write command outputs to a snapshot directory or archive like `anta exec snapshot`"""
+    if archive:
+        path = path.with_suffix(".anta-snapshot")
+        with SnapshotArchiveWriter(path) as writer:
+            for (device, ofmt, command), output in outputs.items():
+                writer.add(device, command, ofmt, output)
+        return path
+    for (device, ofmt, command), output in outputs.items():
+        file = path / device / ofmt / f"{command}.{'json' if ofmt == 'json' else 'log'}"
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(json.dumps(output, indent=4) if ofmt == "json" else output, encoding="UTF-8")
+    return path
+
+
+@pytest.mark.parametrize(
+    "archive_before, archive_after",
+    [
+        pytest.param(False, False, id="directories"),
+        pytest.param(True, True, id="archives"),
+        pytest.param(False, True, id="directory and archive"),
+    ],
+)
+def test_diff_snapshots(tmp_path: Path, archive_before: bool, archive_after: bool) -> None:
+    """
+    Test diff_snapshots()
+    """
+    before = write_snapshot(tmp_path / "before", SNAPSHOT_BEFORE, archive_before)
+    after = write_snapshot(tmp_path / "after", SNAPSHOT_AFTER, archive_after)
+    diff = diff_snapshots(before, after, ignore_keys={"uptime"})
+    assert [(change.device, change.ofmt, change.command, change.change, change.details) for change in diff.changes] == [
+        ("leaf1", "json", "show interfaces Ethernet1/1", "changed", ['interfaces.Ethernet1/1.lineProtocolStatus: "up" -> "down"']),
+        ("leaf3", "json", "show version", "added", []),
+        ("leaf2", "json", "show version", "removed", []),
+    ]
+    assert diff.unchanged == 2
+    assert diff.by_device() == {"leaf1": {"changed": 1}, "leaf3": {"added": 1}, "leaf2": {"removed": 1}}
+
+    diff = diff_snapshots(before, after, devices={"leaf1"})
+    assert sorted((change.command, change.change) for change in diff.changes) == [("show interfaces Ethernet1/1", "changed"), ("show version", "changed")]
+    assert diff.unchanged == 1
+
+
+def test_diff_snapshots_invalid(tmp_path: Path) -> None:
+    """
+    Test diff_snapshots() with a file that is not a snapshot
+    """
+    (tmp_path / "file.json").write_text("{}", encoding="UTF-8")
+    with pytest.raises(ValueError, match="is not a snapshot directory or archive"):
+        diff_snapshots(tmp_path, tmp_path / "file.json")
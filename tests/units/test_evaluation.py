@@ -0,0 +1,154 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.evaluation.py
+"""
+# Mypy does not understand AntaTest.Input typing
+# mypy: disable-error-code=attr-defined
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+from typing import ClassVar, Iterator, Optional
+
+import pytest
+
+from anta import evaluation
+from anta.decorators import skip_on_platforms
+from anta.device import AntaDevice
+from anta.evaluation import EvaluationPool
+from anta.models import AntaCommand, AntaTest
+
+
+class ProcessEvaluatedTest(AntaTest):
+    """ANTA test opting in the process evaluation, reporting the PID of the process evaluating it"""
+
+    name = "ProcessEvaluatedTest"
+    description = "ANTA test opting in the process evaluation"
+    categories = []
+    process_evaluation: ClassVar[Optional[bool]] = True
+    commands = [AntaCommand(command="show version", output={"version": "4.31.1F"})]
+
+    class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
+        version: str = "4.31.1F"
+        fail: bool = False
+
+    @skip_on_platforms(["cEOSLab"])
+    @AntaTest.anta_test
+    def test(self) -> None:
+        if self.inputs.fail:
+            raise ValueError("evaluation failed")
+        self.logger.info(f"Evaluated on {self.device.name}")
+        if self.instance_commands[0].json_output["version"] == self.inputs.version:
+            self.result.is_success(str(os.getpid()))
+        else:
+            self.result.is_failure(str(os.getpid()))
+
+
+class OptOutTest(ProcessEvaluatedTest):
+    """ANTA test opting out of the process evaluation"""
+
+    name = "OptOutTest"
+    process_evaluation = False
+
+
+class DefaultTest(ProcessEvaluatedTest):
+    """ANTA test following the setting of the process pool"""
+
+    name = "DefaultTest"
+    process_evaluation = None
+
+
+@pytest.fixture(name="pool")
+def pool_fixture() -> Iterator[EvaluationPool]:
+    """Evaluate the tests in a pool of a single process"""
+    with EvaluationPool(processes=1) as instance:
+        evaluation.set_pool(instance)
+        yield instance
+        evaluation.set_pool(None)
+
+
+@pytest.mark.parametrize(
+    "test, all_tests, expected",
+    [
+        pytest.param(ProcessEvaluatedTest, False, True, id="opt-in"),
+        pytest.param(OptOutTest, True, False, id="opt-out"),
+        pytest.param(DefaultTest, False, False, id="default"),
+        pytest.param(DefaultTest, True, True, id="all tests"),
+    ],
+)
+def test_pool_accepts(device: AntaDevice, test: type[AntaTest], all_tests: bool, expected: bool) -> None:
+    """
+    Test the test classes evaluated in the process pool
+    """
+    instance = test(device)
+    function = inspect.unwrap(ProcessEvaluatedTest.test)
+    assert EvaluationPool(all_tests=all_tests).accepts(instance, function) is expected
+
+
+def test_pool_accepts_local_class(device: AntaDevice) -> None:
+    """
+    Test that a test class that cannot be imported by a worker process is evaluated in the event loop
+    """
+
+    class LocalTest(ProcessEvaluatedTest):
+        """ANTA test defined in a function"""
+
+        name = "LocalTest"
+
+    function = inspect.unwrap(ProcessEvaluatedTest.test)
+    assert EvaluationPool().accepts(LocalTest(device), function) is False
+
+
+@pytest.mark.parametrize(
+    "inputs, expected",
+    [
+        pytest.param({}, "success", id="success"),
+        pytest.param({"version": "4.30.2F"}, "failure", id="failure"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_pool_evaluate(pool: EvaluationPool, device: AntaDevice, caplog: pytest.LogCaptureFixture, inputs: dict[str, str], expected: str) -> None:
+    """
+    Test that the result of a test evaluated in a worker process and its log messages are sent back
+    """
+    # pylint: disable=unused-argument
+    caplog.set_level(logging.INFO)
+    test = ProcessEvaluatedTest(device, inputs=inputs)
+    result = await test.test()
+    assert result.result == expected
+    assert result.messages != [str(os.getpid())]
+    assert result.timing is not None
+    assert result.timing.evaluation > 0
+    assert ("tests.units.test_evaluation.ProcessEvaluatedTest", logging.INFO, "Evaluated on pytest") in caplog.record_tuples
+
+
+@pytest.mark.parametrize("test", [OptOutTest, DefaultTest], ids=["opt-out", "default"])
+@pytest.mark.asyncio
+async def test_pool_event_loop(pool: EvaluationPool, device: AntaDevice, test: type[AntaTest]) -> None:
+    """
+    Test that the test classes not evaluated in the pool are evaluated in the main process
+    """
+    # pylint: disable=unused-argument
+    result = await test(device).test()
+    assert result.messages == [str(os.getpid())]
+
+
+@pytest.mark.asyncio
+async def test_pool_evaluate_error(pool: EvaluationPool, device: AntaDevice) -> None:
+    """
+    Test that an exception raised by a test in a worker process sets the test result to error
+    """
+    # pylint: disable=unused-argument
+    result = await ProcessEvaluatedTest(device, inputs={"fail": True}).test()
+    assert result.result == "error"
+    assert result.messages == ["ValueError (evaluation failed)"]
+
+
+def test_pool_disabled() -> None:
+    """
+    Test that the tests are evaluated in the event loop by default
+    """
+    assert evaluation.get_pool() is None
@@ -0,0 +1,85 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.latency.py
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from anta.device import AntaDevice
+from anta.latency import CommandLatency, LatencyHistory
+from anta.models import AntaCommand
+from anta.result_manager.models import CommandTiming, ResultTiming, TestResult
+
+from .test_models import FakeTestWithTemplate
+
+
+def result(*commands: CommandTiming) -> TestResult:
+    """Return a test result with the timing of its commands"""
+    return TestResult(name="dummy", test="FakeTest", categories=[], description="", timing=ResultTiming(commands=list(commands)))
+
+
+def test_update() -> None:
+    """
+    Test LatencyHistory.update()
+    """
+    history = LatencyHistory()
+    history.update([result(CommandTiming(command="show version", duration=1.0)), TestResult(name="dummy", test="FakeTest", categories=[], description="")])
+    assert history.commands == {"json": {"show version": CommandLatency(latency=1.0)}}
+    history.update(
+        [
+            result(CommandTiming(command="show version", duration=2.0), CommandTiming(command="show uptime", duration=5.0, cache_hit=True)),
+            result(CommandTiming(command="show version", ofmt="text", duration=3.0)),
+        ]
+    )
+    # Exponential moving average, the command outputs read from the cache are ignored
+    assert history.commands == {"json": {"show version": CommandLatency(latency=1.3, samples=2)}, "text": {"show version": CommandLatency(latency=3.0)}}
+
+
+def test_estimate() -> None:
+    """
+    Test LatencyHistory.estimate() with the commands missing from the history
+    """
+    history = LatencyHistory()
+    assert history.estimate(AntaCommand(command="show version")) == 0
+    history.update([result(*(CommandTiming(command=f"show command {latency}", duration=latency) for latency in (1.0, 2.0, 10.0)))])
+    assert history.estimate(AntaCommand(command="show command 10.0")) == 10.0
+    assert history.estimate(AntaCommand(command="show command 10.0", ofmt="text")) == 2.0
+    assert history.estimate(AntaCommand(command="show version")) == 2.0
+
+
+def test_schedule(device: AntaDevice) -> None:
+    """
+    Test LatencyHistory.schedule()
+    """
+    tests = [FakeTestWithTemplate(device, inputs={"interface": f"Ethernet{index}"}) for index in range(1, 5)]
+    assert LatencyHistory().schedule(tests) == tests
+    history = LatencyHistory()
+    history.update(
+        [
+            result(CommandTiming(command="show interface Ethernet2", duration=1.0)),
+            result(CommandTiming(command="show interface Ethernet3", duration=10.0)),
+            result(CommandTiming(command="show interface Ethernet4", duration=0.1)),
+        ]
+    )
+    # The latency of Ethernet1 is estimated with the median latency
+    assert [test.inputs.interface for test in history.schedule(tests)] == ["Ethernet3", "Ethernet1", "Ethernet2", "Ethernet4"]  # type: ignore[attr-defined]
+
+
+def test_parse_dump(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test LatencyHistory.parse() and LatencyHistory.dump()
+    """
+    path = tmp_path / "latency.json"
+    assert LatencyHistory.parse(path) == LatencyHistory()
+    history = LatencyHistory()
+    history.update([result(CommandTiming(command="show version", duration=1.0))])
+    history.dump(path)
+    assert LatencyHistory.parse(path) == history
+    path.write_text('{"commands": {"xml": {}}}', encoding="UTF-8")
+    assert LatencyHistory.parse(path) == LatencyHistory()
+    assert f"Unable to parse latency history file '{path}'" in caplog.text
@@ -0,0 +1,163 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.metrics.py
+"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from anta.custom_types import TestStatus
+from anta.device import AntaDevice
+from anta.metrics import AntaMetrics, Counter, Gauge, Histogram, MetricsServer
+from anta.models import AntaCommand
+from anta.result_manager.models import CommandTiming, ResultTiming, TestResult
+
+DATA: list[dict[str, Any]] = [
+    {
+        "name": "counter",
+        "metric": Counter("anta_tests_total", "Number of tests", ("device", "status")),
+        "updates": [
+            ("inc", {"device": "leaf1", "status": "success"}),
+            ("inc", {"device": "leaf1", "status": "success"}),
+            ("inc", {"device": "leaf2", "status": "failure"}),
+        ],
+        "expected": [
+            "# HELP anta_tests_total Number of tests",
+            "# TYPE anta_tests_total counter",
+            'anta_tests_total{device="leaf1",status="success"} 2',
+            'anta_tests_total{device="leaf2",status="failure"} 1',
+        ],
+    },
+    {
+        "name": "gauge with escaped labels",
+        "metric": Gauge("anta_device_established", "Established", ("device",)),
+        "updates": [("set", {"value": 0.5, "device": 'le"af\\1\n'})],
+        "expected": ["# HELP anta_device_established Established", "# TYPE anta_device_established gauge", 'anta_device_established{device="le\\"af\\\\1\\n"} 0.5'],
+    },
+    {
+        "name": "histogram",
+        "metric": Histogram("anta_test_duration_seconds", "Duration", ("test",), buckets=(1.0, 0.1)),
+        "updates": [
+            ("observe", {"value": 0.05, "test": "VerifyUptime"}),
+            ("observe", {"value": 0.5, "test": "VerifyUptime"}),
+            ("observe", {"value": 2, "test": "VerifyUptime"}),
+        ],
+        "expected": [
+            "# HELP anta_test_duration_seconds Duration",
+            "# TYPE anta_test_duration_seconds histogram",
+            'anta_test_duration_seconds_bucket{test="VerifyUptime",le="0.1"} 1',
+            'anta_test_duration_seconds_bucket{test="VerifyUptime",le="1"} 2',
+            'anta_test_duration_seconds_bucket{test="VerifyUptime",le="+Inf"} 3',
+            'anta_test_duration_seconds_sum{test="VerifyUptime"} 2.55',
+            'anta_test_duration_seconds_count{test="VerifyUptime"} 3',
+        ],
+    },
+    {
+        "name": "no samples",
+        "metric": Gauge("anta_last_run_timestamp_seconds", "Last run"),
+        "updates": [],
+        "expected": ["# HELP anta_last_run_timestamp_seconds Last run", "# TYPE anta_last_run_timestamp_seconds gauge"],
+    },
+]
+
+
+@pytest.mark.parametrize("data", DATA, ids=[data["name"] for data in DATA])
+def test_metric_render(data: dict[str, Any]) -> None:
+    """
+    Test the Prometheus text format of the metrics
+    """
+    metric = data["metric"]
+    for method, kwargs in data["updates"]:
+        getattr(metric, method)(**kwargs)
+    assert metric.render() == data["expected"]
+
+
+def test_metric_labels() -> None:
+    """
+    Test that the labels of a metric are validated
+    """
+    counter = Counter("anta_commands_sent_total", "Commands", ("device",))
+    with pytest.raises(ValueError, match="expects the labels device"):
+        counter.inc(name="leaf1")
+    # Histograms are observed, not set
+    assert not hasattr(Histogram("anta_command_duration_seconds", "Latency"), "set")
+
+
+def result(device: str, test: str, status: TestStatus, total: float, commands: list[tuple[float, bool | None]]) -> TestResult:
+    """Return a TestResult with its timing"""
+    timing = ResultTiming(total=total, commands=[CommandTiming(command="show version", ofmt="json", duration=duration, cache_hit=hit) for duration, hit in commands])
+    return TestResult(name=device, test=test, categories=[], description="", result=status, timing=timing)
+
+
+@pytest.mark.asyncio
+async def test_anta_metrics(device: AntaDevice, tmp_path: Path) -> None:
+    """
+    Test AntaMetrics with test results and device statistics
+    """
+    for _ in range(3):
+        await device.collect(AntaCommand(command="show version"))
+    device.command_errors = 1
+    metrics = AntaMetrics()
+    metrics.observe(
+        [
+            result(device.name, "VerifyUptime", "success", 0.2, [(0.05, False), (0.0001, True)]),
+            result(device.name, "VerifyNTP", "failure", 0.02, [(0.01, None)]),
+            TestResult(name=device.name, test="VerifyNTP", categories=[], description="", result="error"),
+        ]
+    )
+    metrics.update_devices([device])
+    assert metrics.tests.get(device=device.name, status="success") == 1
+    assert metrics.tests.get(device=device.name, status="error") == 1
+    assert metrics.test_duration.get(test="VerifyUptime") == 1
+    # Cache hits are not part of the command latency
+    assert metrics.command_duration.get() == 2
+    assert metrics.commands_sent.get(device=device.name) == 1
+    assert metrics.command_errors.get(device=device.name) == 1
+    assert metrics.cache_hits.get(device=device.name) == 2
+    assert metrics.cache_misses.get(device=device.name) == 1
+    assert metrics.device_established.get(device=device.name) == 0
+    assert metrics.last_run.get() > 0
+
+    path = tmp_path / "anta.prom"
+    metrics.write_textfile(path)
+    assert path.read_text(encoding="UTF-8") == metrics.render()
+    assert [p.name for p in tmp_path.iterdir()] == ["anta.prom"]
+    assert 'anta_tests_total{device="pytest",status="failure"} 1\n' in metrics.render()
+
+
+async def http_get(port: int, path: str, method: str = "GET") -> tuple[str, str]:
+    """Send an HTTP request to the local metrics server and return the status line and the body"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = (await reader.read()).decode()
+    writer.close()
+    head, _, body = response.partition("\r\n\r\n")
+    return head.splitlines()[0], body
+
+
+@pytest.mark.asyncio
+async def test_metrics_server() -> None:
+    """
+    Test MetricsServer
+    """
+    metrics = AntaMetrics()
+    metrics.tests.inc(device="leaf1", status="success")
+    server = MetricsServer(metrics, host="127.0.0.1", port=0)
+    await server.start()
+    try:
+        status, body = await http_get(server.port, "/metrics")
+        assert status == "HTTP/1.1 200 OK"
+        assert body == metrics.render()
+        assert (await http_get(server.port, "/"))[0] == "HTTP/1.1 404 Not Found"
+        assert (await http_get(server.port, "/metrics", method="POST"))[0] == "HTTP/1.1 405 Method Not Allowed"
+    finally:
+        await server.close()
+    with pytest.raises(OSError):
+        await http_get(server.port, "/metrics")
@@ -278,7 +278,10 @@ ANTATEST_DATA: list[dict[str, Any]] = [
         "expected": {
             "__init__": {
                 "result": "error",
-                "messages": ["Cannot render template {template='show interface {interface}' version='latest' revision=None ofmt='json' use_cache=True}"],
+                "messages": [
+                    "Cannot render template {template='show interface {interface}' version='latest' revision=None ofmt='json' use_cache=True "
+                    "timeout=None retries=0 hedge_after=None}"
+                ],
             },
             "test": {"result": "error"},
         },
@@ -445,6 +448,27 @@ class Test_AntaTest:
         asyncio.run(test.test())
         self._assert_test(test, expected)
 
+    def test_test_timing(self, device: AntaDevice) -> None:
+        """Test the timing of the AntaTest.test method"""
+        for cache_hit in (False, True):
+            test = FakeTestWithTemplate(device, inputs={"interface": "Ethernet1"})
+            asyncio.run(test.test())
+            timing = test.result.timing
+            assert timing is not None
+            assert timing.queue_wait >= 0
+            assert timing.total >= timing.collection + timing.evaluation
+            assert [(command.command, command.cache_hit) for command in timing.commands] == [("show interface Ethernet1", cache_hit)]
+        # The test is not run with invalid inputs
+        test = FakeTestWithTemplate(device, inputs={"interface": 1})
+        asyncio.run(test.test())
+        assert test.result.timing is None
+        # No command is collected with eos_data
+        test = FakeTestWithTemplate(device, inputs={"interface": "Ethernet1"}, eos_data=["show interface Ethernet1"])
+        asyncio.run(test.test())
+        assert test.result.timing is not None
+        assert test.result.timing.collection == 0
+        assert not test.result.timing.commands
+
 
 ANTATEST_BLACKLIST_DATA = ["reload", "reload --force", "write", "wr mem"]
 
@@ -470,3 +494,12 @@ def test_blacklist(device: AntaDevice, data: str) -> None:
     # Run the test() method
     asyncio.run(test_instance.test())
     assert test_instance.result.result == "error"
+
+
+def test_command_policies() -> None:
+    """Test the timeout, retry and hedging policies of the commands rendered from a template"""
+    template = AntaTemplate(template="show interfaces {interface}", timeout=5, retries=2, hedge_after=0.5)
+    command = template.render(interface="Ethernet1")  # type: ignore[arg-type]
+    assert (command.timeout, command.retries, command.hedge_after) == (5, 2, 0.5)
+    with pytest.raises(ValueError, match="Command 'clear counters' cannot be hedged"):
+        AntaCommand(command="clear counters", hedge_after=0.5)
@@ -0,0 +1,116 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.plan.py
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from anta.catalog import AntaCatalog
+from anta.inventory import AntaInventory
+from anta.plan import AntaPlan, PlannedCommand
+from anta.runner import prepare_tests
+from anta.tests.system import VerifyUptime
+
+CATALOG = AntaCatalog.from_dict(
+    {
+        "anta.tests.system": [{"VerifyUptime": {"minimum": 10}}, {"VerifyUptime": {"minimum": 20}}, {"VerifyReloadCause": {"filters": {"tags": ["spine"]}}}],
+        "anta.tests.connectivity": [{"VerifyReachability": {"hosts": [{"source": "Management0", "destination": "1.1.1.1", "vrf": "MGMT"}]}}],
+    }
+)
+
+DATA: list[dict[str, str]] = [
+    {"name": "invalid JSON", "content": "{", "error": "Invalid JSON"},
+    {
+        "name": "missing module",
+        "content": '{"anta_version": "v0.0.0", "tests": [{"module": "anta.tests.undefined", "test": "VerifyUptime"}]}',
+        "error": "cannot be imported",
+    },
+    {
+        "name": "missing test",
+        "content": '{"anta_version": "v0.0.0", "tests": [{"module": "anta.tests.system", "test": "VerifyUndefined"}]}',
+        "error": "is not defined",
+    },
+    {"name": "invalid inputs", "content": '{"anta_version": "v0.0.0", "tests": [{"module": "anta.tests.system", "test": "VerifyUptime"}]}', "error": "minimum"},
+]
+
+
+def test_build(test_inventory: AntaInventory) -> None:
+    """
+    Test AntaPlan.build()
+    """
+    devices = list(test_inventory.values())
+    plan = AntaPlan.build(prepare_tests(devices, CATALOG))
+    # Test definitions are stored once for all devices
+    assert [test.test for test in plan.tests] == ["VerifyReachability", "VerifyUptime", "VerifyUptime", "VerifyReloadCause"]
+    assert sorted(plan.devices) == ["dummy", "dummy2", "dummy3"]
+    assert len(plan.devices["dummy"].tests) == 3
+    assert len(plan.devices["dummy3"].tests) == 4
+    # Both VerifyUptime tests send the same command
+    dummy_plan = plan.devices["dummy"]
+    assert dummy_plan.commands == [
+        PlannedCommand(command="ping vrf MGMT 1.1.1.1 source Management0 repeat 2"),
+        PlannedCommand(command="show uptime"),
+    ]
+    assert [device_test.commands for device_test in dummy_plan.tests] == [[0], [1], [1]]
+
+
+def test_dump_parse(tmp_path: Path, test_inventory: AntaInventory) -> None:
+    """
+    Test AntaPlan.dump() and AntaPlan.parse()
+    """
+    devices = list(test_inventory.values())
+    tests = prepare_tests(devices, CATALOG)
+    plan = AntaPlan.build(tests)
+    filename = tmp_path / "plan.json"
+    plan.dump(filename)
+    data = json.loads(filename.read_text(encoding="UTF-8"))
+    assert "anta_version" in data
+    assert data["tests"][1] == {"module": "anta.tests.system", "test": "VerifyUptime", "inputs": {"minimum": 10}}
+
+    loaded_plan = AntaPlan.parse(filename)
+    assert loaded_plan == plan
+    loaded_tests = loaded_plan.get_tests(devices)
+    assert set(loaded_tests) == set(tests)
+    for definition, device in loaded_tests:
+        assert loaded_plan.verify(definition, definition.test(device=device, inputs=definition.inputs))
+
+
+def test_get_tests_unknown_device(caplog: pytest.LogCaptureFixture, test_inventory: AntaInventory) -> None:
+    """
+    Test AntaPlan.get_tests() with devices that are not part of the test plan
+    """
+    devices = list(test_inventory.values())
+    plan = AntaPlan.build(prepare_tests(devices[:1], CATALOG))
+    assert {device.name for _, device in plan.get_tests(devices)} == {devices[0].name}
+    assert f"Device {devices[1].name} is not part of the test plan" in caplog.messages
+
+
+def test_verify_outdated(caplog: pytest.LogCaptureFixture, test_inventory: AntaInventory) -> None:
+    """
+    Test AntaPlan.verify() when the rendered commands differ from the test plan
+    """
+    devices = list(test_inventory.values())
+    plan = AntaPlan.build(prepare_tests(devices, AntaCatalog.from_list([(VerifyUptime, {"minimum": 10})])))
+    plan.devices[devices[0].name].commands[0] = PlannedCommand(command="show version")
+    definition, device = next(test for test in plan.get_tests(devices) if test[1] == devices[0])
+    assert not plan.verify(definition, definition.test(device=device, inputs=definition.inputs))
+    assert f"Commands of test VerifyUptime on device {devices[0].name} differ from the test plan. The test plan may be outdated." in caplog.messages
+
+
+@pytest.mark.parametrize("data", DATA, ids=[data["name"] for data in DATA])
+def test_parse_fail(tmp_path: Path, data: dict[str, str]) -> None:
+    """
+    Test AntaPlan.parse() with invalid test plan files
+    """
+    filename = tmp_path / "plan.json"
+    filename.write_text(data["content"], encoding="UTF-8")
+    with pytest.raises((ValidationError, ValueError)) as exec_info:
+        AntaPlan.parse(filename)
+    assert data["error"] in str(exec_info.value)
@@ -0,0 +1,122 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.profiling.py
+"""
+from __future__ import annotations
+
+import asyncio
+import pstats
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from anta import profiling
+from anta.profiling import LoopLagMonitor, Profiler, percentile
+
+
+@pytest.fixture(name="profiler")
+def profiler_fixture(tmp_path: Path) -> Iterator[Profiler]:
+    """Enable the event loop monitoring with a Profiler"""
+    instance = Profiler(tmp_path / "profile", top=5)
+    profiling.set_profiler(instance)
+    yield instance
+    profiling.set_profiler(None)
+
+
+@pytest.mark.parametrize(
+    "samples, percent, expected",
+    [
+        pytest.param([], 50, 0.0, id="no sample"),
+        pytest.param([3.0, 1.0, 2.0], 50, 2.0, id="median"),
+        pytest.param([float(value) for value in range(1, 101)], 90, 90.0, id="p90"),
+        pytest.param([float(value) for value in range(1, 101)], 99, 99.0, id="p99"),
+        pytest.param([1.0, 5.0], 100, 5.0, id="max"),
+        pytest.param([1.0, 5.0], 0, 1.0, id="min"),
+    ],
+)
+def test_percentile(samples: list[float], percent: float, expected: float) -> None:
+    """
+    Test percentile()
+    """
+    assert percentile(samples, percent) == expected
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor() -> None:
+    """
+    Test that LoopLagMonitor measures the time the event loop is blocked
+    """
+    monitor = LoopLagMonitor(interval=0.001)
+    monitor.start()
+    await asyncio.sleep(0.01)
+    # Blocking call in the event loop
+    time.sleep(0.1)
+    await asyncio.sleep(0.01)
+    await monitor.stop()
+    assert monitor.samples
+    assert max(monitor.samples) >= 0.09
+    # Stopping twice is a no-op
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_monitor_loop_disabled() -> None:
+    """
+    Test that monitor_loop() does not measure anything without a profiler
+    """
+
+    @profiling.monitor_loop
+    async def coroutine() -> str:
+        return "done"
+
+    assert profiling.get_profiler() is None
+    assert await coroutine() == "done"
+
+
+def test_profiler(profiler: Profiler) -> None:
+    """
+    Test that Profiler records the CPU time, the event loop lag and the memory allocations and writes the profile files
+    """
+
+    @profiling.monitor_loop
+    async def coroutine() -> list[bytes]:
+        await asyncio.sleep(0.02)
+        time.sleep(0.05)
+        await asyncio.sleep(0.02)
+        return [bytes(1024) for _ in range(1000)]
+
+    profiler.start()
+    data = asyncio.run(coroutine())
+    profiler.stop()
+    assert len(data) == 1000
+
+    functions = profiler.functions()
+    assert len(functions) == 5
+    assert functions == sorted(functions, key=lambda function: function.cumulative, reverse=True)
+    assert profiler.lag_percentiles()["max"] >= 0.04
+    assert profiler.peak_memory >= 1000 * 1024
+    assert any(Path(__file__).name in allocator.location for allocator in profiler.allocators())
+
+    profiler.write()
+    stats = pstats.Stats(str(profiler.directory / "profile.prof"))
+    assert stats.total_calls > 0  # type: ignore[attr-defined]
+    summary = (profiler.directory / "summary.txt").read_text(encoding="UTF-8")
+    for title in ("Top 5 functions by cumulative time", "Event loop lag", "Top 5 allocators"):
+        assert title in summary
+
+
+def test_profiler_not_started(tmp_path: Path) -> None:
+    """
+    Test the summary of a profiler that recorded nothing
+    """
+    profiler = Profiler(tmp_path / "profile")
+    assert not profiler.functions()
+    assert not profiler.allocators()
+    assert profiler.lag_percentiles() == {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    profiler.write()
+    assert not (tmp_path / "profile" / "profile.prof").exists()
+    assert (tmp_path / "profile" / "summary.txt").exists()
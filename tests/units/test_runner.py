@@ -7,17 +7,20 @@ test anta.runner.py
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
 import pytest
 
 from anta import logger
 from anta.catalog import AntaCatalog
 from anta.inventory import AntaInventory
+from anta.latency import CommandLatency, LatencyHistory
 from anta.result_manager import ResultManager
 from anta.runner import main
+from anta.simulator import EapiSimulator, SimulatedDevice
 
-from .test_models import FakeTest
+from .test_models import FakeTest, FakeTestWithTemplate
 
 if TYPE_CHECKING:
     from pytest import LogCaptureFixture
@@ -80,3 +83,25 @@ async def test_runner_no_selected_device(caplog: LogCaptureFixture, test_invento
     assert "No device in the established state 'True' matching the tags ['toto'] was found. There is no device to run tests against, exiting" in [
         record.message for record in caplog.records
     ]
+
+
+@pytest.mark.asyncio
+async def test_runner_latency() -> None:
+    """
+    Test that the tests are started from the slowest but that the results keep the catalog order
+    """
+    outputs: dict[tuple[str, str], Any] = {(f"show interface Ethernet{index}", "json"): {} for index in range(1, 4)}
+    catalog = AntaCatalog.from_list([(FakeTestWithTemplate, {"interface": f"Ethernet{index}"}) for index in range(1, 4)])
+    async with EapiSimulator([SimulatedDevice("sim-1", outputs=outputs)], tls=False) as simulator:
+        inventory = simulator.inventory()
+        manager = ResultManager()
+        await main(manager, inventory, catalog)
+        order = [result.messages[0] for result in manager.get_results()]
+        # The last test of the catalog order is the slowest
+        history = LatencyHistory(commands={"json": {command: CommandLatency(latency=10.0 if command == order[-1] else 0.1) for command in order}})
+        manager = ResultManager()
+        started: list[str] = []
+        with patch.object(FakeTestWithTemplate, "collect", autospec=True, side_effect=lambda test: started.append(test.instance_commands[0].command)):
+            await main(manager, inventory, catalog, latency=history)
+        assert started[0] == order[-1]
+        assert [result.messages[0] for result in manager.get_results()] == order
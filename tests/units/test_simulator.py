@@ -0,0 +1,202 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.simulator.py
+"""
+from __future__ import annotations
+
+import socket
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from anta.device import AsyncEOSDevice
+from anta.inventory import AntaInventory
+from anta.models import AntaCommand
+from anta.simulator import DEFAULT_SHOW_VERSION, EapiSimulator, SimulatedDevice, load_mock_data
+
+MOCK_DATA = Path(__file__).parent.parent / "mock_data"
+SNAPSHOT = Path(__file__).parent.parent / "data" / "test_snapshot"
+
+DATA: list[dict[str, Any]] = [
+    {
+        "name": "json output",
+        "device": {"outputs": {("show uptime", "json"): {"upTime": 1000.0}}},
+        "command": {"command": "show uptime"},
+        "expected": {"output": {"upTime": 1000.0}, "errors": []},
+    },
+    {
+        "name": "text output",
+        "device": {"outputs": {("show ntp status", "text"): "synchronised to NTP server\n"}},
+        "command": {"command": "show ntp status", "ofmt": "text"},
+        "expected": {"output": "synchronised to NTP server\n", "errors": []},
+    },
+    {
+        "name": "snapshot output",
+        "device": {},
+        "command": {"command": "show version", "ofmt": "text"},
+        "expected": {"output": (SNAPSHOT / "dummy" / "text" / "show version.log").read_text(encoding="UTF-8"), "errors": []},
+    },
+    {
+        "name": "default show version",
+        "device": {"snapshot": None},
+        "command": {"command": "show version"},
+        "expected": {"output": DEFAULT_SHOW_VERSION, "errors": []},
+    },
+    {
+        "name": "missing output",
+        "device": {},
+        "command": {"command": "show uptime", "ofmt": "text"},
+        "expected": {"output": None, "errors": ["Invalid input (no 'text' output for this command in the simulator)"]},
+    },
+    {
+        "name": "unsupported command",
+        "device": {"outputs": {("show hardware counter drop", "json"): {}}, "unsupported": ["show hardware counter drop"]},
+        "command": {"command": "show hardware counter drop"},
+        "expected": {"output": None, "errors": ["Unavailable command (not supported on this hardware platform)"]},
+    },
+    {
+        "name": "command error",
+        "device": {"outputs": {("show uptime", "json"): {"upTime": 1000.0}}, "error_rate": 1.0},
+        "command": {"command": "show uptime"},
+        "expected": {"output": None, "errors": ["Simulated command error"]},
+    },
+]
+
+
+def test_load_mock_data(tmp_path: Path) -> None:
+    """
+    Test load_mock_data() with the files of tests/mock_data
+    """
+    outputs = load_mock_data(MOCK_DATA)
+    assert set(outputs) == {("show version", "json"), ("show uptime", "json"), ("show ntp status", "text")}
+    assert outputs[("show uptime", "json")]["upTime"] == 1000000.68
+    assert outputs[("show ntp status", "text")].startswith("synchronised to NTP server")
+    (tmp_path / "show_uptime_json.out").write_text("{'upTime'", encoding="UTF-8")
+    with pytest.raises(ValueError, match="Cannot parse the mock data file"):
+        load_mock_data(tmp_path)
+
+
+@pytest.mark.parametrize("data", DATA, ids=[data["name"] for data in DATA])
+@pytest.mark.asyncio
+async def test_simulated_commands(data: dict[str, Any]) -> None:
+    """
+    Test the command outputs and errors of a simulated device collected with AsyncEOSDevice over HTTPS
+    """
+    kwargs = {"snapshot": EapiSimulator.create(1, snapshot=SNAPSHOT).devices[0].snapshot, **data["device"]}
+    async with EapiSimulator([SimulatedDevice("sim-1", **kwargs)]) as simulator:
+        device = simulator.inventory(enable=True)["sim-1"]
+        command = AntaCommand(**data["command"])
+        await device.collect(command)
+        await device.close()
+    assert command.output == data["expected"]["output"]
+    assert command.errors == data["expected"]["errors"]
+    assert device.supports(command) is ("Unavailable" not in "".join(command.errors))
+    # `enable` is run before the command in the same request
+    assert (simulator.devices[0].requests, simulator.devices[0].commands) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_simulator_refresh() -> None:
+    """
+    Test that the simulated devices are established with the hardware model of their `show version` output
+    """
+    simulator = EapiSimulator.create(3, snapshot=SNAPSHOT, mock_data=MOCK_DATA, latency=0.01, jitter=0.01)
+    assert [device.snapshot.name for device in simulator.devices] == ["dummy", "dummy2", "dummy"]  # type: ignore[union-attr]
+    async with simulator:
+        inventory = simulator.inventory()
+        await inventory.connect_inventory()
+        assert all(device.established for device in inventory.values())
+        # The mock data outputs have precedence over the snapshot outputs
+        assert {device.hw_model for device in inventory.values()} == {"DCS-7280TRA-48C6-F"}
+        await inventory.disconnect_inventory()
+
+
+@pytest.mark.asyncio
+async def test_simulator_http() -> None:
+    """
+    Test the HTTP and JSON-RPC errors and the HTTP keep-alive of the simulator
+    """
+    async with EapiSimulator([SimulatedDevice("sim-1")], tls=False) as simulator:
+        device = simulator.devices[0]
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{device.port}") as client:
+            assert (await client.get("/command-api")).status_code == 405
+            assert (await client.post("/other")).status_code == 404
+            response = await client.post("/command-api", content=b"{")
+            assert response.json()["error"]["code"] == -32700
+            response = await client.post("/command-api", json={"jsonrpc": "2.0", "method": "runCmd", "id": 1})
+            assert response.json() == {"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found: runCmd", "data": []}}
+            cmds = ["show version", "show uptime", "show clock"]
+            response = await client.post("/command-api", json={"jsonrpc": "2.0", "method": "runCmds", "params": {"cmds": cmds, "format": "json"}, "id": 2})
+            error = response.json()["error"]
+            assert (error["code"], error["message"]) == (1002, "CLI command 2 of 3 'show uptime' failed: invalid command")
+            assert len(error["data"]) == 2
+        # The requests were sent on a single connection
+        assert (device.connections, device.requests) == (1, 3)
+
+
+@pytest.mark.asyncio
+async def test_simulator_port_in_use() -> None:
+    """
+    Test that the servers already started are closed when a port is in use
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        port = sock.getsockname()[1]
+        simulator = EapiSimulator([SimulatedDevice("sim-1"), SimulatedDevice("sim-2")], port=port - 1, tls=False)
+        with pytest.raises(OSError):
+            await simulator.start()
+    assert not simulator._servers  # pylint: disable=protected-access
+
+
+def test_simulator_create_errors(tmp_path: Path) -> None:
+    """
+    Test EapiSimulator.create() with an empty snapshot
+    """
+    with pytest.raises(ValueError, match="No device found in the snapshot"):
+        EapiSimulator.create(1, snapshot=tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_simulator_write_inventory(tmp_path: Path) -> None:
+    """
+    Test that the inventory file of the simulated devices can be parsed
+    """
+    path = tmp_path / "inventory.yml"
+    async with EapiSimulator.create(2, mock_data=MOCK_DATA) as simulator:
+        simulator.write_inventory(path)
+    inventory = AntaInventory.parse(path, username="anta", password="anta")
+    assert [(device.name, device.port) for device in simulator.devices] == [
+        (device.name, device._session.port) for device in inventory.values() if isinstance(device, AsyncEOSDevice)  # pylint: disable=protected-access
+    ]
+    with pytest.raises(ValueError, match="must be started with TLS"):
+        EapiSimulator([], tls=False).write_inventory(path)
+
+
+@pytest.mark.asyncio
+async def test_simulator_command_timeout() -> None:
+    """
+    Test that the timeout of a command overrides the timeout of the device and is retried
+    """
+    outputs = {("show uptime", "json"): {"upTime": 1000.0}}
+    async with EapiSimulator([SimulatedDevice("sim-1", outputs=outputs, latency=0.2)]) as simulator:
+        device = simulator.inventory()["sim-1"]
+        assert isinstance(device, AsyncEOSDevice)
+        # The requests are counted by the client: a request can time out before it is received by the simulator
+        with patch.object(device._session, "cli", wraps=device._session.cli) as cli_mock:  # pylint: disable=protected-access
+            command = AntaCommand(command="show uptime", timeout=0.05, retries=1)
+            await device.collect(command)
+            assert command.output is None
+            assert command.errors
+            # The command was sent again after the timeout
+            assert cli_mock.call_count == 2
+            command = AntaCommand(command="show uptime", timeout=1)
+            await device.collect(command)
+            assert command.output == {"upTime": 1000.0}
+            assert cli_mock.call_count == 3
+        await device.close()
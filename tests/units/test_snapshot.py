@@ -0,0 +1,144 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.snapshot.py
+"""
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from anta.snapshot import TRAILER, SnapshotArchive, SnapshotArchiveError, SnapshotArchiveWriter, is_archive
+
+OUTPUTS: list[tuple[str, str, str, Any]] = [
+    ("leaf1", "show version", "json", {"modelName": "DCS-7280CR3-32P4-F", "version": "4.31.1F"}),
+    ("leaf1", "show version", "text", "Arista DCS-7280CR3-32P4-F\nSoftware image version: 4.31.1F\n"),
+    ("leaf1", "show uptime", "json", {"upTime": 1000000.0}),
+    ("leaf2", "show version", "json", {"modelName": "DCS-7050SX3-48YC8", "version": "4.30.2F"}),
+]
+
+INVALID_DATA: list[dict[str, Any]] = [
+    {"name": "not an archive", "content": b"{}", "error": "is not an ANTA snapshot archive"},
+    {"name": "unsupported version", "content": b"ANTASNAP\x09\x00", "error": "Unsupported ANTA snapshot archive format version 9"},
+    {"name": "unsupported codec", "content": b"ANTASNAP\x01\x09", "error": "Unsupported compression codec"},
+    {"name": "truncated", "content": b"ANTASNAP\x01\x00", "error": "is truncated"},
+    {"name": "corrupted index", "content": b"ANTASNAP\x01\x00garbage" + TRAILER.pack(10, 7, b"ANTASNAP"), "error": "Cannot decompress"},
+]
+
+
+def write_archive(path: Path, codec: Any = "gzip") -> None:
+    """Write OUTPUTS to a snapshot archive"""
+    with SnapshotArchiveWriter(path, codec=codec) as writer:
+        for output in OUTPUTS:
+            writer.add(*output)
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_write_read(tmp_path: Path, codec: str) -> None:
+    """
+    Test SnapshotArchiveWriter and SnapshotArchive
+    """
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    path = tmp_path / "snapshot.anta-snapshot"
+    write_archive(path, codec)
+    assert is_archive(path)
+    assert not (tmp_path / "snapshot.anta-snapshot.tmp").exists()
+    with SnapshotArchive(path) as archive:
+        assert archive.codec == codec
+        assert archive.devices == ["leaf1", "leaf2"]
+        assert archive.has_device("leaf2")
+        assert archive.commands("leaf1", "json") == ["show version", "show uptime"]
+        # Random access, in any order
+        for device, command, ofmt, output in reversed(OUTPUTS):
+            assert (device, command, ofmt) in archive
+            assert archive.get(device, command, ofmt) == output
+        assert ("leaf2", "show uptime", "json") not in archive
+        with pytest.raises(KeyError):
+            archive.get("leaf2", "show uptime", "json")
+        # Identical outputs have the same digest
+        assert archive.digest("leaf1", "show version", "json") != archive.digest("leaf2", "show version", "json")
+        with SnapshotArchive(path) as other:
+            assert archive.digest("leaf1", "show version", "json") == other.digest("leaf1", "show version", "json")
+
+
+def test_write_threads(tmp_path: Path) -> None:
+    """
+    Test SnapshotArchiveWriter.add() from multiple threads
+    """
+    path = tmp_path / "snapshot.anta-snapshot"
+    with SnapshotArchiveWriter(path) as writer:
+
+        def add(device: str) -> None:
+            for index in range(50):
+                writer.add(device, f"show command {index}", "json", {"index": index})
+
+        threads = [threading.Thread(target=add, args=(f"device{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    with SnapshotArchive(path) as archive:
+        assert len(archive.devices) == 8
+        assert archive.get("device7", "show command 49", "json") == {"index": 49}
+
+
+def test_write_size(tmp_path: Path) -> None:
+    """
+    Test that a snapshot archive is smaller than the equivalent pretty-printed JSON files
+    """
+    path = tmp_path / "snapshot.anta-snapshot"
+    output = {"interfaces": {f"Ethernet{i}": {"lineProtocolStatus": "up", "interfaceStatus": "connected", "bandwidth": 10000000000} for i in range(100)}}
+    with SnapshotArchiveWriter(path) as writer:
+        writer.add("leaf1", "show interfaces", "json", output)
+    assert path.stat().st_size < len(json.dumps(output, indent=2)) / 5
+
+
+def test_write_error(tmp_path: Path) -> None:
+    """
+    Test SnapshotArchiveWriter.close() with an output that cannot be serialized
+    """
+    path = tmp_path / "snapshot.anta-snapshot"
+    writer = SnapshotArchiveWriter(path)
+    writer.add("leaf1", "show version", "json", {"set": {1, 2}})
+    with pytest.raises(TypeError):
+        writer.close()
+    assert not path.exists()
+    assert not (tmp_path / "snapshot.anta-snapshot.tmp").exists()
+
+
+def test_write_abort(tmp_path: Path) -> None:
+    """
+    Test SnapshotArchiveWriter when an exception is raised in the context manager
+    """
+    path = tmp_path / "snapshot.anta-snapshot"
+    with pytest.raises(RuntimeError):
+        with SnapshotArchiveWriter(path) as writer:
+            writer.add(*OUTPUTS[0])
+            raise RuntimeError
+    assert not path.exists()
+    assert not (tmp_path / "snapshot.anta-snapshot.tmp").exists()
+
+
+def test_unsupported_codec(tmp_path: Path) -> None:
+    """
+    Test SnapshotArchiveWriter with an unsupported codec
+    """
+    with pytest.raises(SnapshotArchiveError, match="Unsupported compression codec 'lzma'"):
+        SnapshotArchiveWriter(tmp_path / "snapshot.anta-snapshot", codec="lzma")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("data", INVALID_DATA, ids=[data["name"] for data in INVALID_DATA])
+def test_read_invalid(tmp_path: Path, data: dict[str, Any]) -> None:
+    """
+    Test SnapshotArchive with invalid files
+    """
+    path = tmp_path / "snapshot.anta-snapshot"
+    path.write_bytes(data["content"])
+    with pytest.raises(SnapshotArchiveError, match=data["error"]):
+        SnapshotArchive(path)
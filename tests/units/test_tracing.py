@@ -0,0 +1,169 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.tracing.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import pytest
+
+from anta import tracing
+from anta.tracing import JsonFileExporter, OtlpExporter, Span, SpanExporter, Tracer
+from tests.lib.otlp import OtlpStubServer
+
+
+class MemoryExporter(SpanExporter):
+    """Keep the exported spans in memory"""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self.closed = False
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def exporter() -> Iterator[MemoryExporter]:
+    """Enable tracing with a MemoryExporter"""
+    memory = MemoryExporter()
+    tracer = Tracer([memory], batch_size=2)
+    tracing.set_tracer(tracer)
+    yield memory
+    tracing.set_tracer(None)
+    tracer.shutdown()
+
+
+def test_span_disabled() -> None:
+    """
+    Test that span() returns a shared no-op context manager when tracing is disabled
+    """
+    assert tracing.get_tracer() is None
+    with tracing.span("anta.test", test="VerifyUptime") as span:
+        assert span is None
+    assert tracing.span("anta.test") is tracing.span("anta.eapi.request")
+
+
+@pytest.mark.asyncio
+async def test_span_parents(exporter: MemoryExporter) -> None:
+    """
+    Test that the spans started in asyncio tasks are children of the span of the parent task
+    """
+    # pylint: disable=redefined-outer-name
+
+    async def child(index: int) -> None:
+        with tracing.span("child", index=index):
+            await asyncio.sleep(0)
+
+    @tracing.traced("root")
+    async def root() -> None:
+        await asyncio.gather(*(child(index) for index in range(3)))
+
+    await root()
+    await root()
+    tracing.get_tracer().shutdown()  # type: ignore[union-attr]
+    assert exporter.closed
+    assert [span.name for span in exporter.spans] == ["child", "child", "child", "root"] * 2
+    roots = [span for span in exporter.spans if span.name == "root"]
+    assert all(span.parent_id is None for span in roots)
+    assert roots[0].trace_id != roots[1].trace_id
+    for index, span in enumerate(exporter.spans):
+        if span.name == "child":
+            parent = roots[index // 4]
+            assert (span.trace_id, span.parent_id) == (parent.trace_id, parent.span_id)
+            assert parent.start <= span.start <= span.end <= parent.end
+    assert sorted(span.attributes["index"] for span in exporter.spans[:3]) == [0, 1, 2]
+
+
+def test_span_error(exporter: MemoryExporter) -> None:
+    """
+    Test that a span records the exception raised in its context
+    """
+    # pylint: disable=redefined-outer-name
+    with pytest.raises(ValueError):
+        with tracing.span("anta.test.evaluate"):
+            raise ValueError("invalid input")
+    with tracing.span("anta.test.collect") as span:
+        assert span is not None
+        span.set_attribute("commands", 2)
+    tracing.get_tracer().flush()  # type: ignore[union-attr]
+    tracing.get_tracer().shutdown()  # type: ignore[union-attr]
+    assert [(span.name, span.error, span.attributes) for span in exporter.spans] == [
+        ("anta.test.evaluate", "ValueError (invalid input)", {}),
+        ("anta.test.collect", None, {"commands": 2}),
+    ]
+
+
+def test_json_file_exporter(tmp_path: Path) -> None:
+    """
+    Test JsonFileExporter
+    """
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer([JsonFileExporter(path)])
+    with tracer.span("anta.nrfu"):
+        with tracer.span("anta.test", test="VerifyUptime", device="leaf1"):
+            pass
+    tracer.shutdown()
+    test, nrfu = [json.loads(line) for line in path.read_text(encoding="UTF-8").splitlines()]
+    assert (test["name"], test["attributes"], test["error"]) == ("anta.test", {"test": "VerifyUptime", "device": "leaf1"}, None)
+    assert (nrfu["name"], nrfu["parent_id"]) == ("anta.nrfu", None)
+    assert test["parent_id"] == nrfu["span_id"]
+    assert len(test["trace_id"]) == 32 and len(test["span_id"]) == 16
+    assert nrfu["start_time_unix_nano"] <= test["start_time_unix_nano"] <= test["end_time_unix_nano"] <= nrfu["end_time_unix_nano"]
+
+
+def test_otlp_exporter(otlp_server: OtlpStubServer) -> None:
+    """
+    Test that OtlpExporter sends the spans to an OpenTelemetry collector
+    """
+    tracer = Tracer([OtlpExporter(otlp_server.url)])
+    with tracer.span("anta.nrfu"):
+        with pytest.raises(RuntimeError):
+            with tracer.span("anta.test", test="VerifyUptime", index=1, duration=0.5, established=True):
+                raise RuntimeError("boom")
+    tracer.shutdown()
+    assert len(otlp_server.requests) == 1
+    resource = otlp_server.requests[0]["resourceSpans"][0]["resource"]
+    assert resource["attributes"] == [{"key": "service.name", "value": {"stringValue": "anta"}}]
+    test, nrfu = otlp_server.spans
+    assert "parentSpanId" not in nrfu
+    assert test["parentSpanId"] == nrfu["spanId"]
+    assert test["traceId"] == nrfu["traceId"]
+    assert test["attributes"] == [
+        {"key": "test", "value": {"stringValue": "VerifyUptime"}},
+        {"key": "index", "value": {"intValue": "1"}},
+        {"key": "duration", "value": {"doubleValue": 0.5}},
+        {"key": "established", "value": {"boolValue": True}},
+    ]
+    assert test["status"] == {"code": OtlpExporter.STATUS_CODE_ERROR, "message": "RuntimeError (boom)"}
+    assert nrfu["status"] == {"code": OtlpExporter.STATUS_CODE_OK}
+    assert int(nrfu["startTimeUnixNano"]) <= int(test["startTimeUnixNano"]) <= int(test["endTimeUnixNano"]) <= int(nrfu["endTimeUnixNano"])
+
+
+@pytest.mark.parametrize("status", [pytest.param(500, id="server error"), pytest.param(None, id="unreachable collector")])
+def test_otlp_exporter_error(otlp_server: OtlpStubServer, caplog: pytest.LogCaptureFixture, status: int | None) -> None:
+    """
+    Test that the OtlpExporter errors are logged and do not raise
+    """
+    caplog.set_level(logging.WARNING)
+    url = otlp_server.url
+    if status is None:
+        otlp_server.shutdown()
+        otlp_server.server_close()
+    else:
+        otlp_server.status = status
+    tracer = Tracer([OtlpExporter(f"{url}/v1/traces", timeout=1.0)])
+    with tracer.span("anta.nrfu"):
+        pass
+    tracer.shutdown()
+    assert f"Cannot export 1 span(s) to '{url}/v1/traces'" in caplog.text
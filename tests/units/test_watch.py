@@ -0,0 +1,189 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.watch.py
+"""
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from pydantic import ValidationError
+
+from anta.catalog import AntaCatalog
+from anta.inventory import AntaInventory
+from anta.tests.hardware import VerifyTemperature
+from anta.tests.system import VerifyNTP, VerifyUptime
+from anta.watch import AntaWatcher, WatchCycle, WatchInterval
+
+CATALOG = AntaCatalog.from_list([(VerifyUptime, {"minimum": 100}), (VerifyNTP, None)])
+
+
+def write_outputs(root: Path, device: str, uptime: int = 1000, ntp: str = "synchronised") -> None:
+    """Write the command outputs of the tests of CATALOG to a snapshot directory"""
+    (root / device / "json").mkdir(parents=True, exist_ok=True)
+    (root / device / "text").mkdir(parents=True, exist_ok=True)
+    (root / device / "json" / "show uptime.json").write_text(json.dumps({"upTime": uptime}), encoding="UTF-8")
+    (root / device / "text" / "show ntp status.log").write_text(f"{ntp} to NTP server\n", encoding="UTF-8")
+
+
+async def watch(inventory: AntaInventory, cycles: int | None, on_cycle: Callable[[AntaWatcher, WatchCycle], None] | None = None, **kwargs: Any) -> list[WatchCycle]:
+    """Run an AntaWatcher on CATALOG and return its cycles"""
+    result: list[WatchCycle] = []
+
+    def callback(cycle: WatchCycle) -> None:
+        result.append(cycle)
+        if on_cycle is not None:
+            on_cycle(watcher, cycle)
+
+    watcher = AntaWatcher(inventory, kwargs.pop("catalog", CATALOG), interval=kwargs.pop("interval", 0.01), on_cycle=callback, **kwargs)
+    await watcher.run(cycles)
+    return result
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        pytest.param("hardware=3600", ("hardware", 3600), id="category"),
+        pytest.param("VerifyBGP*=60.5", ("VerifyBGP*", 60.5), id="pattern"),
+        pytest.param("a=b=1", ("a=b", 1), id="equal sign in pattern"),
+        pytest.param("hardware", None, id="no interval"),
+        pytest.param("=60", None, id="no pattern"),
+        pytest.param("hardware=0", None, id="zero interval"),
+        pytest.param("hardware=soon", None, id="invalid interval"),
+    ],
+)
+def test_watch_interval_parse(value: str, expected: tuple[str, float] | None) -> None:
+    """
+    Test WatchInterval.parse()
+    """
+    if expected is None:
+        with pytest.raises((ValueError, ValidationError)):
+            WatchInterval.parse(value)
+    else:
+        interval = WatchInterval.parse(value)
+        assert (interval.pattern, interval.interval) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        pytest.param("VerifyUptime", [True, False, False], id="test name"),
+        pytest.param("verify*", [True, True, True], id="case-insensitive pattern"),
+        pytest.param("system", [True, True, False], id="category"),
+        pytest.param("hardware", [False, False, True], id="module"),
+        pytest.param("anta.tests.system", [True, True, False], id="full module"),
+    ],
+)
+def test_watch_interval_matches(pattern: str, expected: list[bool]) -> None:
+    """
+    Test WatchInterval.matches()
+    """
+    catalog = AntaCatalog.from_list([(VerifyUptime, {"minimum": 100}), (VerifyNTP, None), (VerifyTemperature, None)])
+    interval = WatchInterval(pattern=pattern, interval=60)
+    assert [interval.matches(definition) for definition in catalog.tests] == expected
+
+
+@pytest.mark.asyncio
+async def test_watcher_changes(tmp_path: Path) -> None:
+    """
+    Test that AntaWatcher only reports the test results that changed, with the device cache cleared between cycles
+    """
+
+    def on_cycle(watcher: AntaWatcher, cycle: WatchCycle) -> None:
+        # pylint: disable=unused-argument
+        if cycle.cycle == 1:
+            write_outputs(tmp_path, "leaf1", uptime=10)
+
+    write_outputs(tmp_path, "leaf1")
+    write_outputs(tmp_path, "leaf2")
+    cycles = await watch(AntaInventory.from_snapshot(tmp_path), 3, on_cycle)
+    assert [cycle.tests for cycle in cycles] == [4, 4, 4]
+    assert [(change.name, change.test, change.change, change.after) for change in cycles[0].changes] == [
+        ("leaf1", "VerifyNTP", "added", "success"),
+        ("leaf1", "VerifyUptime", "added", "success"),
+        ("leaf2", "VerifyNTP", "added", "success"),
+        ("leaf2", "VerifyUptime", "added", "success"),
+    ]
+    assert [(change.name, change.test, change.before, change.after, change.regression) for change in cycles[1].changes] == [
+        ("leaf1", "VerifyUptime", "success", "failure", True)
+    ]
+    assert cycles[1].changes[0].messages == ["Device uptime is 10 seconds"]
+    assert not cycles[2].changes
+
+
+@pytest.mark.asyncio
+async def test_watcher_intervals(tmp_path: Path) -> None:
+    """
+    Test that AntaWatcher runs the tests at their own interval and runs all the tests when triggered
+    """
+
+    def on_cycle(watcher: AntaWatcher, cycle: WatchCycle) -> None:
+        if cycle.cycle == 3:
+            watcher.trigger()
+
+    write_outputs(tmp_path, "leaf1")
+    cycles = await watch(AntaInventory.from_snapshot(tmp_path), 5, on_cycle, intervals=[WatchInterval(pattern="VerifyNTP", interval=3600)])
+    assert [cycle.tests for cycle in cycles] == [2, 1, 1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_watcher_stop(tmp_path: Path) -> None:
+    """
+    Test that AntaWatcher.run() returns after stop() is called
+    """
+
+    def on_cycle(watcher: AntaWatcher, cycle: WatchCycle) -> None:
+        if cycle.cycle == 2:
+            watcher.stop()
+
+    write_outputs(tmp_path, "leaf1")
+    cycles = await watch(AntaInventory.from_snapshot(tmp_path), None, on_cycle)
+    assert len(cycles) == 2
+
+
+@pytest.mark.asyncio
+async def test_watcher_unreachable_device(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that AntaWatcher skips the tests of the devices that are not established until they are reachable
+    """
+
+    def on_cycle(watcher: AntaWatcher, cycle: WatchCycle) -> None:
+        # pylint: disable=unused-argument
+        if cycle.cycle == 2:
+            write_outputs(tmp_path, "leaf2")
+
+    caplog.set_level(logging.INFO)
+    write_outputs(tmp_path, "leaf1")
+    write_outputs(tmp_path, "leaf2")
+    inventory = AntaInventory.from_snapshot(tmp_path)
+    shutil.rmtree(tmp_path / "leaf2")
+    cycles = await watch(inventory, 3, on_cycle)
+    assert [cycle.tests for cycle in cycles] == [2, 2, 4]
+    assert {change.name for change in cycles[2].changes} == {"leaf2"}
+    assert caplog.text.count("Device leaf2 is not established") == 1
+    assert "Device leaf2 is established again" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "catalog, devices, expected",
+    [
+        pytest.param(AntaCatalog(), ["leaf1"], "The list of tests is empty, exiting", id="empty catalog"),
+        pytest.param(CATALOG, [], "The inventory is empty, exiting", id="empty inventory"),
+    ],
+)
+async def test_watcher_nothing_to_run(tmp_path: Path, caplog: pytest.LogCaptureFixture, catalog: AntaCatalog, devices: list[str], expected: str) -> None:
+    """
+    Test AntaWatcher.run() without tests to run
+    """
+    caplog.set_level(logging.INFO)
+    for device in devices:
+        write_outputs(tmp_path, device)
+    assert not await watch(AntaInventory.from_snapshot(tmp_path), 1, catalog=catalog)
+    assert expected in caplog.text
@@ -0,0 +1,128 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.watchdog.py
+"""
+# Mypy does not understand AntaTest.Input typing
+# mypy: disable-error-code=attr-defined
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Iterator
+
+import pytest
+
+from anta import watchdog
+from anta.device import AntaDevice
+from anta.models import AntaTest
+from anta.watchdog import UNATTRIBUTED, LoopWatchdog
+
+
+class BlockingTest(AntaTest):
+    """ANTA test blocking the event loop during its evaluation"""
+
+    name = "BlockingTest"
+    description = "ANTA test blocking the event loop during its evaluation"
+    categories = []
+    commands = []
+    threads: list[int] = []
+
+    @AntaTest.anta_test
+    def test(self) -> None:
+        BlockingTest.threads.append(threading.get_ident())
+        time.sleep(0.15)
+        self.result.is_success()
+
+
+@pytest.fixture(name="loop_watchdog")
+def loop_watchdog_fixture(request: pytest.FixtureRequest) -> Iterator[LoopWatchdog]:
+    """Enable a LoopWatchdog with a 50ms threshold, offloading the blocking tests if the fixture is parametrized with True"""
+    instance = LoopWatchdog(threshold=0.05, offload=getattr(request, "param", False))
+    watchdog.set_watchdog(instance)
+    BlockingTest.threads = []
+    yield instance
+    watchdog.set_watchdog(None)
+
+
+@watchdog.monitored
+async def run_tests(tests: list[AntaTest]) -> None:
+    """Run tests one after the other, letting the event loop run between the tests as during the collection of the commands"""
+    for test in tests:
+        await test.test()
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_disabled(device: AntaDevice) -> None:
+    """
+    Test that the tests are evaluated in the event loop thread without a watchdog
+    """
+    assert watchdog.get_watchdog() is None
+    test = BlockingTest(device)
+    assert watchdog.evaluation_executor(test) is None
+    BlockingTest.threads = []
+    await run_tests([test])
+    assert BlockingTest.threads == [threading.get_ident()]
+
+
+@pytest.mark.asyncio
+async def test_watchdog_attribution(loop_watchdog: LoopWatchdog, device: AntaDevice, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that the blocking sections of the event loop are attributed to the running test class
+    """
+    caplog.set_level(logging.WARNING)
+    await run_tests([BlockingTest(device), BlockingTest(device)])
+    assert [stat.test for stat in loop_watchdog.statistics()] == ["BlockingTest"]
+    stats = loop_watchdog.statistics()[0]
+    assert stats.times == 2
+    assert stats.maximum >= 0.1
+    assert not loop_watchdog.offloaded
+    assert BlockingTest.threads == [threading.get_ident()] * 2
+    # A warning per test class and a summary
+    messages = [record.message for record in caplog.records]
+    assert len(messages) == 2
+    assert messages[0].startswith("Test BlockingTest blocked the event loop for ")
+    assert messages[0].endswith("ms on device pytest, delaying the other tests")
+    assert messages[1].startswith("Tests blocking the event loop for more than 50ms: BlockingTest 2 time(s)")
+
+
+@pytest.mark.parametrize("loop_watchdog", [True], indirect=True)
+@pytest.mark.asyncio
+async def test_watchdog_offload(loop_watchdog: LoopWatchdog, device: AntaDevice, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that the evaluation of a test class that blocked the event loop is moved to worker threads
+    """
+    caplog.set_level(logging.WARNING)
+    tests = [BlockingTest(device) for _ in range(3)]
+    await run_tests(tests)
+    assert all(test.result.result == "success" for test in tests)
+    assert loop_watchdog.offloaded == {BlockingTest}
+    # Only the first test blocked the event loop
+    assert loop_watchdog.statistics()[0].times == 1
+    assert BlockingTest.threads[0] == threading.get_ident()
+    assert threading.get_ident() not in BlockingTest.threads[1:]
+    assert "its evaluation is moved to worker threads for the rest of the run" in caplog.text
+    # The worker threads are stopped with the watchdog
+    assert loop_watchdog.executor(BlockingTest) is None
+
+
+@pytest.mark.asyncio
+async def test_watchdog_unattributed(loop_watchdog: LoopWatchdog, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that the blocking sections outside of the tests are not reported as warnings
+    """
+    caplog.set_level(logging.WARNING)
+
+    @watchdog.monitored
+    async def block() -> None:
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+
+    await block()
+    assert list(loop_watchdog.blocking) == [UNATTRIBUTED]
+    assert not caplog.records
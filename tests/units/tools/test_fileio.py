@@ -0,0 +1,73 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.tools.fileio
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from anta.tools.fileio import AsyncFileIO
+
+
+@pytest.mark.asyncio
+async def test_write(tmp_path: Path) -> None:
+    """
+    Test AsyncFileIO.write_text(), AsyncFileIO.write_json() and AsyncFileIO.mkdir()
+    """
+    with AsyncFileIO() as fileio:
+        await fileio.write_json(tmp_path / "a" / "b" / "data.json", {"key": "value"}, parents=True)
+        await fileio.write_text(tmp_path / "a" / "data.txt", "content")
+        await fileio.mkdir(tmp_path / "c" / "d")
+        with pytest.raises(FileNotFoundError):
+            await fileio.write_text(tmp_path / "e" / "data.txt", "content")
+    assert json.loads((tmp_path / "a" / "b" / "data.json").read_text(encoding="UTF-8")) == {"key": "value"}
+    assert (tmp_path / "a" / "data.txt").read_text(encoding="UTF-8") == "content"
+    assert (tmp_path / "c" / "d").is_dir()
+
+
+@pytest.mark.asyncio
+async def test_run_bounded() -> None:
+    """
+    Test that AsyncFileIO.run() bounds the number of pending operations without blocking the event loop
+    """
+    release = threading.Event()
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def blocking() -> None:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        release.wait()
+        with lock:
+            running -= 1
+
+    with AsyncFileIO(max_workers=8, max_pending=2) as fileio:
+        tasks = [asyncio.create_task(fileio.run(blocking)) for _ in range(6)]
+        # The event loop is still running while the operations are pending
+        await asyncio.sleep(0.05)
+        assert not any(task.done() for task in tasks)
+        release.set()
+        await asyncio.gather(*tasks)
+    assert max_running == 2
+
+
+def test_submit(tmp_path: Path) -> None:
+    """
+    Test AsyncFileIO.submit() from synchronous code
+    """
+    with AsyncFileIO(max_pending=1) as fileio:
+        futures = [fileio.submit((tmp_path / f"{i}.txt").write_text, str(i), encoding="UTF-8") for i in range(4)]
+        assert [future.result() for future in futures] == [1, 1, 1, 1]
+        future = fileio.submit((tmp_path / "undefined" / "data.txt").write_text, "content")
+        assert isinstance(future.exception(), FileNotFoundError)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["0.txt", "1.txt", "2.txt", "3.txt"]
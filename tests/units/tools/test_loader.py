@@ -0,0 +1,92 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.tools.loader
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from anta.tools.loader import ParseCache, yaml_load
+
+
+def test_yaml_load() -> None:
+    """
+    Test yaml_load
+    """
+    assert yaml_load("a:\n  - 1\n  - b\n") == {"a": [1, "b"]}
+
+
+class Test_ParseCache:
+    """
+    Test for anta.tools.loader.ParseCache
+    """
+
+    @pytest.fixture
+    def source(self, tmp_path: Path) -> Path:
+        """
+        Source file for the cache
+        """
+        source = tmp_path / "source.yml"
+        source.write_text("a: 1\n", encoding="UTF-8")
+        return source
+
+    def test_path(self, source: Path) -> None:
+        """
+        The cache file is stored next to the source file
+        """
+        assert ParseCache(source).path == source.parent / ".source.yml.anta-cache"
+
+    def test_dump_load(self, source: Path) -> None:
+        """
+        Data dumped in the cache is loaded back if the source has not changed
+        """
+        ParseCache(source).dump({"a": 1})
+        assert ParseCache(source).load() == {"a": 1}
+
+    def test_load_no_cache(self, source: Path) -> None:
+        """
+        No cache file is a cache miss
+        """
+        assert ParseCache(source).load() is None
+
+    def test_load_content_changed(self, source: Path) -> None:
+        """
+        A modified source file is a cache miss
+        """
+        ParseCache(source).dump({"a": 1})
+        stat = source.stat()
+        source.write_text("a: 2\n", encoding="UTF-8")
+        # Keep the same modification time to make sure the digest is checked
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert ParseCache(source).load() is None
+
+    def test_load_mtime_changed(self, source: Path) -> None:
+        """
+        A source file with a different modification time is a cache miss
+        """
+        ParseCache(source).dump({"a": 1})
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert ParseCache(source).load() is None
+
+    def test_load_corrupted(self, source: Path) -> None:
+        """
+        A corrupted cache file is a cache miss
+        """
+        cache = ParseCache(source)
+        cache.path.write_bytes(b"not a pickle")
+        assert cache.load() is None
+
+    def test_dump_fail(self, source: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """
+        Failing to write the cache only logs a warning
+        """
+        cache = ParseCache(source)
+        cache.dump(lambda: None)
+        assert not cache.path.exists()
+        assert "Could not write parsed-file cache" in caplog.text
@@ -0,0 +1,161 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.tools.ssh
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from anta.tools.ssh import SSHConnectionPool
+
+
+class FakeConnection:
+    """Minimal asyncssh.SSHClientConnection"""
+
+    def __init__(self) -> None:
+        self._closed = asyncio.Event()
+
+    @property
+    def is_closed(self) -> bool:
+        """True if the connection has been closed"""
+        return self._closed.is_set()
+
+    def close(self) -> None:
+        """Close the connection"""
+        self._closed.set()
+
+    async def wait_closed(self) -> None:
+        """Wait for the connection to be closed"""
+        await self._closed.wait()
+
+
+class FakeConnector:  # pylint: disable=too-few-public-methods
+    """Open FakeConnection objects and keep track of them"""
+
+    def __init__(self) -> None:
+        self.connections: list[FakeConnection] = []
+
+    async def __call__(self) -> FakeConnection:
+        await asyncio.sleep(0.01)
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+
+@pytest.mark.asyncio
+async def test_reuse() -> None:
+    """
+    Test that consecutive users share the same connection until close()
+    """
+    connector = FakeConnector()
+    pool = SSHConnectionPool(connector, name="leaf1")  # type: ignore[arg-type]
+    for _ in range(3):
+        async with pool.connection() as conn:
+            assert conn is connector.connections[0]
+    assert len(connector.connections) == 1
+    assert len(pool) == 1
+    await pool.close()
+    assert connector.connections[0].is_closed
+    assert len(pool) == 0
+    # The pool can be used after close()
+    async with pool.connection() as conn:
+        assert conn is connector.connections[1]
+    await pool.close()
+
+
+def test_reuse_event_loops() -> None:
+    """
+    Test that the pool can be used by successive event loops after close(), e.g. by successive asyncio.run() calls
+    """
+    connector = FakeConnector()
+    pool = SSHConnectionPool(connector, name="leaf1", max_connections=1, max_sessions=1)  # type: ignore[arg-type]
+
+    async def run() -> None:
+        async def use() -> None:
+            async with pool.connection():
+                await asyncio.sleep(0.01)
+
+        # The second user waits for the connection of the first one
+        await asyncio.gather(use(), use())
+        await pool.close()
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert len(connector.connections) == 2
+
+
+@pytest.mark.asyncio
+async def test_limits() -> None:
+    """
+    Test that concurrent users are spread on at most max_connections connections of max_sessions users
+    """
+    connector = FakeConnector()
+    pool = SSHConnectionPool(connector, name="leaf1", max_connections=2, max_sessions=2)  # type: ignore[arg-type]
+    users = 0
+    max_users = 0
+
+    async def use() -> None:
+        nonlocal users, max_users
+        async with pool.connection():
+            users += 1
+            max_users = max(max_users, users)
+            await asyncio.sleep(0.01)
+            users -= 1
+
+    await asyncio.gather(*(use() for _ in range(10)))
+    assert len(connector.connections) == 2
+    assert max_users == 4
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout() -> None:
+    """
+    Test that a connection is closed after the idle timeout and that a connection closed by the device is discarded
+    """
+    connector = FakeConnector()
+    pool = SSHConnectionPool(connector, name="leaf1", idle_timeout=0.05)  # type: ignore[arg-type]
+    async with pool.connection():
+        await asyncio.sleep(0.1)
+    # Still in use during the idle timeout
+    assert not connector.connections[0].is_closed
+    await asyncio.sleep(0.1)
+    assert connector.connections[0].is_closed
+    assert len(pool) == 0
+
+    async with pool.connection() as conn:
+        pass
+    # Connection closed by the device
+    conn.close()
+    await asyncio.sleep(0.01)
+    assert len(pool) == 0
+    async with pool.connection() as conn:
+        assert conn is connector.connections[2]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_connect_error() -> None:
+    """
+    Test that a connection error is raised to the user and does not leak a pool slot
+    """
+
+    async def connect() -> None:
+        raise OSError("Connection refused")
+
+    pool = SSHConnectionPool(connect, name="leaf1", max_connections=1)  # type: ignore[arg-type]
+    for _ in range(2):
+        with pytest.raises(OSError, match="Connection refused"):
+            async with pool.connection():
+                pass
+
+
+def test_invalid() -> None:
+    """
+    Test SSHConnectionPool with invalid limits
+    """
+    with pytest.raises(ValueError):
+        SSHConnectionPool(FakeConnector(), name="leaf1", max_sessions=0)  # type: ignore[arg-type]
@@ -0,0 +1,139 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.tools.transfer
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from anta.tools.fileio import AsyncFileIO
+from anta.tools.transfer import CHUNK_SIZE, TransferBudget, sftp_download
+
+CONTENT = bytes(range(256)) * 4096  # 1 MiB
+
+
+class FakeSFTPFile:
+    """Remote file of FakeSFTPClient"""
+
+    def __init__(self, client: FakeSFTPClient, content: bytes) -> None:
+        self.client = client
+        self.content = content
+
+    async def __aenter__(self) -> FakeSFTPFile:
+        self.client.open_files += 1
+        self.client.max_open_files = max(self.client.max_open_files, self.client.open_files)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.client.open_files -= 1
+
+    async def read(self, size: int, offset: int) -> bytes:
+        """Read data at an offset"""
+        self.client.offsets.append(offset)
+        await asyncio.sleep(0)
+        return self.content[offset:][:size]
+
+
+class FakeSFTPClient:
+    """Minimal asyncssh.SFTPClient serving files from memory"""
+
+    def __init__(self, files: dict[str, bytes], truncate: bool = False) -> None:
+        self.files = files
+        self.truncate = truncate
+        self.offsets: list[int] = []
+        self.open_files = 0
+        self.max_open_files = 0
+
+    async def stat(self, path: str) -> SimpleNamespace:
+        """Return the attributes of a file"""
+        return SimpleNamespace(size=len(self.files[path]))
+
+    def open(self, path: str, mode: str) -> FakeSFTPFile:
+        """Open a file"""
+        assert mode == "rb"
+        content = self.files[path]
+        return FakeSFTPFile(self, content[: len(content) // 2] if self.truncate else content)
+
+
+@pytest.mark.asyncio
+async def test_sftp_download(tmp_path: Path) -> None:
+    """
+    Test sftp_download() with a new file and then with the downloaded file
+    """
+    sftp = FakeSFTPClient({"/mnt/flash/file": CONTENT})
+    destination = tmp_path / "file"
+    with AsyncFileIO() as fileio:
+        assert await sftp_download(sftp, Path("/mnt/flash/file"), destination, fileio)  # type: ignore[arg-type]
+        assert destination.read_bytes() == CONTENT
+        assert not (tmp_path / "file.part").exists()
+        assert sftp.offsets == list(range(0, len(CONTENT), CHUNK_SIZE))
+        # Same size: skipped
+        assert not await sftp_download(sftp, Path("/mnt/flash/file"), destination, fileio)  # type: ignore[arg-type]
+        # Same size and same digest: skipped
+        assert not await sftp_download(sftp, Path("/mnt/flash/file"), destination, fileio, checksum=hashlib.sha256(CONTENT).hexdigest())  # type: ignore[arg-type]
+        # Same size but different digest: downloaded again
+        destination.write_bytes(bytes(len(CONTENT)))
+        assert await sftp_download(sftp, Path("/mnt/flash/file"), destination, fileio, checksum=hashlib.sha256(CONTENT).hexdigest())  # type: ignore[arg-type]
+        assert destination.read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_sftp_download_resume(tmp_path: Path) -> None:
+    """
+    Test sftp_download() with a partially downloaded file
+    """
+    sftp = FakeSFTPClient({"/mnt/flash/file": CONTENT})
+    (tmp_path / "file.part").write_bytes(CONTENT[: CHUNK_SIZE + 10])
+    with AsyncFileIO() as fileio:
+        assert await sftp_download(sftp, Path("/mnt/flash/file"), tmp_path / "file", fileio)  # type: ignore[arg-type]
+    assert sftp.offsets[0] == CHUNK_SIZE + 10
+    assert (tmp_path / "file").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_sftp_download_errors(tmp_path: Path) -> None:
+    """
+    Test sftp_download() with an incomplete download and a checksum mismatch
+    """
+    with AsyncFileIO() as fileio:
+        with pytest.raises(OSError, match="is incomplete"):
+            await sftp_download(FakeSFTPClient({"/file": CONTENT}, truncate=True), Path("/file"), tmp_path / "file", fileio)  # type: ignore[arg-type]
+        # The partial file is kept to resume the download
+        assert (tmp_path / "file.part").stat().st_size == len(CONTENT) // 2
+        with pytest.raises(OSError, match="Checksum of '/file' does not match"):
+            await sftp_download(FakeSFTPClient({"/file": CONTENT}), Path("/file"), tmp_path / "file", fileio, checksum="0" * 64)  # type: ignore[arg-type]
+        assert not (tmp_path / "file.part").exists()
+        assert not (tmp_path / "file").exists()
+
+
+@pytest.mark.asyncio
+async def test_budget(tmp_path: Path) -> None:
+    """
+    Test that sftp_download() stays within the concurrency and bandwidth limits of a TransferBudget
+    """
+    sftp = FakeSFTPClient({f"/file{i}": CONTENT for i in range(4)})
+    budget = TransferBudget(max_transfers=2, bandwidth=20 * len(CONTENT))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with AsyncFileIO() as fileio:
+        await asyncio.gather(*(sftp_download(sftp, Path(f"/file{i}"), tmp_path / f"file{i}", fileio, budget) for i in range(4)))  # type: ignore[arg-type]
+    # 4 MiB at 20 MiB/s
+    assert loop.time() - start >= 0.2
+    assert sftp.max_open_files == 2
+
+
+@pytest.mark.parametrize("kwargs", [{"max_transfers": 0}, {"bandwidth": 0}])
+def test_budget_invalid(kwargs: dict[str, Any]) -> None:
+    """
+    Test TransferBudget with invalid limits
+    """
+    with pytest.raises(ValueError):
+        TransferBudget(**kwargs)